@@ -199,8 +199,10 @@ def config_show() -> None:
 from . import (  # noqa: E402, F401
     doctor_cmd,
     generate_cmd,
+    mcp_cmd,
     pipeline_cmd,
     project_cmd,
     status_cmd,
+    store_cmd,
     sync_cmd,
 )
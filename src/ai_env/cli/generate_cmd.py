@@ -5,6 +5,7 @@ from __future__ import annotations
 import click
 
 from ..core import get_secrets_manager
+from ..core.output_writer import OutputWriter
 from ..mcp import MCPConfigGenerator
 from . import _output_content, console, main
 
@@ -21,11 +22,16 @@ def generate_all(dry_run: bool) -> None:
     """모든 설정 파일 생성"""
     sm = get_secrets_manager()
     generator = MCPConfigGenerator(sm)
-    results = generator.save_all(dry_run=dry_run)
+    writer = OutputWriter(dry_run=dry_run)
+    results = generator.save_all(dry_run=dry_run, writer=writer)
 
     action = "Would save" if dry_run else "Saved"
+    unchanged = {r.path for r in writer.results if r.status == "unchanged"}
     for name, path in results.items():
-        console.print(f"[green]✓ {action}[/green] {name}: {path}")
+        if path in unchanged:
+            console.print(f"[dim]○ Unchanged[/dim] {name}: {path}")
+        else:
+            console.print(f"[green]✓ {action}[/green] {name}: {path}")
 
 
 @generate.command("claude-desktop")
@@ -0,0 +1,582 @@
+"""mcp 명령어"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+import click
+
+from ..core import get_secrets_manager, load_settings
+from ..mcp import MCPConfigGenerator
+from ..mcp.catalog import load_catalog, save_probe_catalogs
+from ..mcp.footprint import server_footprint
+from ..mcp.hub import MCPHub, connect, hub_dir
+from ..mcp.latency import LatencyStore, LatencySummary
+from ..mcp.pool import ContainerPool
+from ..mcp.probe import DEFAULT_CONCURRENCY, ProbeResult, probe_servers
+from ..mcp.shim import run_shim
+from ..mcp.tap import (
+    DEFAULT_REPLAY_TIMEOUT,
+    load_transcript,
+    read_calls,
+    replay_transcript,
+    run_tap,
+    summarize_calls,
+)
+from . import _create_table, console, main
+
+_STATUS_STYLE = {
+    "ok": "[green]✓ ok[/green]",
+    "failed": "[red]✗ failed[/red]",
+    "timeout": "[red]⏱ timeout[/red]",
+    "skipped": "[dim]- skipped[/dim]",
+}
+
+
+@main.group()
+def mcp() -> None:
+    """MCP 서버 점검"""
+    pass
+
+
+@mcp.command("probe")
+@click.argument("names", nargs=-1)
+@click.option(
+    "--timeout",
+    type=float,
+    default=None,
+    help="서버별 제한 시간(초, 기본: startup_timeout_sec 또는 60)",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=DEFAULT_CONCURRENCY,
+    show_default=True,
+    help="동시에 기동할 서버 수",
+)
+@click.option(
+    "--no-record", is_flag=True, help="기동 시간 기록과 도구 카탈로그(shim 캐시)를 저장하지 않음"
+)
+@click.option("--json", "as_json", is_flag=True, help="JSON으로 출력")
+def mcp_probe(
+    names: tuple[str, ...], timeout: float | None, jobs: int, no_record: bool, as_json: bool
+) -> None:
+    """MCP 서버를 실제로 기동해 initialize + tools/list 응답 확인
+
+    NAMES를 생략하면 mcp_servers.yaml의 활성 서버 전체를 동시에 probe한다.
+    측정한 기동 시간은 ~/.ai-env/mcp_latency.sqlite3에 쌓이고 (mcp_timeouts 설정 참고),
+    도구 목록은 mcp shim이 쓸 카탈로그로 ~/.ai-env/mcp_catalog/에 저장된다.
+    """
+    generator = MCPConfigGenerator(get_secrets_manager())
+
+    def _on_progress(result: ProbeResult) -> None:
+        if not as_json:
+            console.print(f"  {_STATUS_STYLE[result.status]} {result.name}", highlight=False)
+
+    try:
+        results = asyncio.run(
+            probe_servers(
+                generator,
+                list(names) or None,
+                concurrency=jobs,
+                timeout=timeout,
+                on_progress=_on_progress,
+            )
+        )
+    except ValueError as e:
+        raise click.UsageError(str(e)) from e
+    if not no_record:
+        LatencyStore().record_probe(results)
+        save_probe_catalogs(results)
+
+    if as_json:
+        console.print_json(json.dumps([r.to_dict() for r in results]))
+    else:
+        rows = [
+            (
+                r.name,
+                r.type,
+                _STATUS_STYLE[r.status],
+                f"{r.ready_seconds:.2f}s" if r.ready_seconds is not None else "-",
+                str(r.tools) if r.tools is not None else "-",
+                f"{r.rss_bytes / 1024**2:.0f} MiB" if r.rss_bytes is not None else "-",
+                r.error or r.server_info or "",
+            )
+            for r in results
+        ]
+        console.print(
+            _create_table(
+                "MCP Probe",
+                [
+                    ("Server", "cyan"),
+                    ("Type", "dim"),
+                    ("Status", ""),
+                    ("Ready", ""),
+                    ("Tools", ""),
+                    ("RSS", ""),
+                    ("Detail", "dim"),
+                ],
+                rows,
+            )
+        )
+        failed = sum(not r.ok for r in results)
+        console.print(f"[bold]{len(results) - failed}/{len(results)} servers ok[/bold]")
+
+    if any(not r.ok for r in results):
+        raise SystemExit(1)
+
+
+@mcp.command("latency")
+@click.option("--json", "as_json", is_flag=True, help="JSON으로 출력")
+def mcp_latency(as_json: bool) -> None:
+    """기록된 서버별 기동 시간과 계산된 startup_timeout_sec 확인"""
+    generator = MCPConfigGenerator(get_secrets_manager())
+    config = generator.settings.mcp_timeouts
+    summaries = LatencyStore().summarize(config)
+    servers = generator.mcp_config.mcp_servers
+
+    # (서버, 측정 요약, 적용될 timeout, 출처)
+    entries: list[tuple[str, LatencySummary | None, int, str]] = []
+    for name, server in servers.items():
+        if not server.enabled:
+            continue
+        summary = summaries.get(name)
+        if server.startup_timeout_sec is not None:
+            source = "yaml"
+        elif config.adaptive and summary and summary.suggested is not None:
+            source = "measured"
+        else:
+            source = "default"
+        entries.append((name, summary, generator.startup_timeout(name, server), source))
+
+    if as_json:
+        rows: list[dict[str, Any]] = []
+        for name, summary, timeout, source in entries:
+            entry = summary.to_dict() if summary else {"server": name, "samples": 0}
+            rows.append({**entry, "timeout_sec": timeout, "source": source})
+        console.print_json(json.dumps({"adaptive": config.adaptive, "servers": rows}))
+        return
+
+    def _sec(value: float | None) -> str:
+        return f"{value:.2f}s" if value is not None else "-"
+
+    console.print(
+        _create_table(
+            f"MCP startup latency (p{config.percentile:g} × {config.margin:g})",
+            [
+                ("Server", "cyan"),
+                ("Samples", ""),
+                ("p50", ""),
+                (f"p{config.percentile:g}", ""),
+                ("Suggested", ""),
+                ("Timeout", "bold"),
+                ("Source", "dim"),
+            ],
+            [
+                (
+                    name,
+                    str(summary.samples if summary else 0),
+                    _sec(summary.p50 if summary else None),
+                    _sec(summary.p_value if summary else None),
+                    str(summary.suggested if summary and summary.suggested is not None else "-"),
+                    f"{timeout}s",
+                    source,
+                )
+                for name, summary, timeout, source in entries
+            ],
+        )
+    )
+    if not config.adaptive:
+        console.print("[dim]mcp_timeouts.adaptive: false → 측정값은 적용되지 않음[/dim]")
+
+
+@mcp.command("footprint")
+@click.argument("names", nargs=-1)
+@click.option("--refresh", is_flag=True, help="캐시된 카탈로그가 있어도 서버를 다시 probe")
+@click.option("--timeout", type=float, default=None, help="서버별 제한 시간(초)")
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=DEFAULT_CONCURRENCY,
+    show_default=True,
+    help="동시에 기동할 서버 수",
+)
+@click.option("--json", "as_json", is_flag=True, help="JSON으로 출력 (도구별 토큰 포함)")
+def mcp_footprint(
+    names: tuple[str, ...], refresh: bool, timeout: float | None, jobs: int, as_json: bool
+) -> None:
+    """서버별 도구 정의가 에이전트 컨텍스트에서 차지하는 토큰 추정
+
+    카탈로그(~/.ai-env/mcp_catalog/)가 없는 stdio 서버는 기동해 tools/list를 받아 저장한다.
+    타겟별 값은 mcp_servers.yaml의 tool_allow/tool_deny를 적용한 결과
+    (codex/gemini/claude_local만 적용, 나머지 타겟은 전체 도구).
+    """
+    generator = MCPConfigGenerator(get_secrets_manager())
+    servers = generator.mcp_config.mcp_servers
+    selected = list(names) or [name for name, server in servers.items() if server.enabled]
+    unknown = [name for name in selected if name not in servers]
+    if unknown:
+        raise click.UsageError(f"Unknown MCP server(s): {', '.join(unknown)}")
+
+    missing = [
+        name
+        for name in selected
+        if servers[name].enabled
+        and servers[name].type != "sse"
+        and (refresh or load_catalog(name) is None)
+    ]
+    if missing:
+        if not as_json:
+            console.print(f"[dim]Fetching tools/list from {len(missing)} server(s)...[/dim]")
+        results = asyncio.run(probe_servers(generator, missing, concurrency=jobs, timeout=timeout))
+        save_probe_catalogs(results)
+        for result in results:
+            if not result.ok and not as_json:
+                console.print(f"  {_STATUS_STYLE[result.status]} {result.name}: {result.error}")
+
+    footprints = [server_footprint(name, servers[name], load_catalog(name)) for name in selected]
+    if as_json:
+        console.print_json(json.dumps([f.to_dict() for f in footprints]))
+        return
+
+    rows = []
+    for fp in footprints:
+        if not fp.cached:
+            rows.append((fp.name, "-", "-", "[dim]no catalog[/dim]", ""))
+            continue
+        largest = max(fp.tools.items(), key=lambda item: item[1], default=None)
+        rows.append(
+            (
+                fp.name,
+                str(len(fp.tools)),
+                f"~{fp.tokens:,}",
+                " ".join(f"{target}={tokens:,}" for target, tokens in fp.targets.items()),
+                f"{largest[0]} ({largest[1]:,})" if largest else "",
+            )
+        )
+    console.print(
+        _create_table(
+            "MCP tool footprint (≈ tokens)",
+            [
+                ("Server", "cyan"),
+                ("Tools", ""),
+                ("Tokens", "bold"),
+                ("Per target", ""),
+                ("Largest tool", "dim"),
+            ],
+            rows,
+        )
+    )
+    total_tools = sum(len(fp.tools) for fp in footprints)
+    total_tokens = sum(fp.tokens for fp in footprints)
+    console.print(f"[bold]{total_tools} tools, ~{total_tokens:,} tokens[/bold]")
+
+
+@mcp.command("hub")
+@click.argument("names", nargs=-1)
+@click.option("--eager", is_flag=True, help="클라이언트 연결 전에 서버를 미리 기동")
+def mcp_hub(names: tuple[str, ...], eager: bool) -> None:
+    """stdio 서버를 이름별로 하나만 띄워 여러 클라이언트가 공유 (foreground 실행)
+
+    NAMES를 생략하면 mcp_hub.servers(비어 있으면 활성 stdio 서버 전체)를 공유한다.
+    클라이언트는 `ai-env mcp connect <name>`으로 ~/.ai-env/hub/<name>.sock에 붙는다.
+    """
+    generator = MCPConfigGenerator(get_secrets_manager())
+    servers = generator.mcp_config.mcp_servers
+    selected = (
+        list(names)
+        or generator.hub_servers()
+        or [name for name, server in servers.items() if server.enabled and server.type != "sse"]
+    )
+    unknown = [name for name in selected if name not in servers]
+    if unknown:
+        raise click.UsageError(f"Unknown MCP server(s): {', '.join(unknown)}")
+
+    configs = {}
+    for name in selected:
+        config = generator.resolve_server(name)
+        if config is None or servers[name].type == "sse":
+            console.print(f"  [dim]- skipped {name} (disabled or sse)[/dim]")
+            continue
+        configs[name] = config
+
+    hub = MCPHub(configs)
+
+    def _on_ready() -> None:
+        console.print(f"[bold]🔌 MCP hub[/bold] [dim]{hub_dir()}[/dim]")
+        for name in configs:
+            console.print(f"  [green]✓[/green] {name}")
+        console.print("[dim]Ctrl+C로 종료 (서버 프로세스도 함께 종료)[/dim]")
+
+    try:
+        asyncio.run(hub.serve_forever(eager=eager, on_ready=_on_ready))
+    except RuntimeError as e:
+        raise click.ClickException(str(e)) from e
+
+
+def _resolve_stdio(name: str) -> dict[str, Any]:
+    """서버 실행 설정 (connect/shim/tap용)"""
+    generator = MCPConfigGenerator(get_secrets_manager())
+    try:
+        config = generator.resolve_server(name)
+    except KeyError as e:
+        raise click.UsageError(f"Unknown MCP server: {name}") from e
+    if config is None or "command" not in config:
+        raise click.ClickException(f"MCP server {name} is disabled or not a stdio server")
+    return config
+
+
+def _exec_server(config: dict[str, Any]) -> None:
+    """현재 프로세스를 서버로 교체 (클라이언트와 stdio를 직접 주고받음)"""
+    command = config["command"]
+    os.execvpe(command, [command, *config["args"]], {**os.environ, **config.get("env", {})})
+
+
+@mcp.command("connect")
+@click.argument("name")
+def mcp_connect(name: str) -> None:
+    """stdio를 hub 소켓에 연결 (클라이언트 설정용, hub가 없으면 서버를 직접 실행)"""
+    if connect(name):
+        return
+    _exec_server(_resolve_stdio(name))
+
+
+@mcp.command("shim")
+@click.argument("name")
+def mcp_shim(name: str) -> None:
+    """캐시된 도구 카탈로그로 즉시 응답하고 첫 tools/call에서 서버를 기동 (클라이언트 설정용)
+
+    카탈로그가 없으면 서버를 바로 실행한다 (`ai-env mcp probe`로 카탈로그 생성).
+    """
+    config = _resolve_stdio(name)
+    catalog = load_catalog(name)
+    if catalog is None:
+        _exec_server(config)
+        return
+    asyncio.run(run_shim(name, config, catalog))
+
+
+@mcp.command("tap")
+@click.argument("name")
+@click.option("--record", is_flag=True, help="전체 메시지를 트랜스크립트로 저장 (mcp replay 입력)")
+def mcp_tap(name: str, record: bool) -> None:
+    """stdio를 그대로 중계하며 호출별 지연 시간/크기를 기록 (클라이언트 설정용)
+
+    기록: ~/.ai-env/mcp_tap/<name>.jsonl, 트랜스크립트: ~/.ai-env/mcp_tap/transcripts/
+    """
+    asyncio.run(run_tap(name, _resolve_stdio(name), record=record))
+
+
+@mcp.command("calls")
+@click.argument("names", nargs=-1)
+@click.option("--json", "as_json", is_flag=True, help="JSON으로 출력")
+def mcp_calls(names: tuple[str, ...], as_json: bool) -> None:
+    """tap 기록을 (서버, 메서드, 도구)별로 집계 (NAMES를 생략하면 기록된 서버 전체)"""
+    summaries = summarize_calls(read_calls(names or None))
+    if as_json:
+        console.print_json(json.dumps([s.to_dict() for s in summaries]))
+        return
+
+    def _ms(value: float | None) -> str:
+        return f"{value:.0f}ms" if value is not None else "-"
+
+    console.print(
+        _create_table(
+            "MCP calls (ai-env mcp tap)",
+            [
+                ("Server", "cyan"),
+                ("Method", ""),
+                ("Tool", ""),
+                ("Calls", ""),
+                ("Errors", ""),
+                ("p50", ""),
+                ("p95", "bold"),
+                ("Max", ""),
+                ("Req B", "dim"),
+                ("Resp B", "dim"),
+            ],
+            [
+                (
+                    s.server,
+                    s.method,
+                    s.tool or "",
+                    str(s.calls),
+                    str(s.errors) if s.errors else "",
+                    _ms(s.p50_ms),
+                    _ms(s.p95_ms),
+                    _ms(s.max_ms),
+                    f"{s.avg_request_bytes:.0f}",
+                    f"{s.avg_response_bytes:.0f}" if s.avg_response_bytes is not None else "-",
+                )
+                for s in summaries
+            ],
+        )
+    )
+    if not summaries:
+        console.print("[dim]기록 없음 — settings.yaml의 mcp_tap.enabled를 켜고 sync[/dim]")
+
+
+@mcp.command("replay")
+@click.argument("transcript", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option("--server", "server_name", default=None, help="재생할 서버 (기본: 기록한 서버)")
+@click.option(
+    "--timeout",
+    type=click.FloatRange(min=0, min_open=True),
+    default=DEFAULT_REPLAY_TIMEOUT,
+    show_default=True,
+    help="요청당 응답 대기 시간(초)",
+)
+@click.option("--json", "as_json", is_flag=True, help="JSON으로 출력")
+def mcp_replay(transcript: Path, server_name: str | None, timeout: float, as_json: bool) -> None:
+    """기록된 트랜스크립트를 서버에 다시 보내 요청별 지연 시간을 기록 시점과 비교
+
+    요청은 하나씩 순서대로 보낸다. 응답이 없거나 실패한 요청이 있으면 종료 코드 1.
+    """
+    try:
+        header, entries = load_transcript(transcript)
+    except ValueError as e:
+        raise click.ClickException(str(e)) from e
+    name = server_name or header["server"]
+    calls = asyncio.run(replay_transcript(_resolve_stdio(name), entries, timeout=timeout))
+    failed = any(c.error is not None or c.replay_ms is None for c in calls)
+
+    if as_json:
+        console.print_json(json.dumps({"server": name, "calls": [c.to_dict() for c in calls]}))
+    else:
+
+        def _ms(value: float | None) -> str:
+            return f"{value:.0f}ms" if value is not None else "-"
+
+        def _delta(value: float | None) -> str:
+            if value is None:
+                return "-"
+            color = "red" if value > 0 else "green"
+            return f"[{color}]{value:+.0f}ms[/{color}]"
+
+        console.print(
+            _create_table(
+                f"MCP replay: {name}",
+                [
+                    ("Method", "cyan"),
+                    ("Tool", ""),
+                    ("Recorded", ""),
+                    ("Replay", "bold"),
+                    ("Δ", ""),
+                    ("Error", "red"),
+                ],
+                [
+                    (
+                        c.method,
+                        c.tool or "",
+                        _ms(c.recorded_ms),
+                        _ms(c.replay_ms),
+                        _delta(c.delta_ms),
+                        c.error or "",
+                    )
+                    for c in calls
+                ],
+            )
+        )
+    if failed:
+        raise SystemExit(1)
+
+
+@mcp.group("pool")
+def mcp_pool() -> None:
+    """docker 기반 MCP 서버 warm container pool"""
+    pass
+
+
+def _pool_targets(generator: MCPConfigGenerator, names: tuple[str, ...]) -> list[str]:
+    servers = generator.mcp_config.mcp_servers
+    unknown = [name for name in names if name not in servers]
+    if unknown:
+        raise click.UsageError(f"Unknown MCP server(s): {', '.join(unknown)}")
+    return list(names) or generator.pool_candidates()
+
+
+@mcp_pool.command("up")
+@click.argument("names", nargs=-1)
+@click.option("--size", type=click.IntRange(min=1), default=None, help="서버당 컨테이너 수")
+def mcp_pool_up(names: tuple[str, ...], size: int | None) -> None:
+    """서버별 컨테이너를 미리 만들어 둠 (`docker create`, 설정이 바뀐 pool은 다시 생성)
+
+    NAMES를 생략하면 mcp_pool.servers(비어 있으면 `docker run` 서버 전체).
+    mcp_pool.enabled: true면 이후 sync가 클라이언트 설정을 `mcp pool attach`로 생성한다.
+    """
+    generator = MCPConfigGenerator(get_secrets_manager())
+    settings = generator.settings.mcp_pool
+    pool = ContainerPool(settings.docker)
+    failed = 0
+    for name in _pool_targets(generator, names):
+        config = generator.resolve_server(name)
+        try:
+            if config is None:
+                raise ValueError(f"MCP server {name} is disabled")
+            state = pool.up(name, config, size or settings.size)
+        except (ValueError, RuntimeError, OSError) as e:
+            console.print(f"  [red]✗[/red] {name}: {e}")
+            failed += 1
+            continue
+        console.print(f"  [green]✓[/green] {name}: {', '.join(state.containers)}")
+    if not settings.enabled:
+        console.print("[dim]mcp_pool.enabled: false → 클라이언트 설정은 그대로 (docker run)[/dim]")
+    if failed:
+        raise SystemExit(1)
+
+
+@mcp_pool.command("down")
+@click.argument("names", nargs=-1)
+def mcp_pool_down(names: tuple[str, ...]) -> None:
+    """pool 컨테이너 삭제 (NAMES를 생략하면 pool 대상 서버 전체)"""
+    generator = MCPConfigGenerator(get_secrets_manager())
+    pool = ContainerPool(generator.settings.mcp_pool.docker)
+    for name in _pool_targets(generator, names):
+        removed = pool.down(name)
+        if removed:
+            console.print(f"  [green]✓[/green] {name}: removed {removed} container(s)")
+    console.print("[dim]sync를 다시 실행하면 클라이언트 설정이 docker run으로 돌아갑니다[/dim]")
+
+
+@mcp_pool.command("status")
+@click.option("--json", "as_json", is_flag=True, help="JSON으로 출력")
+def mcp_pool_status(as_json: bool) -> None:
+    """pool 컨테이너 상태 (created/exited = 대기, running + in use = 클라이언트 연결 중)"""
+    generator = MCPConfigGenerator(get_secrets_manager())
+    pool = ContainerPool(generator.settings.mcp_pool.docker)
+    statuses = [s for name in generator.pool_candidates() for s in pool.status(name)]
+    if as_json:
+        console.print_json(json.dumps([s.to_dict() for s in statuses]))
+        return
+    console.print(
+        _create_table(
+            "MCP container pool",
+            [("Server", "cyan"), ("Container", ""), ("Status", ""), ("In use", "")],
+            [(s.server, s.container, s.status, "yes" if s.in_use else "") for s in statuses],
+        )
+    )
+
+
+@mcp_pool.command("attach")
+@click.argument("name")
+def mcp_pool_attach(name: str) -> None:
+    """비어 있는 pool 컨테이너에 stdio를 붙임 (클라이언트 설정용)
+
+    pool이 없거나, 설정(시크릿 포함)이 pool 생성 이후 바뀌었거나, 모든 컨테이너가 사용 중이면
+    서버를 직접 실행한다.
+    """
+    config = _resolve_stdio(name)
+    pool = ContainerPool(load_settings().mcp_pool.docker)
+    acquired = pool.acquire(name, config)
+    if acquired is None:
+        _exec_server(config)
+        return
+    container, _lock_fd = acquired  # fd는 exec 후에도 열려 있어 세션 동안 잠금 유지
+    argv = pool.attach_argv(container)
+    os.execvp(argv[0], argv)
@@ -2,11 +2,13 @@
 
 from __future__ import annotations
 
+import json
 from pathlib import Path
 
 import click
 
-from ..core import sync_project_claude_to_codex
+from ..core import load_settings, sync_project_claude_to_codex, sync_workspace
+from ..core.project_sync import DEFAULT_MAX_DEPTH, ProjectReport
 from . import console, main
 
 
@@ -65,3 +67,94 @@ def project_sync_codex(
         console.print(f"    {result.source} → {result.target}")
         if result.backup_path is not None:
             console.print(f"    [dim]backup: {result.backup_path}[/dim]")
+
+
+def _print_project_report(report: ProjectReport, action: str) -> None:
+    """프로젝트 하나의 결과 한 줄 출력 (완료 순서대로 호출됨)."""
+    if not report.ok:
+        console.print(f"  [red]✗[/red] {report.project}: {report.error}")
+        return
+    parts = []
+    for result in report.results:
+        status = action if result.status in ("linked", "copied") else result.status
+        parts.append(f"{result.name} {status}")
+    console.print(
+        f"  [green]✓[/green] {report.project} [dim]({', '.join(parts)}; "
+        f"{report.elapsed * 1000:.0f}ms)[/dim]"
+    )
+
+
+@project.command("sync")
+@click.option(
+    "--all",
+    "workspace_root",
+    required=True,
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+    help="이 디렉토리 아래 모든 프로젝트(CLAUDE.md 또는 .claude/skills가 있는 디렉토리) 동기화",
+)
+@click.option(
+    "--max-depth",
+    type=click.IntRange(min=0),
+    default=DEFAULT_MAX_DEPTH,
+    show_default=True,
+    help="프로젝트 탐색 최대 깊이",
+)
+@click.option("--no-gitignore", is_flag=True, help=".gitignore에 걸린 디렉토리도 탐색")
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=None,
+    help="동시에 동기화할 프로젝트 수 (기본: settings.yaml의 sync.workers)",
+)
+@click.option("--copy", is_flag=True, help="AGENTS.md를 심볼릭 링크 대신 복사")
+@click.option("--dry-run", is_flag=True, help="실제 변경 없이 미리보기")
+@click.option("--agents-only", is_flag=True, help="CLAUDE.md → AGENTS.md만 동기화")
+@click.option("--skills-only", is_flag=True, help=".claude/skills → .codex/skills만 동기화")
+@click.option("--json", "as_json", is_flag=True, help="집계 결과를 JSON으로 출력")
+def project_sync_all(
+    workspace_root: Path,
+    max_depth: int,
+    no_gitignore: bool,
+    jobs: int | None,
+    copy: bool,
+    dry_run: bool,
+    agents_only: bool,
+    skills_only: bool,
+    as_json: bool,
+) -> None:
+    """워크스페이스 아래 모든 프로젝트의 Claude 지침/스킬을 Codex용으로 일괄 동기화"""
+    sync_agents = not skills_only or agents_only
+    sync_skills = not agents_only or skills_only
+    workers = jobs if jobs is not None else load_settings().sync.workers
+    action = "would sync" if dry_run else "synced"
+
+    if not as_json:
+        console.print("[bold]🔗 Workspace Claude → Codex sync[/bold]")
+        console.print(f"[dim]Root: {workspace_root.resolve()} (max depth {max_depth})[/dim]\n")
+
+    report = sync_workspace(
+        workspace_root,
+        max_depth=max_depth,
+        respect_gitignore=not no_gitignore,
+        max_workers=workers,
+        use_copy=copy,
+        dry_run=dry_run,
+        sync_agents=sync_agents,
+        sync_skills=sync_skills,
+        on_progress=None if as_json else lambda r: _print_project_report(r, action),
+    )
+
+    if as_json:
+        console.print_json(json.dumps(report.to_dict()))
+    else:
+        if not report.projects:
+            console.print("  [yellow]○ No projects found[/yellow]")
+        counts = ", ".join(f"{n} {status}" for status, n in sorted(report.status_counts().items()))
+        console.print(
+            f"\n[dim]⏱ {len(report.projects)} projects in {report.wall_time:.2f}s "
+            f"(discovery {report.discover_seconds:.2f}s, workers={workers})"
+            f"{': ' + counts if counts else ''}[/dim]"
+        )
+    if report.errors:
+        raise click.ClickException(f"{len(report.errors)} project(s) failed to sync")
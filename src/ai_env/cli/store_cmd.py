@@ -0,0 +1,51 @@
+"""store 명령어"""
+
+from __future__ import annotations
+
+import json
+
+import click
+
+from ..core.skill_store import SkillStore
+from . import console, main
+from .sync_cmd import _format_size
+
+
+@main.group()
+def store() -> None:
+    """공유 스킬 store 관리 (~/.ai-env/store)"""
+    pass
+
+
+@store.command("status")
+@click.option("--json", "as_json", is_flag=True, help="JSON으로 출력")
+def store_status(as_json: bool) -> None:
+    """store 객체 수/크기/링크 수 확인"""
+    skill_store = SkillStore()
+    if as_json:
+        console.print_json(json.dumps(skill_store.to_dict()))
+        return
+
+    stats = skill_store.stats()
+    console.print(f"[bold]📦 Skill store[/bold] [dim]{skill_store.root}[/dim]")
+    console.print(f"  objects: {stats.objects} ({_format_size(stats.bytes)}), links: {stats.refs}")
+
+
+@store.command("gc")
+@click.option("--dry-run", is_flag=True, help="실제 삭제 없이 삭제 대상만 표시")
+@click.option("--json", "as_json", is_flag=True, help="JSON으로 출력")
+def store_gc(dry_run: bool, as_json: bool) -> None:
+    """어떤 대상도 링크하지 않는 store 객체 삭제"""
+    result = SkillStore().gc(dry_run=dry_run)
+    if as_json:
+        console.print_json(json.dumps(result.to_dict()))
+        return
+
+    action = "Would remove" if dry_run else "Removed"
+    for digest in result.removed:
+        console.print(f"  [red]✗[/red] {digest[:12]}")
+    console.print(
+        f"[bold]{action} {len(result.removed)} object(s)[/bold] "
+        f"({_format_size(result.freed_bytes)}), kept {result.kept}, "
+        f"pruned {result.pruned_refs} stale link(s)"
+    )
@@ -2,23 +2,317 @@
 
 from __future__ import annotations
 
+import functools
+import json
+import time
+from collections import Counter
+from collections.abc import Callable
 from pathlib import Path
+from typing import Any
 
 import click
 
-from ..core import get_project_root, get_secrets_manager, load_mcp_config
+from ..core import (
+    SecretsManager,
+    get_project_root,
+    get_secrets_manager,
+    load_mcp_config,
+    load_settings,
+)
+from ..core.file_copy import COPY_MODES, FileCopier
+from ..core.homes import HomeSyncResult, build_fanout, load_roster, sync_homes
+from ..core.output_writer import OutputWriter
+from ..core.skill_catalog import SkillCatalog
+from ..core.skill_store import SkillStore
 from ..core.sync import (
-    _update_team_skill_repos,
+    plan_global_sync,
     sync_claude_global_config,
     sync_codex_global_config,
     sync_gemini_global_config,
 )
+from ..core.sync_executor import SyncStage, run_stages
+from ..core.sync_plan import OP_KINDS, SyncPlan, apply_skills_plans, content_op, plan_skills
+from ..core.team_skills import TeamRepoUpdate, update_team_skill_repos
 from ..mcp import MCPConfigGenerator
-from . import console, main
+from ..mcp.output_manifest import OutputManifest
+from . import _create_table, console, main
+
+# (스테이지 이름, 헤더, 설명, 결과 없을 때 메시지)
+_GLOBAL_SECTIONS: list[tuple[str, str, str, str]] = [
+    (
+        "claude",
+        "📁 Claude Code Global Config",
+        "ai-env/.claude → ~/.claude",
+        "No files to sync (source directory empty)",
+    ),
+    (
+        "codex",
+        "📁 Codex CLI Global Config",
+        "ai-env/.claude/global/CLAUDE.md + merged skills → ~/.codex/AGENTS.md, ~/.codex/skills",
+        "No files to sync (source not found)",
+    ),
+    (
+        "gemini",
+        "📁 Gemini CLI Global Config",
+        "ai-env/.claude/global/CLAUDE.md + skills index → ~/.gemini/GEMINI.md",
+        "No files to sync (source not found)",
+    ),
+]
+
+
+def _prepare_skill_sources(
+    prepared: dict[str, Any],
+    project_root: Path,
+    skills_include: list[str] | None,
+    skills_exclude: list[str] | None,
+    copy_mode: str | None,
+) -> None:
+    """스킬 소스를 한 번 스캔하고 Claude/Codex 스킬 계획을 세움 (skills 스테이지)
+
+    팀 레포 pull 뒤에 실행되어야 하므로 스테이지 구성 시점이 아니라 실행 시점에 스캔한다.
+    결과는 prepared["catalog"], prepared["plans"](그룹 → SkillsPlan)에 담는다.
+    """
+    catalog = SkillCatalog.scan(project_root, skills_include, skills_exclude)
+    prepared["catalog"] = catalog
+    # --dry-run과 같은 plan_global_sync로 한 번 세우고 글로벌 스테이지는 그대로 실행
+    prepared["plans"] = {
+        skills_plan.group: skills_plan
+        for skills_plan in plan_global_sync(
+            skills_include, skills_exclude, copy_mode, catalog, ("claude", "codex")
+        ).skills
+    }
+
+
+def _sync_global_section(
+    name: str, prepared: dict[str, Any], copy_mode: str | None, **kwargs: Any
+) -> dict[str, str]:
+    """skills 스테이지가 준비한 카탈로그/스킬 계획으로 글로벌 설정 하나를 동기화"""
+    sync_fns: dict[str, Callable[..., dict[str, str]]] = {
+        "claude": sync_claude_global_config,
+        "codex": sync_codex_global_config,
+        "gemini": sync_gemini_global_config,
+    }
+    if name != "gemini":
+        # Gemini는 파일을 복사하지 않으므로 복사 전략/스킬 계획이 없음
+        kwargs.update(copy_mode=copy_mode, skills_plan=prepared["plans"].get(name))
+    return sync_fns[name](catalog=prepared["catalog"], **kwargs)
+
+
+def _sync_mcp_outputs(
+    sm: SecretsManager, dry_run: bool, writer: OutputWriter | None = None
+) -> tuple[dict[str, Path], str | None]:
+    """MCP 설정 파일 + .env.example 생성 (MCP 스테이지, 내용이 같은 파일은 쓰지 않음)
+
+    입력 fingerprint가 지난 sync와 같은 출력은 렌더링하지 않는다 (mcp_outputs.json).
+    """
+    from ..core.env_example import save_env_example
+
+    writer = writer or OutputWriter(dry_run=dry_run)
+    generator = MCPConfigGenerator(sm)
+    results = generator.save_all(dry_run=dry_run, writer=writer, manifest=OutputManifest.load())
+    return results, save_env_example(dry_run=dry_run, writer=writer)
+
+
+def _plan_sync(
+    sm: SecretsManager,
+    project_root: Path,
+    skills_include: list[str] | None,
+    skills_exclude: list[str] | None,
+    copy_mode: str | None,
+    claude_only: bool,
+    mcp_only: bool,
+) -> SyncPlan:
+    """--dry-run용 전체 변경 계획 (글로벌 설정 + MCP 설정 파일 + .env.example)"""
+    from ..core.env_example import generate_env_example
+
+    plan = SyncPlan()
+    if not mcp_only:
+        catalog = SkillCatalog.scan(project_root, skills_include, skills_exclude)
+        plan = plan_global_sync(skills_include, skills_exclude, copy_mode, catalog)
+    if not claude_only:
+        for _name, path, text in MCPConfigGenerator(sm).render_all():
+            plan.add(content_op(text, path, "mcp"))
+        plan.add(content_op(generate_env_example(), project_root / ".env.example", "mcp"))
+    return plan
+
+
+def _format_size(size: int) -> str:
+    if size < 1024:
+        return f"{size}B"
+    if size < 1024 * 1024:
+        return f"{size / 1024:.1f}KB"
+    return f"{size / (1024 * 1024):.1f}MB"
+
+
+def _print_plan(plan: SyncPlan, as_json: bool) -> None:
+    """--dry-run 결과: 변경 계획을 표 또는 JSON으로 출력"""
+    if as_json:
+        console.print_json(json.dumps(plan.to_dict()))
+        return
+    if plan.empty:
+        console.print("[green]✓ Everything up to date (no changes planned)[/green]")
+        return
+
+    rows = [
+        (op.kind, op.group, str(op.target), _format_size(op.size) if op.size else "-")
+        for op in plan.ops
+    ]
+    console.print(
+        _create_table(
+            "Sync Plan",
+            [("Op", "cyan"), ("Target", "dim"), ("Path", "white"), ("Size", "green")],
+            rows,
+        )
+    )
+    totals = plan.totals()
+    summary = ", ".join(
+        f"{kind} {totals[kind]['count']} ({_format_size(totals[kind]['bytes'])})"
+        for kind in OP_KINDS
+        if totals[kind]["count"]
+    )
+    console.print(f"[bold]Plan:[/bold] {summary} [dim]· {len(plan.by_device())} device(s)[/dim]")
+
+
+def _print_team_update(update: TeamRepoUpdate) -> None:
+    """팀 스킬 레포 업데이트 결과 한 줄 출력 (완료 순서대로 호출됨)."""
+    icon, color = ("✓", "green") if update.ok else ("✗", "red")
+    console.print(
+        f"  [{color}]{icon}[/{color}] {update.name}: {update.message} "
+        f"[dim]({update.elapsed:.1f}s)[/dim]"
+    )
+
+
+def _update_team_repos(
+    skills_include: list[str] | None, skills_exclude: list[str] | None
+) -> list[TeamRepoUpdate]:
+    """팀 스킬 레포를 동시에 git pull 하면서 진행 상황을 출력."""
+    project_root = get_project_root()
+    settings = load_settings()
+    console.print("[bold]📥 Team skills git pull (develop)...[/bold]")
+    updates = update_team_skill_repos(
+        project_root,
+        skills_include=skills_include,
+        skills_exclude=skills_exclude,
+        concurrency=settings.sync.team_repo_concurrency,
+        timeout=settings.sync.team_repo_timeout,
+        on_progress=_print_team_update,
+    )
+    if not updates:
+        console.print("  [dim]No team skill repos found[/dim]")
+    else:
+        counts = Counter(update.status for update in updates)
+        summary = ", ".join(f"{count} {status}" for status, count in sorted(counts.items()))
+        changed = sum(update.files_changed for update in updates if update.changed)
+        console.print(f"  [dim]{len(updates)} repo(s): {summary} · {changed} files changed[/dim]")
+    console.print()
+    return updates
+
+
+def _warn_stale_team_repos(updates: list[TeamRepoUpdate]) -> None:
+    """pull에 실패한 팀 레포 경고 (현재 체크아웃 그대로 동기화됨)."""
+    failed = [update.name for update in updates if not update.ok]
+    if failed:
+        console.print(
+            f"\n[yellow]⚠ Team repos not updated, synced their current checkout: "
+            f"{', '.join(failed)}[/yellow]"
+        )
+
+
+def _print_home_result(result: HomeSyncResult) -> None:
+    """--homes 홈 하나의 결과 한 줄 출력 (완료 순서대로 호출됨)."""
+    if result.ok:
+        console.print(
+            f"  [green]✓[/green] {result.user}: {len(result.written)} files → {result.home} "
+            f"[dim]({result.elapsed:.2f}s)[/dim]"
+        )
+    else:
+        console.print(f"  [red]✗[/red] {result.user}: {result.error}")
+
+
+def _sync_homes(
+    roster_path: Path,
+    skills_include: list[str] | None,
+    skills_exclude: list[str] | None,
+    copy_mode: str | None,
+    claude_only: bool,
+    mcp_only: bool,
+    jobs: int | None,
+    dry_run: bool,
+) -> None:
+    """--homes: roster의 모든 홈에 공유 산출물을 병렬로 동기화"""
+    try:
+        roster = load_roster(roster_path)
+    except ValueError as e:
+        raise click.ClickException(str(e)) from e
+
+    settings = load_settings()
+    targets: tuple[str, ...] = ("claude", "codex", "gemini", "mcp")
+    if claude_only:
+        targets = ("claude", "codex", "gemini")
+    elif mcp_only:
+        targets = ("mcp",)
+    try:
+        fanout = build_fanout(
+            get_project_root(),
+            roster,
+            settings,
+            skills_include,
+            skills_exclude,
+            copy_mode,
+            targets,
+        )
+    except ValueError as e:
+        raise click.ClickException(str(e)) from e
+    workers = jobs if jobs is not None else settings.sync.workers
+    action = "Previewing" if dry_run else "Syncing"
+    console.print(f"[bold]🏠 {action} {len(roster.homes)} home(s) (workers={workers})...[/bold]")
+    start = time.perf_counter()
+    results = sync_homes(
+        roster, fanout, dry_run=dry_run, max_workers=workers, on_progress=_print_home_result
+    )
+    failed = [r for r in results if not r.ok]
+    console.print(
+        f"\n[dim]⏱ {len(results)} homes in {time.perf_counter() - start:.2f}s "
+        f"({len(failed)} failed)[/dim]"
+    )
+    if failed:
+        raise click.ClickException(f"{len(failed)} home(s) failed to sync")
+
+
+def _watch_loop(
+    project_root: Path,
+    skills_include: list[str] | None,
+    skills_exclude: list[str] | None,
+    copier: FileCopier,
+) -> None:
+    """변경 감시 모드 (Ctrl-C까지). 바뀐 스킬/파일만 Claude/Codex 대상에 반영."""
+    from ..core.watch import run_watch
+
+    def _report(messages: list[str], elapsed: float) -> None:
+        for message in messages:
+            console.print(f"  [green]✓[/green] {message}")
+        console.print(f"  [dim]⏱ synced in {elapsed * 1000:.0f}ms[/dim]")
+
+    console.print("\n[bold]👀 Watching for changes... (Ctrl-C to stop)[/bold]")
+    try:
+        run_watch(
+            project_root,
+            skills_include,
+            skills_exclude,
+            copier=copier,
+            cmux_enabled=load_settings().cmux_enabled,
+            on_sync=_report,
+        )
+    except KeyboardInterrupt:
+        console.print("\n[dim]Stopped watching[/dim]")
 
 
 @main.command()
-@click.option("--dry-run", is_flag=True, help="실제 저장하지 않고 미리보기")
+@click.option(
+    "--dry-run",
+    is_flag=True,
+    help="실제 저장하지 않고 변경 계획 미리보기 (실행 시점에 대상이 바뀌면 결과가 다를 수 있음)",
+)
 @click.option("--claude-only", is_flag=True, help="Claude 글로벌 설정만 동기화")
 @click.option("--mcp-only", is_flag=True, help="MCP 설정만 동기화")
 @click.option("--skills-only", is_flag=True, help="스킬만 동기화 (빠른 동기화용)")
@@ -33,6 +327,37 @@ from . import console, main
     multiple=True,
     help="제외할 팀 스킬 디렉토리 (예: --skills-exclude cde-ranking-skills). 여러 번 사용 가능.",
 )
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=None,
+    help="동시 실행 스테이지 수 (기본: settings.yaml의 sync.workers)",
+)
+@click.option(
+    "--copy-mode",
+    type=click.Choice(COPY_MODES),
+    default=None,
+    help="파일 복사 전략 (기본: settings.yaml의 sync.copy_mode). 지원하지 않으면 일반 복사로 fallback.",
+)
+@click.option(
+    "--json",
+    "as_json",
+    is_flag=True,
+    help="--dry-run 계획을 JSON으로 출력",
+)
+@click.option(
+    "--watch",
+    is_flag=True,
+    help="동기화 후 변경을 감시하며 바뀐 스킬/파일만 다시 동기화 (Ctrl-C로 종료)",
+)
+@click.option(
+    "--homes",
+    "homes_roster",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    default=None,
+    help="roster.yaml의 모든 사용자 홈에 병렬 동기화 (사용자별 .env/소유권)",
+)
 def sync(
     dry_run: bool,
     claude_only: bool,
@@ -41,8 +366,25 @@ def sync(
     skills_all: bool,
     skills_include: tuple[str, ...],
     skills_exclude: tuple[str, ...],
+    jobs: int | None,
+    copy_mode: str | None,
+    as_json: bool,
+    watch: bool,
+    homes_roster: Path | None,
 ) -> None:
-    """설정 파일 동기화 (ai-env → 각 대상)"""
+    """설정 파일 동기화 (ai-env → 각 대상)
+
+    --dry-run은 대상과 비교한 변경 계획(create/update/delete/chmod + 바이트)을 출력한다.
+    실제 sync도 스킬은 같은 방식으로 한 번 계획해 그대로 실행하지만, CLAUDE.md/commands/hooks와
+    생성 파일은 각 스테이지가 쓸 때 다시 비교하므로 --dry-run은 미리보기일 뿐이다.
+    --homes는 스킬 스캔/설정 로드를 한 번만 하고 roster의 홈마다 사용자 .env로 렌더링해 쓴다.
+    """
+    if watch and dry_run:
+        raise click.UsageError("--watch cannot be combined with --dry-run")
+    if as_json and not dry_run:
+        raise click.UsageError("--json requires --dry-run")
+    if homes_roster is not None and (watch or as_json or skills_only):
+        raise click.UsageError("--homes cannot be combined with --watch, --json or --skills-only")
     # --skills-all: 모든 cde-*skills 포함
     # include=None(필터 없음) + exclude=[](빈 리스트=아무것도 제외 안 함)
     # → _collect_skill_sources가 team skills 스캔 분기 진입 + 전부 포함
@@ -54,51 +396,85 @@ def sync(
 
     # 팀 스킬 레포 최신화 (include/exclude/all 옵션이 있을 때만)
     _has_team_skills = effective_include is not None or effective_exclude is not None
-    if _has_team_skills and not dry_run:
-        project_root = get_project_root()
-        pull_results = _update_team_skill_repos(
-            project_root,
-            skills_include=effective_include,
-            skills_exclude=effective_exclude,
+    pull_team_repos = _has_team_skills and not dry_run
+    team_updates: list[TeamRepoUpdate] = []
+    if pull_team_repos and (homes_roster is not None or skills_only):
+        # 전체 sync는 pull을 스테이지로 실행해 MCP 생성과 겹침
+        team_updates = _update_team_repos(effective_include, effective_exclude)
+
+    if homes_roster is not None:
+        _sync_homes(
+            homes_roster,
+            effective_include,
+            effective_exclude,
+            copy_mode,
+            claude_only,
+            mcp_only,
+            jobs,
+            dry_run,
         )
-        if pull_results:
-            console.print("[bold]📥 Team skills git pull (develop)...[/bold]")
-            for name, status in pull_results.items():
-                icon = "✓" if "failed" not in status else "✗"
-                color = "green" if "failed" not in status else "red"
-                console.print(f"  [{color}]{icon}[/{color}] {name}: {status}")
-            console.print()
+        _warn_stale_team_repos(team_updates)
+        return
 
     # --skills-only: 스킬만 빠르게 동기화 (hooks/startup용)
     if skills_only:
-        from ..core.codex_skills import copy_skill_tree_for_codex
-        from ..core.sync import _sync_skills_merged
+        from ..core.codex_skills import copy_skill_file_for_codex
 
-        if not _has_team_skills:
-            project_root = get_project_root()
-        action = "Would sync" if dry_run else "Synced"
-        console.print("[bold]🔄 Skills-only sync...[/bold]")
-        skill_targets = [
-            ("Claude", Path.home() / ".claude" / "skills", None),
-            ("Codex", Path.home() / ".codex" / "skills", copy_skill_tree_for_codex),
+        project_root = get_project_root()
+        catalog = SkillCatalog.scan(project_root, effective_include, effective_exclude)
+        settings = load_settings()
+        copier = FileCopier(copy_mode or settings.sync.copy_mode)
+        skill_targets: list[tuple[str, str, Path, Callable[[Path, Path], object]]] = [
+            ("Claude", "claude", Path.home() / ".claude" / "skills", copier),
+            (
+                "Codex",
+                "codex",
+                Path.home() / ".codex" / "skills",
+                functools.partial(copy_skill_file_for_codex, copy_file_fn=copier),
+            ),
         ]
-        for label, target_dir, copy_fn in skill_targets:
-            desc, _ = _sync_skills_merged(
-                project_root,
-                target_dir,
-                dry_run,
-                skills_include=effective_include,
-                skills_exclude=effective_exclude,
-                copy_fn=copy_fn,
-            )
-            console.print(f"  [green]✓[/green] {label}: {action} {desc} → {target_dir}")
-        return
+        store = SkillStore() if settings.sync.skill_store else None
+        # 계획을 먼저 세우고 (스캔은 여기서 한 번), 실행은 대상 장치별로 묶어 병렬 처리
+        plan = SyncPlan()
+        for _label, group, target_dir, copy_file_fn in skill_targets:
+            plan.add_skills(plan_skills(catalog, target_dir, copy_file_fn, group, store))
+        if dry_run:
+            _print_plan(plan, as_json)
+            return
 
-    console.print("[bold]🔄 Syncing AI environment configurations...[/bold]\n")
+        console.print("[bold]🔄 Skills-only sync...[/bold]")
+        apply_skills_plans(plan.skills, max_workers=jobs or settings.sync.workers)
+        for (label, _group, target_dir, _fn), skills_plan in zip(
+            skill_targets, plan.skills, strict=True
+        ):
+            desc = copier.annotate(f"skills/ ({skills_plan.skill_count} items)")
+            console.print(f"  [green]✓[/green] {label}: Synced {desc} → {target_dir}")
+        _warn_stale_team_repos(team_updates)
+        if watch:
+            _watch_loop(project_root, effective_include, effective_exclude, copier)
+        return
 
     sm = get_secrets_manager()
     project_root = get_project_root()
 
+    # JSON 계획은 다른 출력 없이 (파이프로 바로 파싱할 수 있도록)
+    if dry_run and as_json:
+        _print_plan(
+            _plan_sync(
+                sm,
+                project_root,
+                effective_include,
+                effective_exclude,
+                copy_mode,
+                claude_only,
+                mcp_only,
+            ),
+            as_json=True,
+        )
+        return
+
+    console.print("[bold]🔄 Syncing AI environment configurations...[/bold]\n")
+
     # .env 파일 존재 확인
     if not sm.env_file.exists():
         console.print(f"[yellow]⚠ Warning: .env file not found at {sm.env_file}[/yellow]")
@@ -128,88 +504,143 @@ def sync(
 
     console.print(f"[dim]Source: {project_root}[/dim]\n")
 
-    action = "Would sync" if dry_run else "Synced"
-
-    if not mcp_only:
-        console.print("[bold cyan]📁 Claude Code Global Config[/bold cyan]")
-        console.print("[dim]   ai-env/.claude → ~/.claude[/dim]")
-        claude_results = sync_claude_global_config(
-            dry_run=dry_run,
-            skills_include=effective_include,
-            skills_exclude=effective_exclude,
+    if dry_run:
+        plan = _plan_sync(
+            sm,
+            project_root,
+            effective_include,
+            effective_exclude,
+            copy_mode,
+            claude_only,
+            mcp_only,
         )
+        _print_plan(plan, as_json=False)
+        return
 
-        if not claude_results:
-            console.print("  [yellow]○ No files to sync (source directory empty)[/yellow]")
-        else:
-            for name, file_path in claude_results.items():
-                console.print(f"  [green]✓[/green] {action} {name}")
-                console.print(f"    → {file_path}")
-
-        # Codex CLI 글로벌 설정 동기화
-        console.print("\n[bold cyan]📁 Codex CLI Global Config[/bold cyan]")
-        console.print(
-            "[dim]   ai-env/.claude/global/CLAUDE.md + merged skills → ~/.codex/AGENTS.md, ~/.codex/skills[/dim]"
-        )
-        codex_results = sync_codex_global_config(
-            dry_run=dry_run,
-            skills_include=effective_include,
-            skills_exclude=effective_exclude,
-        )
-        if not codex_results:
-            console.print("  [yellow]○ No files to sync (source not found)[/yellow]")
-        else:
-            for name, file_path in codex_results.items():
-                console.print(f"  [green]✓[/green] {action} {name}")
-                console.print(f"    → {file_path}")
-
-        # Gemini CLI 글로벌 설정 동기화
-        console.print("\n[bold cyan]📁 Gemini CLI Global Config[/bold cyan]")
-        console.print(
-            "[dim]   ai-env/.claude/global/CLAUDE.md + skills index → ~/.gemini/GEMINI.md[/dim]"
+    # 스테이지 그래프: team(pull) → skills(스캔+계획) → claude/codex/gemini, mcp는 독립
+    # 팀 레포 pull이 스킬 소스를 바꾸므로 스킬을 읽는 스테이지만 기다리고 MCP 생성은 pull과 겹침
+    # 생성 파일(settings.json, AGENTS.md, MCP 설정 등)은 writer 하나로 written/unchanged 집계
+    writer = OutputWriter(dry_run=dry_run)
+    stages: list[SyncStage] = []
+    if pull_team_repos and not mcp_only:
+        stages.append(
+            SyncStage(
+                "team",
+                functools.partial(_update_team_repos, effective_include, effective_exclude),
+            )
         )
-        gemini_results = sync_gemini_global_config(
-            dry_run=dry_run,
-            skills_include=effective_include,
-            skills_exclude=effective_exclude,
+    if not mcp_only:
+        # 스킬 소스는 한 번만 스캔해 Claude/Codex 복사와 AGENTS.md/GEMINI.md 인덱스가 공유
+        prepared: dict[str, Any] = {}
+        stages.append(
+            SyncStage(
+                "skills",
+                functools.partial(
+                    _prepare_skill_sources,
+                    prepared,
+                    project_root,
+                    effective_include,
+                    effective_exclude,
+                    copy_mode,
+                ),
+                depends_on=("team",) if pull_team_repos else (),
+            )
         )
-        if not gemini_results:
-            console.print("  [yellow]○ No files to sync (source not found)[/yellow]")
-        else:
-            for name, file_path in gemini_results.items():
-                console.print(f"  [green]✓[/green] {action} {name}")
-                console.print(f"    → {file_path}")
+        for name, _header, _desc, _empty in _GLOBAL_SECTIONS:
+            stages.append(
+                SyncStage(
+                    name,
+                    functools.partial(
+                        _sync_global_section,
+                        name,
+                        prepared,
+                        copy_mode,
+                        dry_run=dry_run,
+                        skills_include=effective_include,
+                        skills_exclude=effective_exclude,
+                        writer=writer,
+                    ),
+                    depends_on=("skills",),
+                )
+            )
+    if not claude_only:
+        stages.append(SyncStage("mcp", functools.partial(_sync_mcp_outputs, sm, dry_run, writer)))
 
-    if claude_only:
-        if not dry_run:
-            console.print("\n[bold green]✓ Claude global config sync complete![/bold green]")
-        return
+    workers = jobs if jobs is not None else load_settings().sync.workers
+    report = run_stages(stages, max_workers=workers)
+    if "team" in report.results and report.results["team"].ok:
+        team_updates = report.results["team"].result
 
-    # MCP 설정 동기화
-    console.print("\n[bold cyan]🔌 AI Tools Configuration[/bold cyan]")
-    generator = MCPConfigGenerator(sm)
+    # 출력은 실행 순서와 무관하게 고정된 순서로
+    if not mcp_only:
+        for index, (name, header, desc, empty_msg) in enumerate(_GLOBAL_SECTIONS):
+            prefix = "\n" if index else ""
+            console.print(f"{prefix}[bold cyan]{header}[/bold cyan]")
+            console.print(f"[dim]   {desc}[/dim]")
+            stage_result = report.results[name]
+            if stage_result.error is not None:
+                console.print(f"  [red]✗ {stage_result.error}[/red]")
+            elif stage_result.skipped:
+                console.print("  [yellow]○ Skipped (skill sources could not be prepared)[/yellow]")
+            elif not stage_result.result:
+                console.print(f"  [yellow]○ {empty_msg}[/yellow]")
+            else:
+                for item_name, file_path in stage_result.result.items():
+                    console.print(f"  [green]✓[/green] Synced {item_name}")
+                    console.print(f"    → {file_path}")
 
-    try:
-        results: dict[str, Path] = generator.save_all(dry_run=dry_run)
+    if not claude_only:
+        # MCP 설정 동기화
+        console.print("\n[bold cyan]🔌 AI Tools Configuration[/bold cyan]")
+        mcp_result = report.results["mcp"]
+        if mcp_result.ok:
+            results, env_example_path = mcp_result.result
+            unchanged = {str(r.path) for r in writer.results if r.status == "unchanged"}
+            for name in sorted(results.keys()):
+                path: Path = results[name]
+                if str(path) in unchanged:
+                    console.print(f"  [dim]○ Unchanged {name}[/dim]")
+                else:
+                    console.print(f"  [green]✓[/green] Synced {name}")
+                console.print(f"    → {str(path)}")
 
-        for name in sorted(results.keys()):
-            path: Path = results[name]
-            console.print(f"  [green]✓[/green] {action} {name}")
-            console.print(f"    → {str(path)}")
+            if env_example_path:
+                if env_example_path in unchanged:
+                    console.print("\n  [dim]○ Unchanged .env.example[/dim]")
+                else:
+                    console.print("\n  [green]✓[/green] Synced .env.example")
+                console.print(f"    → {env_example_path}")
 
-        # .env.example 자동 생성
-        from ..core.env_example import save_env_example
+    critical = " → ".join(report.critical_path)
+    counts = writer.counts()
+    console.print(
+        f"\n[dim]⏱ {len(stages)} stages in {report.wall_time:.2f}s "
+        f"(workers={workers}, critical path: {critical} {report.critical_path_seconds:.2f}s)[/dim]"
+    )
+    console.print(
+        f"[dim]📝 Generated files: {counts['written']} written, "
+        f"{counts['unchanged']} unchanged[/dim]"
+    )
 
-        env_example_path = save_env_example(dry_run=dry_run)
-        if env_example_path:
-            console.print(f"\n  [green]✓[/green] {action} .env.example")
-            console.print(f"    → {env_example_path}")
+    for failed in report.errors:
+        console.print(f"\n[red]✗ Error during sync ({failed.name}): {failed.error}[/red]")
+        if failed.error is not None:
+            raise failed.error
+    _warn_stale_team_repos(team_updates)
 
-        if not dry_run:
-            console.print("\n[bold green]✓ Sync complete![/bold green]")
-            console.print(
-                "\n[dim]💡 Tip: Run 'source ./generated/shell_exports.sh' to load env vars[/dim]"
-            )
-    except Exception as e:
-        console.print(f"\n[red]✗ Error during sync: {e}[/red]")
-        raise
+    if claude_only:
+        console.print("\n[bold green]✓ Claude global config sync complete![/bold green]")
+    else:
+        console.print("\n[bold green]✓ Sync complete![/bold green]")
+        console.print(
+            "\n[dim]💡 Tip: Run 'source ./generated/shell_exports.sh' to load env vars[/dim]"
+        )
+
+    if watch:
+        settings = load_settings()
+        _watch_loop(
+            project_root,
+            effective_include,
+            effective_exclude,
+            FileCopier(copy_mode or settings.sync.copy_mode),
+        )
@@ -2,33 +2,60 @@
 
 from .config import (
     MCPConfig,
+    MCPHubConfig,
+    MCPPoolConfig,
+    MCPResourceLimits,
+    MCPResourcesConfig,
     MCPServerConfig,
+    MCPShimConfig,
+    MCPTapConfig,
+    MCPTimeoutConfig,
     OutputsConfig,
     ProviderConfig,
     Settings,
+    SyncConfig,
     expand_path,
     get_project_root,
+    get_state_dir,
     load_mcp_config,
     load_settings,
 )
 from .doctor import DoctorReport, run_doctor
-from .project_sync import ProjectSyncResult, sync_project_claude_to_codex
+from .project_sync import (
+    ProjectSyncResult,
+    WorkspaceSyncReport,
+    discover_projects,
+    sync_project_claude_to_codex,
+    sync_workspace,
+)
 from .secrets import SecretsManager, get_secrets_manager
 
 __all__ = [
     "DoctorReport",
     "MCPConfig",
+    "MCPHubConfig",
+    "MCPPoolConfig",
+    "MCPResourceLimits",
+    "MCPResourcesConfig",
     "MCPServerConfig",
+    "MCPShimConfig",
+    "MCPTapConfig",
+    "MCPTimeoutConfig",
     "OutputsConfig",
     "ProjectSyncResult",
     "ProviderConfig",
     "Settings",
     "SecretsManager",
+    "SyncConfig",
+    "WorkspaceSyncReport",
+    "discover_projects",
     "expand_path",
     "get_project_root",
     "get_secrets_manager",
+    "get_state_dir",
     "load_mcp_config",
     "load_settings",
     "run_doctor",
     "sync_project_claude_to_codex",
+    "sync_workspace",
 ]
@@ -2,11 +2,31 @@
 
 from __future__ import annotations
 
+import hashlib
+import os
 import re
+import shutil
+import threading
+import uuid
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import BinaryIO, TypeVar
 
 import yaml
 
+from .config import get_state_dir
+from .frontmatter import read_markdown_head
+
+# Bump whenever the normalized header format changes; old cache entries are ignored.
+NORMALIZER_VERSION = 2
+_NORMALIZE_WORKERS = 4
+_STREAM_CHUNK = 1024 * 1024
+# bytes.strip() 기본 공백 + str.isspace()가 공백으로 보는 ASCII 제어 문자
+_ASCII_SPACE = b" \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f"
+
+_T = TypeVar("_T")
+
 _FRONTMATTER_PATTERN = re.compile(r"\A---\s*\n(.*?)\n---\s*\n?", re.DOTALL)
 
 
@@ -62,30 +82,350 @@ def normalize_skill_markdown_for_codex(content: str, skill_name: str) -> str:
         name = skill_name
         description = _extract_description_from_body(body, skill_name)
 
+    normalized = _normalized_header(name, description)
+    normalized_body = body.rstrip()
+    if normalized_body:
+        normalized += f"\n{normalized_body}\n"
+    return normalized
+
+
+def _normalized_header(name: str, description: str) -> str:
+    """Strict YAML frontmatter block (``---`` ... ``---``) for Codex."""
     normalized_frontmatter = yaml.safe_dump(
         {"name": name, "description": description},
         allow_unicode=True,
         sort_keys=False,
     ).strip()
+    return f"---\n{normalized_frontmatter}\n---\n"
 
-    normalized_parts = ["---", normalized_frontmatter, "---", ""]
-    normalized_body = body.rstrip()
-    if normalized_body:
-        normalized_parts.append(normalized_body)
-        normalized_parts.append("")
 
-    return "\n".join(normalized_parts)
+class NormalizedSkillCache:
+    """Content-addressed cache of normalized SKILL.md frontmatter headers.
+
+    Entries are keyed by the normalizer version, the skill name and a digest of the bytes the
+    header was derived from, so an unchanged skill skips frontmatter parsing and YAML
+    serialization entirely. The body is never cached; it is streamed from the source.
+    Stored under ``<state dir>/cache/codex-skill-md/<xx>/<key>.md``.
+    """
+
+    def __init__(self, root: Path | None = None) -> None:
+        self.root = root if root is not None else get_state_dir() / "cache" / "codex-skill-md"
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(head_digest: str, skill_name: str) -> str:
+        return hashlib.sha256(
+            f"v{NORMALIZER_VERSION}\0{skill_name}\0{head_digest}".encode()
+        ).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.md"
+
+    def get(self, key: str) -> str | None:
+        try:
+            return self._path(key).read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError):
+            return None
+
+    def put(self, key: str, text: str) -> None:
+        """Store an entry atomically. Cache write failures never fail the sync."""
+        path = self._path(key)
+        tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(text, encoding="utf-8")
+            os.replace(tmp, path)
+        except OSError:
+            tmp.unlink(missing_ok=True)
+
+    def header(self, key: str, build: Callable[[], str]) -> str:
+        """Return the cached header for ``key``, building and storing it on a miss."""
+        cached = self.get(key)
+        with self._lock:
+            if cached is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if cached is not None:
+            return cached
+        text = build()
+        self.put(key, text)
+        return text
+
+
+_default_cache: NormalizedSkillCache | None = None
+_default_cache_lock = threading.Lock()
+
+
+def default_normalized_skill_cache() -> NormalizedSkillCache:
+    """Process-wide cache rooted at the current state directory."""
+    global _default_cache
+    with _default_cache_lock:
+        root = get_state_dir() / "cache" / "codex-skill-md"
+        if _default_cache is None or _default_cache.root != root:
+            _default_cache = NormalizedSkillCache(root)
+        return _default_cache
+
+
+class _StreamingUnsupportedError(Exception):
+    """Rare layouts the streaming path cannot reproduce byte-for-byte."""
+
+
+def _scan_body_description(f: BinaryIO, skill_name: str) -> tuple[str, str]:
+    """Streaming equivalent of ``_extract_description_from_body`` (reads only up to the match).
+
+    Returns:
+        (description, digest of the bytes read)
+    """
+    digest = hashlib.sha256()
+    for raw in iter(f.readline, b""):
+        digest.update(raw)
+        text = raw.decode("utf-8", errors="replace").replace("\r\n", "\n").replace("\r", "\n")
+        for line in text.split("\n"):
+            stripped = line.strip()
+            if not stripped or stripped.startswith("#"):
+                continue
+            return stripped, digest.hexdigest()
+    return skill_name, digest.hexdigest()
+
+
+def _is_space_at(data: bytes, index: int) -> bool:
+    """Whether the character decoded at ``index`` (0 or -1) of a short byte slice is whitespace."""
+    text = data.decode("utf-8", errors="ignore")
+    return bool(text) and text[index].isspace()
+
+
+def _body_range(f: BinaryIO, start: int, skip: bytes) -> tuple[int, int]:
+    """Byte range of the body with leading ``skip`` bytes and trailing whitespace removed.
+
+    Raises:
+        _StreamingUnsupportedError: when a non-ASCII whitespace character sits at either edge
+    """
+    size = f.seek(0, os.SEEK_END)
+    f.seek(start)
+    while start < size:
+        chunk = f.read(_STREAM_CHUNK)
+        stripped = chunk.lstrip(skip)
+        start += len(chunk) - len(stripped)
+        if stripped:
+            if skip == _ASCII_SPACE and stripped[0] >= 0x80:
+                f.seek(start)
+                if _is_space_at(f.read(4), 0):
+                    raise _StreamingUnsupportedError
+            break
+
+    end = size
+    while end > start:
+        f.seek(max(start, end - _STREAM_CHUNK))
+        chunk = f.read(end - max(start, end - _STREAM_CHUNK))
+        stripped = chunk.rstrip(_ASCII_SPACE)
+        end -= len(chunk) - len(stripped)
+        if stripped:
+            if stripped[-1] >= 0x80:
+                f.seek(max(start, end - 4))
+                if _is_space_at(f.read(end - max(start, end - 4)), -1):
+                    raise _StreamingUnsupportedError
+            break
+    return start, end
+
+
+def _copy_body(src: BinaryIO, dst: BinaryIO, start: int, end: int) -> None:
+    """Stream ``src[start:end]`` to ``dst`` with universal newline translation.
+
+    Memory stays at one chunk regardless of body size.
+    """
+    src.seek(start)
+    remaining = end - start
+    pending_cr = False
+    while remaining > 0:
+        chunk = src.read(min(_STREAM_CHUNK, remaining))
+        if not chunk:
+            break
+        remaining -= len(chunk)
+        if pending_cr:
+            chunk = b"\r" + chunk
+            pending_cr = False
+        if b"\r" in chunk:
+            if chunk.endswith(b"\r") and remaining > 0:
+                chunk = chunk[:-1]
+                pending_cr = True
+            chunk = chunk.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+        dst.write(chunk)
+    if pending_cr:
+        dst.write(b"\n")
+
+
+def _stream_header(
+    src: BinaryIO, skill_name: str, cache: NormalizedSkillCache
+) -> tuple[str, int, bytes]:
+    """Normalized header of an open SKILL.md, reading only what the header depends on.
+
+    Returns:
+        (header, offset the body starts after, leading bytes to skip before the body)
+
+    Raises:
+        _StreamingUnsupportedError: when the file starts with ``---`` but its head is not a
+            plain ``---`` ... ``---`` block (empty, blank-only or oversized block, lone
+            ``\r`` line endings, closing line with trailing text), where
+            ``_FRONTMATTER_PATTERN`` may match differently
+    """
+    if src.read(3) == b"---":
+        src.seek(0)
+        head = read_markdown_head(src)
+        if (
+            head.frontmatter is None
+            or not head.frontmatter.strip()
+            or head.closing_line.rstrip() != "---"
+        ):
+            raise _StreamingUnsupportedError
+        src.seek(0)
+        if b"\r" in src.read(head.body_offset).replace(b"\r\n", b""):
+            raise _StreamingUnsupportedError
+        frontmatter = head.frontmatter
+
+        def _build() -> str:
+            name_lines = _extract_frontmatter_value(frontmatter, "name")
+            description_lines = _extract_frontmatter_value(frontmatter, "description")
+            name = name_lines[0] if name_lines else skill_name
+            description = "\n".join(description_lines) if description_lines else skill_name
+            return _normalized_header(name, description)
+
+        header = cache.header(cache.key(head.digest, skill_name), _build)
+        # 정규식의 ``---\s*``처럼 닫는 줄 뒤 공백/빈 줄을 모두 건너뜀
+        return header, head.body_offset, _ASCII_SPACE
+    src.seek(0)
+    description, digest = _scan_body_description(src, skill_name)
+    header = cache.header(
+        cache.key(digest, skill_name), lambda: _normalized_header(skill_name, description)
+    )
+    return header, 0, b"\r\n"
+
+
+def _write_normalized_stream(
+    src: BinaryIO, out: BinaryIO, skill_name: str, cache: NormalizedSkillCache
+) -> None:
+    header, body_offset, skip = _stream_header(src, skill_name, cache)
+    start, end = _body_range(src, body_offset, skip)
+
+    out.write(header.encode("utf-8"))
+    if start < end:
+        out.write(b"\n")
+        _copy_body(src, out, start, end)
+        out.write(b"\n")
+
+
+def write_normalized_skill_markdown(
+    source: Path,
+    target: Path,
+    skill_name: str,
+    cache: NormalizedSkillCache | None = None,
+) -> None:
+    """Write the Codex-normalized form of ``source`` to ``target`` without loading the body.
+
+    Only the frontmatter header is parsed (up to ``FRONTMATTER_MAX_BYTES``); the body is
+    streamed through in chunks, so memory stays constant regardless of SKILL.md size.
+    Heads the streaming path cannot mirror exactly (see ``_stream_header``) fall back to
+    ``normalize_skill_markdown_for_codex`` on the whole file, so the output always matches it
+    byte-for-byte. ``source`` and ``target`` may be the same file (written through a
+    temporary file and replaced).
+    """
+    if cache is None:
+        cache = default_normalized_skill_cache()
+    tmp = target.with_name(f".{target.name}.{uuid.uuid4().hex[:8]}.tmp")
+    try:
+        with open(source, "rb") as src:
+            try:
+                with open(tmp, "wb") as out:
+                    _write_normalized_stream(src, out, skill_name, cache)
+            except _StreamingUnsupportedError:
+                src.seek(0)
+                content = src.read().decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+                tmp.write_text(
+                    normalize_skill_markdown_for_codex(content, skill_name), encoding="utf-8"
+                )
+        os.replace(tmp, target)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def copy_skill_file_for_codex(
+    source: Path,
+    target: Path,
+    copy_file_fn: Callable[[Path, Path], object] = shutil.copy2,
+    cache: NormalizedSkillCache | None = None,
+) -> None:
+    """Copy a single skill file, normalizing it when it is a SKILL.md.
+
+    Non-SKILL.md files go through ``copy_file_fn`` so reflink/hardlink copy modes apply.
+    SKILL.md headers come from the normalization cache when the source is unchanged.
+    """
+    if source.name != "SKILL.md":
+        copy_file_fn(source, target)
+        return
+
+    write_normalized_skill_markdown(source, target, target.parent.name, cache)
+
+
+def _run_on_pool(fn: Callable[[_T], object], items: list[_T], max_workers: int) -> None:
+    if len(items) <= 1 or max_workers <= 1:
+        for item in items:
+            fn(item)
+        return
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as pool:
+        list(pool.map(fn, items))
+
+
+def normalize_skill_files(
+    skill_mds: list[Path],
+    cache: NormalizedSkillCache | None = None,
+    max_workers: int = _NORMALIZE_WORKERS,
+) -> None:
+    """Normalize SKILL.md files in place on a worker pool."""
+    if cache is None:
+        cache = default_normalized_skill_cache()
+
+    def _normalize(skill_md: Path) -> None:
+        write_normalized_skill_markdown(skill_md, skill_md, skill_md.parent.name, cache)
+
+    _run_on_pool(_normalize, skill_mds, max_workers)
+
+
+def prime_normalized_skill_cache(
+    skill_mds: list[tuple[Path, str]],
+    cache: NormalizedSkillCache | None = None,
+    max_workers: int = _NORMALIZE_WORKERS,
+) -> None:
+    """Build the cached headers of ``(SKILL.md, skill name)`` pairs on a worker pool.
+
+    Skill trees are applied one file at a time, so a plan's cache misses are parsed here in
+    parallel first and the copies that follow only hit the cache. Files the streaming path
+    cannot read are skipped; the copy normalizes them (or reports the error) as before.
+    """
+    if cache is None:
+        cache = default_normalized_skill_cache()
+
+    def _prime(item: tuple[Path, str]) -> None:
+        source, skill_name = item
+        try:
+            with open(source, "rb") as src:
+                _stream_header(src, skill_name, cache)
+        except (OSError, ValueError, _StreamingUnsupportedError):
+            pass
+
+    _run_on_pool(_prime, skill_mds, max_workers)
 
 
 def copy_skill_tree_for_codex(source: Path, target: Path) -> None:
-    """Copy a skill directory or skills root and normalize every SKILL.md file."""
+    """Copy a skill directory or skills root and normalize every SKILL.md file.
+
+    Normalization runs on the staged copy, so the target never exposes un-normalized files.
+    """
     from .sync import safe_copytree
 
-    safe_copytree(source, target)
+    def _normalize(staged: Path) -> None:
+        normalize_skill_files(list(staged.rglob("SKILL.md")))
 
-    for skill_md in target.rglob("SKILL.md"):
-        normalized = normalize_skill_markdown_for_codex(
-            skill_md.read_text(encoding="utf-8"),
-            skill_md.parent.name,
-        )
-        skill_md.write_text(normalized, encoding="utf-8")
+    safe_copytree(source, target, prepare=_normalize)
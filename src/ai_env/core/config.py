@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import os
 from pathlib import Path
-from typing import TypeVar
+from typing import Literal, TypeVar
 
 import yaml
 from pydantic import BaseModel, Field
@@ -42,6 +42,105 @@ class OutputsConfig(BaseModel):
     shell_exports: str = "./generated/shell_exports.sh"
 
 
+class SyncConfig(BaseModel):
+    """동기화 실행 설정"""
+
+    # 독립 스테이지(Claude/Codex/Gemini/MCP) 동시 실행 수 (1이면 순차 실행)
+    workers: int = Field(default=4, ge=1)
+    # 파일 복사 전략: copy | reflink | hardlink | auto (실패 시 일반 복사로 fallback)
+    copy_mode: Literal["copy", "reflink", "hardlink", "auto"] = "copy"
+    # 팀 스킬 레포(cde-*skills) git pull 동시 실행 수 / 레포당 제한 시간(초)
+    team_repo_concurrency: int = Field(default=4, ge=1)
+    team_repo_timeout: float = Field(default=60.0, gt=0)
+    # 스킬을 대상마다 복사하지 않고 ~/.ai-env/store 객체를 심볼릭 링크로 공유
+    skill_store: bool = False
+
+
+class MCPTimeoutConfig(BaseModel):
+    """측정된 기동 시간 기반 MCP startup_timeout_sec 자동 조정"""
+
+    # true면 ai-env mcp probe 기록(~/.ai-env/mcp_latency.sqlite3)으로 Codex 제한 시간 계산
+    # (mcp_servers.yaml의 startup_timeout_sec가 지정된 서버는 그 값을 그대로 사용)
+    adaptive: bool = False
+    # 최근 window개 샘플의 percentile 값 × margin, [min_sec, max_sec]로 제한
+    percentile: float = Field(default=95.0, gt=0, le=100)
+    margin: float = Field(default=1.5, ge=1.0)
+    min_sec: int = Field(default=10, ge=1)
+    max_sec: int = Field(default=300, ge=1)
+    window: int = Field(default=50, ge=1)
+    # 샘플이 이보다 적으면 기본값(30초) 사용
+    min_samples: int = Field(default=5, ge=1)
+
+
+class MCPHubConfig(BaseModel):
+    """공유 stdio MCP hub (ai-env mcp hub)"""
+
+    # true면 클라이언트 설정에 서버 명령 대신 `<connect_command> mcp connect <name>`을 생성
+    enabled: bool = False
+    # hub로 공유할 stdio 서버 (비어 있으면 활성 stdio 서버 전체)
+    servers: list[str] = Field(default_factory=list)
+    # 클라이언트가 실행할 ai-env 명령 (PATH에 없으면 절대 경로)
+    connect_command: str = "ai-env"
+
+
+class MCPShimConfig(BaseModel):
+    """지연 기동 MCP shim (ai-env mcp shim)"""
+
+    # true면 도구 카탈로그가 캐시된 stdio 서버를 `<command> mcp shim <name>`으로 생성
+    # (카탈로그는 ai-env mcp probe가 ~/.ai-env/mcp_catalog/<name>.json에 저장)
+    enabled: bool = False
+    # shim으로 감쌀 서버 (비어 있으면 활성 stdio 서버 전체)
+    servers: list[str] = Field(default_factory=list)
+    command: str = "ai-env"
+
+
+class MCPPoolConfig(BaseModel):
+    """docker 기반 MCP 서버 warm container pool (ai-env mcp pool)"""
+
+    # true면 pool이 만들어진(ai-env mcp pool up) 서버를 `<command> mcp pool attach <name>`으로 생성
+    enabled: bool = False
+    # pool을 만들 서버 (비어 있으면 `docker run`으로 실행하는 활성 서버 전체)
+    servers: list[str] = Field(default_factory=list)
+    # 서버당 미리 만들어 둘 컨테이너 수 (동시에 붙을 수 있는 클라이언트 수)
+    size: int = Field(default=2, ge=1)
+    command: str = "ai-env"
+    docker: str = "docker"
+
+
+class MCPTapConfig(BaseModel):
+    """MCP 호출 기록 tap (ai-env mcp tap)"""
+
+    # true면 stdio 서버를 `<command> mcp tap <name>`으로 생성해 호출별 지연 시간/크기를
+    # ~/.ai-env/mcp_tap/<name>.jsonl에 기록 (shim/hub/pool로 연결하는 서버는 제외)
+    enabled: bool = False
+    # 기록할 서버 (비어 있으면 활성 stdio 서버 전체)
+    servers: list[str] = Field(default_factory=list)
+    command: str = "ai-env"
+    # true면 전체 메시지도 transcripts/에 저장 (ai-env mcp replay 입력, 응답 내용이 남으니 주의)
+    record: bool = False
+
+
+class MCPResourceLimits(BaseModel):
+    """MCP 서버 자원 제한 (docker run 플래그 또는 native 명령 wrapper로 적용)"""
+
+    # settings.yaml mcp_resources.profiles 이름 (mcp_servers.yaml의 서버 resources에서만 사용)
+    profile: str | None = None
+    cpus: float | None = Field(default=None, gt=0)
+    # 메모리 상한 ("512m", "1g", 바이트 숫자)
+    memory: str | None = Field(default=None, pattern=r"^\d+(\.\d+)?[kKmMgGtT]?([iI]?[bB])?$")
+    pids: int | None = Field(default=None, ge=1)
+
+
+class MCPResourcesConfig(BaseModel):
+    """MCP 서버 자원 제한 profile"""
+
+    # 서버에 resources가 없을 때 적용할 profile (None이면 제한 없음)
+    default_profile: str | None = None
+    # docker가 아닌 명령의 제한 방식: off | prlimit | systemd-run (Linux)
+    native: Literal["off", "prlimit", "systemd-run"] = "off"
+    profiles: dict[str, MCPResourceLimits] = Field(default_factory=dict)
+
+
 class Settings(BaseModel):
     """메인 설정"""
 
@@ -55,6 +154,13 @@ class Settings(BaseModel):
     fallback_log_dir: str | None = None
     providers: dict[str, ProviderConfig] = Field(default_factory=dict)
     outputs: OutputsConfig = Field(default_factory=OutputsConfig)
+    sync: SyncConfig = Field(default_factory=SyncConfig)
+    mcp_timeouts: MCPTimeoutConfig = Field(default_factory=MCPTimeoutConfig)
+    mcp_hub: MCPHubConfig = Field(default_factory=MCPHubConfig)
+    mcp_shim: MCPShimConfig = Field(default_factory=MCPShimConfig)
+    mcp_pool: MCPPoolConfig = Field(default_factory=MCPPoolConfig)
+    mcp_tap: MCPTapConfig = Field(default_factory=MCPTapConfig)
+    mcp_resources: MCPResourcesConfig = Field(default_factory=MCPResourcesConfig)
 
 
 class MCPServerConfig(BaseModel):
@@ -68,6 +174,11 @@ class MCPServerConfig(BaseModel):
     url_env: str | None = None  # SSE 서버용
     targets: list[str] = Field(default_factory=list)
     startup_timeout_sec: int | None = None  # Codex MCP startup timeout (seconds)
+    # 타겟별 도구 필터 (키: 타겟 이름 또는 "*", 값: 도구 이름 또는 glob)
+    tool_allow: dict[str, list[str]] = Field(default_factory=dict)
+    tool_deny: dict[str, list[str]] = Field(default_factory=dict)
+    # 자원 제한 (profile 지정 및/또는 cpus/memory/pids 직접 지정)
+    resources: MCPResourceLimits | None = None
 
 
 class MCPConfig(BaseModel):
@@ -81,6 +192,14 @@ def get_project_root() -> Path:
     return Path(__file__).parent.parent.parent.parent
 
 
+def get_state_dir() -> Path:
+    """ai-env 상태/캐시 디렉토리 (기본: ~/.ai-env, AI_ENV_STATE_DIR로 변경 가능)"""
+    override = os.environ.get("AI_ENV_STATE_DIR")
+    if override:
+        return Path(override).expanduser()
+    return Path.home() / ".ai-env"
+
+
 def _load_yaml_model(model_cls: type[_T], config_path: Path, label: str) -> _T:
     """YAML 파일을 Pydantic 모델로 로드하는 공통 함수
 
@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 import hashlib
-import json
 import shutil
 from dataclasses import dataclass, field
 from pathlib import Path
@@ -118,33 +117,14 @@ def check_sync_drift(report: DoctorReport) -> None:
     from ..mcp import MCPConfigGenerator
 
     generator = MCPConfigGenerator(sm)
-    settings = generator.settings
-
-    # (타겟 이름, 생성 함수, 출력 경로) 튜플 리스트
-    mcp_targets: list[tuple[str, Any, str]] = [
-        ("claude_desktop", generator.generate_claude_desktop(), settings.outputs.claude_desktop),
-        ("chatgpt_desktop", generator.generate_chatgpt_desktop(), settings.outputs.chatgpt_desktop),
-        ("codex_desktop", generator.generate_codex_desktop(), settings.outputs.codex_desktop),
-        ("antigravity", generator.generate_antigravity(), settings.outputs.antigravity),
-        ("codex_global", generator.generate_codex(), settings.outputs.codex_global),
-        ("gemini_global", generator.generate_gemini(), settings.outputs.gemini_global),
-        ("claude_local", generator.generate_claude_local(), settings.outputs.claude_local),
-        ("codex_local", generator.generate_codex(), settings.outputs.codex_local),
-        ("gemini_local", generator.generate_gemini(), settings.outputs.gemini_local),
-    ]
+    # MCP 설정 파일만 검사 (shell_exports 제외)
+    names = [name for name in generator.OUTPUT_RENDERERS if name != "shell_exports"]
 
-    for name, content, path_str in mcp_targets:
-        path = expand_path(path_str)
+    for name, path, expected in generator.render_all(names=names):
         if not path.exists():
             report.checks.append(CheckResult(name, "warn", f"not found: {path}", "sync"))
             continue
 
-        # 생성 결과를 문자열로 변환
-        if isinstance(content, dict):
-            expected = json.dumps(content, indent=2)
-        else:
-            expected = content
-
         actual = path.read_text()
         if _sha256(expected) == _sha256(actual):
             report.checks.append(CheckResult(name, "pass", "up to date", "sync"))
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from .config import get_project_root, load_mcp_config, load_settings
+from .output_writer import OutputWriter
 
 
 def generate_env_example() -> str:
@@ -76,11 +77,12 @@ def generate_env_example() -> str:
     return "\n".join(lines)
 
 
-def save_env_example(dry_run: bool = False) -> str | None:
-    """프로젝트 루트에 .env.example 생성
+def save_env_example(dry_run: bool = False, writer: OutputWriter | None = None) -> str | None:
+    """프로젝트 루트에 .env.example 생성 (내용이 같으면 쓰지 않음)
 
     Args:
         dry_run: True면 실제 저장하지 않음
+        writer: 출력 writer (None이면 새로 만듦)
 
     Returns:
         생성된 파일 경로 (또는 None)
@@ -89,7 +91,6 @@ def save_env_example(dry_run: bool = False) -> str | None:
     content = generate_env_example()
     path = project_root / ".env.example"
 
-    if not dry_run:
-        path.write_text(content, encoding="utf-8")
-
+    writer = writer or OutputWriter(dry_run=dry_run)
+    writer.write_text(path, content)
     return str(path)
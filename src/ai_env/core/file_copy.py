@@ -0,0 +1,160 @@
+"""File copy strategies (copy / reflink / hardlink) for sync targets."""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import os
+import shutil
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Literal
+
+CopyMode = Literal["copy", "reflink", "hardlink", "auto"]
+COPY_MODES: tuple[str, ...] = ("copy", "reflink", "hardlink", "auto")
+
+# linux/fs.h: _IOW(0x94, 9, int)
+_FICLONE = 0x40049409
+
+
+def _try_ficlone(src: Path, dst: Path) -> bool:
+    """Linux FICLONE ioctl로 reflink (btrfs/xfs 등 CoW 파일시스템)."""
+    if not sys.platform.startswith("linux"):
+        return False
+    try:
+        import fcntl
+
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+        return True
+    except (ImportError, OSError):
+        dst.unlink(missing_ok=True)
+        return False
+
+
+def _try_clonefile(src: Path, dst: Path) -> bool:
+    """macOS clonefile(2)로 reflink (APFS)."""
+    if sys.platform != "darwin":
+        return False
+    libc_name = ctypes.util.find_library("c")
+    if not libc_name:
+        return False
+    try:
+        libc = ctypes.CDLL(libc_name, use_errno=True)
+        result = libc.clonefile(os.fsencode(src), os.fsencode(dst), 0)
+    except (AttributeError, OSError):
+        return False
+    return bool(result == 0)
+
+
+def _try_copy_file_range(src: Path, dst: Path) -> bool:
+    """copy_file_range(2)로 커널 내 복사 (같은 CoW 파일시스템에서는 reflink로 처리됨)."""
+    copy_file_range = getattr(os, "copy_file_range", None)
+    if copy_file_range is None:
+        return False
+    try:
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            remaining = os.fstat(fsrc.fileno()).st_size
+            while remaining > 0:
+                copied = copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+        if remaining > 0:
+            raise OSError("short copy_file_range")
+        return True
+    except OSError:
+        dst.unlink(missing_ok=True)
+        return False
+
+
+def _try_hardlink(src: Path, dst: Path) -> bool:
+    """하드링크 생성 (다른 디바이스/권한 문제 시 실패)."""
+    try:
+        os.link(src, dst)
+        return True
+    except OSError:
+        return False
+
+
+class FileCopier:
+    """복사 모드에 따라 파일을 복사하고 실제 사용된 전략을 집계.
+
+    모든 전략은 임시 파일에 쓴 뒤 ``os.replace``로 교체한다.
+    이전 sync가 만든 하드링크에 덮어써서 소스가 바뀌는 일을 막기 위함이다.
+
+    - copy: ``shutil.copy2``
+    - reflink: FICLONE / clonefile → copy_file_range → copy
+    - hardlink: 하드링크 → copy (``allow_hardlink=False``면 바로 copy)
+    - auto: reflink → 하드링크(허용 시) → copy
+
+    ``shutil.copytree(copy_function=...)``와 매니페스트 증분 동기화의
+    ``copy_file_fn``으로 그대로 사용할 수 있다.
+    """
+
+    def __init__(self, mode: str = "copy", *, allow_hardlink: bool = True):
+        if mode not in COPY_MODES:
+            raise ValueError(f"Unknown copy mode: {mode} (expected one of {', '.join(COPY_MODES)})")
+        self.mode = mode
+        self.allow_hardlink = allow_hardlink
+        self.strategies: Counter[str] = Counter()
+
+    def without_hardlink(self) -> FileCopier:
+        """대상 에이전트/sync가 파일을 수정하는 트리용 (예: chmod하는 hooks/)."""
+        return FileCopier(self.mode, allow_hardlink=False)
+
+    def _strategy_chain(self) -> list[str]:
+        if self.mode == "copy":
+            return []
+        chain: list[str] = []
+        if self.mode in ("reflink", "auto"):
+            chain += ["reflink", "copy_file_range"]
+        if self.mode in ("hardlink", "auto") and self.allow_hardlink:
+            chain.append("hardlink")
+        return chain
+
+    def _attempt(self, strategy: str, src: Path, tmp: Path) -> bool:
+        if strategy == "reflink":
+            if _try_ficlone(src, tmp) or _try_clonefile(src, tmp):
+                shutil.copystat(src, tmp)
+                return True
+            return False
+        if strategy == "copy_file_range":
+            if _try_copy_file_range(src, tmp):
+                shutil.copystat(src, tmp)
+                return True
+            return False
+        return _try_hardlink(src, tmp)
+
+    def __call__(self, src: str | os.PathLike[str], dst: str | os.PathLike[str]) -> str:
+        """src → dst 복사. copytree 호환을 위해 dst 경로 문자열을 반환."""
+        src_path, dst_path = Path(src), Path(dst)
+        tmp = dst_path.with_name(f".{dst_path.name}.ai-env-tmp")
+        tmp.unlink(missing_ok=True)
+
+        used = "copy"
+        for strategy in self._strategy_chain():
+            if self._attempt(strategy, src_path, tmp):
+                used = strategy
+                break
+        else:
+            shutil.copy2(src_path, tmp)
+
+        os.replace(tmp, dst_path)
+        self.strategies[used] += 1
+        return str(dst_path)
+
+    def describe(self) -> str:
+        """사용된 전략 요약 (예: "reflink" 또는 "hardlink 10, copy 2")."""
+        if not self.strategies:
+            return self.mode
+        if len(self.strategies) == 1:
+            return next(iter(self.strategies))
+        return ", ".join(f"{name} {count}" for name, count in self.strategies.most_common())
+
+    def annotate(self, desc: str) -> str:
+        """기본 copy 모드가 아니면 결과 설명에 전략을 덧붙인다."""
+        if self.mode == "copy":
+            return desc
+        return f"{desc} [{self.describe()}]"
@@ -0,0 +1,85 @@
+"""Streaming reader for the leading YAML frontmatter block of Markdown files."""
+
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO
+
+# frontmatter는 이 크기 안에서 닫혀야 한다 (넘으면 frontmatter가 없는 것으로 본다)
+FRONTMATTER_MAX_BYTES = 64 * 1024
+
+
+def _text(line: bytes) -> str:
+    """read_text()와 같은 universal newline 처리."""
+    return line.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+
+
+@dataclass
+class MarkdownHead:
+    """파일 앞부분만 읽은 결과.
+
+    Attributes:
+        frontmatter: 첫 줄 ``---``부터 다음 ``---`` 줄 사이 텍스트 (없으면 None)
+        body_offset: 본문 시작 바이트 위치 (frontmatter가 없으면 0)
+        closing_line: 닫는 ``---`` 줄 원문 (``---`` 뒤에 다른 문자가 있는지 판단용)
+        digest: 읽은 앞부분 바이트의 SHA-256 (frontmatter 캐시 키용)
+    """
+
+    frontmatter: str | None
+    body_offset: int
+    closing_line: str = ""
+    digest: str = ""
+
+    @property
+    def summary_text(self) -> str:
+        """parse_skill_summary()에 넘길 수 있는 frontmatter 블록 (없으면 빈 문자열)."""
+        if self.frontmatter is None:
+            return ""
+        return f"---\n{self.frontmatter}\n---\n"
+
+
+def read_markdown_head(f: BinaryIO, max_bytes: int = FRONTMATTER_MAX_BYTES) -> MarkdownHead:
+    """열린 파일의 처음부터 frontmatter 블록만 읽는다 (본문은 읽지 않음).
+
+    첫 줄이 ``---``이고 max_bytes 안에 ``---``로 시작하는 닫는 줄이 있으면 frontmatter로 본다.
+
+    Args:
+        f: 바이너리 모드로 연 파일 (위치는 처음이어야 함)
+        max_bytes: frontmatter 최대 크기
+    """
+    digest = hashlib.sha256()
+    first = f.readline(max_bytes + 1)
+    digest.update(first)
+    if first.strip() != b"---":
+        return MarkdownHead(None, 0, digest=digest.hexdigest())
+
+    consumed = len(first)
+    lines: list[str] = []
+    while True:
+        raw = f.readline(max_bytes + 1 - consumed)
+        if not raw:
+            break
+        consumed += len(raw)
+        if consumed > max_bytes:  # 상한 초과 (줄 중간에서 잘렸을 수 있음)
+            break
+        digest.update(raw)
+        line = _text(raw)
+        if line.startswith("---"):
+            if not lines:  # 빈 블록은 frontmatter로 보지 않음 (기존 정규식과 동일)
+                break
+            return MarkdownHead(
+                "".join(lines).removesuffix("\n"),
+                consumed,
+                closing_line=line,
+                digest=digest.hexdigest(),
+            )
+        lines.append(line)
+    return MarkdownHead(None, 0, digest=hashlib.sha256(first).hexdigest())
+
+
+def read_frontmatter_text(path: Path, max_bytes: int = FRONTMATTER_MAX_BYTES) -> str:
+    """파일의 frontmatter 블록 텍스트 (없으면 빈 문자열, 본문은 읽지 않음)."""
+    with open(path, "rb") as f:
+        return read_markdown_head(f, max_bytes).summary_text
@@ -0,0 +1,367 @@
+"""Fan-out sync of global configs into many user home directories."""
+
+from __future__ import annotations
+
+import os
+import pwd
+import stat
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+from .config import MCPConfig, Settings, _load_yaml_model, expand_path, load_mcp_config
+from .secrets import SecretsManager
+from .skill_catalog import SkillCatalog
+from .skill_store import SkillStore
+
+# 사용자 .env 기본 위치 (홈 기준)
+DEFAULT_HOME_ENV_FILE = ".ai-env/.env"
+# 시크릿이 들어가는 출력 파일 권한 (소유자만 읽기/쓰기)
+SECRET_FILE_MODE = 0o600
+# 다른 사용자 홈에 쓸 때의 복사 모드 (하드링크 제외)
+_NO_HARDLINK = {"hardlink": "copy", "auto": "reflink"}
+
+
+class HomeEntry(BaseModel):
+    """roster의 사용자 한 명"""
+
+    user: str
+    home: str | None = None  # 없으면 passwd의 홈 디렉토리
+    env_file: str | None = None  # 없으면 <home>/.ai-env/.env
+
+
+class HomeRoster(BaseModel):
+    """--homes roster.yaml"""
+
+    homes: list[HomeEntry] = Field(default_factory=list)
+    # 모든 홈이 공유할 스킬 store 경로 (사용자들이 읽을 수 있는 위치여야 함)
+    store_dir: str | None = None
+
+
+def load_roster(path: Path) -> HomeRoster:
+    """roster YAML 로드
+
+    Raises:
+        ValueError: YAML 파싱 오류 또는 검증 실패 시
+    """
+    if not path.exists():
+        raise ValueError(f"Roster not found: {path}")
+    return _load_yaml_model(HomeRoster, path, "home roster")
+
+
+@dataclass
+class HomeTarget:
+    """동기화할 홈 디렉토리 (roster 항목을 passwd로 해석한 결과)"""
+
+    user: str
+    home: Path
+    env_file: Path
+    uid: int
+    gid: int
+
+    @classmethod
+    def resolve(cls, entry: HomeEntry) -> HomeTarget:
+        """roster 항목을 uid/gid와 홈/.env 경로로 해석
+
+        Raises:
+            ValueError: 시스템에 없는 사용자
+        """
+        try:
+            pw = pwd.getpwnam(entry.user)
+        except KeyError as e:
+            raise ValueError(f"Unknown user in roster: {entry.user}") from e
+        home = expand_path(entry.home) if entry.home else Path(pw.pw_dir)
+        env_file = expand_path(entry.env_file) if entry.env_file else home / DEFAULT_HOME_ENV_FILE
+        return cls(entry.user, home, env_file, pw.pw_uid, pw.pw_gid)
+
+
+@dataclass
+class HomeSyncResult:
+    """홈 하나의 동기화 결과"""
+
+    user: str
+    home: Path
+    written: list[Path] = field(default_factory=list)
+    error: str | None = None
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "user": self.user,
+            "home": str(self.home),
+            "written": [str(p) for p in self.written],
+            "error": self.error,
+            "elapsed": round(self.elapsed, 3),
+        }
+
+
+@dataclass
+class HomeFanout:
+    """모든 홈이 공유하는 입력 (한 번만 스캔/로드)
+
+    스킬 카탈로그, MCP/앱 설정, 스킬 store는 한 번 준비해 모든 홈이 공유하고,
+    시크릿이 들어가는 파일(settings.json, MCP 설정)만 사용자 .env로 홈마다 렌더링한다.
+    """
+
+    catalog: SkillCatalog
+    settings: Settings
+    mcp_config: MCPConfig
+    store: SkillStore | None = None
+    copy_mode: str | None = None
+    targets: tuple[str, ...] = ("claude", "codex", "gemini", "mcp")
+
+    def sync_home(self, target: HomeTarget, dry_run: bool = False) -> HomeSyncResult:
+        """홈 하나에 글로벌 설정 + MCP 설정을 쓰고 소유권/권한을 맞춘다.
+
+        root로 다른 사용자 홈에 쓸 때는 먼저 dry-run으로 쓸 경로를 구하고, 그 경로(와 상위
+        디렉토리)가 심볼릭 링크이거나 다른 사용자 소유면 아무것도 쓰지 않고 실패로 보고한다
+        (예: ~/.claude → /etc 링크로 root가 홈 밖에 쓰게 만드는 경우).
+        """
+        result = HomeSyncResult(target.user, target.home)
+        start = time.perf_counter()
+        try:
+            guarded = not dry_run and os.geteuid() == 0 and target.uid != 0
+            if guarded:
+                self._check_paths(target, self._sync(target, dry_run=True)[0])
+            written, secret_files = self._sync(target, dry_run)
+            if not dry_run:
+                if guarded:
+                    # 쓰는 동안 바뀌었을 수 있으므로 chmod/chown 전에 다시 확인
+                    self._check_paths(target, written)
+                for path in secret_files:
+                    if path.is_file() and not path.is_symlink():
+                        path.chmod(SECRET_FILE_MODE)
+                _chown_written(target, written)
+            result.written = sorted(set(written))
+        except Exception as e:
+            result.error = str(e)
+        result.elapsed = time.perf_counter() - start
+        return result
+
+    def _sync(self, target: HomeTarget, dry_run: bool) -> tuple[list[Path], list[Path]]:
+        """대상별 동기화 실행
+
+        Returns:
+            (쓴 경로, 그중 시크릿이 들어가는 파일)
+        """
+        from ..mcp import MCPConfigGenerator
+        from .sync import (
+            sync_claude_global_config,
+            sync_codex_global_config,
+            sync_gemini_global_config,
+        )
+
+        secrets = SecretsManager(target.env_file, inherit_environ=False)
+        copy_mode = self.copy_mode or self.settings.sync.copy_mode
+        if target.uid != os.geteuid():
+            # 다른 사용자 홈에 하드링크를 만들면 chown이 저장소 원본 inode까지 넘겨줌
+            copy_mode = _NO_HARDLINK.get(copy_mode, copy_mode)
+        written: list[Path] = []
+        secret_files: list[Path] = []
+        common: dict[str, Any] = {"dry_run": dry_run, "catalog": self.catalog}
+        if "claude" in self.targets:
+            claude = sync_claude_global_config(
+                copy_mode=copy_mode,
+                home=target.home,
+                secrets=secrets,
+                store=self.store,
+                **common,
+            )
+            written += [Path(p) for p in claude.values()]
+            secret_files.append(target.home / ".claude" / "settings.json")
+        if "codex" in self.targets:
+            codex = sync_codex_global_config(
+                copy_mode=copy_mode, home=target.home, store=self.store, **common
+            )
+            written += [Path(p) for p in codex.values()]
+        if "gemini" in self.targets:
+            gemini = sync_gemini_global_config(home=target.home, **common)
+            written += [Path(p) for p in gemini.values()]
+        if "mcp" in self.targets:
+            generator = MCPConfigGenerator(secrets, self.mcp_config, self.settings)
+            mcp_files = generator.save_all(dry_run=dry_run, home=target.home).values()
+            written += mcp_files
+            secret_files += mcp_files
+        return written, secret_files
+
+    def _check_paths(self, target: HomeTarget, paths: list[Path]) -> None:
+        """root가 쓸 경로가 사용자가 다른 곳을 가리키게 만들 수 없는지 확인
+
+        홈부터 각 경로까지 이미 있는 구성 요소는 심볼릭 링크가 아니고 사용자(또는 방금 만든
+        root) 소유여야 한다.
+        디렉토리(skills/ 등)는 안쪽까지 같은 규칙이며, 공유 store 객체를 가리키는 링크만 허용한다.
+
+        Raises:
+            ValueError: 안전하지 않은 경로
+        """
+        store_root = self.store.root.resolve() if self.store is not None else None
+
+        def _check(path: Path, allow_store_link: bool = False) -> os.stat_result | None:
+            try:
+                st = path.lstat()
+            except FileNotFoundError:
+                return None
+            if stat.S_ISLNK(st.st_mode):
+                if (
+                    allow_store_link
+                    and store_root is not None
+                    and store_root in path.resolve().parents
+                ):
+                    return None
+                raise ValueError(
+                    f"Refusing to write through symlink in {target.user}'s home: {path}"
+                )
+            if st.st_uid not in (target.uid, 0):
+                raise ValueError(f"Refusing to write to {path}: not owned by {target.user}")
+            return st
+
+        # 홈 자체는 root 소유 링크(/home/alice → /data/alice)일 수 있음
+        if target.home.is_symlink() and target.home.lstat().st_uid != 0:
+            raise ValueError(f"Refusing to write through symlink: {target.home}")
+        if target.home.exists() and target.home.stat().st_uid not in (target.uid, 0):
+            raise ValueError(f"Refusing to write to {target.home}: not owned by {target.user}")
+        for path in paths:
+            if target.home not in path.parents:
+                raise ValueError(f"Refusing to write outside {target.user}'s home: {path}")
+            for component in reversed(path.parents):
+                if target.home in component.parents and _check(component) is None:
+                    break
+            else:
+                st = _check(path, allow_store_link=True)
+                if st is not None and stat.S_ISDIR(st.st_mode):
+                    for dirpath, dirnames, filenames in os.walk(path):
+                        for name in dirnames + filenames:
+                            _check(Path(dirpath) / name, allow_store_link=True)
+
+
+def _chown_written(target: HomeTarget, written: list[Path]) -> None:
+    """홈 아래에 쓴 파일/디렉토리 소유자를 사용자로 변경 (root로 실행할 때만)
+
+    심볼릭 링크는 따라가지 않으므로 공유 store 객체는 실행자 소유로 남는다.
+    """
+    if os.geteuid() != 0:
+        return
+    paths: set[Path] = set()
+    for path in written:
+        # 새로 만들었을 수 있는 상위 디렉토리 (~/.claude 등)
+        for parent in path.parents:
+            if parent == target.home or target.home not in parent.parents:
+                break
+            paths.add(parent)
+        paths.add(path)
+        if path.is_dir() and not path.is_symlink():
+            for dirpath, dirnames, filenames in os.walk(path):
+                paths.update(Path(dirpath) / name for name in dirnames + filenames)
+    for path in paths:
+        try:
+            st = path.lstat()
+        except FileNotFoundError:
+            continue
+        if (st.st_uid, st.st_gid) != (target.uid, target.gid):
+            os.lchown(path, target.uid, target.gid)
+
+
+def check_shared_store(root: Path) -> None:
+    """공유 store를 모든 사용자가 읽을 수 있는지 확인
+
+    상위 디렉토리는 모두 o+x, store와 이미 있는 객체 디렉토리는 o+rx여야 한다.
+
+    Raises:
+        ValueError: 다른 사용자가 읽을 수 없는 경로
+    """
+    readable = stat.S_IROTH | stat.S_IXOTH
+    for parent in root.parents:
+        if parent.exists() and not parent.stat().st_mode & stat.S_IXOTH:
+            raise ValueError(f"Skill store {root} is not reachable by other users: {parent} (o+x)")
+    if not root.exists():
+        return
+    for path in [root, *(p for p in root.iterdir() if p.is_dir() and not p.is_symlink())]:
+        if path.stat().st_mode & readable != readable:
+            raise ValueError(f"Skill store is not readable by other users: {path} (o+rx)")
+
+
+def sync_homes(
+    roster: HomeRoster,
+    fanout: HomeFanout,
+    dry_run: bool = False,
+    max_workers: int = 4,
+    on_progress: Callable[[HomeSyncResult], None] | None = None,
+) -> list[HomeSyncResult]:
+    """roster의 모든 홈에 병렬로 동기화
+
+    사용자 해석 실패도 해당 홈의 실패 결과로 보고하고 나머지 홈은 계속 진행한다.
+
+    Args:
+        roster: 대상 사용자 목록
+        fanout: 공유 입력 (build_fanout 결과)
+        dry_run: True면 실제로 쓰지 않음
+        max_workers: 동시에 처리할 홈 수
+        on_progress: 홈 하나가 끝날 때마다 호출 (완료 순서)
+
+    Returns:
+        roster 순서의 결과 목록
+    """
+    results: dict[int, HomeSyncResult] = {}
+    targets: dict[int, HomeTarget] = {}
+    for index, entry in enumerate(roster.homes):
+        try:
+            targets[index] = HomeTarget.resolve(entry)
+        except ValueError as e:
+            results[index] = HomeSyncResult(entry.user, Path(entry.home or "?"), error=str(e))
+            if on_progress is not None:
+                on_progress(results[index])
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            pool.submit(fanout.sync_home, target, dry_run): index
+            for index, target in targets.items()
+        }
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+            if on_progress is not None:
+                on_progress(results[futures[future]])
+    return [results[index] for index in sorted(results)]
+
+
+def build_fanout(
+    project_root: Path,
+    roster: HomeRoster,
+    settings: Settings,
+    skills_include: list[str] | None = None,
+    skills_exclude: list[str] | None = None,
+    copy_mode: str | None = None,
+    targets: tuple[str, ...] = ("claude", "codex", "gemini", "mcp"),
+) -> HomeFanout:
+    """모든 홈이 공유할 입력 준비 (스킬 스캔, 설정 로드는 여기서 한 번)
+
+    Raises:
+        ValueError: sync.skill_store가 켜져 있는데 roster에 store_dir이 없거나,
+            store_dir을 다른 사용자가 읽을 수 없음
+    """
+    store: SkillStore | None = None
+    if roster.store_dir:
+        store = SkillStore(expand_path(roster.store_dir))
+        check_shared_store(store.root)
+    elif settings.sync.skill_store:
+        # 실행자의 ~/.ai-env/store(root라면 /root/...)는 다른 사용자가 읽을 수 없음
+        raise ValueError(
+            "sync.skill_store is enabled: set store_dir in the roster to a directory "
+            "every user can read (e.g. /srv/ai-env/store)"
+        )
+    return HomeFanout(
+        catalog=SkillCatalog.scan(project_root, skills_include, skills_exclude),
+        settings=settings,
+        mcp_config=load_mcp_config(),
+        store=store,
+        copy_mode=copy_mode,
+        targets=targets,
+    )
@@ -0,0 +1,122 @@
+"""Write-if-changed, atomic writer shared by every generated config file."""
+
+from __future__ import annotations
+
+import os
+import threading
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Literal
+
+WriteStatus = Literal["written", "unchanged"]
+
+
+@dataclass(frozen=True)
+class WriteResult:
+    """출력 파일 하나의 처리 결과."""
+
+    path: Path
+    status: WriteStatus
+    size: int
+
+
+def _same_content(path: Path, data: bytes) -> bool:
+    """기존 파일 내용이 data와 같은지 (크기가 다르면 읽지 않음)."""
+    try:
+        if path.stat().st_size != len(data):
+            return False
+        return path.read_bytes() == data
+    except OSError:
+        return False
+
+
+@dataclass
+class OutputWriter:
+    """생성된 설정 파일을 내용이 바뀐 경우에만 원자적으로 쓰는 writer.
+
+    같은 내용이면 파일을 건드리지 않으므로 mtime이 유지되고, Claude Desktop/Codex/Gemini CLI가
+    설정을 다시 읽거나 MCP 서버를 재시작하지 않는다. 쓸 때는 같은 디렉토리의 임시 파일에 쓴 뒤
+    rename하므로 읽는 쪽이 일부만 쓰인 파일을 보지 않는다. 여러 스테이지(스레드)가 공유할 수 있다.
+
+    Attributes:
+        dry_run: True면 비교만 하고 쓰지 않음 (결과 status는 실제로 쓸지 여부)
+        results: 처리한 파일 결과 (처리 순서)
+    """
+
+    dry_run: bool = False
+    results: list[WriteResult] = field(default_factory=list)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def write_text(self, path: Path, text: str, mode: int | None = None) -> WriteResult:
+        """text를 path에 쓴다 (기존 내용과 같으면 건너뜀).
+
+        심볼릭 링크면 링크가 가리키는 파일에 쓴다 (dotfiles 레포로 연결된 설정 유지).
+
+        Args:
+            path: 대상 파일
+            text: 내용 (UTF-8로 저장)
+            mode: 새로 쓸 때 적용할 권한 (None이면 기존 파일 권한 유지, 새 파일은 umask 기본)
+
+        Raises:
+            OSError: 쓰기 실패 (PermissionError 포함)
+        """
+        data = text.encode("utf-8")
+        target = path.resolve() if path.is_symlink() else path
+        if _same_content(target, data):
+            if mode is not None and not self.dry_run and (target.stat().st_mode & 0o777) != mode:
+                target.chmod(mode)
+            return self._record(WriteResult(path, "unchanged", len(data)))
+
+        if not self.dry_run:
+            _atomic_write(target, data, mode)
+        return self._record(WriteResult(path, "written", len(data)))
+
+    def skip(self, path: Path, size: int) -> WriteResult:
+        """내용을 비교하지 않고 변경 없음으로 기록 (입력이 같아 렌더링을 건너뛴 출력)."""
+        return self._record(WriteResult(path, "unchanged", size))
+
+    def _record(self, result: WriteResult) -> WriteResult:
+        with self._lock:
+            self.results.append(result)
+        return result
+
+    def counts(self) -> dict[str, int]:
+        """status별 파일 수 ({"written": n, "unchanged": m})."""
+        counts = {"written": 0, "unchanged": 0}
+        for result in self.results:
+            counts[result.status] += 1
+        return counts
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "counts": self.counts(),
+            "files": [
+                {"path": str(r.path), "status": r.status, "size": r.size} for r in self.results
+            ],
+        }
+
+
+def _atomic_write(path: Path, data: bytes, mode: int | None) -> None:
+    """같은 디렉토리의 임시 파일에 쓰고 rename (기존 파일 권한 유지)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if mode is None:
+        try:
+            mode = path.stat().st_mode & 0o777
+        except FileNotFoundError:
+            mode = None
+    tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data)
+        if mode is not None:
+            os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def annotate(desc: str, result: WriteResult) -> str:
+    """sync 결과 설명에 변경 없음 표시 (예: "settings.json (unchanged)")."""
+    return f"{desc} (unchanged)" if result.status == "unchanged" else desc
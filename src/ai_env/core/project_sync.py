@@ -2,14 +2,24 @@
 
 from __future__ import annotations
 
+import fnmatch
 import os
 import shutil
-from dataclasses import dataclass
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
+from typing import Any
 
 from .codex_skills import copy_skill_tree_for_codex
 
+# 워크스페이스 탐색 기본 깊이 (root가 0)
+DEFAULT_MAX_DEPTH = 4
+# .gitignore와 무관하게 내려가지 않는 디렉토리
+_SKIP_DIRS = frozenset({"node_modules", "__pycache__", "venv", "site-packages"})
+
 
 @dataclass
 class ProjectSyncResult:
@@ -22,6 +32,16 @@ class ProjectSyncResult:
     mode: str
     backup_path: Path | None = None
 
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "source": str(self.source),
+            "target": str(self.target),
+            "status": self.status,
+            "mode": self.mode,
+            "backup_path": str(self.backup_path) if self.backup_path else None,
+        }
+
 
 def _timestamp() -> str:
     """백업 파일명용 타임스탬프 반환."""
@@ -211,3 +231,233 @@ def sync_project_claude_to_codex(
         )
 
     return results
+
+
+@dataclass(frozen=True)
+class _IgnoreRule:
+    """.gitignore 패턴 한 줄 (base는 .gitignore가 있는 디렉토리의 root 기준 상대 경로)."""
+
+    base: str
+    pattern: str
+    negate: bool
+    dir_only: bool
+    anchored: bool
+
+    @classmethod
+    def parse(cls, base: str, line: str) -> _IgnoreRule | None:
+        line = line.rstrip("\n").rstrip()
+        if not line or line.startswith("#"):
+            return None
+        negate = line.startswith("!")
+        if negate:
+            line = line[1:]
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        if line.startswith("**/"):
+            line = line[3:]
+        anchored = "/" in line
+        line = line.lstrip("/")
+        if not line:
+            return None
+        return cls(base, line, negate, dir_only, anchored)
+
+    def matches(self, rel_path: str, is_dir: bool) -> bool:
+        if self.dir_only and not is_dir:
+            return False
+        if self.base:
+            if not rel_path.startswith(self.base + "/"):
+                return False
+            rel_path = rel_path[len(self.base) + 1 :]
+        if self.anchored:
+            return fnmatch.fnmatchcase(rel_path, self.pattern)
+        return fnmatch.fnmatchcase(rel_path.rsplit("/", 1)[-1], self.pattern)
+
+
+def _read_gitignore(directory: str, base: str) -> list[_IgnoreRule]:
+    try:
+        with open(os.path.join(directory, ".gitignore"), encoding="utf-8", errors="replace") as f:
+            lines = f.readlines()
+    except OSError:
+        return []
+    return [rule for line in lines if (rule := _IgnoreRule.parse(base, line)) is not None]
+
+
+def _is_ignored(rules: list[_IgnoreRule], rel_path: str, is_dir: bool) -> bool:
+    """마지막으로 매칭된 규칙이 결정 (! 규칙이면 다시 포함)."""
+    ignored = False
+    for rule in rules:
+        if rule.matches(rel_path, is_dir):
+            ignored = not rule.negate
+    return ignored
+
+
+def discover_projects(
+    root: Path,
+    max_depth: int = DEFAULT_MAX_DEPTH,
+    respect_gitignore: bool = True,
+) -> list[Path]:
+    """root 아래에서 Claude 자산이 있는 프로젝트 디렉토리 탐색.
+
+    `CLAUDE.md` 파일이나 `.claude/skills` 디렉토리가 있으면 프로젝트로 본다.
+    `os.scandir`로 한 디렉토리를 한 번만 읽고, 숨김 디렉토리와 node_modules 등은 내려가지 않는다.
+    프로젝트 안의 하위 프로젝트(모노레포)도 깊이 제한 안에서 찾는다.
+
+    Args:
+        root: 탐색 시작 디렉토리 (root 자신도 프로젝트가 될 수 있음)
+        max_depth: root로부터 내려갈 최대 깊이
+        respect_gitignore: True면 각 디렉토리의 .gitignore에 걸리는 디렉토리는 건너뜀
+
+    Returns:
+        발견한 프로젝트 경로 (경로 순 정렬)
+    """
+    root = root.resolve()
+    found: list[Path] = []
+    stack: list[tuple[str, str, int, list[_IgnoreRule]]] = [(str(root), "", 0, [])]
+    while stack:
+        directory, rel_dir, depth, rules = stack.pop()
+        if respect_gitignore:
+            rules = rules + _read_gitignore(directory, rel_dir)
+        try:
+            with os.scandir(directory) as it:
+                entries = list(it)
+        except OSError:
+            continue
+
+        is_project = False
+        subdirs: list[os.DirEntry[str]] = []
+        for entry in entries:
+            try:
+                if entry.name == "CLAUDE.md" and entry.is_file():
+                    is_project = True
+                elif entry.is_dir(follow_symlinks=False):
+                    if entry.name == ".claude":
+                        is_project = is_project or os.path.isdir(os.path.join(entry.path, "skills"))
+                    elif not entry.name.startswith(".") and entry.name not in _SKIP_DIRS:
+                        subdirs.append(entry)
+            except OSError:
+                continue
+        if is_project:
+            found.append(Path(directory))
+
+        if depth >= max_depth:
+            continue
+        for entry in subdirs:
+            rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            if rules and _is_ignored(rules, rel_path, is_dir=True):
+                continue
+            stack.append((entry.path, rel_path, depth + 1, rules))
+    return sorted(found)
+
+
+@dataclass
+class ProjectReport:
+    """워크스페이스 동기화 중 프로젝트 하나의 결과."""
+
+    project: Path
+    results: list[ProjectSyncResult] = field(default_factory=list)
+    elapsed: float = 0.0
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "project": str(self.project),
+            "results": [result.to_dict() for result in self.results],
+            "elapsed": round(self.elapsed, 3),
+            "error": self.error,
+        }
+
+
+@dataclass
+class WorkspaceSyncReport:
+    """`project sync --all` 집계 결과."""
+
+    root: Path
+    projects: list[ProjectReport] = field(default_factory=list)
+    discover_seconds: float = 0.0
+    wall_time: float = 0.0
+
+    @property
+    def errors(self) -> list[ProjectReport]:
+        return [report for report in self.projects if not report.ok]
+
+    def status_counts(self) -> dict[str, int]:
+        """항목 상태(linked/copied/unchanged/missing)별 개수."""
+        counts: dict[str, int] = {}
+        for report in self.projects:
+            for result in report.results:
+                counts[result.status] = counts.get(result.status, 0) + 1
+        return counts
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "root": str(self.root),
+            "projects": [report.to_dict() for report in self.projects],
+            "status_counts": self.status_counts(),
+            "errors": len(self.errors),
+            "discover_seconds": round(self.discover_seconds, 3),
+            "wall_time": round(self.wall_time, 3),
+        }
+
+
+def sync_workspace(
+    root: Path,
+    *,
+    max_depth: int = DEFAULT_MAX_DEPTH,
+    respect_gitignore: bool = True,
+    max_workers: int = 4,
+    use_copy: bool = False,
+    dry_run: bool = False,
+    sync_agents: bool = True,
+    sync_skills: bool = True,
+    on_progress: Callable[[ProjectReport], None] | None = None,
+) -> WorkspaceSyncReport:
+    """root 아래 모든 프로젝트를 제한된 워커 풀에서 동기화.
+
+    한 프로젝트의 실패는 해당 ProjectReport.error로 기록하고 나머지는 계속 진행한다.
+
+    Args:
+        root: 워크스페이스 루트 (예: ~/work)
+        max_depth: 프로젝트 탐색 최대 깊이
+        respect_gitignore: .gitignore에 걸리는 디렉토리는 탐색하지 않음
+        max_workers: 동시에 동기화할 프로젝트 수
+        use_copy, dry_run, sync_agents, sync_skills: sync_project_claude_to_codex 옵션
+        on_progress: 프로젝트 하나가 끝날 때마다 호출 (완료 순서)
+
+    Returns:
+        발견 순서(경로 순)의 프로젝트별 결과와 소요 시간
+    """
+    start = time.perf_counter()
+    projects = discover_projects(root, max_depth, respect_gitignore)
+    report = WorkspaceSyncReport(root=root.resolve(), discover_seconds=time.perf_counter() - start)
+
+    def _run(project: Path) -> ProjectReport:
+        project_start = time.perf_counter()
+        project_report = ProjectReport(project)
+        try:
+            project_report.results = sync_project_claude_to_codex(
+                project,
+                use_copy=use_copy,
+                dry_run=dry_run,
+                sync_agents=sync_agents,
+                sync_skills=sync_skills,
+            )
+        except (OSError, ValueError) as e:  # ValueError: UnicodeDecodeError 등 잘못된 SKILL.md
+            project_report.error = str(e)
+        project_report.elapsed = time.perf_counter() - project_start
+        return project_report
+
+    if projects:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(projects))) as pool:
+            futures = {pool.submit(_run, project): index for index, project in enumerate(projects)}
+            done: dict[int, ProjectReport] = {}
+            for future in as_completed(futures):
+                done[futures[future]] = future.result()
+                if on_progress is not None:
+                    on_progress(done[futures[future]])
+        report.projects = [done[index] for index in range(len(projects))]
+    report.wall_time = time.perf_counter() - start
+    return report
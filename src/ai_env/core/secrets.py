@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import os
 import re
+from pathlib import Path
 
 from dotenv import dotenv_values
 
@@ -13,8 +14,16 @@ from .config import get_project_root
 class SecretsManager:
     """환경변수/시크릿 관리 (.env 파일에서 읽기 전용)"""
 
-    def __init__(self, env_file: str = ".env"):
+    def __init__(self, env_file: str | Path = ".env", inherit_environ: bool = True):
+        """.env 파일 로드
+
+        Args:
+            env_file: .env 경로 (상대 경로면 프로젝트 루트 기준)
+            inherit_environ: False면 .env에 없는 값을 os.environ에서 찾지 않음
+                (다른 사용자용 설정을 만들 때 실행자의 환경변수가 섞이지 않도록)
+        """
         self.env_file = get_project_root() / env_file
+        self.inherit_environ = inherit_environ
         self._cache: dict[str, str] = {}
         self._load()
 
@@ -36,8 +45,11 @@ class SecretsManager:
             default: 값이 없을 때 기본값
 
         Returns:
-            환경변수 값 (캐시 → os.environ → 기본값 순서로 조회)
+            환경변수 값 (캐시 → os.environ → 기본값 순서로 조회,
+            inherit_environ=False면 os.environ은 건너뜀)
         """
+        if not self.inherit_environ:
+            return self._cache.get(key, default)
         return self._cache.get(key, os.environ.get(key, default))
 
     def list(self) -> dict[str, str]:
@@ -130,6 +142,10 @@ class SecretsManager:
             template,
         )
 
+    def referenced_keys(self, template: str) -> tuple[str, ...]:
+        """템플릿 문자열이 ${VAR}로 참조하는 환경변수 이름 (등장 순서, 중복 제거)"""
+        return tuple(dict.fromkeys(self._VAR_PATTERN.findall(template)))
+
 
 def get_secrets_manager(env_file: str = ".env") -> SecretsManager:
     """SecretsManager 인스턴스 반환"""
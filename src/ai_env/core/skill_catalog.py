@@ -0,0 +1,252 @@
+"""Skill source catalog scanned once and shared by every consumer in a sync run."""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import subprocess
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Literal
+
+from .frontmatter import read_frontmatter_text
+from .sync_manifest import SourceFile, list_source_files
+
+# personal: ai-env/.claude/skills/<name>
+# nested: <team>/.claude/skills/<name>, skills-subdir: <team>/skills/<name>, flat: <team>/<name>
+SkillLayout = Literal["personal", "nested", "skills-subdir", "flat"]
+
+PERSONAL_ORIGIN = "personal"
+
+
+def parse_skill_summary(content: str, default_name: str) -> tuple[str, str] | None:
+    """SKILL.md 내용의 frontmatter에서 name과 description 첫 줄을 추출.
+
+    Args:
+        content: SKILL.md 내용 (frontmatter 블록만 있어도 됨, read_frontmatter_text 참고)
+        default_name: name 필드가 없을 때 사용할 이름 (보통 디렉토리 이름)
+
+    Returns:
+        (name, description_first_line) 또는 None (frontmatter 없음)
+    """
+    # frontmatter 파싱 (--- ... ---)
+    fm_match = re.search(r"^---\s*\n(.*?)\n---", content, re.DOTALL | re.MULTILINE)
+    if not fm_match:
+        return None
+
+    fm_text = fm_match.group(1)
+
+    # name 추출
+    name_match = re.search(r"^name:\s*(.+)$", fm_text, re.MULTILINE)
+    name = name_match.group(1).strip() if name_match else default_name
+
+    # description 추출 (첫 줄만, | 블록이면 다음 줄)
+    desc_match = re.search(r"^description:\s*\|?\s*\n?\s*(.+)$", fm_text, re.MULTILINE)
+    if desc_match:
+        desc = desc_match.group(1).strip()
+    else:
+        # 인라인 description
+        desc_inline = re.search(r"^description:\s*(.+)$", fm_text, re.MULTILINE)
+        desc = desc_inline.group(1).strip() if desc_inline else name
+
+    return name, desc
+
+
+@dataclass(frozen=True)
+class GitTreeState:
+    """git 레포 하위 디렉토리의 HEAD tree oid와 작업 트리 변경 여부."""
+
+    tree: str
+    dirty: bool
+
+
+def git_tree_state(path: Path) -> GitTreeState | None:
+    """path 디렉토리의 HEAD tree object id와 dirty 여부 (git 레포가 아니면 None).
+
+    tracked 파일 수정과 untracked 파일 추가 모두 dirty로 본다.
+    """
+    try:
+        tree = subprocess.run(
+            ["git", "rev-parse", "HEAD:./"],
+            cwd=path,
+            capture_output=True,
+            text=True,
+            check=True,
+            timeout=30,
+        ).stdout.strip()
+        status = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=normal", "--", "."],
+            cwd=path,
+            capture_output=True,
+            text=True,
+            check=True,
+            timeout=30,
+        ).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return GitTreeState(tree=tree, dirty=bool(status.strip()))
+
+
+_UNSET = object()
+
+
+@dataclass(eq=False)
+class SkillEntry:
+    """스킬 소스 디렉토리 한 개.
+
+    SKILL.md 요약과 파일 목록은 처음 요청될 때 한 번만 읽고 캐시한다.
+    여러 sync 스테이지가 스레드에서 동시에 접근하므로 캐시는 lock으로 보호한다.
+    """
+
+    source: Path
+    layout: SkillLayout
+    origin: str = PERSONAL_ORIGIN
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+    _summary: object = field(default=_UNSET, init=False, repr=False)
+    _files: list[SourceFile] | None = field(default=None, init=False, repr=False)
+
+    @property
+    def name(self) -> str:
+        return self.source.name
+
+    @property
+    def summary(self) -> tuple[str, str] | None:
+        """SKILL.md frontmatter의 (name, description 첫 줄). 없으면 None."""
+        with self._lock:
+            if self._summary is _UNSET:
+                skill_md = self.source / "SKILL.md"
+                try:
+                    # frontmatter만 읽음 (큰 본문은 읽지 않음)
+                    content = read_frontmatter_text(skill_md)
+                except FileNotFoundError:
+                    self._summary = None
+                else:
+                    self._summary = parse_skill_summary(content, self.name)
+            return self._summary  # type: ignore[return-value]
+
+    @property
+    def files(self) -> list[SourceFile]:
+        """스킬 트리의 파일 목록 (stat 포함)."""
+        with self._lock:
+            if self._files is None:
+                self._files = list_source_files(self.source)
+            return self._files
+
+    @property
+    def fingerprint(self) -> str:
+        """파일 경로/크기/mtime 기반 지문. 내용이 바뀌면 (mtime 변경으로) 값이 달라진다."""
+        digest = hashlib.sha256()
+        for rel_path, _path, st in self.files:
+            digest.update(f"{rel_path}\0{st.st_size}\0{st.st_mtime_ns}\n".encode())
+        return digest.hexdigest()
+
+
+def find_team_skill_links(
+    project_root: Path,
+    skills_include: list[str] | None = None,
+    skills_exclude: list[str] | None = None,
+) -> list[Path]:
+    """include/exclude 필터를 적용한 팀 스킬 심링크(cde-*skills) 목록 (broken symlink 제외)."""
+    links: list[Path] = []
+    for item in sorted(project_root.iterdir()):
+        if not item.name.startswith("cde-") or not item.name.endswith("skills"):
+            continue
+        if not item.exists():  # broken symlink
+            continue
+        if skills_include is not None and item.name not in skills_include:
+            continue
+        if skills_exclude is not None and item.name in skills_exclude:
+            continue
+        links.append(item)
+    return links
+
+
+def _team_scan_dir(team_dir: Path) -> tuple[Path, SkillLayout]:
+    """팀 스킬 레포에서 스킬 디렉토리를 찾을 위치와 구조."""
+    nested_skills = team_dir / ".claude" / "skills"
+    if nested_skills.is_dir():
+        return nested_skills, "nested"
+    skills_subdir = team_dir / "skills"
+    if skills_subdir.is_dir():
+        return skills_subdir, "skills-subdir"
+    return team_dir, "flat"
+
+
+@dataclass
+class SkillCatalog:
+    """한 번의 sync 실행에서 공유하는 스킬 소스 목록.
+
+    Claude/Codex 스킬 복사, AGENTS.md/GEMINI.md 스킬 인덱스가 모두 같은 카탈로그를 사용하므로
+    디렉토리 탐색과 SKILL.md 읽기는 스킬 수에 비례한다 (소비자 수와 무관).
+    """
+
+    project_root: Path
+    skills_include: list[str] | None = None
+    skills_exclude: list[str] | None = None
+    entries: list[SkillEntry] = field(default_factory=list)
+    # 팀 레포 이름 → 스킬을 스캔한 디렉토리 (git tree 비교용)
+    team_dirs: dict[str, Path] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+    _tree_states: dict[str, GitTreeState | None] = field(
+        default_factory=dict, init=False, repr=False
+    )
+
+    @classmethod
+    def scan(
+        cls,
+        project_root: Path,
+        skills_include: list[str] | None = None,
+        skills_exclude: list[str] | None = None,
+    ) -> SkillCatalog:
+        """스킬 소스 디렉토리 수집 (personal + team)
+
+        personal 소스는 ai-env/.claude/skills/ 이다.
+        team 스킬(cde-*skills)은 명시적으로 include/exclude 옵션을 준 경우에만 수집한다.
+
+        Args:
+            project_root: ai-env 프로젝트 루트
+            skills_include: 포함할 팀 스킬 디렉토리 이름 (예: ["cde-skills"])
+                지정 시 이 목록에 있는 디렉토리만 포함.
+            skills_exclude: 제외할 팀 스킬 디렉토리 이름 (예: ["cde-ranking-skills"])
+                skills_include 없이 지정하면 team 전체에서 제외 필터로 동작.
+        """
+        catalog = cls(project_root, skills_include, skills_exclude)
+
+        # 1. personal skills (항상 포함)
+        personal_dir = project_root / ".claude" / "skills"
+        if personal_dir.is_dir():
+            for d in sorted(personal_dir.iterdir()):
+                if d.is_dir() and not d.name.startswith("."):
+                    catalog.entries.append(SkillEntry(d, "personal"))
+
+        # 옵션이 없으면 기본은 personal만 동기화
+        if skills_include is None and skills_exclude is None:
+            return catalog
+
+        # 2. team skills: cde-*skills 심링크들 (cde-skills, cde-ranking-skills 등)
+        for item in find_team_skill_links(project_root, skills_include, skills_exclude):
+            # 심링크 resolve해서 실제 경로 사용
+            scan_dir, layout = _team_scan_dir(item.resolve())
+            catalog.team_dirs[item.name] = scan_dir
+            for d in sorted(scan_dir.iterdir()):
+                if d.is_dir() and not d.name.startswith(".") and not d.name.startswith("_"):
+                    if (d / "SKILL.md").exists():
+                        catalog.entries.append(SkillEntry(d, layout, origin=item.name))
+
+        return catalog
+
+    @property
+    def sources(self) -> list[Path]:
+        """스킬 소스 디렉토리 경로 목록 (수집 순서 유지)."""
+        return [entry.source for entry in self.entries]
+
+    def tree_state(self, origin: str) -> GitTreeState | None:
+        """팀 레포 스킬 디렉토리의 git tree 상태 (레포당 한 번만 조회, personal은 None)."""
+        scan_dir = self.team_dirs.get(origin)
+        if scan_dir is None:
+            return None
+        with self._lock:
+            if origin not in self._tree_states:
+                self._tree_states[origin] = git_tree_state(scan_dir)
+            return self._tree_states[origin]
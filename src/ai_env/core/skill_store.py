@@ -0,0 +1,316 @@
+"""Content-addressed skill tree store shared by every agent target."""
+
+from __future__ import annotations
+
+import contextlib
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import stat
+import threading
+import time
+import uuid
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from .config import get_state_dir
+from .staged_swap import STAGING_PREFIX, discard_async, exchange_paths, sweep_stale_staging
+from .sync_manifest import writer_id
+
+REFS_FILENAME = "refs.json"
+_LOCK_FILENAME = "refs.lock"
+# 방금 만든 객체를 링크하기 전에 gc가 지우지 않도록 두는 유예 시간
+GC_GRACE_SECONDS = 3600
+
+_WRITE_BITS = stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH
+
+
+def output_version(copy_file_fn: Callable[[Path, Path], object]) -> str:
+    """복사 함수가 만드는 결과 형식의 식별자 (객체 digest에 포함).
+
+    Codex 정규화처럼 내용을 바꾸는 함수는 정규화기 버전까지 포함한다.
+    """
+    from .codex_skills import NORMALIZER_VERSION, copy_skill_file_for_codex
+
+    writer = writer_id(copy_file_fn)
+    if writer == writer_id(copy_skill_file_for_codex):
+        writer += f":v{NORMALIZER_VERSION}"
+    return writer
+
+
+def tree_digest(writer: str, name: str, files: list[tuple[str, str, bool]]) -> str:
+    """스킬 트리 객체 digest.
+
+    Args:
+        writer: output_version() 결과
+        name: 스킬 디렉토리 이름 (정규화 결과에 들어가므로 포함)
+        files: (상대경로, 소스 SHA-256, 실행 권한 여부) 목록
+    """
+    digest = hashlib.sha256(f"{writer}\0{name}\n".encode())
+    for rel_path, sha, executable in sorted(files):
+        digest.update(f"{rel_path}\0{sha}\0{int(executable)}\n".encode())
+    return digest.hexdigest()
+
+
+@dataclass
+class StoreGcResult:
+    """store gc 결과."""
+
+    removed: list[str] = field(default_factory=list)
+    kept: int = 0
+    freed_bytes: int = 0
+    pruned_refs: int = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "removed": self.removed,
+            "kept": self.kept,
+            "freed_bytes": self.freed_bytes,
+            "pruned_refs": self.pruned_refs,
+        }
+
+
+@dataclass
+class StoreStats:
+    """store 상태 요약."""
+
+    objects: int = 0
+    bytes: int = 0
+    refs: int = 0
+
+
+def _tree_size(path: Path) -> int:
+    total = 0
+    for dirpath, _dirnames, filenames in os.walk(path):
+        for filename in filenames:
+            with contextlib.suppress(OSError):
+                total += os.lstat(os.path.join(dirpath, filename)).st_size
+    return total
+
+
+def _is_object_name(name: str) -> bool:
+    return len(name) == 64 and all(c in "0123456789abcdef" for c in name)
+
+
+class SkillStore:
+    """``~/.ai-env/store/<sha256>`` 객체 저장소.
+
+    같은 내용의 스킬 트리(대상별 변환 결과 기준)는 한 번만 저장하고,
+    각 대상의 스킬 디렉토리는 객체를 가리키는 심볼릭 링크가 된다.
+    객체 파일은 읽기 전용이므로 링크를 통해 실수로 수정해도 다른 대상에 번지지 않는다.
+    ``refs.json``은 객체별로 링크 경로를 기록하며 gc가 실제 링크와 대조해 참조 수를 계산한다.
+    """
+
+    def __init__(self, root: Path | None = None) -> None:
+        self.root = root if root is not None else get_state_dir() / "store"
+        self._lock = threading.Lock()
+
+    def object_path(self, digest: str) -> Path:
+        return self.root / digest
+
+    def points_to(self, link: Path, digest: str) -> bool:
+        """link가 이미 digest 객체를 가리키는 심볼릭 링크인지 여부."""
+        try:
+            return os.readlink(link) == str(self.object_path(digest))
+        except OSError:
+            return False
+
+    @contextlib.contextmanager
+    def _locked(self) -> Iterator[None]:
+        """refs.json 갱신 잠금 (스레드 + 프로세스)."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        with self._lock, open(self.root / _LOCK_FILENAME, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _load_refs(self) -> dict[str, list[str]]:
+        try:
+            data = json.loads((self.root / REFS_FILENAME).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict):
+            return {}
+        return {str(k): [str(p) for p in v] for k, v in data.items() if isinstance(v, list)}
+
+    def _save_refs(self, refs: dict[str, list[str]]) -> None:
+        path = self.root / REFS_FILENAME
+        tmp = path.with_name(f"{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+        payload = {k: sorted(set(v)) for k, v in sorted(refs.items()) if v}
+        tmp.write_text(json.dumps(payload, indent=1) + "\n", encoding="utf-8")
+        os.replace(tmp, path)
+
+    def ensure(
+        self,
+        digest: str,
+        name: str,
+        files: list[tuple[str, Path]],
+        copy_file_fn: Callable[[Path, Path], object],
+    ) -> Path:
+        """객체가 없으면 만든다 (있으면 유예 시간 갱신만).
+
+        staging(``<root>/.ai-env-staging-*/<name>``)에 복사한 뒤 rename으로 공개하므로
+        일부만 만들어진 객체는 보이지 않는다. 동시에 같은 객체를 만들면 먼저 끝난 쪽을 사용한다.
+
+        Args:
+            digest: tree_digest() 결과
+            name: 스킬 이름 (Codex 정규화가 상위 디렉토리 이름을 사용)
+            files: (상대경로, 소스 파일) 목록
+            copy_file_fn: 파일 복사 함수
+        """
+        obj = self.object_path(digest)
+        if obj.is_dir():
+            with contextlib.suppress(OSError):
+                os.utime(obj)
+            return obj
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        staging_root = self.root / f"{STAGING_PREFIX}{uuid.uuid4().hex[:12]}"
+        staging = staging_root / name
+        try:
+            staging.mkdir(parents=True)
+            for rel_path, src_file in files:
+                target = staging / rel_path
+                target.parent.mkdir(parents=True, exist_ok=True)
+                copy_file_fn(src_file, target)
+                if os.path.samefile(src_file, target):
+                    # 하드링크 복사면 소스까지 읽기 전용이 되므로 독립된 복사본으로 교체
+                    target.unlink()
+                    shutil.copy2(src_file, target)
+                mode = target.stat().st_mode
+                target.chmod(stat.S_IMODE(mode) & ~_WRITE_BITS)
+            try:
+                os.rename(staging, obj)
+            except OSError:
+                if not obj.is_dir():
+                    raise
+        finally:
+            discard_async(staging_root)
+        return obj
+
+    def link(self, link: Path, digest: str) -> None:
+        """link 위치를 digest 객체를 가리키는 심볼릭 링크로 교체하고 참조를 기록.
+
+        기존 디렉토리나 링크는 원자적으로 교체되고 이전 내용은 비동기로 삭제된다.
+        """
+        obj = self.object_path(digest)
+        link.parent.mkdir(parents=True, exist_ok=True)
+        with self._locked():
+            refs = self._load_refs()
+            old_target: str | None = None
+            with contextlib.suppress(OSError):
+                old_target = os.readlink(link)
+
+            tmp_link = link.with_name(f"{STAGING_PREFIX}{uuid.uuid4().hex[:12]}")
+            os.symlink(obj, tmp_link)
+            if link.is_symlink() or not link.exists():
+                os.replace(tmp_link, link)
+            elif exchange_paths(tmp_link, link):
+                discard_async(tmp_link)
+            else:
+                old = link.with_name(f"{tmp_link.name}.old")
+                os.rename(link, old)
+                os.rename(tmp_link, link)
+                discard_async(old)
+
+            link_str = str(link)
+            if old_target is not None:
+                old_digest = Path(old_target).name
+                if old_digest in refs:
+                    refs[old_digest] = [p for p in refs[old_digest] if p != link_str]
+            refs.setdefault(digest, []).append(link_str)
+            self._save_refs(refs)
+
+    def unlink(self, link: Path) -> None:
+        """store를 가리키는 링크를 제거하고 참조 기록에서 뺀다."""
+        with self._locked():
+            refs = self._load_refs()
+            try:
+                target = os.readlink(link)
+            except OSError:
+                return
+            link.unlink()
+            digest = Path(target).name
+            if digest in refs:
+                refs[digest] = [p for p in refs[digest] if p != str(link)]
+                self._save_refs(refs)
+
+    def _live_refs(self, refs: dict[str, list[str]]) -> dict[str, list[str]]:
+        """실제로 객체를 가리키는 링크만 남긴 참조 목록."""
+        return {
+            digest: [p for p in links if self.points_to(Path(p), digest)]
+            for digest, links in refs.items()
+        }
+
+    def stats(self) -> StoreStats:
+        result = StoreStats()
+        if not self.root.is_dir():
+            return result
+        refs = self._live_refs(self._load_refs())
+        for entry in self.root.iterdir():
+            if _is_object_name(entry.name):
+                result.objects += 1
+                result.bytes += _tree_size(entry)
+        result.refs = sum(len(links) for links in refs.values())
+        return result
+
+    def gc(self, dry_run: bool = False, grace: float = GC_GRACE_SECONDS) -> StoreGcResult:
+        """참조가 없는 객체 삭제.
+
+        refs.json의 링크가 더 이상 객체를 가리키지 않으면 참조에서 제외한다.
+        유예 시간 안에 만들어지거나 사용된 객체는 남긴다 (진행 중인 sync 보호).
+        """
+        result = StoreGcResult()
+        if not self.root.is_dir():
+            return result
+        with self._locked():
+            refs = self._load_refs()
+            live = self._live_refs(refs)
+            result.pruned_refs = sum(len(v) for v in refs.values()) - sum(
+                len(v) for v in live.values()
+            )
+            cutoff = time.time() - grace
+            for entry in sorted(self.root.iterdir()):
+                if not _is_object_name(entry.name):
+                    continue
+                if live.get(entry.name):
+                    result.kept += 1
+                    continue
+                try:
+                    recent = entry.stat().st_mtime > cutoff
+                except OSError:
+                    continue
+                if recent:
+                    result.kept += 1
+                    continue
+                result.removed.append(entry.name)
+                result.freed_bytes += _tree_size(entry)
+                if not dry_run:
+                    _remove_object(entry)
+            if not dry_run:
+                self._save_refs(live)
+                sweep_stale_staging(self.root)
+        return result
+
+    def to_dict(self) -> dict[str, Any]:
+        stats = self.stats()
+        return {
+            "root": str(self.root),
+            "objects": stats.objects,
+            "bytes": stats.bytes,
+            "refs": stats.refs,
+        }
+
+
+def _remove_object(path: Path) -> None:
+    """읽기 전용 파일이 있어도 지울 수 있도록 디렉토리 권한을 복구한 뒤 삭제."""
+    for dirpath, _dirnames, _filenames in os.walk(path):
+        with contextlib.suppress(OSError):
+            os.chmod(dirpath, 0o755)
+    shutil.rmtree(path, ignore_errors=True)
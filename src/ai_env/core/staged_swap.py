@@ -0,0 +1,167 @@
+"""Staged directory materialization with an atomic swap into place."""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import os
+import shutil
+import sys
+import threading
+import time
+import uuid
+from collections.abc import Callable
+from pathlib import Path
+
+# 대상 디렉토리 옆에 만드는 staging 루트 접두사 (점으로 시작하므로 스킬 스캔에서 제외됨)
+STAGING_PREFIX = ".ai-env-staging-"
+# 비정상 종료로 남은 staging 루트를 정리하는 기준 (다른 sync가 사용 중일 수 있으므로 여유를 둠)
+STALE_STAGING_SECONDS = 3600
+
+# linux/fs.h
+_AT_FDCWD = -100
+_RENAME_EXCHANGE = 1 << 1
+
+_renameat2: Callable[..., int] | None = None
+_renameat2_loaded = False
+_cleanup_threads: list[threading.Thread] = []
+_cleanup_lock = threading.Lock()
+
+
+def _load_renameat2() -> Callable[..., int] | None:
+    """glibc의 renameat2 (2.28+). 없으면 None."""
+    global _renameat2, _renameat2_loaded
+    if _renameat2_loaded:
+        return _renameat2
+    _renameat2_loaded = True
+    if not sys.platform.startswith("linux"):
+        return None
+    libc_name = ctypes.util.find_library("c")
+    if not libc_name:
+        return None
+    try:
+        libc = ctypes.CDLL(libc_name, use_errno=True)
+        fn = libc.renameat2
+    except (AttributeError, OSError):
+        return None
+    fn.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_int, ctypes.c_char_p, ctypes.c_uint]
+    fn.restype = ctypes.c_int
+    _renameat2 = fn
+    return fn
+
+
+def exchange_paths(a: Path, b: Path) -> bool:
+    """두 경로를 원자적으로 맞바꿈 (renameat2 RENAME_EXCHANGE).
+
+    Returns:
+        성공 여부 (커널/파일시스템이 지원하지 않으면 False)
+    """
+    fn = _load_renameat2()
+    if fn is None:
+        return False
+    result = fn(_AT_FDCWD, os.fsencode(a), _AT_FDCWD, os.fsencode(b), _RENAME_EXCHANGE)
+    return bool(result == 0)
+
+
+def swap_into_place(staging: Path, dst: Path) -> None:
+    """staging을 dst 위치로 교체. 이전 dst 내용은 staging 루트 아래에 남는다.
+
+    - dst가 없으면 rename 한 번
+    - RENAME_EXCHANGE를 지원하면 syscall 한 번으로 교체 (dst가 사라지는 순간 없음)
+    - 아니면 dst를 옆으로 옮긴 뒤 rename (두 syscall 사이만 비어 있음).
+      두 번째 rename이 실패하면 이전 dst를 되돌린 뒤 예외를 다시 발생시킨다
+    """
+    if not dst.exists() and not dst.is_symlink():
+        os.rename(staging, dst)
+        return
+
+    if dst.is_dir() and not dst.is_symlink() and exchange_paths(staging, dst):
+        return
+
+    old = staging.with_name(f"{staging.name}.old")
+    os.rename(dst, old)
+    try:
+        os.rename(staging, dst)
+    except BaseException:
+        os.rename(old, dst)
+        raise
+
+
+def _remove(path: Path) -> None:
+    if path.is_dir() and not path.is_symlink():
+        shutil.rmtree(path, ignore_errors=True)
+    else:
+        path.unlink(missing_ok=True)
+
+
+def discard_async(path: Path) -> None:
+    """이전 세대를 백그라운드 스레드에서 삭제.
+
+    non-daemon 스레드이므로 프로세스 종료 전에 삭제가 끝난다.
+    """
+    thread = threading.Thread(target=_remove, args=(path,), name=f"ai-env-cleanup-{path.name}")
+    with _cleanup_lock:
+        _cleanup_threads[:] = [t for t in _cleanup_threads if t.is_alive()]
+        _cleanup_threads.append(thread)
+    thread.start()
+
+
+def wait_for_cleanup(timeout: float | None = None) -> None:
+    """진행 중인 비동기 삭제가 끝날 때까지 대기."""
+    with _cleanup_lock:
+        threads = list(_cleanup_threads)
+    for thread in threads:
+        thread.join(timeout)
+
+
+def sweep_stale_staging(parent: Path, max_age: float = STALE_STAGING_SECONDS) -> int:
+    """비정상 종료로 남은 오래된 staging 루트를 비동기 삭제.
+
+    Returns:
+        삭제 예약한 디렉토리 수
+    """
+    try:
+        entries = list(os.scandir(parent))
+    except OSError:
+        return 0
+    cutoff = time.time() - max_age
+    swept = 0
+    for entry in entries:
+        if not entry.name.startswith(STAGING_PREFIX):
+            continue
+        try:
+            if entry.stat(follow_symlinks=False).st_mtime > cutoff:
+                continue
+        except OSError:
+            continue
+        discard_async(Path(entry.path))
+        swept += 1
+    return swept
+
+
+def new_staging_dir(dst: Path) -> Path:
+    """dst 옆에 staging 디렉토리 경로를 만든다.
+
+    반환 경로의 이름은 dst와 같다 (``<parent>/.ai-env-staging-xxxx/<dst.name>``).
+    SKILL.md 정규화처럼 디렉토리 이름에 의존하는 처리가 staging에서도 그대로 동작한다.
+    """
+    root = dst.parent / f"{STAGING_PREFIX}{uuid.uuid4().hex[:12]}"
+    root.mkdir(parents=True)
+    return root / dst.name
+
+
+def materialize(dst: Path, build: Callable[[Path], object]) -> None:
+    """staging에 새 트리를 만든 뒤 dst와 교체하고, 이전 세대는 비동기로 삭제.
+
+    build는 staging 경로를 받아 트리를 완성해야 한다. 실패하면 dst는 그대로 남는다.
+
+    Args:
+        dst: 최종 대상 디렉토리
+        build: staging 경로에 내용을 채우는 함수
+    """
+    staging = new_staging_dir(dst)
+    try:
+        build(staging)
+        swap_into_place(staging, dst)
+    finally:
+        discard_async(staging.parent)
@@ -2,38 +2,87 @@
 
 from __future__ import annotations
 
+import functools
 import json
-import re
 import shutil
-import subprocess
 from collections.abc import Callable
 from pathlib import Path
 
-from .codex_skills import copy_skill_tree_for_codex
-from .config import get_project_root, load_settings
-from .secrets import get_secrets_manager
+from .codex_skills import copy_skill_file_for_codex
+from .config import Settings, get_project_root, load_settings
+from .file_copy import FileCopier
+from .frontmatter import read_frontmatter_text
+from .output_writer import OutputWriter, WriteResult, annotate
+from .secrets import SecretsManager, get_secrets_manager
+from .skill_catalog import SkillCatalog, parse_skill_summary
+from .skill_store import SkillStore
+from .staged_swap import materialize, sweep_stale_staging
+from .sync_manifest import (
+    SyncManifest,
+    apply_tree_plan,
+    list_source_files,
+    plan_tree_incremental,
+    writer_id,
+)
+from .sync_plan import (
+    EXEC_BITS,
+    PlanOp,
+    SkillsPlan,
+    SyncPlan,
+    _apply_tree_to_store,
+    _remove_skill_tree,
+    apply_skills_plan,
+    content_op,
+    delete_op,
+    file_op,
+    plan_skills,
+)
 
 # cmux 훅 스크립트 파일명
 _CMUX_HOOK_SCRIPT = "cmux_notify.sh"
 
 
-def safe_copytree(src: Path, dst: Path) -> None:
-    """기존 대상을 제거 후 디렉토리 트리 복사.
+def safe_copytree(
+    src: Path,
+    dst: Path,
+    copier: FileCopier | None = None,
+    prepare: Callable[[Path], object] | None = None,
+) -> None:
+    """디렉토리 트리를 staging에 복사한 뒤 기존 대상과 교체.
+
+    rmtree + copytree와 달리 대상이 비어 있거나 일부만 복사된 순간이 없다.
+    (에이전트가 sync 도중 시작해도 이전 또는 새 트리 중 하나를 온전히 본다)
+    copier를 지정하면 파일 단위 복사에 해당 전략(reflink/hardlink 등)을 사용한다.
 
-    rmtree + copytree 패턴을 통합한 유틸리티.
+    Args:
+        src: 소스 디렉토리
+        dst: 목적지 디렉토리
+        copier: 파일 복사 전략 (None이면 일반 복사)
+        prepare: 교체 전에 staging 트리를 후처리하는 함수 (예: 권한 설정, 정규화)
     """
-    if dst.exists():
-        shutil.rmtree(dst)
-    shutil.copytree(src, dst)
 
+    def _build(staging: Path) -> None:
+        shutil.copytree(src, staging, copy_function=copier or shutil.copy2)
+        if prepare is not None:
+            prepare(staging)
 
-def _sync_file(src: Path, dst: Path, dry_run: bool) -> tuple[str, int]:
+    sweep_stale_staging(dst.parent)
+    materialize(dst, _build)
+
+
+def _sync_file(
+    src: Path, dst: Path, dry_run: bool, copier: FileCopier | None = None
+) -> tuple[str, int]:
     """단일 파일 동기화
 
+    대상(CLAUDE.md 등)은 사용자가 직접 고치는 파일이므로 하드링크는 사용하지 않는다
+    (제자리 수정이 저장소 원본까지 바꾸는 것 방지).
+
     Args:
         src: 소스 파일 경로
         dst: 목적지 파일 경로
         dry_run: True면 실제 복사하지 않음
+        copier: 파일 복사 전략 (None이면 일반 복사)
 
     Returns:
         (파일 이름, 복사된 파일 수)
@@ -42,110 +91,143 @@ def _sync_file(src: Path, dst: Path, dry_run: bool) -> tuple[str, int]:
         OSError: 파일 복사 실패 시
         PermissionError: 권한 오류 시
     """
+    copier = (copier or FileCopier()).without_hardlink()
     if not dry_run:
         try:
             dst.parent.mkdir(parents=True, exist_ok=True)
-            shutil.copy2(src, dst)
+            copier(src, dst)
         except PermissionError as e:
             raise PermissionError(f"Permission denied copying {src} to {dst}") from e
         except OSError as e:
             raise OSError(f"Failed to copy {src} to {dst}: {e}") from e
-    return src.name, 1
+    return copier.annotate(src.name), 1
 
 
-def _sync_md_files(src: Path, dst: Path, dry_run: bool) -> tuple[str, int]:
+def _sync_md_files(
+    src: Path, dst: Path, dry_run: bool, copier: FileCopier | None = None
+) -> tuple[str, int]:
     """디렉토리 내 .md 파일만 동기화 (commands/ 디렉토리용)
 
+    사용자가 고치는 명령 파일이므로 _sync_file처럼 하드링크는 사용하지 않는다.
+
     Args:
         src: 소스 디렉토리
         dst: 목적지 디렉토리
         dry_run: True면 실제 복사하지 않음
+        copier: 파일 복사 전략 (None이면 일반 복사)
 
     Returns:
         (설명, 복사된 파일 수)
     """
+    copier = (copier or FileCopier()).without_hardlink()
     md_files = list(src.glob("*.md"))
 
     if not dry_run:
         dst.mkdir(parents=True, exist_ok=True)
         for md_file in md_files:
-            shutil.copy2(md_file, dst / md_file.name)
+            copier(md_file, dst / md_file.name)
 
-    return f"{src.name}/ ({len(md_files)} files)", len(md_files)
+    return copier.annotate(f"{src.name}/ ({len(md_files)} files)"), len(md_files)
 
 
-def _sync_subdirectories(src: Path, dst: Path, dry_run: bool) -> tuple[str, int]:
+def _sync_subdirectories(
+    src: Path, dst: Path, dry_run: bool, copier: FileCopier | None = None
+) -> tuple[str, int]:
     """서브디렉토리들 동기화 (skills/ 디렉토리용)
 
     Args:
         src: 소스 디렉토리
         dst: 목적지 디렉토리
         dry_run: True면 실제 복사하지 않음
+        copier: 파일 복사 전략 (None이면 일반 복사)
 
     Returns:
         (설명, 복사된 디렉토리 수)
     """
+    if copier is None:
+        copier = FileCopier()
     subdirs = [d for d in src.iterdir() if d.is_dir() and not d.name.startswith(".")]
 
     if not dry_run:
         dst.mkdir(parents=True, exist_ok=True)
         for subdir in subdirs:
-            safe_copytree(subdir, dst / subdir.name)
+            safe_copytree(subdir, dst / subdir.name, copier)
 
-    return f"{src.name}/ ({len(subdirs)} items)", len(subdirs)
+    return copier.annotate(f"{src.name}/ ({len(subdirs)} items)"), len(subdirs)
 
 
-def _sync_directory(src: Path, dst: Path, dry_run: bool) -> tuple[str, int]:
+def _sync_directory(
+    src: Path, dst: Path, dry_run: bool, copier: FileCopier | None = None
+) -> tuple[str, int]:
     """일반 디렉토리 동기화 (전체 복사)
 
     Args:
         src: 소스 디렉토리
         dst: 목적지 디렉토리
         dry_run: True면 실제 복사하지 않음
+        copier: 파일 복사 전략 (None이면 일반 복사)
 
     Returns:
         (설명, 복사된 항목 수)
     """
+    if copier is None:
+        copier = FileCopier()
     if not dry_run:
-        safe_copytree(src, dst)
+        safe_copytree(src, dst, copier)
 
-    return f"{src.name}/", 1
+    return copier.annotate(f"{src.name}/"), 1
 
 
 def _sync_hooks(
-    src: Path, dst: Path, dry_run: bool, *, cmux_enabled: bool = True
+    src: Path,
+    dst: Path,
+    dry_run: bool,
+    *,
+    cmux_enabled: bool = True,
+    copier: FileCopier | None = None,
 ) -> tuple[str, int]:
     """hooks 디렉토리 동기화 (전체 복사 + .sh 실행 권한 설정)
 
+    sync가 복사본에 chmod를 하므로 하드링크는 사용하지 않는다 (소스 권한 변경 방지).
+
     Args:
         src: 소스 디렉토리
         dst: 목적지 디렉토리
         dry_run: True면 실제 복사하지 않음
         cmux_enabled: False면 cmux_notify.sh를 제외
+        copier: 파일 복사 전략 (None이면 일반 복사)
 
     Returns:
         (설명, 복사된 항목 수)
     """
+    copier = (copier or FileCopier()).without_hardlink()
     sh_files = list(src.glob("*.sh"))
     if not cmux_enabled:
         sh_files = [f for f in sh_files if f.name != _CMUX_HOOK_SCRIPT]
 
-    if not dry_run:
-        safe_copytree(src, dst)
+    def _prepare(staged: Path) -> None:
         # cmux 비활성화 시 복사된 cmux 스크립트 제거
         if not cmux_enabled:
-            cmux_script = dst / _CMUX_HOOK_SCRIPT
+            cmux_script = staged / _CMUX_HOOK_SCRIPT
             if cmux_script.exists():
                 cmux_script.unlink()
         # .sh 파일에 실행 권한 부여
-        for sh_file in dst.glob("*.sh"):
+        for sh_file in staged.glob("*.sh"):
             sh_file.chmod(sh_file.stat().st_mode | 0o755)
 
-    return f"hooks/ ({len(sh_files)} scripts)", len(sh_files)
+    if not dry_run:
+        safe_copytree(src, dst, copier, prepare=_prepare)
+
+    return copier.annotate(f"hooks/ ({len(sh_files)} scripts)"), len(sh_files)
 
 
 def _sync_file_or_dir(
-    src: Path, dst: Path, dry_run: bool = False, *, cmux_enabled: bool = True
+    src: Path,
+    dst: Path,
+    dry_run: bool = False,
+    *,
+    cmux_enabled: bool = True,
+    copier: FileCopier | None = None,
 ) -> tuple[str, int]:
     """파일이나 디렉토리 동기화 (공통 로직)
 
@@ -161,6 +243,7 @@ def _sync_file_or_dir(
         dst: 목적지 경로
         dry_run: True면 실제 복사하지 않음
         cmux_enabled: hooks/ 동기화 시 cmux 스크립트 포함 여부
+        copier: 파일 복사 전략 (None이면 일반 복사)
 
     Returns:
         (설명, 복사된 항목 수)
@@ -169,80 +252,17 @@ def _sync_file_or_dir(
         return "", 0
 
     if src.is_file():
-        return _sync_file(src, dst, dry_run)
+        return _sync_file(src, dst, dry_run, copier)
 
     # 디렉토리 처리
     if src.name == "commands":
-        return _sync_md_files(src, dst, dry_run)
+        return _sync_md_files(src, dst, dry_run, copier)
     elif src.name == "skills":
-        return _sync_subdirectories(src, dst, dry_run)
+        return _sync_subdirectories(src, dst, dry_run, copier)
     elif src.name == "hooks":
-        return _sync_hooks(src, dst, dry_run, cmux_enabled=cmux_enabled)
+        return _sync_hooks(src, dst, dry_run, cmux_enabled=cmux_enabled, copier=copier)
     else:
-        return _sync_directory(src, dst, dry_run)
-
-
-def _update_team_skill_repos(
-    project_root: Path,
-    skills_include: list[str] | None = None,
-    skills_exclude: list[str] | None = None,
-) -> dict[str, str]:
-    """팀 스킬 심링크의 실제 레포에서 git pull (develop 브랜치일 때만)
-
-    Args:
-        project_root: ai-env 프로젝트 루트
-        skills_include: 포함할 팀 스킬 디렉토리 이름
-        skills_exclude: 제외할 팀 스킬 디렉토리 이름
-
-    Returns:
-        {디렉토리명: 결과 메시지} 딕셔너리
-    """
-    results: dict[str, str] = {}
-
-    for item in sorted(project_root.iterdir()):
-        if not item.name.startswith("cde-") or not item.name.endswith("skills"):
-            continue
-        if not item.exists():  # broken symlink
-            continue
-        if skills_include is not None and item.name not in skills_include:
-            continue
-        if skills_exclude is not None and item.name in skills_exclude:
-            continue
-
-        repo_dir = item.resolve()
-        if not (repo_dir / ".git").exists():
-            results[item.name] = "not a git repo, skipped"
-            continue
-
-        try:
-            # 현재 브랜치 확인 — develop일 때만 pull, 작업 브랜치는 그대로 sync
-            branch_result = subprocess.run(
-                ["git", "rev-parse", "--abbrev-ref", "HEAD"],
-                cwd=repo_dir,
-                capture_output=True,
-                text=True,
-                check=True,
-            )
-            current_branch = branch_result.stdout.strip()
-            if current_branch == "develop":
-                pull_result = subprocess.run(
-                    ["git", "pull", "--ff-only"],
-                    cwd=repo_dir,
-                    capture_output=True,
-                    text=True,
-                    check=True,
-                )
-                output = pull_result.stdout.strip()
-                if "Already up to date" in output:
-                    results[item.name] = "already up to date"
-                else:
-                    results[item.name] = "updated"
-            else:
-                results[item.name] = f"on branch '{current_branch}', skipped pull"
-        except subprocess.CalledProcessError as e:
-            results[item.name] = f"failed: {e.stderr.strip()}"
-
-    return results
+        return _sync_directory(src, dst, dry_run, copier)
 
 
 def _collect_skill_sources(
@@ -263,62 +283,9 @@ def _collect_skill_sources(
             skills_include 없이 지정하면 team 전체에서 제외 필터로 동작.
 
     Returns:
-        스킬 서브디렉토리 경로 리스트
+        스킬 서브디렉토리 경로 리스트 (스캔 결과를 재사용하려면 SkillCatalog.scan 사용)
     """
-    sources: list[Path] = []
-
-    # 1. personal skills (항상 포함)
-    personal_dir = project_root / ".claude" / "skills"
-
-    if personal_dir.is_dir():
-        for d in sorted(personal_dir.iterdir()):
-            if d.is_dir() and not d.name.startswith("."):
-                sources.append(d)
-
-    # 옵션이 없으면 기본은 personal만 동기화
-    if skills_include is None and skills_exclude is None:
-        return sources
-
-    # 2. team skills: cde-*skills 심링크들 (cde-skills, cde-ranking-skills 등)
-    #    각 심링크는 다음 구조 중 하나:
-    #    - nested 구조: .claude/skills/skill-name/SKILL.md
-    #    - skills subdir 구조: skills/skill-name/SKILL.md
-    #    - flat 구조: skill-name/SKILL.md (루트에 스킬 디렉토리)
-    for item in sorted(project_root.iterdir()):
-        if not item.name.startswith("cde-") or not item.name.endswith("skills"):
-            continue
-        if not item.exists():  # broken symlink
-            continue
-
-        # include/exclude 필터 적용
-        if skills_include is not None and item.name not in skills_include:
-            continue
-        if skills_exclude is not None and item.name in skills_exclude:
-            continue
-
-        # 심링크 resolve해서 실제 경로 사용
-        cde_skills_dir = item.resolve()
-
-        # 스킬 디렉토리 탐색 (3가지 구조 지원)
-        #   1) nested: .claude/skills/skill-name/SKILL.md
-        #   2) skills subdir: skills/skill-name/SKILL.md
-        #   3) flat: skill-name/SKILL.md (루트에 직접)
-        nested_skills = cde_skills_dir / ".claude" / "skills"
-        skills_subdir = cde_skills_dir / "skills"
-
-        if nested_skills.is_dir():
-            scan_dir = nested_skills
-        elif skills_subdir.is_dir():
-            scan_dir = skills_subdir
-        else:
-            scan_dir = cde_skills_dir
-
-        for d in sorted(scan_dir.iterdir()):
-            if d.is_dir() and not d.name.startswith(".") and not d.name.startswith("_"):
-                if (d / "SKILL.md").exists():
-                    sources.append(d)
-
-    return sources
+    return SkillCatalog.scan(project_root, skills_include, skills_exclude).sources
 
 
 def _sync_skills_merged(
@@ -327,9 +294,18 @@ def _sync_skills_merged(
     dry_run: bool,
     skills_include: list[str] | None = None,
     skills_exclude: list[str] | None = None,
-    copy_fn: Callable[[Path, Path], None] | None = None,
+    copy_file_fn: Callable[[Path, Path], object] | None = None,
+    copier: FileCopier | None = None,
+    catalog: SkillCatalog | None = None,
+    store: SkillStore | None = None,
+    plan: SkillsPlan | None = None,
 ) -> tuple[str, int]:
-    """personal + team 스킬을 합쳐서 동기화
+    """personal + team 스킬을 합쳐서 증분 동기화
+
+    대상 디렉토리의 매니페스트(.ai-env-manifest.json)를 기준으로 계획(plan_skills)을 세운 뒤
+    추가/변경된 파일만 복사하고, 소스에서 삭제된 파일만 제거한다.
+    팀 레포는 스킬 디렉토리의 git tree oid가 마지막 동기화와 같으면 레포 전체를 건너뛴다.
+    이번 실행에 포함되지 않은 스킬(외부/시스템 스킬 등)은 건드리지 않는다.
 
     Args:
         project_root: ai-env 프로젝트 루트
@@ -337,23 +313,84 @@ def _sync_skills_merged(
         dry_run: True면 실제 복사하지 않음
         skills_include: 포함할 팀 스킬 디렉토리 이름
         skills_exclude: 제외할 팀 스킬 디렉토리 이름
-        copy_fn: 스킬 디렉토리 복사 함수 (기본: safe_copytree).
+        copy_file_fn: 스킬 파일 복사 함수 (기본: copier).
             signature: (src: Path, dst: Path) -> None
+        copier: 파일 복사 전략 (None이면 일반 복사). 결과 설명에 사용 전략을 표시한다.
+        catalog: 이미 스캔한 스킬 카탈로그 (None이면 새로 스캔)
+        store: 공유 스킬 store (설정되면 스킬 디렉토리를 store 객체 링크로 만듦)
+        plan: 미리 세운 계획 (plan_global_sync 결과, 주면 다시 계획하지 않고 그대로 실행)
 
     Returns:
-        (설명, 복사된 스킬 수)
+        (설명, 동기화된 스킬 수)
     """
-    if copy_fn is None:
-        copy_fn = safe_copytree
+    if copier is None:
+        copier = FileCopier()
+    if copy_file_fn is None:
+        copy_file_fn = copier
 
-    skill_dirs = _collect_skill_sources(project_root, skills_include, skills_exclude)
+    if plan is None:
+        if catalog is None:
+            catalog = SkillCatalog.scan(project_root, skills_include, skills_exclude)
+        plan = plan_skills(catalog, dst, copy_file_fn, store=store)
 
     if not dry_run:
-        dst.mkdir(parents=True, exist_ok=True)
-        for skill_dir in skill_dirs:
-            copy_fn(skill_dir, dst / skill_dir.name)
+        apply_skills_plan(plan)
+
+    count = plan.skill_count
+    return copier.annotate(f"skills/ ({count} items)"), count
+
+
+def _sync_skill_subset(
+    dst: Path,
+    catalog: SkillCatalog,
+    names: set[str],
+    copy_file_fn: Callable[[Path, Path], object],
+    store: SkillStore | None = None,
+) -> list[str]:
+    """지정한 스킬만 증분 동기화 (watch 모드용)
+
+    소스에서 사라진 스킬은 매니페스트가 관리하던 경우에만 대상에서 제거한다.
+    갱신한 스킬의 팀 레포 tree 기록은 지워서 다음 전체 sync가 다시 비교하게 한다.
 
-    return f"skills/ ({len(skill_dirs)} items)", len(skill_dirs)
+    Args:
+        dst: 목적지 스킬 디렉토리 (~/.claude/skills)
+        catalog: 최신 스킬 카탈로그
+        names: 동기화할 스킬 이름
+        copy_file_fn: 스킬 파일 복사 함수
+        store: 공유 스킬 store (설정되면 전체 sync처럼 store 객체 링크로 갱신)
+
+    Returns:
+        변경된 스킬 이름 목록 (정렬)
+    """
+    # 이름이 겹치면 나중에 수집된 (team) 스킬이 우선
+    by_name = {entry.name: entry for entry in catalog.entries}
+    changed: list[str] = []
+
+    dst.mkdir(parents=True, exist_ok=True)
+    manifest = SyncManifest.load(dst, writer_id(copy_file_fn))
+    try:
+        for name in sorted(names):
+            entry = by_name.get(name)
+            if entry is None:
+                if not manifest.has_tree(name):
+                    continue
+                _remove_skill_tree(dst, name, manifest)
+                changed.append(name)
+                continue
+
+            tree = plan_tree_incremental(entry.source, dst / name, manifest, entry.files)
+            if store is not None:
+                updated = _apply_tree_to_store(tree, manifest, copy_file_fn, store)
+            else:
+                updated = apply_tree_plan(tree, manifest, copy_file_fn).changed
+            if updated:
+                changed.append(name)
+                if entry.origin in manifest.trees:
+                    del manifest.trees[entry.origin]
+                    manifest.dirty = True
+    finally:
+        manifest.save()
+    return changed
 
 
 def _strip_cmux_hooks(settings_json: str) -> str:
@@ -391,10 +428,72 @@ def _strip_cmux_hooks(settings_json: str) -> str:
     return json.dumps(data, indent=2, ensure_ascii=False) + "\n"
 
 
+def _render_claude_settings(
+    global_dir: Path, cmux_enabled: bool, secrets: SecretsManager | None = None
+) -> str | None:
+    """settings.json.template 렌더링 (환경변수 치환 + cmux 조건부 처리, 템플릿이 없으면 None)"""
+    settings_template = global_dir / "settings.json.template"
+    if not settings_template.exists():
+        return None
+
+    sm = secrets if secrets is not None else get_secrets_manager()
+    with open(settings_template) as f:
+        content = sm.substitute(f.read())
+
+    # cmux 비활성화 시 settings.json에서 cmux 훅 제거
+    if not cmux_enabled:
+        content = _strip_cmux_hooks(content)
+    return content
+
+
+def _write_claude_settings(
+    global_dir: Path,
+    target_dir: Path,
+    cmux_enabled: bool,
+    dry_run: bool,
+    secrets: SecretsManager | None = None,
+    writer: OutputWriter | None = None,
+) -> WriteResult | None:
+    """settings.json.template → settings.json (환경변수 치환 + cmux 조건부 처리)
+
+    내용이 같으면 파일을 다시 쓰지 않는다 (Claude Code가 설정을 다시 읽지 않도록).
+
+    Returns:
+        settings.json 쓰기 결과 (템플릿이 없으면 None)
+    """
+    content = _render_claude_settings(global_dir, cmux_enabled, secrets)
+    if content is None:
+        return None
+
+    writer = writer or OutputWriter(dry_run=dry_run)
+    return writer.write_text(target_dir / "settings.json", content)
+
+
+def _resolve_skill_store(settings: Settings | None = None) -> SkillStore | None:
+    """settings.yaml의 sync.skill_store가 켜져 있으면 공유 스킬 store 반환."""
+    if settings is None:
+        settings = load_settings()
+    return SkillStore() if settings.sync.skill_store else None
+
+
+def _resolve_copier(copy_mode: str | None) -> FileCopier:
+    """copy_mode가 없으면 settings.yaml의 sync.copy_mode를 사용."""
+    if copy_mode is None:
+        copy_mode = load_settings().sync.copy_mode
+    return FileCopier(copy_mode)
+
+
 def sync_claude_global_config(
     dry_run: bool = False,
     skills_include: list[str] | None = None,
     skills_exclude: list[str] | None = None,
+    copy_mode: str | None = None,
+    catalog: SkillCatalog | None = None,
+    home: Path | None = None,
+    secrets: SecretsManager | None = None,
+    store: SkillStore | None = None,
+    writer: OutputWriter | None = None,
+    skills_plan: SkillsPlan | None = None,
 ) -> dict[str, str]:
     """
     글로벌 Claude Code 설정 동기화
@@ -409,15 +508,23 @@ def sync_claude_global_config(
         dry_run: True면 실제 복사하지 않음
         skills_include: 포함할 팀 스킬 디렉토리 이름 (예: ["cde-skills"])
         skills_exclude: 제외할 팀 스킬 디렉토리 이름 (예: ["cde-ranking-skills"])
+        copy_mode: 파일 복사 전략 (copy/reflink/hardlink/auto, None이면 settings.yaml)
+        catalog: 이미 스캔한 스킬 카탈로그 (sync 명령이 한 번 스캔해 모든 스테이지에 공유)
+        home: 대상 홈 디렉토리 (None이면 현재 사용자 홈, --homes fan-out용)
+        secrets: settings.json 치환에 사용할 시크릿 (None이면 프로젝트 .env)
+        store: 공유 스킬 store (None이면 settings.yaml의 sync.skill_store에 따름)
+        writer: 생성 파일(settings.json) writer (여러 스테이지가 공유해 written/unchanged 집계)
+        skills_plan: ~/.claude/skills 계획 (plan_global_sync에서 세운 것, None이면 여기서 계획)
     """
     project_root = get_project_root()
     source_dir = project_root / ".claude"
     global_dir = source_dir / "global"  # CLAUDE.md와 settings.json.template 위치
-    target_dir = Path.home() / ".claude"
+    target_dir = (home or Path.home()) / ".claude"
 
     # settings.yaml에서 cmux 활성화 여부 확인
     settings = load_settings()
     cmux_enabled = settings.cmux_enabled
+    copier = FileCopier(copy_mode or settings.sync.copy_mode)
 
     results: dict[str, str] = {}
 
@@ -425,43 +532,46 @@ def sync_claude_global_config(
         return results
 
     # 1. CLAUDE.md 동기화 (global/에서)
-    desc, _ = _sync_file_or_dir(global_dir / "CLAUDE.md", target_dir / "CLAUDE.md", dry_run)
+    desc, _ = _sync_file_or_dir(
+        global_dir / "CLAUDE.md", target_dir / "CLAUDE.md", dry_run, copier=copier
+    )
     if desc:
         results[desc] = str(target_dir / "CLAUDE.md")
 
     # 2. settings.json 생성 (환경변수 치환 + cmux 조건부 처리, global/에서)
-    settings_template = global_dir / "settings.json.template"
-    settings_dst = target_dir / "settings.json"
-    if settings_template.exists():
-        sm = get_secrets_manager()
-        with open(settings_template) as f:
-            content = sm.substitute(f.read())
-
-        # cmux 비활성화 시 settings.json에서 cmux 훅 제거
-        if not cmux_enabled:
-            content = _strip_cmux_hooks(content)
-
-        if not dry_run:
-            settings_dst.parent.mkdir(parents=True, exist_ok=True)
-            with open(settings_dst, "w") as f:
-                f.write(content)
-        results["settings.json"] = str(settings_dst)
+    written = _write_claude_settings(global_dir, target_dir, cmux_enabled, dry_run, secrets, writer)
+    if written is not None:
+        results[annotate("settings.json", written)] = str(written.path)
 
     # 3. commands/ 동기화 (.claude/commands → ~/.claude/commands)
-    desc, _ = _sync_file_or_dir(source_dir / "commands", target_dir / "commands", dry_run)
+    desc, _ = _sync_file_or_dir(
+        source_dir / "commands", target_dir / "commands", dry_run, copier=copier
+    )
     if desc:
         results[desc] = str(target_dir / "commands")
 
     # 4. hooks/ 동기화 (.claude/hooks → ~/.claude/hooks, cmux 조건부)
     desc, _ = _sync_file_or_dir(
-        source_dir / "hooks", target_dir / "hooks", dry_run, cmux_enabled=cmux_enabled
+        source_dir / "hooks",
+        target_dir / "hooks",
+        dry_run,
+        cmux_enabled=cmux_enabled,
+        copier=copier,
     )
     if desc:
         results[desc] = str(target_dir / "hooks")
 
     # 5. skills/ 동기화 (personal + team 합쳐서 → ~/.claude/skills)
     desc, _ = _sync_skills_merged(
-        project_root, target_dir / "skills", dry_run, skills_include, skills_exclude
+        project_root,
+        target_dir / "skills",
+        dry_run,
+        skills_include,
+        skills_exclude,
+        copier=copier,
+        catalog=catalog,
+        store=store if store is not None else _resolve_skill_store(settings),
+        plan=skills_plan,
     )
     if desc:
         results[desc] = str(target_dir / "skills")
@@ -482,35 +592,14 @@ def _extract_skill_summary(skill_dir: Path) -> tuple[str, str] | None:
     if not skill_md.exists():
         return None
 
-    content = skill_md.read_text(encoding="utf-8")
-
-    # frontmatter 파싱 (--- ... ---)
-    fm_match = re.search(r"^---\s*\n(.*?)\n---", content, re.DOTALL | re.MULTILINE)
-    if not fm_match:
-        return None
-
-    fm_text = fm_match.group(1)
-
-    # name 추출
-    name_match = re.search(r"^name:\s*(.+)$", fm_text, re.MULTILINE)
-    name = name_match.group(1).strip() if name_match else skill_dir.name
-
-    # description 추출 (첫 줄만, | 블록이면 다음 줄)
-    desc_match = re.search(r"^description:\s*\|?\s*\n?\s*(.+)$", fm_text, re.MULTILINE)
-    if desc_match:
-        desc = desc_match.group(1).strip()
-    else:
-        # 인라인 description
-        desc_inline = re.search(r"^description:\s*(.+)$", fm_text, re.MULTILINE)
-        desc = desc_inline.group(1).strip() if desc_inline else name
-
-    return name, desc
+    return parse_skill_summary(read_frontmatter_text(skill_md), skill_dir.name)
 
 
 def _build_skills_index(
     project_root: Path,
     skills_include: list[str] | None = None,
     skills_exclude: list[str] | None = None,
+    catalog: SkillCatalog | None = None,
 ) -> str:
     """스킬 인덱스 Markdown 섹션 생성.
 
@@ -520,12 +609,14 @@ def _build_skills_index(
         project_root: ai-env 프로젝트 루트
         skills_include: 포함할 팀 스킬 디렉토리 이름
         skills_exclude: 제외할 팀 스킬 디렉토리 이름
+        catalog: 이미 스캔한 스킬 카탈로그 (None이면 새로 스캔)
 
     Returns:
         Markdown 섹션 문자열 (스킬 없으면 빈 문자열)
     """
-    skill_dirs = _collect_skill_sources(project_root, skills_include, skills_exclude)
-    if not skill_dirs:
+    if catalog is None:
+        catalog = SkillCatalog.scan(project_root, skills_include, skills_exclude)
+    if not catalog.entries:
         return ""
 
     lines = [
@@ -535,13 +626,13 @@ def _build_skills_index(
         "## Available Skills",
         "",
     ]
-    for skill_dir in skill_dirs:
-        summary = _extract_skill_summary(skill_dir)
+    for entry in catalog.entries:
+        summary = entry.summary
         if summary:
             name, desc = summary
             lines.append(f"- **{name}**: {desc}")
         else:
-            lines.append(f"- **{skill_dir.name}**")
+            lines.append(f"- **{entry.name}**")
 
     lines.append("")
     lines.append("각 스킬의 상세 가이드: `.claude/skills/{name}/SKILL.md` 참조")
@@ -550,12 +641,34 @@ def _build_skills_index(
     return "\n".join(lines)
 
 
+def _render_agent_global_md(
+    project_root: Path,
+    skills_include: list[str] | None = None,
+    skills_exclude: list[str] | None = None,
+    catalog: SkillCatalog | None = None,
+) -> str | None:
+    """글로벌 CLAUDE.md + 스킬 인덱스 (AGENTS.md/GEMINI.md 내용, 원본이 없으면 None)"""
+    source = project_root / ".claude" / "global" / "CLAUDE.md"
+    if not source.exists():
+        return None
+
+    # 원본 내용 + 스킬 인덱스 append
+    content = source.read_text(encoding="utf-8")
+    skills_index = _build_skills_index(project_root, skills_include, skills_exclude, catalog)
+    if skills_index:
+        content = content.rstrip() + "\n" + skills_index
+    return content
+
+
 def _sync_agent_global_md(
     target_dir_name: str,
     target_filename: str,
     dry_run: bool,
     skills_include: list[str] | None = None,
     skills_exclude: list[str] | None = None,
+    catalog: SkillCatalog | None = None,
+    home: Path | None = None,
+    writer: OutputWriter | None = None,
 ) -> dict[str, str]:
     """에이전트별 글로벌 MD 파일 동기화 (공통 로직)
 
@@ -568,61 +681,78 @@ def _sync_agent_global_md(
         dry_run: True면 실제 복사하지 않음
         skills_include: 포함할 팀 스킬 디렉토리 이름
         skills_exclude: 제외할 팀 스킬 디렉토리 이름
+        catalog: 이미 스캔한 스킬 카탈로그 (None이면 새로 스캔)
+        home: 대상 홈 디렉토리 (None이면 현재 사용자 홈)
+        writer: 생성 파일 writer (내용이 같으면 쓰지 않음)
     """
-    project_root = get_project_root()
-    source = project_root / ".claude" / "global" / "CLAUDE.md"
-
-    if not source.exists():
+    content = _render_agent_global_md(get_project_root(), skills_include, skills_exclude, catalog)
+    if content is None:
         return {}
 
-    # 원본 내용 + 스킬 인덱스 append
-    content = source.read_text(encoding="utf-8")
-    skills_index = _build_skills_index(project_root, skills_include, skills_exclude)
-    if skills_index:
-        content = content.rstrip() + "\n" + skills_index
-
-    dst = Path.home() / target_dir_name / target_filename
-    if not dry_run:
-        dst.parent.mkdir(parents=True, exist_ok=True)
-        dst.write_text(content, encoding="utf-8")
-
-    return {target_filename: str(dst)}
+    dst = (home or Path.home()) / target_dir_name / target_filename
+    writer = writer or OutputWriter(dry_run=dry_run)
+    return {annotate(target_filename, writer.write_text(dst, content)): str(dst)}
 
 
 def _sync_agent_global(
     target_dir_name: str,
     target_filename: str,
-    skills_copy_fn: Callable[[Path, Path], None] | None,
+    skills_copy_file_fn: Callable[[Path, Path], object] | None,
     dry_run: bool,
     skills_include: list[str] | None,
     skills_exclude: list[str] | None,
+    copier: FileCopier | None = None,
+    catalog: SkillCatalog | None = None,
+    home: Path | None = None,
+    store: SkillStore | None = None,
+    writer: OutputWriter | None = None,
+    skills_plan: SkillsPlan | None = None,
 ) -> dict[str, str]:
     """에이전트별 글로벌 설정 동기화 (공통 로직)
 
     Args:
         target_dir_name: 홈 디렉토리 하위 폴더 이름 (예: ".codex", ".gemini")
         target_filename: 대상 파일 이름 (예: "AGENTS.md", "GEMINI.md")
-        skills_copy_fn: 스킬 복사 함수 (None이면 스킬 동기화 건너뜀)
+        skills_copy_file_fn: 스킬 파일 복사 함수 (None이면 스킬 동기화 건너뜀)
         dry_run: True면 실제 복사하지 않음
         skills_include: 포함할 팀 스킬 디렉토리 이름
         skills_exclude: 제외할 팀 스킬 디렉토리 이름
+        copier: 파일 복사 전략 (결과 설명 표시용, None이면 일반 복사)
+        catalog: 이미 스캔한 스킬 카탈로그 (None이면 한 번 스캔해 MD와 스킬 복사에 공유)
+        home: 대상 홈 디렉토리 (None이면 현재 사용자 홈)
+        store: 공유 스킬 store (None이면 settings.yaml의 sync.skill_store에 따름)
+        writer: 생성 파일(AGENTS.md/GEMINI.md) writer
+        skills_plan: 스킬 디렉토리 계획 (None이면 여기서 계획)
     """
+    if catalog is None:
+        catalog = SkillCatalog.scan(get_project_root(), skills_include, skills_exclude)
     results = _sync_agent_global_md(
-        target_dir_name, target_filename, dry_run, skills_include, skills_exclude
+        target_dir_name,
+        target_filename,
+        dry_run,
+        skills_include,
+        skills_exclude,
+        catalog,
+        home,
+        writer,
     )
     if not results:
         return results
 
-    # 스킬 파일 동기화 (copy_fn이 있는 에이전트만)
-    if skills_copy_fn is not None:
-        skills_dir = Path.home() / target_dir_name / "skills"
+    # 스킬 파일 동기화 (copy_file_fn이 있는 에이전트만)
+    if skills_copy_file_fn is not None:
+        skills_dir = (home or Path.home()) / target_dir_name / "skills"
         desc, count = _sync_skills_merged(
             get_project_root(),
             skills_dir,
             dry_run,
             skills_include,
             skills_exclude,
-            copy_fn=skills_copy_fn,
+            copy_file_fn=skills_copy_file_fn,
+            copier=copier,
+            catalog=catalog,
+            store=store if store is not None else _resolve_skill_store(),
+            plan=skills_plan,
         )
         if count:
             results[desc] = str(skills_dir)
@@ -634,14 +764,33 @@ def sync_codex_global_config(
     dry_run: bool = False,
     skills_include: list[str] | None = None,
     skills_exclude: list[str] | None = None,
+    copy_mode: str | None = None,
+    catalog: SkillCatalog | None = None,
+    home: Path | None = None,
+    store: SkillStore | None = None,
+    writer: OutputWriter | None = None,
+    skills_plan: SkillsPlan | None = None,
 ) -> dict[str, str]:
     """Codex CLI 글로벌 설정 동기화
 
     ai-env/.claude/global/CLAUDE.md + 스킬 인덱스 → ~/.codex/AGENTS.md
     ai-env/.claude/skills + team skills 병합 → ~/.codex/skills
+    SKILL.md는 정규화 후 새로 쓰므로 복사 전략은 나머지 스킬 파일에만 적용된다.
     """
+    copier = _resolve_copier(copy_mode)
     return _sync_agent_global(
-        ".codex", "AGENTS.md", copy_skill_tree_for_codex, dry_run, skills_include, skills_exclude
+        ".codex",
+        "AGENTS.md",
+        functools.partial(copy_skill_file_for_codex, copy_file_fn=copier),
+        dry_run,
+        skills_include,
+        skills_exclude,
+        copier=copier,
+        catalog=catalog,
+        home=home,
+        store=store,
+        writer=writer,
+        skills_plan=skills_plan,
     )
 
 
@@ -649,9 +798,112 @@ def sync_gemini_global_config(
     dry_run: bool = False,
     skills_include: list[str] | None = None,
     skills_exclude: list[str] | None = None,
+    catalog: SkillCatalog | None = None,
+    home: Path | None = None,
+    writer: OutputWriter | None = None,
 ) -> dict[str, str]:
     """Gemini CLI 글로벌 설정 동기화
 
     ai-env/.claude/global/CLAUDE.md + 스킬 인덱스 → ~/.gemini/GEMINI.md
     """
-    return _sync_agent_global(".gemini", "GEMINI.md", None, dry_run, skills_include, skills_exclude)
+    return _sync_agent_global(
+        ".gemini",
+        "GEMINI.md",
+        None,
+        dry_run,
+        skills_include,
+        skills_exclude,
+        catalog=catalog,
+        home=home,
+        writer=writer,
+    )
+
+
+def _plan_hooks(src: Path, dst: Path, cmux_enabled: bool, plan: SyncPlan, group: str) -> None:
+    """hooks/ 계획: 파일 복사 + 대상에만 있는 파일 삭제 + .sh 실행 권한 (cmux 조건부)"""
+    files = list_source_files(src)
+    if not cmux_enabled:
+        files = [f for f in files if f[0] != _CMUX_HOOK_SCRIPT]
+    wanted = {rel_path for rel_path, _path, _st in files}
+
+    for rel_path, path, st in files:
+        target = dst / rel_path
+        op = file_op(path, target, group)
+        plan.add(op)
+        # _sync_hooks는 최상위 .sh에만 실행 권한을 부여
+        if "/" in rel_path or not rel_path.endswith(".sh"):
+            continue
+        mode = st.st_mode if op is not None else target.stat().st_mode
+        if mode & EXEC_BITS != EXEC_BITS:
+            plan.add(PlanOp("chmod", target, 0, None, group))
+
+    if dst.is_dir():
+        for rel_path, _path, _st in list_source_files(dst):
+            if rel_path not in wanted:
+                plan.add(delete_op(dst / rel_path, group))
+
+
+def plan_global_sync(
+    skills_include: list[str] | None = None,
+    skills_exclude: list[str] | None = None,
+    copy_mode: str | None = None,
+    catalog: SkillCatalog | None = None,
+    targets: tuple[str, ...] = ("claude", "codex", "gemini"),
+) -> SyncPlan:
+    """글로벌 설정 동기화의 변경 계획 (아무것도 쓰지 않음)
+
+    대상의 현재 상태와 비교해 실제로 바뀌는 파일만 create/update/delete/chmod 작업으로 모은다.
+    스킬 트리 계획(SyncPlan.skills)은 apply_skills_plans로 다시 스캔 없이 실행할 수 있다.
+
+    Args:
+        skills_include: 포함할 팀 스킬 디렉토리 이름
+        skills_exclude: 제외할 팀 스킬 디렉토리 이름
+        copy_mode: 파일 복사 전략 (None이면 settings.yaml). 매니페스트 식별에 사용
+        catalog: 이미 스캔한 스킬 카탈로그 (None이면 새로 스캔)
+        targets: 계획할 대상 (claude, codex, gemini)
+    """
+    project_root = get_project_root()
+    if catalog is None:
+        catalog = SkillCatalog.scan(project_root, skills_include, skills_exclude)
+    settings = load_settings()
+    copier = FileCopier(copy_mode or settings.sync.copy_mode)
+    store = _resolve_skill_store(settings)
+    home = Path.home()
+    plan = SyncPlan()
+
+    source_dir = project_root / ".claude"
+    global_dir = source_dir / "global"
+    if "claude" in targets and source_dir.exists():
+        target_dir = home / ".claude"
+        if (global_dir / "CLAUDE.md").is_file():
+            plan.add(file_op(global_dir / "CLAUDE.md", target_dir / "CLAUDE.md", "claude"))
+        settings_content = _render_claude_settings(global_dir, settings.cmux_enabled)
+        if settings_content is not None:
+            plan.add(content_op(settings_content, target_dir / "settings.json", "claude"))
+        if (source_dir / "commands").is_dir():
+            for md_file in sorted((source_dir / "commands").glob("*.md")):
+                plan.add(file_op(md_file, target_dir / "commands" / md_file.name, "claude"))
+        if (source_dir / "hooks").is_dir():
+            _plan_hooks(
+                source_dir / "hooks", target_dir / "hooks", settings.cmux_enabled, plan, "claude"
+            )
+        plan.add_skills(plan_skills(catalog, target_dir / "skills", copier, "claude", store))
+
+    agent_targets = [
+        ("codex", ".codex", "AGENTS.md"),
+        ("gemini", ".gemini", "GEMINI.md"),
+    ]
+    for name, dir_name, filename in agent_targets:
+        if name not in targets:
+            continue
+        content = _render_agent_global_md(project_root, catalog=catalog)
+        if content is None:
+            continue
+        plan.add(content_op(content, home / dir_name / filename, name))
+        if name == "codex":
+            codex_copy = functools.partial(copy_skill_file_for_codex, copy_file_fn=copier)
+            plan.add_skills(
+                plan_skills(catalog, home / dir_name / "skills", codex_copy, name, store)
+            )
+
+    return plan
@@ -0,0 +1,166 @@
+"""Dependency-aware parallel executor for sync stages."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any
+
+DEFAULT_SYNC_WORKERS = 4
+
+
+@dataclass
+class SyncStage:
+    """실행 단위 (예: Claude 글로벌 설정 동기화)."""
+
+    name: str
+    fn: Callable[[], Any]
+    depends_on: tuple[str, ...] = ()
+
+
+@dataclass
+class StageResult:
+    """단일 스테이지 실행 결과. started/finished는 실행 시작 기준 상대 시간(초)."""
+
+    name: str
+    result: Any = None
+    error: BaseException | None = None
+    started: float = 0.0
+    finished: float = 0.0
+    skipped: bool = False
+
+    @property
+    def elapsed(self) -> float:
+        return self.finished - self.started
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and not self.skipped
+
+
+@dataclass
+class ExecutionReport:
+    """전체 실행 보고서."""
+
+    results: dict[str, StageResult] = field(default_factory=dict)
+    wall_time: float = 0.0
+    critical_path: list[str] = field(default_factory=list)
+
+    @property
+    def critical_path_seconds(self) -> float:
+        return sum(self.results[name].elapsed for name in self.critical_path)
+
+    @property
+    def errors(self) -> list[StageResult]:
+        return [r for r in self.results.values() if r.error is not None]
+
+
+def _topological_order(stages: list[SyncStage]) -> list[str]:
+    """스테이지 이름을 의존성 순서로 정렬.
+
+    Raises:
+        ValueError: 알 수 없는 의존성, 중복 이름, 순환 의존성이 있을 때
+    """
+    by_name: dict[str, SyncStage] = {}
+    for stage in stages:
+        if stage.name in by_name:
+            raise ValueError(f"Duplicate sync stage: {stage.name}")
+        by_name[stage.name] = stage
+
+    for stage in stages:
+        for dep in stage.depends_on:
+            if dep not in by_name:
+                raise ValueError(f"Sync stage '{stage.name}' depends on unknown stage '{dep}'")
+
+    order: list[str] = []
+    state: dict[str, int] = {}  # 1: visiting, 2: done
+
+    def _visit(name: str) -> None:
+        if state.get(name) == 2:
+            return
+        if state.get(name) == 1:
+            raise ValueError(f"Circular dependency detected at sync stage '{name}'")
+        state[name] = 1
+        for dep in by_name[name].depends_on:
+            _visit(dep)
+        state[name] = 2
+        order.append(name)
+
+    for stage in stages:
+        _visit(stage.name)
+    return order
+
+
+def _critical_path(stages: list[SyncStage], results: dict[str, StageResult]) -> list[str]:
+    """실행 시간 기준 가장 긴 의존성 체인."""
+    by_name = {stage.name: stage for stage in stages}
+    best: dict[str, tuple[float, list[str]]] = {}
+
+    for name in _topological_order(stages):
+        own = results[name].elapsed
+        chains = [best[dep] for dep in by_name[name].depends_on]
+        prev_cost, prev_path = max(chains, key=lambda c: c[0], default=(0.0, []))
+        best[name] = (prev_cost + own, [*prev_path, name])
+
+    if not best:
+        return []
+    return max(best.values(), key=lambda c: c[0])[1]
+
+
+def run_stages(stages: list[SyncStage], max_workers: int = DEFAULT_SYNC_WORKERS) -> ExecutionReport:
+    """의존성 그래프에 따라 독립 스테이지를 스레드 풀에서 병렬 실행.
+
+    실패한 스테이지에 의존하는 스테이지는 실행하지 않고 skipped로 표시한다.
+    예외는 삼키지 않고 StageResult.error에 담아 호출자가 처리하게 한다.
+
+    Args:
+        stages: 실행할 스테이지 목록
+        max_workers: 최대 동시 실행 수 (1이면 순차 실행)
+
+    Returns:
+        ExecutionReport (스테이지별 결과, 전체 소요 시간, critical path)
+    """
+    _topological_order(stages)  # 입력 검증
+    by_name = {stage.name: stage for stage in stages}
+    results: dict[str, StageResult] = {}
+    pending = [stage.name for stage in stages]
+    running: dict[Future[Any], str] = {}
+    origin = time.monotonic()
+
+    def _run(stage: SyncStage) -> StageResult:
+        result = StageResult(name=stage.name, started=time.monotonic() - origin)
+        try:
+            result.result = stage.fn()
+        except Exception as e:  # noqa: BLE001 - 호출자에게 전달
+            result.error = e
+        result.finished = time.monotonic() - origin
+        return result
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        while pending or running:
+            for name in list(pending):
+                deps = by_name[name].depends_on
+                if any(dep in results and not results[dep].ok for dep in deps):
+                    now = time.monotonic() - origin
+                    results[name] = StageResult(name=name, skipped=True, started=now, finished=now)
+                    pending.remove(name)
+                elif all(dep in results for dep in deps):
+                    running[pool.submit(_run, by_name[name])] = name
+                    pending.remove(name)
+
+            if not running:
+                continue
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                results[name] = future.result()
+
+    report = ExecutionReport(
+        results={stage.name: results[stage.name] for stage in stages},
+        wall_time=time.monotonic() - origin,
+    )
+    report.critical_path = _critical_path(stages, report.results)
+    return report
@@ -0,0 +1,297 @@
+"""Per-target sync manifest for incremental skill tree copies."""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import json
+import os
+import shutil
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from .staged_swap import materialize
+
+# 대상 디렉토리에 저장되는 매니페스트 파일명 (점으로 시작하므로 스킬 스캔에서 제외됨)
+MANIFEST_FILENAME = ".ai-env-manifest.json"
+MANIFEST_VERSION = 1
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+# (소스 기준 상대경로, 경로, stat)
+SourceFile = tuple[str, Path, os.stat_result]
+
+
+@dataclass
+class FileRecord:
+    """동기화된 소스 파일 한 개의 기록."""
+
+    size: int
+    mtime_ns: int
+    sha256: str
+
+
+@dataclass
+class TreeSyncStats:
+    """단일 트리 증분 동기화 결과."""
+
+    copied: int = 0
+    removed: int = 0
+    unchanged: int = 0
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.copied or self.removed)
+
+
+def file_sha256(path: Path) -> str:
+    """파일 내용의 SHA-256 해시 반환 (청크 단위로 읽음)."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def copy_file(src: Path, dst: Path) -> None:
+    """기본 파일 복사 함수 (메타데이터 포함)."""
+    shutil.copy2(src, dst)
+
+
+def writer_id(copy_file_fn: Callable[[Path, Path], object]) -> str:
+    """파일 복사 함수의 식별자 (매니페스트 무효화 판단용).
+
+    functools.partial은 감싼 함수, 호출 가능 객체는 클래스 기준으로 식별한다.
+    복사 전략(copy/reflink/hardlink)은 결과 내용이 같으므로 식별자에 포함하지 않는다.
+    """
+    target: object = copy_file_fn
+    while isinstance(target, functools.partial):
+        target = target.func
+    if not hasattr(target, "__qualname__"):
+        target = type(target)
+    module = getattr(target, "__module__", "") or ""
+    return f"{module}.{getattr(target, '__qualname__', '')}"
+
+
+@dataclass
+class SyncManifest:
+    """대상 디렉토리별 동기화 매니페스트.
+
+    `files`는 대상 루트 기준 상대 경로(예: ``skill-name/SKILL.md``)를 키로,
+    마지막 동기화 시점의 소스 파일 크기/mtime/해시를 기록한다.
+    `writer`가 바뀌면(예: Codex 정규화 방식 변경) 기존 기록은 무효화된다.
+    `trees`는 팀 레포 이름별로 마지막으로 깨끗하게 동기화한 git tree oid를 기록한다.
+    """
+
+    path: Path
+    writer: str = ""
+    files: dict[str, FileRecord] = field(default_factory=dict)
+    trees: dict[str, str] = field(default_factory=dict)
+    dirty: bool = False
+
+    @classmethod
+    def load(cls, target_root: Path, writer: str) -> SyncManifest:
+        """대상 디렉토리의 매니페스트 로드 (없거나 손상/불일치 시 빈 매니페스트)."""
+        path = target_root / MANIFEST_FILENAME
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return cls(path=path, writer=writer)
+
+        if data.get("version") != MANIFEST_VERSION or data.get("writer") != writer:
+            return cls(path=path, writer=writer, dirty=True)
+
+        try:
+            files = {rel: FileRecord(**record) for rel, record in data.get("files", {}).items()}
+        except TypeError:
+            return cls(path=path, writer=writer, dirty=True)
+        trees = {str(k): str(v) for k, v in data.get("trees", {}).items()}
+        return cls(path=path, writer=writer, files=files, trees=trees)
+
+    def save(self) -> None:
+        """변경이 있을 때만 매니페스트를 원자적으로 저장."""
+        if not self.dirty:
+            return
+        payload = {
+            "version": MANIFEST_VERSION,
+            "writer": self.writer,
+            "files": {rel: asdict(record) for rel, record in sorted(self.files.items())},
+            "trees": dict(sorted(self.trees.items())),
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.tmp")
+        tmp_path.write_text(json.dumps(payload, indent=1) + "\n", encoding="utf-8")
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+    def has_tree(self, prefix: str) -> bool:
+        """`prefix/` 하위 기록이 하나라도 있는지 여부."""
+        head = f"{prefix}/"
+        return any(rel.startswith(head) for rel in self.files)
+
+    def tree_entries(self, prefix: str) -> list[str]:
+        """`prefix/` 하위 기록 경로 목록."""
+        head = f"{prefix}/"
+        return [rel for rel in self.files if rel.startswith(head)]
+
+
+def list_source_files(src: Path) -> list[SourceFile]:
+    """소스 트리의 (상대경로, 경로, stat) 목록. 심링크는 따라간다 (copytree 기본 동작과 동일)."""
+    entries: list[SourceFile] = []
+    for dirpath, _dirnames, filenames in os.walk(src, followlinks=True):
+        base = Path(dirpath)
+        for filename in sorted(filenames):
+            path = base / filename
+            try:
+                st = path.stat()
+            except OSError:  # broken symlink
+                continue
+            entries.append((path.relative_to(src).as_posix(), path, st))
+    return entries
+
+
+def _link_or_copy(src: Path, dst: Path) -> None:
+    """기존 대상 파일을 staging으로 하드링크 (실패 시 복사)."""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+@dataclass
+class TreePlan:
+    """단일 트리 증분 동기화 계획 (plan_tree_incremental 결과, 아직 쓰기 없음).
+
+    entries는 (상대경로, 소스 파일, 변경 여부) 목록이며 변경 없는 파일은 기존 대상에서 링크된다.
+    """
+
+    src: Path
+    dst: Path
+    first_sync: bool
+    entries: list[tuple[str, Path, bool]] = field(default_factory=list)
+    records: dict[str, FileRecord] = field(default_factory=dict)
+    removed_keys: list[str] = field(default_factory=list)
+    stats: TreeSyncStats = field(default_factory=TreeSyncStats)
+
+    @property
+    def needs_apply(self) -> bool:
+        return self.first_sync or self.stats.changed
+
+
+def plan_tree_incremental(
+    src: Path,
+    dst: Path,
+    manifest: SyncManifest,
+    source_files: list[SourceFile] | None = None,
+) -> TreePlan:
+    """매니페스트와 대상을 비교해 복사/삭제할 파일을 계산 (대상과 매니페스트는 수정하지 않음).
+
+    - 소스 크기/mtime이 기록과 같고 대상 파일이 있으면 해시 없이 유지
+    - 크기/mtime이 다르면 해시를 비교해 내용이 같으면 기록만 갱신
+    - 매니페스트에 없는 첫 동기화는 기존 대상 내용을 버리고 전체 복사 (기존 동작과 동일)
+
+    Args:
+        src: 소스 디렉토리 (예: ai-env/.claude/skills/foo)
+        dst: 대상 디렉토리 (예: ~/.claude/skills/foo). 매니페스트 키 prefix는 dst.name
+        manifest: 대상 루트의 매니페스트
+        source_files: 이미 스캔한 소스 파일 목록 (None이면 src를 탐색)
+    """
+    prefix = dst.name
+    # 첫 동기화: 기록이 없으므로 대상 내용을 신뢰할 수 없음
+    first_sync = not manifest.has_tree(prefix) or not dst.is_dir()
+    plan = TreePlan(src=src, dst=dst, first_sync=first_sync)
+
+    if source_files is None:
+        source_files = list_source_files(src)
+
+    for rel_path, src_file, st in source_files:
+        key = f"{prefix}/{rel_path}"
+        exists = not first_sync and (dst / rel_path).exists()
+        record = None if first_sync else manifest.files.get(key)
+
+        if (
+            record is not None
+            and record.size == st.st_size
+            and record.mtime_ns == st.st_mtime_ns
+            and exists
+        ):
+            plan.entries.append((rel_path, src_file, False))
+            plan.stats.unchanged += 1
+            continue
+
+        digest = file_sha256(src_file)
+        changed = not (record is not None and record.sha256 == digest and exists)
+        plan.entries.append((rel_path, src_file, changed))
+        if changed:
+            plan.stats.copied += 1
+        else:
+            plan.stats.unchanged += 1
+        plan.records[key] = FileRecord(size=st.st_size, mtime_ns=st.st_mtime_ns, sha256=digest)
+
+    seen = {f"{prefix}/{rel_path}" for rel_path, _src_file, _changed in plan.entries}
+    plan.removed_keys = [key for key in manifest.tree_entries(prefix) if key not in seen]
+    plan.stats.removed = len(plan.removed_keys)
+    return plan
+
+
+def apply_tree_plan(
+    plan: TreePlan,
+    manifest: SyncManifest,
+    copy_file_fn: Callable[[Path, Path], object] = copy_file,
+) -> TreeSyncStats:
+    """계획을 실행 (소스/대상을 다시 스캔하지 않음).
+
+    변경이 있으면 새 트리를 staging 디렉토리에 만든 뒤 대상과 교체한다.
+    유지되는 파일은 기존 대상에서 하드링크하므로 변경된 파일만 실제로 복사된다.
+    교체 전까지 대상은 이전 상태 그대로이므로 일부만 갱신된 트리가 노출되지 않는다.
+    """
+    dst = plan.dst
+    if plan.needs_apply:
+
+        def _build(staging: Path) -> None:
+            staging.mkdir()
+            for rel_path, src_file, changed in plan.entries:
+                staged_file = staging / rel_path
+                staged_file.parent.mkdir(parents=True, exist_ok=True)
+                if changed:
+                    copy_file_fn(src_file, staged_file)
+                else:
+                    _link_or_copy(dst / rel_path, staged_file)
+
+        materialize(dst, _build)
+
+    record_tree_plan(plan, manifest)
+    return plan.stats
+
+
+def record_tree_plan(plan: TreePlan, manifest: SyncManifest) -> None:
+    """실행한 계획의 파일 기록을 매니페스트에 반영."""
+    for key in plan.removed_keys:
+        del manifest.files[key]
+    manifest.files.update(plan.records)
+    if plan.records or plan.removed_keys:
+        manifest.dirty = True
+
+
+def sync_tree_incremental(
+    src: Path,
+    dst: Path,
+    manifest: SyncManifest,
+    copy_file_fn: Callable[[Path, Path], object] = copy_file,
+    source_files: list[SourceFile] | None = None,
+) -> TreeSyncStats:
+    """매니페스트를 기준으로 변경된 파일만 복사하고 삭제된 파일만 제거 (계획 + 실행).
+
+    Args:
+        src: 소스 디렉토리 (예: ai-env/.claude/skills/foo)
+        dst: 대상 디렉토리 (예: ~/.claude/skills/foo). 매니페스트 키 prefix는 dst.name
+        manifest: 대상 루트의 매니페스트
+        copy_file_fn: 단일 파일 복사 함수. signature: (src: Path, dst: Path) -> None
+        source_files: 이미 스캔한 소스 파일 목록 (None이면 src를 탐색)
+
+    Returns:
+        TreeSyncStats (복사/삭제/유지 파일 수)
+    """
+    plan = plan_tree_incremental(src, dst, manifest, source_files)
+    return apply_tree_plan(plan, manifest, copy_file_fn)
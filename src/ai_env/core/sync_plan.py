@@ -0,0 +1,389 @@
+"""Typed change plans computed before sync writes anything."""
+
+from __future__ import annotations
+
+import os
+from collections import defaultdict
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Literal
+
+from .codex_skills import copy_skill_file_for_codex, prime_normalized_skill_cache
+from .skill_catalog import SkillCatalog
+from .staged_swap import discard_async, new_staging_dir, sweep_stale_staging
+from .sync_manifest import (
+    SyncManifest,
+    TreePlan,
+    apply_tree_plan,
+    file_sha256,
+    list_source_files,
+    plan_tree_incremental,
+    record_tree_plan,
+    writer_id,
+)
+
+if TYPE_CHECKING:
+    from .skill_store import SkillStore
+
+OpKind = Literal["create", "update", "delete", "chmod"]
+OP_KINDS: tuple[OpKind, ...] = ("create", "update", "delete", "chmod")
+
+# hooks/*.sh에 부여하는 실행 권한
+EXEC_BITS = 0o755
+
+
+@dataclass(frozen=True)
+class PlanOp:
+    """대상 파일 하나에 대한 변경 작업.
+
+    size는 create/update에서 쓸 바이트 수, delete에서 지울 바이트 수 (chmod는 0).
+    """
+
+    kind: OpKind
+    target: Path
+    size: int = 0
+    source: Path | None = None
+    group: str = ""
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "target": str(self.target),
+            "size": self.size,
+            "source": str(self.source) if self.source is not None else None,
+            "group": self.group,
+        }
+
+
+def _stat_or_none(path: Path) -> os.stat_result | None:
+    try:
+        return path.stat()
+    except OSError:
+        return None
+
+
+def device_of(path: Path) -> int:
+    """path가 놓일 파일시스템의 장치 번호 (아직 없으면 가장 가까운 상위 디렉토리 기준)."""
+    for candidate in (path, *path.parents):
+        st = _stat_or_none(candidate)
+        if st is not None:
+            return st.st_dev
+    return 0
+
+
+def file_op(src: Path, dst: Path, group: str = "") -> PlanOp | None:
+    """src를 dst로 복사할 때의 작업 (내용이 같으면 None).
+
+    크기가 다를 때만 바로 update로 판단하고, 같으면 해시를 비교한다.
+    """
+    src_st = src.stat()
+    dst_st = _stat_or_none(dst)
+    if dst_st is None:
+        return PlanOp("create", dst, src_st.st_size, src, group)
+    if dst_st.st_size == src_st.st_size and file_sha256(src) == file_sha256(dst):
+        return None
+    return PlanOp("update", dst, src_st.st_size, src, group)
+
+
+def content_op(content: str | bytes, dst: Path, group: str = "") -> PlanOp | None:
+    """생성한 내용을 dst에 쓸 때의 작업 (기존 내용과 같으면 None)."""
+    data = content.encode("utf-8") if isinstance(content, str) else content
+    try:
+        current = dst.read_bytes()
+    except FileNotFoundError:
+        return PlanOp("create", dst, len(data), None, group)
+    if current == data:
+        return None
+    return PlanOp("update", dst, len(data), None, group)
+
+
+def delete_op(dst: Path, group: str = "") -> PlanOp | None:
+    """dst를 지우는 작업 (없으면 None)."""
+    st = _stat_or_none(dst)
+    if st is None:
+        return None
+    return PlanOp("delete", dst, st.st_size, None, group)
+
+
+def tree_ops(plan: TreePlan, group: str = "") -> list[PlanOp]:
+    """트리 증분 계획을 파일 단위 작업으로 변환.
+
+    첫 동기화는 대상 트리 전체를 교체하므로 소스에 없는 기존 대상 파일도 delete로 보고한다.
+    """
+    ops: list[PlanOp] = []
+    for rel_path, src_file, changed in plan.entries:
+        if not changed:
+            continue
+        target = plan.dst / rel_path
+        kind: OpKind = "update" if target.exists() else "create"
+        ops.append(PlanOp(kind, target, src_file.stat().st_size, src_file, group))
+
+    prefix_len = len(plan.dst.name) + 1
+    removed = [plan.dst / key[prefix_len:] for key in plan.removed_keys]
+    if plan.first_sync and plan.dst.is_dir():
+        keep = {rel_path for rel_path, _src, _changed in plan.entries}
+        removed = [
+            plan.dst / rel for rel, _path, _st in list_source_files(plan.dst) if rel not in keep
+        ]
+    for target in removed:
+        op = delete_op(target, group)
+        if op is not None:
+            ops.append(op)
+    return ops
+
+
+def _unchanged_team_origins(catalog: SkillCatalog, manifest: SyncManifest, dst: Path) -> set[str]:
+    """마지막 동기화 이후 git tree가 그대로인 팀 레포 이름.
+
+    기록된 tree oid와 현재 HEAD tree가 같고, 작업 트리가 깨끗하고,
+    대상에 해당 스킬 디렉토리가 모두 남아 있으면 파일 단위 비교 없이 건너뛸 수 있다.
+    """
+    unchanged: set[str] = set()
+    for origin in catalog.team_dirs:
+        recorded = manifest.trees.get(origin)
+        if recorded is None:
+            continue
+        state = catalog.tree_state(origin)
+        if state is None or state.dirty or state.tree != recorded:
+            continue
+        names = [e.name for e in catalog.entries if e.origin == origin]
+        if all((dst / name).is_dir() for name in names):
+            unchanged.add(origin)
+    return unchanged
+
+
+@dataclass
+class SkillsPlan:
+    """스킬 대상 디렉토리 하나(~/.claude/skills 등)의 병합 동기화 계획.
+
+    apply_skills_plan은 여기 담긴 트리 계획만 실행하므로 소스/대상을 다시 스캔하지 않는다.
+    """
+
+    dst: Path
+    manifest: SyncManifest
+    copy_file_fn: Callable[[Path, Path], object]
+    trees: list[TreePlan] = field(default_factory=list)
+    # 팀 레포 이름 → 기록할 tree oid (None이면 기록 삭제), 건너뛴 레포는 제외
+    tree_records: dict[str, str | None] = field(default_factory=dict)
+    # 매니페스트가 관리하지만 카탈로그에서 사라진 스킬 이름 (대상에서 제거)
+    removed: list[str] = field(default_factory=list)
+    skill_count: int = 0
+    group: str = ""
+    # 설정되면 스킬 디렉토리를 복사하지 않고 store 객체로의 심볼릭 링크로 만든다
+    store: SkillStore | None = None
+
+    @property
+    def ops(self) -> list[PlanOp]:
+        ops = [op for tree in self.trees for op in tree_ops(tree, self.group)]
+        for name in self.removed:
+            for rel in self.manifest.tree_entries(name):
+                op = delete_op(self.dst / rel, self.group)
+                if op is not None:
+                    ops.append(op)
+        return ops
+
+
+def plan_skills(
+    catalog: SkillCatalog,
+    dst: Path,
+    copy_file_fn: Callable[[Path, Path], object],
+    group: str = "",
+    store: SkillStore | None = None,
+) -> SkillsPlan:
+    """카탈로그의 스킬을 dst에 병합 동기화하는 계획 (대상과 매니페스트 파일은 수정하지 않음).
+
+    팀 레포는 git tree oid가 마지막 동기화와 같으면 레포 전체를 건너뛰고,
+    이름이 겹치는 personal 스킬도 건너뛴다 (team 복사본을 덮어쓰지 않도록).
+    소스에서 사라진 스킬은 매니페스트가 관리하던 경우에만 제거 대상으로 계획한다
+    (사용자가 대상에 직접 만든 디렉토리는 건드리지 않음).
+    store를 주면 실행 시 스킬 디렉토리를 공유 객체 링크로 만든다 (SkillStore 참고).
+    """
+    manifest = SyncManifest.load(dst, writer_id(copy_file_fn))
+    plan = SkillsPlan(
+        dst=dst,
+        manifest=manifest,
+        copy_file_fn=copy_file_fn,
+        skill_count=len(catalog.entries),
+        group=group,
+        store=store,
+    )
+    unchanged = _unchanged_team_origins(catalog, manifest, dst)
+    skipped_names = {e.name for e in catalog.entries if e.origin in unchanged}
+    # 이름이 겹치면 나중에 수집된 (team) 스킬만 계획 (모든 트리를 같은 대상 상태 기준으로 계산하므로)
+    by_name = {entry.name: entry for entry in catalog.entries}
+    for entry in by_name.values():
+        if entry.name in skipped_names:
+            continue
+        plan.trees.append(
+            plan_tree_incremental(entry.source, dst / entry.name, manifest, entry.files)
+        )
+    managed = {rel.split("/", 1)[0] for rel in manifest.files}
+    plan.removed = sorted(managed - by_name.keys())
+
+    for origin in catalog.team_dirs:
+        if origin in unchanged:
+            continue
+        state = catalog.tree_state(origin)
+        plan.tree_records[origin] = state.tree if state is not None and not state.dirty else None
+    for origin in manifest.trees.keys() - catalog.team_dirs.keys():
+        plan.tree_records[origin] = None
+    return plan
+
+
+def _codex_skill_mds(plan: SkillsPlan) -> list[tuple[Path, str]]:
+    """Codex 계획에서 새로 쓸 SKILL.md (소스, 스킬 이름) 목록 (정규화 헤더 캐시 준비용)"""
+    if writer_id(plan.copy_file_fn) != writer_id(copy_skill_file_for_codex):
+        return []
+    return [
+        (src_file, (tree.dst / rel_path).parent.name)
+        for tree in plan.trees
+        for rel_path, src_file, changed in tree.entries
+        if changed and src_file.name == "SKILL.md"
+    ]
+
+
+def apply_skills_plan(plan: SkillsPlan) -> None:
+    """스킬 계획 실행 후 매니페스트 저장.
+
+    Codex 계획은 바뀐 SKILL.md의 정규화 헤더를 먼저 워커 풀에서 한꺼번에 만들어 두므로
+    트리를 차례로 적용할 때는 캐시만 읽는다.
+    """
+    plan.dst.mkdir(parents=True, exist_ok=True)
+    sweep_stale_staging(plan.dst)
+    prime_normalized_skill_cache(_codex_skill_mds(plan))
+    manifest = plan.manifest
+    try:
+        for tree in plan.trees:
+            if plan.store is not None:
+                _apply_tree_to_store(tree, manifest, plan.copy_file_fn, plan.store)
+            else:
+                apply_tree_plan(tree, manifest, plan.copy_file_fn)
+        for name in plan.removed:
+            _remove_skill_tree(plan.dst, name, manifest)
+        for origin, tree_oid in plan.tree_records.items():
+            if tree_oid is not None:
+                manifest.trees[origin] = tree_oid
+            else:
+                manifest.trees.pop(origin, None)
+            manifest.dirty = True
+    finally:
+        manifest.save()
+
+
+def _remove_skill_tree(dst: Path, name: str, manifest: SyncManifest) -> None:
+    """매니페스트가 관리하던 스킬 디렉토리(또는 store 링크)와 그 기록을 제거.
+
+    디렉토리는 staging으로 옮긴 뒤 백그라운드에서 지운다.
+    """
+    for rel in manifest.tree_entries(name):
+        del manifest.files[rel]
+    manifest.dirty = True
+    target = dst / name
+    if os.path.lexists(target):
+        staging = new_staging_dir(target)
+        os.rename(target, staging)
+        discard_async(staging.parent)
+
+
+def _apply_tree_to_store(
+    tree: TreePlan,
+    manifest: SyncManifest,
+    copy_file_fn: Callable[[Path, Path], object],
+    store: SkillStore,
+) -> bool:
+    """스킬 트리를 store 객체로 만들고 대상 디렉토리를 그 객체의 링크로 교체.
+
+    digest는 소스 파일 해시로 계산하므로 같은 스킬을 쓰는 다른 대상(다른 홈 포함)은
+    객체를 다시 만들지 않고 링크만 건다. 이미 같은 객체를 가리키면 아무것도 하지 않는다.
+
+    Returns:
+        링크를 새로 걸었으면 True
+    """
+    from .skill_store import output_version, tree_digest
+
+    name = tree.dst.name
+    digest_files: list[tuple[str, str, bool]] = []
+    for rel_path, src_file, _changed in tree.entries:
+        key = f"{name}/{rel_path}"
+        record = tree.records.get(key) or manifest.files.get(key)
+        sha = record.sha256 if record is not None else file_sha256(src_file)
+        executable = bool(src_file.stat().st_mode & 0o111)
+        digest_files.append((rel_path, sha, executable))
+    digest = tree_digest(output_version(copy_file_fn), name, digest_files)
+
+    relinked = not store.points_to(tree.dst, digest)
+    if relinked:
+        files = [(rel_path, src_file) for rel_path, src_file, _changed in tree.entries]
+        store.ensure(digest, name, files, copy_file_fn)
+        store.link(tree.dst, digest)
+    record_tree_plan(tree, manifest)
+    return relinked
+
+
+def apply_skills_plans(plans: Iterable[SkillsPlan], max_workers: int = 4) -> None:
+    """여러 스킬 계획을 대상 장치별로 묶어 실행.
+
+    같은 장치의 계획은 한 스레드에서 차례로, 서로 다른 장치는 병렬로 실행한다.
+    (한 디스크에 동시에 쓰기를 몰지 않으면서 장치 간 I/O는 겹친다)
+    """
+    batches: dict[int, list[SkillsPlan]] = defaultdict(list)
+    for plan in plans:
+        batches[device_of(plan.dst)].append(plan)
+    if not batches:
+        return
+
+    def _run(batch: list[SkillsPlan]) -> None:
+        for plan in batch:
+            apply_skills_plan(plan)
+
+    if len(batches) == 1 or max_workers <= 1:
+        for batch in batches.values():
+            _run(batch)
+        return
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(batches))) as pool:
+        for future in [pool.submit(_run, batch) for batch in batches.values()]:
+            future.result()
+
+
+@dataclass
+class SyncPlan:
+    """sync 전체의 변경 계획 (미리보기와 실행 공용)."""
+
+    ops: list[PlanOp] = field(default_factory=list)
+    skills: list[SkillsPlan] = field(default_factory=list)
+
+    def add(self, op: PlanOp | None) -> None:
+        if op is not None:
+            self.ops.append(op)
+
+    def add_skills(self, plan: SkillsPlan) -> None:
+        self.skills.append(plan)
+        self.ops.extend(plan.ops)
+
+    @property
+    def empty(self) -> bool:
+        return not self.ops
+
+    def totals(self) -> dict[str, dict[str, int]]:
+        """작업 종류별 개수와 바이트 합계."""
+        result: dict[str, dict[str, int]] = {kind: {"count": 0, "bytes": 0} for kind in OP_KINDS}
+        for op in self.ops:
+            result[op.kind]["count"] += 1
+            result[op.kind]["bytes"] += op.size
+        return result
+
+    def by_device(self) -> dict[int, list[PlanOp]]:
+        """대상 장치별 작업 묶음 (실행 배치 단위)."""
+        batches: dict[int, list[PlanOp]] = defaultdict(list)
+        for op in self.ops:
+            batches[device_of(op.target)].append(op)
+        return dict(batches)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "ops": [op.to_dict() for op in self.ops],
+            "totals": self.totals(),
+            "devices": len(self.by_device()),
+        }
@@ -0,0 +1,178 @@
+"""Concurrent git updates for team skill repositories (cde-*skills)."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import os
+import signal
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+from .skill_catalog import find_team_skill_links
+
+# pull은 develop 브랜치에서만 수행 (작업 브랜치는 그대로 sync)
+PULL_BRANCH = "develop"
+DEFAULT_CONCURRENCY = 4
+DEFAULT_TIMEOUT = 60.0
+
+# 테스트에서 느린 git을 흉내내기 위해 교체 가능
+_GIT = "git"
+
+
+@dataclass
+class TeamRepoUpdate:
+    """팀 스킬 레포 한 개의 업데이트 결과.
+
+    status: updated | up-to-date | skipped | failed | timeout
+    """
+
+    name: str
+    repo_dir: Path
+    status: str
+    message: str
+    branch: str | None = None
+    old_head: str | None = None
+    new_head: str | None = None
+    files_changed: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.status not in ("failed", "timeout")
+
+    @property
+    def changed(self) -> bool:
+        return self.old_head is not None and self.old_head != self.new_head
+
+
+class _GitError(Exception):
+    pass
+
+
+async def _git(repo_dir: Path, *args: str) -> str:
+    """git 명령 실행 후 stdout 반환. 취소(타임아웃) 시 프로세스를 종료한다.
+
+    Raises:
+        _GitError: 종료 코드가 0이 아닐 때 (stderr 포함)
+    """
+    env = {**os.environ, "GIT_TERMINAL_PROMPT": "0"}  # 인증 프롬프트로 멈추지 않도록
+    proc = await asyncio.create_subprocess_exec(
+        _GIT,
+        *args,
+        cwd=repo_dir,
+        env=env,
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        start_new_session=True,  # 타임아웃 시 ssh/remote-https 등 자식까지 함께 종료
+    )
+    try:
+        stdout, stderr = await proc.communicate()
+    except asyncio.CancelledError:
+        with contextlib.suppress(ProcessLookupError):
+            os.killpg(proc.pid, signal.SIGKILL)
+        await proc.wait()
+        raise
+    if proc.returncode != 0:
+        raise _GitError(stderr.decode(errors="replace").strip())
+    return stdout.decode(errors="replace").strip()
+
+
+async def _update_repo(update: TeamRepoUpdate) -> None:
+    """develop 브랜치면 pull --ff-only 후 HEAD 변화와 변경 파일 수를 기록."""
+    repo_dir = update.repo_dir
+    update.branch = await _git(repo_dir, "rev-parse", "--abbrev-ref", "HEAD")
+    update.old_head = await _git(repo_dir, "rev-parse", "HEAD")
+    update.new_head = update.old_head
+
+    if update.branch != PULL_BRANCH:
+        update.status = "skipped"
+        update.message = f"on branch '{update.branch}', skipped pull"
+        return
+
+    await _git(repo_dir, "pull", "--ff-only")
+    update.new_head = await _git(repo_dir, "rev-parse", "HEAD")
+
+    if update.new_head == update.old_head:
+        update.status = "up-to-date"
+        update.message = "already up to date"
+        return
+
+    diff = await _git(repo_dir, "diff", "--name-only", update.old_head, update.new_head)
+    update.files_changed = len([line for line in diff.splitlines() if line])
+    update.status = "updated"
+    update.message = f"updated ({update.files_changed} files changed)"
+
+
+async def update_team_skill_repos_async(
+    project_root: Path,
+    skills_include: list[str] | None = None,
+    skills_exclude: list[str] | None = None,
+    *,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    timeout: float = DEFAULT_TIMEOUT,
+    on_progress: Callable[[TeamRepoUpdate], None] | None = None,
+) -> list[TeamRepoUpdate]:
+    """팀 스킬 레포들을 동시에 업데이트 (develop 브랜치일 때만 pull).
+
+    Args:
+        project_root: ai-env 프로젝트 루트
+        skills_include: 포함할 팀 스킬 디렉토리 이름
+        skills_exclude: 제외할 팀 스킬 디렉토리 이름
+        concurrency: 동시에 실행할 최대 레포 수
+        timeout: 레포당 제한 시간(초). 초과 시 git 프로세스를 종료하고 timeout으로 기록
+        on_progress: 레포 하나가 끝날 때마다 호출 (완료 순서)
+
+    Returns:
+        레포 이름순 TeamRepoUpdate 리스트
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def _run(name: str, repo_dir: Path) -> TeamRepoUpdate:
+        update = TeamRepoUpdate(name=name, repo_dir=repo_dir, status="failed", message="")
+        async with semaphore:
+            started = time.monotonic()
+            if not (repo_dir / ".git").exists():
+                update.status = "skipped"
+                update.message = "not a git repo, skipped"
+            else:
+                try:
+                    await asyncio.wait_for(_update_repo(update), timeout)
+                except TimeoutError:
+                    update.status = "timeout"
+                    update.message = f"timed out after {timeout:g}s"
+                except (_GitError, OSError) as e:
+                    update.status = "failed"
+                    update.message = f"failed: {e}"
+            update.elapsed = time.monotonic() - started
+        if on_progress is not None:
+            on_progress(update)
+        return update
+
+    links = find_team_skill_links(project_root, skills_include, skills_exclude)
+    return list(await asyncio.gather(*(_run(link.name, link.resolve()) for link in links)))
+
+
+def update_team_skill_repos(
+    project_root: Path,
+    skills_include: list[str] | None = None,
+    skills_exclude: list[str] | None = None,
+    *,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    timeout: float = DEFAULT_TIMEOUT,
+    on_progress: Callable[[TeamRepoUpdate], None] | None = None,
+) -> list[TeamRepoUpdate]:
+    """update_team_skill_repos_async의 동기 래퍼 (CLI용)."""
+    return asyncio.run(
+        update_team_skill_repos_async(
+            project_root,
+            skills_include,
+            skills_exclude,
+            concurrency=concurrency,
+            timeout=timeout,
+            on_progress=on_progress,
+        )
+    )
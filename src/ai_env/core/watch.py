@@ -0,0 +1,421 @@
+"""Watch mode: re-sync only the skills/files that changed (inotify with polling fallback)."""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import errno
+import functools
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Protocol
+
+from .codex_skills import copy_skill_file_for_codex
+from .file_copy import FileCopier
+from .output_writer import OutputWriter
+from .skill_catalog import SkillCatalog
+from .skill_store import SkillStore
+
+DEFAULT_DEBOUNCE = 0.15
+DEFAULT_POLL_INTERVAL = 0.5
+
+# 에디터 임시 파일 (vim swap, emacs lock, vim 쓰기 테스트 파일 등)은 동기화를 트리거하지 않음
+_IGNORED_SUFFIXES = (".swp", ".swx", ".swo", "~", ".tmp")
+_IGNORED_NAMES = {"4913", ".DS_Store"}
+
+# linux/inotify.h
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_WATCH_MASK = (
+    _IN_MODIFY
+    | _IN_ATTRIB
+    | _IN_CLOSE_WRITE
+    | _IN_MOVED_FROM
+    | _IN_MOVED_TO
+    | _IN_CREATE
+    | _IN_DELETE
+    | _IN_DELETE_SELF
+    | _IN_MOVE_SELF
+)
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class Watcher(Protocol):
+    """파일 변경 감시자. wait()는 timeout 동안 변경된 경로 집합을 반환한다."""
+
+    def wait(self, timeout: float) -> set[Path]: ...
+
+    def close(self) -> None: ...
+
+
+def _walk(root: Path) -> Iterable[tuple[str, list[str], list[str]]]:
+    """os.walk에서 .git 디렉토리는 제외 (flat 구조 팀 레포는 레포 루트를 감시)."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d != ".git"]
+        yield dirpath, dirnames, filenames
+
+
+class InotifyWatcher:
+    """Linux inotify 기반 재귀 감시 (ctypes, 추가 의존성 없음).
+
+    새로 생긴 디렉토리는 감시를 추가하고 그 안의 파일도 변경으로 보고한다.
+    이벤트 큐가 넘치면 감시 루트 전체를 변경으로 보고한다.
+
+    Raises:
+        OSError: inotify를 사용할 수 없을 때 (비 Linux, watch 한도 초과 등)
+    """
+
+    def __init__(self, roots: list[Path]):
+        if not sys.platform.startswith("linux"):
+            raise OSError(errno.ENOSYS, "inotify is only available on Linux")
+        libc_name = ctypes.util.find_library("c")
+        if not libc_name:
+            raise OSError(errno.ENOSYS, "libc not found")
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self._fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._roots = roots
+        self._wd_paths: dict[int, Path] = {}
+        try:
+            for root in roots:
+                self._add_tree(root)
+        except OSError:
+            self.close()
+            raise
+
+    def _add_watch(self, path: Path) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), _WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err in (errno.ENOENT, errno.ENOTDIR):  # 감시 전에 사라짐
+                return
+            raise OSError(err, f"inotify_add_watch failed: {path}")
+        self._wd_paths[wd] = path
+
+    def _add_tree(self, root: Path) -> set[Path]:
+        """root 하위 모든 디렉토리 감시 추가. 이미 있던 파일 경로를 반환."""
+        found: set[Path] = set()
+        for dirpath, _dirnames, filenames in _walk(root):
+            self._add_watch(Path(dirpath))
+            found.update(Path(dirpath) / name for name in filenames)
+        return found
+
+    def wait(self, timeout: float) -> set[Path]:
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+
+        changed: set[Path] = set()
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            raw_name = data[offset : offset + length].rstrip(b"\0")
+            offset += length
+
+            if mask & _IN_Q_OVERFLOW:
+                changed.update(self._roots)
+                continue
+            if mask & _IN_IGNORED:
+                self._wd_paths.pop(wd, None)
+                continue
+            base = self._wd_paths.get(wd)
+            if base is None:
+                continue
+            path = base / os.fsdecode(raw_name) if raw_name else base
+            changed.add(path)
+            if mask & _IN_ISDIR and mask & (_IN_CREATE | _IN_MOVED_TO):
+                try:
+                    changed.update(self._add_tree(path))
+                except OSError:
+                    changed.add(path)
+        return changed
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class PollingWatcher:
+    """stat 스냅샷 비교 기반 감시 (inotify를 쓸 수 없는 환경용)."""
+
+    def __init__(self, roots: list[Path], interval: float = DEFAULT_POLL_INTERVAL):
+        self._roots = roots
+        self._interval = interval
+        self._snapshot = self._scan()
+
+    def _scan(self) -> dict[Path, tuple[int, int]]:
+        snapshot: dict[Path, tuple[int, int]] = {}
+        for root in self._roots:
+            for dirpath, _dirnames, filenames in _walk(root):
+                for name in filenames:
+                    path = Path(dirpath) / name
+                    try:
+                        st = path.stat()
+                    except OSError:
+                        continue
+                    snapshot[path] = (st.st_mtime_ns, st.st_size)
+        return snapshot
+
+    def wait(self, timeout: float) -> set[Path]:
+        deadline = time.monotonic() + timeout
+        while True:
+            current = self._scan()
+            changed = {
+                path
+                for path in current.keys() | self._snapshot.keys()
+                if current.get(path) != self._snapshot.get(path)
+            }
+            self._snapshot = current
+            remaining = deadline - time.monotonic()
+            if changed or remaining <= 0:
+                return changed
+            time.sleep(min(self._interval, remaining))
+
+    def close(self) -> None:
+        pass
+
+
+def create_watcher(roots: list[Path], *, polling: bool = False) -> Watcher:
+    """inotify 감시자를 만들고, 사용할 수 없으면 polling으로 fallback."""
+    existing = [root for root in roots if root.is_dir()]
+    if not polling:
+        try:
+            return InotifyWatcher(existing)
+        except OSError:
+            pass
+    return PollingWatcher(existing)
+
+
+@dataclass
+class WatchPlan:
+    """변경 경로를 분류한 재동기화 계획."""
+
+    skills: set[str] = field(default_factory=set)
+    # 스킬 추가/삭제 또는 SKILL.md 변경 → AGENTS.md/GEMINI.md 스킬 인덱스 재생성
+    skills_index: bool = False
+    global_md: bool = False
+    settings: bool = False
+    commands: bool = False
+    hooks: bool = False
+
+    @property
+    def empty(self) -> bool:
+        return not (
+            self.skills
+            or self.skills_index
+            or self.global_md
+            or self.settings
+            or self.commands
+            or self.hooks
+        )
+
+
+def _is_ignored(path: Path) -> bool:
+    name = path.name
+    return name in _IGNORED_NAMES or name.endswith(_IGNORED_SUFFIXES) or name.startswith(".#")
+
+
+def watch_roots(project_root: Path, catalog: SkillCatalog) -> list[Path]:
+    """감시할 디렉토리: .claude/{global,commands,hooks,skills} + 팀 스킬 디렉토리."""
+    claude_dir = project_root / ".claude"
+    roots = [claude_dir / name for name in ("global", "commands", "hooks", "skills")]
+    roots.extend(catalog.team_dirs.values())
+    return roots
+
+
+def classify_changes(paths: Iterable[Path], project_root: Path, catalog: SkillCatalog) -> WatchPlan:
+    """변경 경로를 스킬 이름/설정 파일 단위 재동기화 계획으로 변환."""
+    claude_dir = project_root / ".claude"
+    skill_roots = [claude_dir / "skills", *catalog.team_dirs.values()]
+    plan = WatchPlan()
+
+    for path in paths:
+        if _is_ignored(path):
+            continue
+        if path.is_relative_to(claude_dir / "global"):
+            if path.name == "settings.json.template":
+                plan.settings = True
+            else:
+                plan.global_md = True
+            continue
+        if path.is_relative_to(claude_dir / "commands"):
+            plan.commands = True
+            continue
+        if path.is_relative_to(claude_dir / "hooks"):
+            plan.hooks = True
+            continue
+        for root in skill_roots:
+            if not path.is_relative_to(root):
+                continue
+            parts = path.relative_to(root).parts
+            if not parts:  # 스킬 루트 자체 (큐 overflow 등) → 전체
+                plan.skills.update(entry.name for entry in catalog.entries)
+                plan.skills_index = True
+            elif not parts[0].startswith((".", "_")):
+                plan.skills.add(parts[0])
+                if len(parts) == 1 or parts[1:] == ("SKILL.md",):
+                    plan.skills_index = True
+            break
+    return plan
+
+
+def apply_watch_plan(
+    plan: WatchPlan,
+    project_root: Path,
+    catalog: SkillCatalog,
+    *,
+    copier: FileCopier | None = None,
+    cmux_enabled: bool = True,
+    store: SkillStore | None = None,
+) -> list[str]:
+    """계획에 포함된 항목만 Claude/Codex(/Gemini 인덱스) 대상에 반영.
+
+    스킬은 store(None이면 settings.yaml의 sync.skill_store에 따름)가 있으면
+    전체 sync와 같이 store 객체 링크로 갱신한다.
+
+    Returns:
+        사람이 읽을 수 있는 변경 요약 목록
+    """
+    from .sync import (
+        _resolve_skill_store,
+        _sync_agent_global_md,
+        _sync_file_or_dir,
+        _sync_skill_subset,
+        _write_claude_settings,
+    )
+
+    copier = copier or FileCopier()
+    claude_dir = project_root / ".claude"
+    claude_target = Path.home() / ".claude"
+    messages: list[str] = []
+
+    if plan.global_md:
+        _sync_file_or_dir(
+            claude_dir / "global" / "CLAUDE.md", claude_target / "CLAUDE.md", copier=copier
+        )
+        messages.append("CLAUDE.md")
+    # 생성 파일은 내용이 바뀐 경우에만 쓰고 보고
+    writer = OutputWriter()
+    if plan.settings:
+        _write_claude_settings(
+            claude_dir / "global", claude_target, cmux_enabled, False, None, writer
+        )
+    if plan.commands:
+        desc, _ = _sync_file_or_dir(
+            claude_dir / "commands", claude_target / "commands", copier=copier
+        )
+        messages.append(desc or "commands/")
+    if plan.hooks:
+        desc, _ = _sync_file_or_dir(
+            claude_dir / "hooks", claude_target / "hooks", cmux_enabled=cmux_enabled, copier=copier
+        )
+        messages.append(desc or "hooks/")
+
+    if plan.skills:
+        targets: list[tuple[str, Path, Callable[[Path, Path], object]]] = [
+            ("claude", claude_target / "skills", copier),
+            (
+                "codex",
+                Path.home() / ".codex" / "skills",
+                functools.partial(copy_skill_file_for_codex, copy_file_fn=copier),
+            ),
+        ]
+        if store is None:
+            store = _resolve_skill_store()
+        for label, dst, copy_fn in targets:
+            changed = _sync_skill_subset(dst, catalog, plan.skills, copy_fn, store)
+            if changed:
+                messages.append(f"{label} skills: {', '.join(changed)}")
+
+    if plan.global_md or plan.skills_index:
+        for dir_name, filename in ((".codex", "AGENTS.md"), (".gemini", "GEMINI.md")):
+            _sync_agent_global_md(
+                dir_name,
+                filename,
+                False,
+                catalog.skills_include,
+                catalog.skills_exclude,
+                catalog,
+                writer=writer,
+            )
+    messages.extend(r.path.name for r in writer.results if r.status == "written")
+    return messages
+
+
+def run_watch(
+    project_root: Path,
+    skills_include: list[str] | None = None,
+    skills_exclude: list[str] | None = None,
+    *,
+    copier: FileCopier | None = None,
+    cmux_enabled: bool = True,
+    debounce: float = DEFAULT_DEBOUNCE,
+    polling: bool = False,
+    on_sync: Callable[[list[str], float], None] | None = None,
+    stop: threading.Event | None = None,
+) -> None:
+    """변경을 감시하며 영향받은 스킬/파일만 재동기화 (stop이 설정되거나 Ctrl-C까지).
+
+    변경이 멈춘 뒤 debounce 초 동안 추가 이벤트가 없으면 한 번에 반영한다.
+    팀 스킬 심링크 추가/삭제는 감시 루트가 바뀌므로 watch를 다시 시작해야 한다.
+
+    Args:
+        project_root: ai-env 프로젝트 루트
+        skills_include: 포함할 팀 스킬 디렉토리 이름
+        skills_exclude: 제외할 팀 스킬 디렉토리 이름
+        copier: 파일 복사 전략
+        cmux_enabled: hooks/settings.json 동기화 시 cmux 포함 여부
+        debounce: 이벤트 묶음 대기 시간(초)
+        polling: True면 inotify 대신 polling 사용
+        on_sync: 반영 후 (변경 요약, 이벤트→반영 소요 초)로 호출
+        stop: 종료 신호
+    """
+    catalog = SkillCatalog.scan(project_root, skills_include, skills_exclude)
+    watcher = create_watcher(watch_roots(project_root, catalog), polling=polling)
+    stop = stop or threading.Event()
+    try:
+        while not stop.is_set():
+            changed = watcher.wait(0.5)
+            if not changed:
+                continue
+            first_event = time.monotonic()
+            while more := watcher.wait(debounce):
+                changed |= more
+
+            catalog = SkillCatalog.scan(project_root, skills_include, skills_exclude)
+            plan = classify_changes(changed, project_root, catalog)
+            if plan.empty:
+                continue
+            messages = apply_watch_plan(
+                plan, project_root, catalog, copier=copier, cmux_enabled=cmux_enabled
+            )
+            if on_sync is not None:
+                on_sync(messages, time.monotonic() - first_event)
+    finally:
+        watcher.close()
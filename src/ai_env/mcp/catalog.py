@@ -0,0 +1,61 @@
+"""Cached MCP tool catalogs (initialize result + tools/list) used by the lazy shim."""
+
+from __future__ import annotations
+
+import json
+import os
+from collections.abc import Iterable
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from ..core.config import get_state_dir
+
+if TYPE_CHECKING:
+    from .probe import ProbeResult
+
+CATALOG_DIR_NAME = "mcp_catalog"
+
+
+def catalog_dir() -> Path:
+    """도구 카탈로그 캐시 디렉토리 (~/.ai-env/mcp_catalog)"""
+    return get_state_dir() / CATALOG_DIR_NAME
+
+
+def catalog_path(name: str, base: Path | None = None) -> Path:
+    return (base or catalog_dir()) / f"{name}.json"
+
+
+def load_catalog(name: str, base: Path | None = None) -> dict[str, Any] | None:
+    """캐시된 {"initialize": ..., "tools": [...]} (없거나 깨졌으면 None)"""
+    path = catalog_path(name, base)
+    try:
+        catalog = json.loads(path.read_text())
+    except (OSError, json.JSONDecodeError):
+        return None
+    if not isinstance(catalog, dict) or not isinstance(catalog.get("initialize"), dict):
+        return None
+    return catalog
+
+
+def save_catalog(name: str, catalog: dict[str, Any], base: Path | None = None) -> Path:
+    """카탈로그 저장 (임시 파일 + rename)"""
+    path = catalog_path(name, base)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(catalog, indent=2))
+    os.replace(tmp, path)
+    return path
+
+
+def save_probe_catalogs(results: Iterable[ProbeResult], base: Path | None = None) -> int:
+    """probe 결과 중 카탈로그가 있는 서버를 저장
+
+    Returns:
+        저장한 서버 수
+    """
+    saved = 0
+    for result in results:
+        if result.status == "ok" and result.catalog is not None:
+            save_catalog(result.name, result.catalog, base)
+            saved += 1
+    return saved
@@ -0,0 +1,112 @@
+"""Token footprint of MCP tool definitions and per-target tool allow/deny filters."""
+
+from __future__ import annotations
+
+import fnmatch
+import json
+import math
+from dataclasses import dataclass, field
+from typing import Any
+
+from ..core.config import MCPServerConfig
+
+# 도구 정의(JSON) 약 4자 = 1토큰 (토크나이저 없이 쓰는 근사치)
+CHARS_PER_TOKEN = 4
+# 클라이언트 설정에서 서버별 도구를 거를 수 있는 타겟
+# (codex: enabled_tools/disabled_tools, gemini: includeTools/excludeTools,
+#  claude_local: permissions.deny의 mcp__<server>__<tool>)
+TOOL_FILTER_TARGETS = frozenset({"codex", "gemini", "claude_local"})
+
+
+def estimate_tokens(tool: dict[str, Any]) -> int:
+    """도구 정의 하나가 에이전트 컨텍스트에서 차지하는 토큰 수 추정"""
+    text = json.dumps(tool, separators=(",", ":"), ensure_ascii=False)
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def tool_patterns(server: MCPServerConfig, target: str) -> tuple[list[str] | None, list[str]]:
+    """타겟에 적용할 (allow, deny) 패턴
+
+    allow는 타겟 키가 "*"보다 우선하고 (None이면 전체 허용), deny는 "*"와 타겟 키를 합친다.
+    """
+    allow = server.tool_allow.get(target, server.tool_allow.get("*"))
+    deny = [*server.tool_deny.get("*", []), *server.tool_deny.get(target, [])]
+    return allow, deny
+
+
+def _matches(name: str, patterns: list[str]) -> bool:
+    return any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns)
+
+
+def is_selected(tool: str, allow: list[str] | None, deny: list[str]) -> bool:
+    """allow/deny 패턴(도구 이름 또는 glob)을 통과하는 도구인지"""
+    return (allow is None or _matches(tool, allow)) and not _matches(tool, deny)
+
+
+def is_glob(pattern: str) -> bool:
+    """도구 이름이 아닌 glob 패턴인지"""
+    return any(c in pattern for c in "*?[")
+
+
+def expand_patterns(patterns: list[str], tools: list[str] | None) -> list[str]:
+    """패턴을 클라이언트 설정에 넣을 도구 이름으로 (glob은 카탈로그 도구 이름으로 확장)
+
+    카탈로그가 없으면 glob 패턴은 확장할 수 없어 빠진다.
+    """
+    names: list[str] = []
+    for pattern in patterns:
+        if not is_glob(pattern):
+            names.append(pattern)
+        elif tools is not None:
+            names.extend(t for t in tools if fnmatch.fnmatchcase(t, pattern))
+    return list(dict.fromkeys(names))
+
+
+@dataclass
+class ServerFootprint:
+    """서버 하나의 도구 정의 토큰 추정치"""
+
+    name: str
+    tools: dict[str, int] = field(default_factory=dict)  # 도구 이름 → 토큰
+    targets: dict[str, int] = field(default_factory=dict)  # 타겟 → 필터 적용 후 토큰
+    cached: bool = True  # 카탈로그가 있는지
+
+    @property
+    def tokens(self) -> int:
+        return sum(self.tools.values())
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "cached": self.cached,
+            "tools": len(self.tools),
+            "tokens": self.tokens,
+            "targets": self.targets,
+            "tool_tokens": dict(sorted(self.tools.items(), key=lambda item: -item[1])),
+        }
+
+
+def server_footprint(
+    name: str, server: MCPServerConfig, catalog: dict[str, Any] | None
+) -> ServerFootprint:
+    """카탈로그의 도구별 토큰과 타겟별 필터 적용 결과
+
+    필터를 지원하지 않는 타겟(Desktop 앱 등)은 전체 도구 토큰으로 계산한다.
+    """
+    if catalog is None:
+        return ServerFootprint(name, cached=False)
+    tools = {
+        tool["name"]: estimate_tokens(tool)
+        for tool in catalog.get("tools", [])
+        if isinstance(tool, dict) and isinstance(tool.get("name"), str)
+    }
+    result = ServerFootprint(name, tools)
+    for target in dict.fromkeys(server.targets):
+        if target not in TOOL_FILTER_TARGETS:
+            result.targets[target] = result.tokens
+            continue
+        allow, deny = tool_patterns(server, target)
+        result.targets[target] = sum(
+            tokens for tool, tokens in tools.items() if is_selected(tool, allow, deny)
+        )
+    return result
@@ -2,23 +2,68 @@
 
 from __future__ import annotations
 
+import copy
+import functools
+import hashlib
 import json
+import sqlite3
 import warnings
 from pathlib import Path
 from typing import Any
 
 from ..core import (
+    MCPConfig,
+    MCPResourceLimits,
     MCPServerConfig,
     SecretsManager,
+    Settings,
     expand_path,
     load_mcp_config,
     load_settings,
 )
+from ..core.output_writer import OutputWriter
+from .catalog import catalog_path, load_catalog
+from .footprint import expand_patterns, is_glob, is_selected, tool_patterns
+from .latency import LatencyStore
+from .output_manifest import OutputManifest
+from .pool import PoolState, is_docker_run
+from .resources import docker_limit_args, effective_limits, native_wrapper
 from .vibe import generate_shell_functions
 
+# 입력 fingerprint 형식 버전 (fingerprint에 넣는 항목이 바뀌면 올림)
+FINGERPRINT_VERSION = 1
+
+
+def _renderer_sources() -> list[Path]:
+    """렌더링 결과에 영향을 주는 모듈 파일
+
+    mcp 패키지 전체(생성 코드, 생성 코드가 쓰는 catalog/footprint/latency/pool/resources,
+    출력이 실행하는 shim/hub/pool/tap 진입점)와 설정 기본값(core/config), 환경변수 치환
+    (core/secrets). 모듈을 하나씩 나열하면 새 의존 모듈을 빠뜨리기 쉬우므로 패키지 단위로 본다.
+    """
+    package_dir = Path(__file__).parent
+    core_dir = package_dir.parent / "core"
+    return [*sorted(package_dir.glob("*.py")), core_dir / "config.py", core_dir / "secrets.py"]
+
+
+@functools.cache
+def _renderer_digest() -> str:
+    """생성 코드 해시 — ai-env를 업데이트하면 모든 출력을 다시 렌더링"""
+    digest = hashlib.sha256()
+    for module_file in _renderer_sources():
+        digest.update(module_file.name.encode())
+        with open(module_file, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
 
 class MCPConfigGenerator:
-    """MCP 설정 파일 생성기"""
+    """MCP 설정 파일 생성기
+
+    인스턴스 하나가 한 번의 실행(run) 동안의 렌더 그래프를 가진다: 타겟 → 서버 역색인,
+    서버별 해석 결과(환경변수 치환 포함), 타겟별 생성 결과를 한 번만 계산해 save_all,
+    render_all, doctor 드리프트 검사가 공유한다. 설정/시크릿이 바뀌면 새 인스턴스를 만든다.
+    """
 
     CODEX_DEFAULT_STARTUP_TIMEOUT_SEC = 30
     RM_RF_DENY_RULES = [
@@ -45,10 +90,59 @@ class MCPConfigGenerator:
         "AGIT_TOKEN": "AGIT_ACCESS_TOKEN",
     }
 
-    def __init__(self, secrets: SecretsManager):
+    # 출력 이름 → 생성 메서드 (codex/gemini는 글로벌·로컬 두 경로에 같은 내용을 씀)
+    OUTPUT_RENDERERS: dict[str, str] = {
+        "claude_desktop": "generate_claude_desktop",
+        "chatgpt_desktop": "generate_chatgpt_desktop",
+        "codex_desktop": "generate_codex_desktop",
+        "antigravity": "generate_antigravity",
+        "codex_global": "generate_codex",
+        "gemini_global": "generate_gemini",
+        "claude_local": "generate_claude_local",
+        "codex_local": "generate_codex",
+        "gemini_local": "generate_gemini",
+        "shell_exports": "_generate_shell_exports",
+    }
+    # 타겟별 서버 도구 필터 키 (allow, deny) — claude_local은 permissions.deny로 적용
+    TOOL_FILTER_KEYS: dict[str, tuple[str, str]] = {
+        "codex": ("enabled_tools", "disabled_tools"),
+        "gemini": ("includeTools", "excludeTools"),
+    }
+    # 생성 메서드 → 입력으로 쓰는 MCP 타겟 (fingerprint 계산용)
+    RENDERER_TARGETS: dict[str, str] = {
+        "generate_claude_desktop": "claude_desktop",
+        "generate_chatgpt_desktop": "chatgpt_desktop",
+        "generate_codex_desktop": "codex_desktop",
+        "generate_antigravity": "antigravity",
+        "generate_codex": "codex",
+        "generate_gemini": "gemini",
+        "generate_claude_local": "claude_local",
+    }
+
+    def __init__(
+        self,
+        secrets: SecretsManager,
+        mcp_config: MCPConfig | None = None,
+        settings: Settings | None = None,
+        latency: LatencyStore | None = None,
+    ):
         self.secrets = secrets
-        self.mcp_config = load_mcp_config()
-        self.settings = load_settings()
+        # 여러 사용자용으로 렌더링할 때는 한 번 로드한 설정을 공유
+        self.mcp_config = mcp_config if mcp_config is not None else load_mcp_config()
+        self.settings = settings if settings is not None else load_settings()
+        # 렌더 그래프 캐시 (인스턴스 수명 = 한 번의 실행)
+        self._target_index: dict[str, list[str]] | None = None
+        self._resolved: dict[str, dict[str, Any] | None] = {}
+        self._rendered: dict[str, str] = {}
+        self._fingerprints: dict[str, str] = {}
+        self._catalog_tools: dict[str, list[str] | None] = {}
+        # mcp_timeouts.adaptive일 때 측정 기록에서 계산한 서버별 startup_timeout_sec
+        self._latency = latency
+        self._measured: dict[str, int] | None = None
+        self._hub: frozenset[str] | None = None
+        self._shim: frozenset[str] | None = None
+        self._pool: frozenset[str] | None = None
+        self._tap: frozenset[str] | None = None
 
     def _substitute_env(self, value: str) -> str:
         """환경변수 치환"""
@@ -61,13 +155,247 @@ class MCPConfigGenerator:
     def _build_server_config(
         self, name: str, server: MCPServerConfig, target: str
     ) -> dict[str, Any] | None:
-        """단일 MCP 서버 설정 생성"""
+        """단일 MCP 서버 설정 생성 (서버 해석 결과는 타겟 간 공유, 반환값은 타겟별 깊은 사본)"""
         if not server.enabled:
             return None
 
         if target not in server.targets:
             return None
 
+        if name not in self._resolved:
+            self._resolved[name] = self._resolve_server(name, server)
+        resolved = self._resolved[name]
+        if resolved is None:
+            return None
+        if name in self._shim_set():
+            # 캐시된 카탈로그로 즉시 응답하고 첫 tools/call에서 서버(또는 hub)에 연결
+            config: dict[str, Any] = {
+                "command": self.settings.mcp_shim.command,
+                "args": ["mcp", "shim", name],
+            }
+        elif name in self._hub_set():
+            # 서버 명령/시크릿은 hub만 가지고, 클라이언트는 hub 소켓에 붙는 connector를 실행
+            config = {
+                "command": self.settings.mcp_hub.connect_command,
+                "args": ["mcp", "connect", name],
+            }
+        elif name in self._pool_set():
+            # 미리 만들어 둔 컨테이너에 `docker start -ai`로 붙음 (시크릿은 컨테이너에)
+            config = {
+                "command": self.settings.mcp_pool.command,
+                "args": ["mcp", "pool", "attach", name],
+            }
+        elif name in self._tap_set():
+            # 서버 앞에서 stdio를 그대로 중계하며 호출별 지연 시간/크기 기록
+            config = {
+                "command": self.settings.mcp_tap.command,
+                "args": [
+                    "mcp",
+                    "tap",
+                    name,
+                    *(["--record"] if self.settings.mcp_tap.record else []),
+                ],
+            }
+        else:
+            config = copy.deepcopy(resolved)
+
+        if target == "codex":
+            config["startup_timeout_sec"] = self.startup_timeout(name, server)
+
+        if target in self.TOOL_FILTER_KEYS and (server.tool_allow or server.tool_deny):
+            allow_key, deny_key = self.TOOL_FILTER_KEYS[target]
+            allow, deny = self.tool_filter(name, server, target)
+            if allow is not None:
+                config[allow_key] = allow
+            if deny:
+                config[deny_key] = deny
+
+        return config
+
+    def _catalog_tool_names(self, name: str) -> list[str] | None:
+        """캐시된 카탈로그의 도구 이름 (없으면 None, `ai-env mcp probe`/`footprint`가 저장)"""
+        if name not in self._catalog_tools:
+            catalog = load_catalog(name)
+            self._catalog_tools[name] = (
+                None
+                if catalog is None
+                else [t["name"] for t in catalog.get("tools", []) if isinstance(t, dict)]
+            )
+        return self._catalog_tools[name]
+
+    def tool_filter(
+        self, name: str, server: MCPServerConfig, target: str
+    ) -> tuple[list[str] | None, list[str]]:
+        """타겟 설정에 넣을 (허용 도구, 거부 도구) 이름 (glob은 카탈로그로 확장)
+
+        카탈로그가 없어 allow의 glob을 확장할 수 없으면 allow를 빼고 (전체 허용) 경고한다.
+        빈 허용 목록은 모든 도구를 끄기 때문.
+
+        Returns:
+            allow가 None이면 전체 허용
+        """
+        allow, deny = tool_patterns(server, target)
+        tools = self._catalog_tool_names(name)
+        if tools is None and allow is not None and any(is_glob(p) for p in allow):
+            self._warn_unexpanded(name, target, allow, deny)
+            allow = None
+        elif tools is None:
+            self._warn_unexpanded(name, target, [], deny)
+        return (
+            expand_patterns(allow, tools) if allow is not None else None,
+            expand_patterns(deny, tools),
+        )
+
+    def _claude_tool_deny_rules(self) -> list[str]:
+        """claude_local 서버 도구 필터 → permissions.deny 규칙 (mcp__<server>__<tool>)
+
+        Claude Code 설정에는 서버별 허용 목록이 없으므로 allow는 카탈로그에서
+        허용되지 않은 도구를 deny로 바꿔 적용한다 (카탈로그가 없으면 deny 이름만, 경고).
+        """
+        rules: list[str] = []
+        for name in self._servers_for_target("claude_local"):
+            server = self.mcp_config.mcp_servers[name]
+            if not (server.tool_allow or server.tool_deny):
+                continue
+            allow, deny = tool_patterns(server, "claude_local")
+            tools = self._catalog_tool_names(name)
+            denied = expand_patterns(deny, tools)
+            if tools is not None:
+                denied.extend(t for t in tools if not is_selected(t, allow, deny))
+            else:
+                self._warn_unexpanded(name, "claude_local", allow or [], deny)
+            rules.extend(f"mcp__{name}__{tool}" for tool in dict.fromkeys(denied))
+        return rules
+
+    @staticmethod
+    def _warn_unexpanded(name: str, target: str, allow: list[str], deny: list[str]) -> None:
+        """카탈로그가 없어 적용하지 못하는 도구 필터 경고 (무시되는 allow 전체, deny glob)"""
+        skipped = [*allow, *(p for p in deny if is_glob(p))]
+        if skipped:
+            warnings.warn(
+                f"MCP server {name}: no tool catalog, {target} filter ignores "
+                f"{', '.join(skipped)} (run `ai-env mcp probe {name}`)",
+                stacklevel=3,
+            )
+
+    def startup_timeout(self, name: str, server: MCPServerConfig) -> int:
+        """Codex startup_timeout_sec (yaml 지정값 > 측정 기반 값 > 기본 30초)"""
+        if server.startup_timeout_sec is not None:
+            return server.startup_timeout_sec
+        return self._measured_timeouts().get(name, self.CODEX_DEFAULT_STARTUP_TIMEOUT_SEC)
+
+    def _measured_timeouts(self) -> dict[str, int]:
+        """측정 기록 기반 제한 시간 (adaptive가 꺼져 있거나 기록을 못 읽으면 빈 dict)"""
+        if self._measured is None:
+            self._measured = {}
+            config = self.settings.mcp_timeouts
+            if config.adaptive:
+                store = self._latency or LatencyStore()
+                try:
+                    self._measured = store.timeouts(config)
+                except sqlite3.Error as e:
+                    warnings.warn(f"Ignoring MCP latency history: {e}", stacklevel=2)
+        return self._measured
+
+    def hub_servers(self) -> list[str]:
+        """공유 hub로 연결할 stdio 서버 (mcp_hub.enabled가 아니면 빈 목록)"""
+        hub = self.settings.mcp_hub
+        if not hub.enabled:
+            return []
+        return [
+            name
+            for name, server in self.mcp_config.mcp_servers.items()
+            if server.enabled and server.type != "sse" and (not hub.servers or name in hub.servers)
+        ]
+
+    def shim_servers(self) -> list[str]:
+        """지연 기동 shim으로 감쌀 stdio 서버 (카탈로그가 캐시된 서버만)"""
+        shim = self.settings.mcp_shim
+        if not shim.enabled:
+            return []
+        return [
+            name
+            for name, server in self.mcp_config.mcp_servers.items()
+            if server.enabled
+            and server.type != "sse"
+            and (not shim.servers or name in shim.servers)
+            and catalog_path(name).exists()
+        ]
+
+    def pool_candidates(self) -> list[str]:
+        """warm pool 대상 서버 (`docker run`으로 실행하는 활성 서버 중 mcp_pool.servers)"""
+        pool = self.settings.mcp_pool
+        return [
+            name
+            for name, server in self.mcp_config.mcp_servers.items()
+            if server.enabled
+            and server.type != "sse"
+            and server.command == "docker"
+            and server.args[:1] == ["run"]
+            and (not pool.servers or name in pool.servers)
+        ]
+
+    def pool_servers(self) -> list[str]:
+        """pool 컨테이너로 연결할 서버 (mcp_pool.enabled이고 `pool up`으로 pool을 만든 서버)"""
+        if not self.settings.mcp_pool.enabled:
+            return []
+        return [name for name in self.pool_candidates() if PoolState.load(name) is not None]
+
+    def tap_servers(self) -> list[str]:
+        """호출 기록 tap으로 감쌀 stdio 서버 (shim/hub/pool로 연결하는 서버 제외)"""
+        tap = self.settings.mcp_tap
+        if not tap.enabled:
+            return []
+        routed = self._shim_set() | self._hub_set() | self._pool_set()
+        return [
+            name
+            for name, server in self.mcp_config.mcp_servers.items()
+            if server.enabled
+            and server.type != "sse"
+            and (not tap.servers or name in tap.servers)
+            and name not in routed
+        ]
+
+    def _tap_set(self) -> frozenset[str]:
+        if self._tap is None:
+            self._tap = frozenset(self.tap_servers())
+        return self._tap
+
+    def _pool_set(self) -> frozenset[str]:
+        if self._pool is None:
+            self._pool = frozenset(self.pool_servers())
+        return self._pool
+
+    def _shim_set(self) -> frozenset[str]:
+        if self._shim is None:
+            self._shim = frozenset(self.shim_servers())
+        return self._shim
+
+    def _hub_set(self) -> frozenset[str]:
+        if self._hub is None:
+            self._hub = frozenset(self.hub_servers())
+        return self._hub
+
+    def resolve_server(self, name: str) -> dict[str, Any] | None:
+        """타겟과 무관한 서버 실행 설정 (probe 등 직접 기동용, 렌더 그래프 캐시 공유)
+
+        Returns:
+            stdio: {"command", "args", "env"?}, sse: {"type": "sse", "url"}.
+            비활성 서버이거나 SSE URL이 없으면 None
+
+        Raises:
+            KeyError: mcp_servers.yaml에 없는 서버
+        """
+        server = self.mcp_config.mcp_servers[name]
+        if not server.enabled:
+            return None
+        if name not in self._resolved:
+            self._resolved[name] = self._resolve_server(name, server)
+        resolved = self._resolved[name]
+        return copy.deepcopy(resolved) if resolved is not None else None
+
+    def _resolve_server(self, name: str, server: MCPServerConfig) -> dict[str, Any] | None:
+        """타겟과 무관한 서버 설정 (url/command/args/env 치환) — 서버당 한 번만 계산"""
         if server.type == "sse":
             url = self.secrets.get(server.url_env, "") if server.url_env else ""
             if not url:
@@ -99,21 +427,50 @@ class MCPConfigGenerator:
                 if env:
                     config["env"] = env
 
-        if target == "codex":
-            timeout = (
-                server.startup_timeout_sec
-                if server.startup_timeout_sec is not None
-                else self.CODEX_DEFAULT_STARTUP_TIMEOUT_SEC
-            )
-            config["startup_timeout_sec"] = timeout
+            limits = self.resource_limits(name)
+            if limits is not None:
+                # probe/hub/shim/pool/tap도 resolve 결과를 쓰므로 모두 같은 제한으로 실행
+                if is_docker_run(config):
+                    config["args"] = docker_limit_args(config["args"], limits)
+                else:
+                    config["command"], config["args"] = native_wrapper(
+                        config["command"],
+                        config["args"],
+                        limits,
+                        self.settings.mcp_resources.native,
+                    )
 
         return config
 
+    def resource_limits(self, name: str) -> MCPResourceLimits | None:
+        """서버의 자원 제한 (mcp_resources profile + 서버 resources, SSE 서버는 None)
+
+        Raises:
+            KeyError: mcp_servers.yaml에 없는 서버
+            ValueError: settings.yaml에 없는 profile
+        """
+        server = self.mcp_config.mcp_servers[name]
+        if server.type == "sse":
+            return None
+        return effective_limits(name, server, self.settings.mcp_resources)
+
+    def _servers_for_target(self, target: str) -> list[str]:
+        """타겟을 쓰는 활성 서버 이름 (역색인, mcp_servers.yaml 순서 유지)"""
+        if self._target_index is None:
+            index: dict[str, list[str]] = {}
+            for name, server in self.mcp_config.mcp_servers.items():
+                if not server.enabled:
+                    continue
+                for server_target in dict.fromkeys(server.targets):
+                    index.setdefault(server_target, []).append(name)
+            self._target_index = index
+        return self._target_index.get(target, [])
+
     def _generate_mcp_servers_for_target(self, target: str) -> dict[str, Any]:
         """특정 타겟용 MCP 서버 설정 생성 (공통 로직)"""
         servers = {}
-        for name, server in self.mcp_config.mcp_servers.items():
-            config = self._build_server_config(name, server, target)
+        for name in self._servers_for_target(target):
+            config = self._build_server_config(name, self.mcp_config.mcp_servers[name], target)
             if config:
                 servers[name] = config
         return servers
@@ -131,7 +488,7 @@ class MCPConfigGenerator:
         return {
             "permissions": {
                 "allow": self.CLAUDE_PERMISSION_ALLOW,
-                "deny": self.RM_RF_DENY_RULES,
+                "deny": [*self.RM_RF_DENY_RULES, *self._claude_tool_deny_rules()],
                 "ask": [],
                 "defaultMode": "acceptEdits",
             },
@@ -169,12 +526,14 @@ class MCPConfigGenerator:
                 lines.append(f'url = "{config["url"]}"')
                 if "startup_timeout_sec" in config:
                     lines.append(f"startup_timeout_sec = {config['startup_timeout_sec']}")
+                lines.extend(self._codex_tool_lines(config))
             else:
                 lines.append(f'command = "{config["command"]}"')
                 args_str = ", ".join(f'"{a}"' for a in config["args"])
                 lines.append(f"args = [{args_str}]")
                 if "startup_timeout_sec" in config:
                     lines.append(f"startup_timeout_sec = {config['startup_timeout_sec']}")
+                lines.extend(self._codex_tool_lines(config))
 
                 if "env" in config:
                     lines.append("")
@@ -186,13 +545,26 @@ class MCPConfigGenerator:
 
         return "\n".join(lines)
 
+    def _codex_tool_lines(self, config: dict[str, Any]) -> list[str]:
+        """config.toml 서버 테이블의 enabled_tools/disabled_tools 줄"""
+        lines = []
+        for key in self.TOOL_FILTER_KEYS["codex"]:
+            if key in config:
+                tools_str = ", ".join(f'"{t}"' for t in config[key])
+                lines.append(f"{key} = [{tools_str}]")
+        return lines
+
     def generate_gemini(self) -> dict[str, Any]:
         """Gemini CLI용 settings.json 생성"""
         servers = self._generate_mcp_servers_for_target("gemini")
 
         for name, config in servers.items():
             if config.get("type") == "sse":
-                servers[name] = {"url": config["url"]}
+                tool_keys = self.TOOL_FILTER_KEYS["gemini"]
+                servers[name] = {
+                    "url": config["url"],
+                    **{key: config[key] for key in tool_keys if key in config},
+                }
 
         return {"security": {"auth": {"selectedType": "oauth-personal"}}, "mcpServers": servers}
 
@@ -224,59 +596,168 @@ class MCPConfigGenerator:
             fallback_log_dir=self.settings.fallback_log_dir,
         )
 
-    def _save_config(
-        self, name: str, path_str: str, content: dict[str, Any] | str, dry_run: bool
-    ) -> Path:
-        """설정 파일 저장 (JSON 또는 텍스트)"""
-        path = expand_path(path_str)
-        if not dry_run:
-            try:
-                path.parent.mkdir(parents=True, exist_ok=True)
-                with open(path, "w") as f:
-                    if isinstance(content, dict | list):
-                        json.dump(content, f, indent=2)
-                    else:
-                        f.write(content)
-            except PermissionError as e:
-                raise PermissionError(f"Permission denied writing {name} to {path}") from e
-            except OSError as e:
-                raise OSError(f"Failed to write {name} to {path}: {e}") from e
+    def _generate_shell_exports(self) -> str:
+        """shell_exports.sh 내용 (환경변수 export + vibe 쉘 함수)"""
+        return self.secrets.export_to_shell() + "\n\n" + self.generate_shell_functions()
+
+    @staticmethod
+    def _serialize(content: dict[str, Any] | str) -> str:
+        """설정 내용을 파일에 쓸 텍스트로 변환 (JSON 또는 텍스트)"""
+        if isinstance(content, dict | list):
+            return json.dumps(content, indent=2)
+        return content
+
+    def _save_config(self, name: str, path: Path, text: str, writer: OutputWriter) -> Path:
+        """설정 파일 저장 (내용이 같으면 쓰지 않아 앱이 설정을 다시 읽지 않음)"""
+        try:
+            writer.write_text(path, text)
+        except PermissionError as e:
+            raise PermissionError(f"Permission denied writing {name} to {path}") from e
+        except OSError as e:
+            raise OSError(f"Failed to write {name} to {path}: {e}") from e
         return path
 
-    def save_all(self, dry_run: bool = False) -> dict[str, Path]:
-        """모든 설정 파일 저장"""
-        codex_config = self.generate_codex()
-        gemini_config = self.generate_gemini()
-
-        configs: list[tuple[str, str, Any]] = [
-            (
-                "claude_desktop",
-                self.settings.outputs.claude_desktop,
-                self.generate_claude_desktop(),
-            ),
-            (
-                "chatgpt_desktop",
-                self.settings.outputs.chatgpt_desktop,
-                self.generate_chatgpt_desktop(),
-            ),
-            (
-                "codex_desktop",
-                self.settings.outputs.codex_desktop,
-                self.generate_codex_desktop(),
-            ),
-            ("antigravity", self.settings.outputs.antigravity, self.generate_antigravity()),
-            ("codex_global", self.settings.outputs.codex_global, codex_config),
-            ("gemini_global", self.settings.outputs.gemini_global, gemini_config),
-            ("claude_local", self.settings.outputs.claude_local, self.generate_claude_local()),
-            ("codex_local", self.settings.outputs.codex_local, codex_config),
-            ("gemini_local", self.settings.outputs.gemini_local, gemini_config),
-            (
-                "shell_exports",
-                self.settings.outputs.shell_exports,
-                self.secrets.export_to_shell() + "\n\n" + self.generate_shell_functions(),
-            ),
-        ]
+    def render(self, name: str) -> str:
+        """출력 하나의 파일 내용 (같은 생성 메서드를 쓰는 출력끼리 결과 공유)
 
-        return {
-            name: self._save_config(name, path, content, dry_run) for name, path, content in configs
-        }
+        Raises:
+            KeyError: 알 수 없는 출력 이름
+        """
+        method = self.OUTPUT_RENDERERS[name]
+        if method not in self._rendered:
+            self._rendered[method] = self._serialize(getattr(self, method)())
+        return self._rendered[method]
+
+    def input_fingerprint(self, name: str) -> str:
+        """출력 하나를 만드는 입력의 fingerprint (같으면 render 결과도 같음)
+
+        그 출력의 타겟을 쓰는 서버 정의, 서버가 참조하는 환경변수(env_keys, url_env,
+        args의 ${VAR}) 값, hub/shim 설정, 관련 Settings 필드와 생성 코드만 포함한다.
+        다른 타겟 서버의 토큰이 바뀌어도 이 출력의 fingerprint는 그대로다.
+
+        Raises:
+            KeyError: 알 수 없는 출력 이름
+        """
+        method = self.OUTPUT_RENDERERS[name]
+        if method not in self._fingerprints:
+            digest = hashlib.sha256()
+
+            def add(*parts: object) -> None:
+                for part in parts:
+                    digest.update(str(part).encode())
+                    digest.update(b"\0")
+
+            add(FINGERPRINT_VERSION, _renderer_digest(), method)
+            if method == "_generate_shell_exports":
+                add(
+                    self.secrets.export_to_shell(),
+                    self.settings.agent_priority,
+                    self.settings.fallback_log_dir,
+                )
+            else:
+                target = self.RENDERER_TARGETS[method]
+                for server_name in self._servers_for_target(target):
+                    add(*self._server_inputs(server_name))
+                if target == "codex":
+                    add(
+                        self.settings.codex_model,
+                        self.settings.codex_model_reasoning_effort,
+                        sorted(self._resolve_codex_env().items()),
+                    )
+                    for server_name in self._servers_for_target(target):
+                        server = self.mcp_config.mcp_servers[server_name]
+                        add(self.startup_timeout(server_name, server))
+            self._fingerprints[method] = digest.hexdigest()
+        return self._fingerprints[method]
+
+    def _server_inputs(self, name: str) -> list[object]:
+        """서버 하나의 fingerprint 입력 (정의, 참조하는 환경변수 값, hub/shim 연결 방식)"""
+        server = self.mcp_config.mcp_servers[name]
+        keys = list(server.env_keys)
+        if server.url_env:
+            keys.append(server.url_env)
+        for arg in server.args:
+            keys.extend(self.secrets.referenced_keys(arg))
+        inputs: list[object] = [name, server.model_dump_json()]
+        limits = self.resource_limits(name)
+        if limits is not None:
+            inputs.append(
+                f"resources:{self.settings.mcp_resources.native}:{limits.model_dump_json()}"
+            )
+        if server.tool_allow or server.tool_deny:
+            inputs.append(self._catalog_tool_names(name))  # glob 확장/claude_local deny
+        inputs.extend(f"{key}={self.secrets.get(key, '')}" for key in dict.fromkeys(keys))
+        if name in self._shim_set():
+            inputs.append(f"shim:{self.settings.mcp_shim.command}")
+        elif name in self._hub_set():
+            inputs.append(f"hub:{self.settings.mcp_hub.connect_command}")
+        elif name in self._pool_set():
+            inputs.append(f"pool:{self.settings.mcp_pool.command}")
+        elif name in self._tap_set():
+            tap = self.settings.mcp_tap
+            inputs.append(f"tap:{tap.command}:{tap.record}")
+        return inputs
+
+    def _output_paths(
+        self, home: Path | None = None, names: list[str] | None = None
+    ) -> list[tuple[str, Path]]:
+        """출력 (이름, 경로) 목록 (render_all 참고)"""
+        paths = []
+        for name in self.OUTPUT_RENDERERS:
+            if names is not None and name not in names:
+                continue
+            path_str: str = getattr(self.settings.outputs, name)
+            if home is not None:
+                if not path_str.startswith("~/"):
+                    continue
+                paths.append((name, home / path_str[2:]))
+            else:
+                paths.append((name, expand_path(path_str)))
+        return paths
+
+    def render_all(
+        self, home: Path | None = None, names: list[str] | None = None
+    ) -> list[tuple[str, Path, str]]:
+        """모든 설정 파일의 (이름, 경로, 내용) 목록 (파일은 쓰지 않음)
+
+        Args:
+            home: 지정하면 홈 디렉토리(~/) 아래 출력만 이 경로 기준으로 반환
+                (프로젝트 로컬 출력과 shell_exports는 제외, --homes fan-out용)
+            names: 지정하면 이 출력만 (OUTPUT_RENDERERS 순서)
+        """
+        return [(name, path, self.render(name)) for name, path in self._output_paths(home, names)]
+
+    def save_all(
+        self,
+        dry_run: bool = False,
+        home: Path | None = None,
+        writer: OutputWriter | None = None,
+        manifest: OutputManifest | None = None,
+    ) -> dict[str, Path]:
+        """모든 설정 파일 저장 (home을 지정하면 그 홈 아래 출력만, render_all 참고)
+
+        Args:
+            dry_run: True면 실제 저장하지 않음 (writer를 주면 writer 설정을 따름)
+            home: 홈 디렉토리 fan-out 대상
+            writer: 출력 writer (written/unchanged 집계를 받으려면 전달)
+            manifest: 지정하면 입력 fingerprint가 기록과 같고 파일도 그대로인 출력은
+                렌더링하지 않고 unchanged로 기록 (증분 재생성, 실제로 쓴 뒤 매니페스트 저장)
+        """
+        writer = writer or OutputWriter(dry_run=dry_run)
+        results = {}
+        for name, path in self._output_paths(home):
+            if manifest is None:
+                results[name] = self._save_config(name, path, self.render(name), writer)
+                continue
+            fingerprint = self.input_fingerprint(name)
+            record = manifest.is_current(path, fingerprint)
+            if record is not None:
+                writer.skip(path, record.size)
+                results[name] = path
+                continue
+            results[name] = self._save_config(name, path, self.render(name), writer)
+            if not writer.dry_run:
+                manifest.update(path, fingerprint)
+        if manifest is not None and not writer.dry_run:
+            manifest.save()
+        return results
@@ -0,0 +1,340 @@
+"""Shared stdio MCP hub: one server instance per name, multiplexed over unix sockets."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import itertools
+import json
+import os
+import signal
+import socket
+import sys
+import threading
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from ..core.config import get_state_dir
+from .probe import STREAM_LIMIT, spawn, terminate
+
+HUB_DIR_NAME = "hub"
+_NO_CLIENT_ERROR = -32603
+
+
+def hub_dir() -> Path:
+    """hub 소켓 디렉토리 (~/.ai-env/hub)"""
+    return get_state_dir() / HUB_DIR_NAME
+
+
+def socket_path(name: str, base: Path | None = None) -> Path:
+    """서버 이름별 unix 소켓 경로"""
+    return (base or hub_dir()) / f"{name}.sock"
+
+
+def _encode(message: dict[str, Any]) -> bytes:
+    return json.dumps(message, separators=(",", ":")).encode() + b"\n"
+
+
+class _Client:
+    """hub에 연결된 클라이언트 하나 (connector 프로세스)
+
+    쓰기는 큐를 거치므로 느린 클라이언트가 서버 출력 라우팅을 막지 않는다.
+    """
+
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+        self.queue: asyncio.Queue[bytes | None] = asyncio.Queue()
+        self.task = asyncio.create_task(self._write_loop())
+
+    async def _write_loop(self) -> None:
+        with contextlib.suppress(ConnectionError):
+            while (data := await self.queue.get()) is not None:
+                self.writer.write(data)
+                await self.writer.drain()
+        self.writer.close()
+
+    def send(self, message: dict[str, Any]) -> None:
+        self.queue.put_nowait(_encode(message))
+
+    def close(self) -> None:
+        self.queue.put_nowait(None)
+
+
+class HubBackend:
+    """stdio 서버 하나와 그 서버를 공유하는 클라이언트들
+
+    클라이언트 요청 id를 hub 전용 id로 바꿔 서버에 보내고, 응답은 원래 클라이언트/id로
+    되돌린다. initialize는 서버에 한 번만 보내고 이후 클라이언트에는 캐시된 결과로 응답한다.
+    서버 알림은 모든 클라이언트에, 서버 → 클라이언트 요청(sampling 등)은 마지막으로
+    요청을 보낸 클라이언트에 전달한다.
+    """
+
+    def __init__(self, name: str, config: dict[str, Any]):
+        self.name = name
+        self.config = config
+        self.proc: asyncio.subprocess.Process | None = None
+        self.clients: set[_Client] = set()
+        self.spawn_count = 0
+        self._ids = itertools.count(1)
+        self._pending: dict[int, tuple[_Client, Any]] = {}
+        self._server_requests: dict[Any, _Client] = {}
+        self._init_id: int | None = None
+        self._init_result: dict[str, Any] | None = None
+        self._init_waiters: list[tuple[_Client, Any]] = []
+        self._initialized_sent = False
+        self._last_client: _Client | None = None
+        self._start_lock = asyncio.Lock()
+        self._reader: asyncio.Task[None] | None = None
+
+    @property
+    def running(self) -> bool:
+        return self.proc is not None and self.proc.returncode is None
+
+    async def ensure_started(self) -> None:
+        """서버가 떠 있지 않으면 기동 (동시에 여러 클라이언트가 붙어도 한 번만)"""
+        async with self._start_lock:
+            if self.running:
+                return
+            self._reset()
+            self.proc = await spawn(self.config, stderr=None)
+            self.spawn_count += 1
+            self._reader = asyncio.create_task(self._read_loop(self.proc))
+
+    def _reset(self) -> None:
+        self._pending.clear()
+        self._server_requests.clear()
+        self._init_id = None
+        self._init_result = None
+        self._init_waiters.clear()
+        self._initialized_sent = False
+
+    async def stop(self) -> None:
+        for client in list(self.clients):
+            client.close()
+        self.clients.clear()
+        if self.proc is not None:
+            await terminate(self.proc)
+        if self._reader is not None:
+            self._reader.cancel()
+
+    def _to_server(self, message: dict[str, Any]) -> None:
+        if self.proc is None or self.proc.stdin is None or self.proc.stdin.is_closing():
+            return
+        self.proc.stdin.write(_encode(message))
+
+    async def _read_loop(self, proc: asyncio.subprocess.Process) -> None:
+        assert proc.stdout is not None
+        while line := await proc.stdout.readline():
+            try:
+                message = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # 서버가 stdout에 찍은 로그
+            if isinstance(message, dict):
+                self._from_server(message)
+        # 서버 종료: 클라이언트 연결을 끊어 클라이언트가 재연결(→ 재기동)하게 한다
+        for client in list(self.clients):
+            client.close()
+        self.clients.clear()
+
+    def _from_server(self, message: dict[str, Any]) -> None:
+        msg_id = message.get("id")
+        if "method" not in message and msg_id is not None:
+            if msg_id == self._init_id:
+                self._init_result = message.get("result")
+                for client, client_id in self._init_waiters:
+                    client.send({**message, "id": client_id})
+                self._init_waiters.clear()
+                if self._init_result is None:  # 에러 응답이면 다음 클라이언트가 다시 시도
+                    self._init_id = None
+            elif msg_id in self._pending:
+                client, client_id = self._pending.pop(msg_id)
+                client.send({**message, "id": client_id})
+        elif "method" in message and msg_id is not None:
+            target = self._last_client if self._last_client in self.clients else None
+            if target is None:
+                error = {"code": _NO_CLIENT_ERROR, "message": "no client connected to hub"}
+                self._to_server({"jsonrpc": "2.0", "id": msg_id, "error": error})
+                return
+            self._server_requests[msg_id] = target
+            target.send(message)
+        else:
+            for client in self.clients:
+                client.send(message)
+
+    def from_client(self, client: _Client, message: dict[str, Any]) -> None:
+        """클라이언트 메시지를 id를 바꿔 서버로 전달"""
+        method = message.get("method")
+        msg_id = message.get("id")
+        if method == "initialize":
+            if self._init_result is not None:
+                client.send({"jsonrpc": "2.0", "id": msg_id, "result": self._init_result})
+                return
+            self._init_waiters.append((client, msg_id))
+            if self._init_id is None:
+                self._init_id = next(self._ids)
+                self._to_server({**message, "id": self._init_id})
+            return
+        if method == "notifications/initialized":
+            if not self._initialized_sent:
+                self._initialized_sent = True
+                self._to_server(message)
+            return
+        if method == "notifications/cancelled":
+            params = message.get("params") or {}
+            hub_id = self._hub_id(client, params.get("requestId"))
+            if hub_id is not None:
+                self._pending.pop(hub_id, None)
+                self._to_server({**message, "params": {**params, "requestId": hub_id}})
+            return
+        if method is not None and msg_id is not None:
+            hub_id = next(self._ids)
+            self._pending[hub_id] = (client, msg_id)
+            self._last_client = client
+            self._to_server({**message, "id": hub_id})
+            return
+        if method is None and msg_id is not None:
+            # 서버 → 클라이언트 요청에 대한 응답 (id는 서버가 정한 그대로)
+            if self._server_requests.pop(msg_id, None) is client:
+                self._to_server(message)
+            return
+        self._to_server(message)
+
+    def _hub_id(self, client: _Client, client_id: Any) -> int | None:
+        for hub_id, (owner, original) in self._pending.items():
+            if owner is client and original == client_id:
+                return hub_id
+        return None
+
+    def detach(self, client: _Client) -> None:
+        """연결이 끊긴 클라이언트의 미완료 요청은 서버에 취소 알림"""
+        self.clients.discard(client)
+        for hub_id in [h for h, (owner, _) in self._pending.items() if owner is client]:
+            del self._pending[hub_id]
+            self._to_server(
+                {
+                    "jsonrpc": "2.0",
+                    "method": "notifications/cancelled",
+                    "params": {"requestId": hub_id, "reason": "client disconnected"},
+                }
+            )
+        self._init_waiters = [(c, i) for c, i in self._init_waiters if c is not client]
+        self._server_requests = {k: c for k, c in self._server_requests.items() if c is not client}
+        client.close()
+
+    async def serve_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """connector 연결 하나 처리 (줄 단위 JSON-RPC)"""
+        client = _Client(writer)
+        try:
+            await self.ensure_started()
+        except OSError as e:
+            error = {"code": _NO_CLIENT_ERROR, "message": f"failed to start {self.name}: {e}"}
+            client.send({"jsonrpc": "2.0", "id": None, "error": error})
+            client.close()
+            return
+        self.clients.add(client)
+        try:
+            while line := await reader.readline():
+                try:
+                    message = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(message, dict):
+                    self.from_client(client, message)
+        except (ConnectionError, asyncio.LimitOverrunError):
+            pass
+        finally:
+            self.detach(client)
+
+
+class MCPHub:
+    """stdio 서버별 unix 소켓을 열고 연결을 HubBackend로 넘기는 hub 프로세스"""
+
+    def __init__(self, configs: dict[str, dict[str, Any]], base: Path | None = None):
+        self.base = base or hub_dir()
+        self.backends = {name: HubBackend(name, config) for name, config in configs.items()}
+        self._servers: list[asyncio.Server] = []
+
+    async def start(self, eager: bool = False) -> None:
+        """소켓 열기 (eager면 서버도 미리 기동)
+
+        Raises:
+            RuntimeError: 같은 소켓을 쓰는 hub가 이미 실행 중
+        """
+        self.base.mkdir(parents=True, exist_ok=True)
+        self.base.chmod(0o700)  # 소켓을 통해 시크릿이 담긴 서버에 접근하므로 소유자만
+        for name, backend in self.backends.items():
+            path = socket_path(name, self.base)
+            if path.exists():
+                if _is_listening(path):
+                    raise RuntimeError(f"MCP hub already serving {name} at {path}")
+                path.unlink()
+            server = await asyncio.start_unix_server(
+                backend.serve_client, path=str(path), limit=STREAM_LIMIT
+            )
+            self._servers.append(server)
+        if eager:
+            await asyncio.gather(*(b.ensure_started() for b in self.backends.values()))
+
+    async def stop(self) -> None:
+        for server in self._servers:
+            server.close()
+        await asyncio.gather(*(b.stop() for b in self.backends.values()))
+        for name in self.backends:
+            socket_path(name, self.base).unlink(missing_ok=True)
+
+    async def serve_forever(
+        self, eager: bool = False, on_ready: Callable[[], None] | None = None
+    ) -> None:
+        """SIGINT/SIGTERM을 받을 때까지 실행하고 서버들을 정리"""
+        await self.start(eager)
+        if on_ready is not None:
+            on_ready()
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop.set)
+        try:
+            await stop.wait()
+        finally:
+            await self.stop()
+
+
+def _is_listening(path: Path) -> bool:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(str(path))
+        except OSError:
+            return False
+    return True
+
+
+def connect(name: str, base: Path | None = None) -> bool:
+    """stdin/stdout을 hub 소켓에 중계 (클라이언트 설정의 `ai-env mcp connect <name>`)
+
+    Returns:
+        hub에 연결해 중계를 마쳤으면 True, hub가 없으면 False (호출자가 서버를 직접 실행)
+    """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(socket_path(name, base)))
+    except OSError:
+        sock.close()
+        return False
+
+    def _upstream() -> None:
+        with contextlib.suppress(OSError):
+            while data := os.read(sys.stdin.fileno(), 65536):
+                sock.sendall(data)
+        with contextlib.suppress(OSError):
+            sock.shutdown(socket.SHUT_WR)
+
+    threading.Thread(target=_upstream, daemon=True).start()
+    out = sys.stdout.buffer
+    with sock, contextlib.suppress(OSError):
+        while data := sock.recv(65536):
+            out.write(data)
+            out.flush()
+    return True
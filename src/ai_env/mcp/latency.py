@@ -0,0 +1,163 @@
+"""Persisted MCP startup latency history and percentile-based timeout tuning."""
+
+from __future__ import annotations
+
+import contextlib
+import math
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from ..core.config import MCPTimeoutConfig, get_state_dir
+
+if TYPE_CHECKING:
+    from .probe import ProbeResult
+
+LATENCY_DB_NAME = "mcp_latency.sqlite3"
+# 서버당 보관할 최대 샘플 수 (오래된 것부터 삭제)
+MAX_SAMPLES_PER_SERVER = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS samples (
+    server TEXT NOT NULL,
+    ts REAL NOT NULL,
+    seconds REAL NOT NULL,
+    status TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS samples_server_ts ON samples (server, ts);
+"""
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """nearest-rank 백분위수 (values는 비어 있지 않아야 함)"""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+@dataclass
+class LatencySummary:
+    """서버 하나의 최근 기동 시간 요약"""
+
+    server: str
+    samples: int
+    timeouts: int
+    p50: float | None
+    p_value: float | None  # 설정된 percentile 값
+    suggested: int | None  # 샘플이 부족하면 None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "server": self.server,
+            "samples": self.samples,
+            "timeouts": self.timeouts,
+            "p50": round(self.p50, 3) if self.p50 is not None else None,
+            "p_value": round(self.p_value, 3) if self.p_value is not None else None,
+            "suggested_timeout_sec": self.suggested,
+        }
+
+
+class LatencyStore:
+    """MCP 서버 기동(→ initialize 응답) 시간 시계열 (~/.ai-env/mcp_latency.sqlite3)
+
+    `ai-env mcp probe`가 측정값을 쌓고, generator가 최근 샘플의 백분위수 × margin으로
+    서버별 startup_timeout_sec를 계산한다. timeout으로 끝난 probe는 제한 시간을 하한값으로
+    기록하므로, 반복해서 timeout되는 서버는 다음 계산에서 더 긴 제한 시간을 받는다.
+    """
+
+    def __init__(self, path: Path | None = None):
+        self.path = path or get_state_dir() / LATENCY_DB_NAME
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            conn.executescript(_SCHEMA)
+        except sqlite3.Error:
+            conn.close()
+            raise
+        return conn
+
+    def record(self, samples: Iterable[tuple[str, float, str]], now: float | None = None) -> int:
+        """(서버, 초, status) 샘플 저장 후 서버별 보관 한도를 넘는 오래된 샘플 삭제
+
+        Returns:
+            저장한 샘플 수
+        """
+        ts = now if now is not None else time.time()
+        rows = [(server, ts, seconds, status) for server, seconds, status in samples]
+        if not rows:
+            return 0
+        # Connection의 with는 commit/rollback만 하므로 closing으로 닫음
+        with self._lock, contextlib.closing(self._connect()) as conn, conn:
+            conn.executemany("INSERT INTO samples VALUES (?, ?, ?, ?)", rows)
+            for server in {row[0] for row in rows}:
+                conn.execute(
+                    "DELETE FROM samples WHERE server = ? AND rowid NOT IN "
+                    "(SELECT rowid FROM samples WHERE server = ? ORDER BY ts DESC LIMIT ?)",
+                    (server, server, MAX_SAMPLES_PER_SERVER),
+                )
+        return len(rows)
+
+    def record_probe(self, results: Iterable[ProbeResult]) -> int:
+        """probe 결과 저장 (ok는 기동 시간, timeout은 제한 시간을 하한값으로)"""
+        samples: list[tuple[str, float, str]] = []
+        for result in results:
+            if result.status == "ok" and result.ready_seconds is not None:
+                samples.append((result.name, result.ready_seconds, "ok"))
+            elif result.status == "timeout":
+                samples.append((result.name, result.elapsed, "timeout"))
+        return self.record(samples)
+
+    def history(self, window: int) -> dict[str, list[tuple[float, str]]]:
+        """서버별 최근 window개 샘플 (초, status), 최신순"""
+        if not self.path.exists():
+            return {}
+        with self._lock, contextlib.closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT server, seconds, status FROM ("
+                "  SELECT server, seconds, status, "
+                "  ROW_NUMBER() OVER (PARTITION BY server ORDER BY ts DESC) AS n FROM samples"
+                ") WHERE n <= ?",
+                (window,),
+            ).fetchall()
+        history: dict[str, list[tuple[float, str]]] = {}
+        for server, seconds, status in rows:
+            history.setdefault(server, []).append((seconds, status))
+        return history
+
+    def summarize(self, config: MCPTimeoutConfig) -> dict[str, LatencySummary]:
+        """서버별 최근 샘플 요약과 제안 제한 시간"""
+        summaries = {}
+        for server, samples in self.history(config.window).items():
+            values = [seconds for seconds, _status in samples]
+            p_value = percentile(values, config.percentile)
+            summaries[server] = LatencySummary(
+                server=server,
+                samples=len(values),
+                timeouts=sum(status == "timeout" for _seconds, status in samples),
+                p50=percentile(values, 50),
+                p_value=p_value,
+                suggested=(
+                    suggest_timeout(p_value, config) if len(values) >= config.min_samples else None
+                ),
+            )
+        return summaries
+
+    def timeouts(self, config: MCPTimeoutConfig) -> dict[str, int]:
+        """샘플이 충분한 서버의 제안 startup_timeout_sec"""
+        return {
+            server: summary.suggested
+            for server, summary in self.summarize(config).items()
+            if summary.suggested is not None
+        }
+
+
+def suggest_timeout(p_value: float, config: MCPTimeoutConfig) -> int:
+    """백분위수 × margin을 [min_sec, max_sec] 범위의 정수 초로"""
+    return min(config.max_sec, max(config.min_sec, math.ceil(p_value * config.margin)))
@@ -0,0 +1,91 @@
+"""Per-output input fingerprints for incremental MCP config regeneration."""
+
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from ..core.config import get_state_dir
+
+OUTPUT_MANIFEST_NAME = "mcp_outputs.json"
+OUTPUT_MANIFEST_VERSION = 1
+
+
+@dataclass
+class OutputRecord:
+    """마지막으로 생성한 출력 파일 하나의 입력 fingerprint와 파일 stat."""
+
+    fingerprint: str
+    size: int
+    mtime_ns: int
+
+
+@dataclass
+class OutputManifest:
+    """MCP 출력 파일별 입력 fingerprint 기록 (~/.ai-env/mcp_outputs.json).
+
+    `files`는 출력 파일 절대 경로를 키로, 그 파일을 만든 입력(서버 정의, 참조한 환경변수 값,
+    관련 설정)의 fingerprint와 생성 직후의 크기/mtime을 기록한다. fingerprint와 stat이 모두
+    같으면 다시 렌더링하지 않는다 (파일을 손으로 고쳤거나 지웠으면 stat이 달라져 다시 쓴다).
+    """
+
+    path: Path
+    files: dict[str, OutputRecord] = field(default_factory=dict)
+    dirty: bool = False
+
+    @classmethod
+    def load(cls, path: Path | None = None) -> OutputManifest:
+        """매니페스트 로드 (없거나 손상/버전 불일치 시 빈 매니페스트)."""
+        path = path or get_state_dir() / OUTPUT_MANIFEST_NAME
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return cls(path=path)
+        if not isinstance(data, dict) or data.get("version") != OUTPUT_MANIFEST_VERSION:
+            return cls(path=path, dirty=True)
+        try:
+            files = {key: OutputRecord(**record) for key, record in data.get("files", {}).items()}
+        except TypeError:
+            return cls(path=path, dirty=True)
+        return cls(path=path, files=files)
+
+    def is_current(self, output: Path, fingerprint: str) -> OutputRecord | None:
+        """출력이 같은 입력으로 만들어진 뒤 바뀌지 않았으면 그 기록, 아니면 None."""
+        record = self.files.get(str(output))
+        if record is None or record.fingerprint != fingerprint:
+            return None
+        try:
+            st = output.stat()
+        except OSError:
+            return None
+        if st.st_size != record.size or st.st_mtime_ns != record.mtime_ns:
+            return None
+        return record
+
+    def update(self, output: Path, fingerprint: str) -> None:
+        """방금 쓴(또는 내용이 같았던) 출력의 fingerprint와 stat 기록."""
+        try:
+            st = output.stat()
+        except OSError:
+            self.dirty = self.files.pop(str(output), None) is not None or self.dirty
+            return
+        record = OutputRecord(fingerprint, st.st_size, st.st_mtime_ns)
+        if self.files.get(str(output)) != record:
+            self.files[str(output)] = record
+            self.dirty = True
+
+    def save(self) -> None:
+        """변경이 있을 때만 매니페스트를 원자적으로 저장."""
+        if not self.dirty:
+            return
+        payload = {
+            "version": OUTPUT_MANIFEST_VERSION,
+            "files": {key: asdict(record) for key, record in sorted(self.files.items())},
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.tmp")
+        tmp_path.write_text(json.dumps(payload, indent=1) + "\n", encoding="utf-8")
+        os.replace(tmp_path, self.path)
+        self.dirty = False
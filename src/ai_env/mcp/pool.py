@@ -0,0 +1,278 @@
+"""Warm pool of pre-created, stopped containers for `docker run`-based MCP servers."""
+
+from __future__ import annotations
+
+import contextlib
+import fcntl
+import hashlib
+import json
+import os
+import subprocess
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from ..core.config import get_state_dir
+
+POOL_DIR_NAME = "pool"
+POOL_LABEL = "ai-env.pool"
+
+# `docker run` 옵션 중 값을 다음 인자로 받는 것 (이미지 위치를 찾는 데 필요)
+_VALUE_FLAGS = frozenset(
+    {
+        "-e", "--env", "--env-file", "-v", "--volume", "--mount", "-p", "--publish",
+        "-w", "--workdir", "-u", "--user", "-l", "--label", "--label-file", "-m",
+        "--memory", "-h", "--hostname", "--network", "--net", "--entrypoint", "--name",
+        "--platform", "--pull", "--add-host", "--cpus", "--dns", "--device", "--ulimit",
+        "--log-driver", "--log-opt", "--cap-add", "--cap-drop", "--security-opt",
+        "--tmpfs", "--shm-size", "--restart", "--stop-signal", "--stop-timeout",
+        "--user-ns", "--userns", "--ipc", "--pid", "--runtime", "--gpus", "--group-add",
+        "--expose", "--link", "--volumes-from", "--health-cmd", "--cidfile",
+        "--pids-limit", "--memory-swap", "--memory-reservation", "--cpu-shares",
+    }
+)  # fmt: skip
+# pool 컨테이너에 쓰면 안 되는 `docker run` 옵션 (값 없는 플래그)
+_DROP_FLAGS = frozenset({"--rm", "-d", "--detach"})
+
+
+def pool_dir() -> Path:
+    """pool 상태/잠금 디렉토리 (~/.ai-env/pool)"""
+    return get_state_dir() / POOL_DIR_NAME
+
+
+def is_docker_run(config: dict[str, Any]) -> bool:
+    """`docker run ...`으로 실행하는 stdio 서버 설정인지"""
+    command = config.get("command") or ""
+    return os.path.basename(command) == "docker" and config.get("args", [])[:1] == ["run"]
+
+
+def create_args(config: dict[str, Any], container: str, server: str) -> list[str]:
+    """`docker run` 설정을 pool 컨테이너용 `docker create` 인자로
+
+    --rm/-d/--name은 빼고, stdin을 붙일 수 있게 -i와 pool 라벨/이름을 붙인다.
+    이미지 뒤의 인자(서버 명령)는 그대로 둔다.
+
+    Raises:
+        ValueError: `docker run` 설정이 아니거나 이미지를 찾지 못함
+    """
+    if not is_docker_run(config):
+        raise ValueError(f"MCP server {server} is not started with `docker run`")
+    run_args = config["args"][1:]
+    options: list[str] = []
+    index = 0
+    while index < len(run_args):
+        arg = run_args[index]
+        if not arg.startswith("-") or arg == "-":
+            break
+        if arg in _DROP_FLAGS:
+            index += 1
+            continue
+        if arg == "--name":
+            index += 2
+            continue
+        if arg.startswith("--name="):
+            index += 1
+            continue
+        options.append(arg)
+        if arg in _VALUE_FLAGS:
+            options.append(run_args[index + 1] if index + 1 < len(run_args) else "")
+            index += 1
+        index += 1
+    if index >= len(run_args):
+        raise ValueError(f"MCP server {server}: no image in docker run args")
+    return [
+        "create",
+        "-i",
+        "--name",
+        container,
+        "--label",
+        f"{POOL_LABEL}={server}",
+        *options,
+        *run_args[index:],
+    ]
+
+
+def config_hash(config: dict[str, Any]) -> str:
+    """서버 실행 설정(명령/인자/env) 해시 — 시크릿이 바뀌면 pool을 다시 만들어야 함"""
+    payload = json.dumps(
+        {k: config.get(k) for k in ("command", "args", "env")}, sort_keys=True
+    ).encode()
+    return hashlib.sha256(payload).hexdigest()
+
+
+def container_name(server: str, index: int) -> str:
+    return f"ai-env-pool-{server}-{index}"
+
+
+@dataclass
+class PoolState:
+    """서버 하나의 pool 기록 (~/.ai-env/pool/<server>.json)"""
+
+    server: str
+    config_hash: str
+    containers: list[str] = field(default_factory=list)
+
+    @classmethod
+    def load(cls, server: str, base: Path | None = None) -> PoolState | None:
+        path = (base or pool_dir()) / f"{server}.json"
+        try:
+            return cls(**json.loads(path.read_text()))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def save(self, base: Path | None = None) -> None:
+        directory = base or pool_dir()
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{self.server}.json"
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(asdict(self), indent=2))
+        os.replace(tmp, path)
+
+    @staticmethod
+    def remove(server: str, base: Path | None = None) -> None:
+        ((base or pool_dir()) / f"{server}.json").unlink(missing_ok=True)
+
+
+@dataclass
+class ContainerStatus:
+    """pool 컨테이너 하나의 상태"""
+
+    server: str
+    container: str
+    status: str  # created/exited/running/... 또는 missing
+    in_use: bool = False  # attach 잠금을 누가 잡고 있는지
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+class ContainerPool:
+    """docker CLI로 pool 컨테이너를 만들고 지우고 조회
+
+    컨테이너는 `docker create`로 미리 만들어 두고(이미지 레이어 준비, 컨테이너 생성 비용을 선불),
+    클라이언트는 `docker start -ai <container>`로 붙는다. 클라이언트가 끝나면 컨테이너는 멈춘
+    상태로 돌아가 다음 attach에 재사용된다. 컨테이너에는 생성 시점의 env(시크릿)가 들어가므로
+    설정 해시가 바뀌면 attach는 pool을 쓰지 않고 `pool up`으로 다시 만들어야 한다.
+    """
+
+    def __init__(self, docker: str = "docker", base: Path | None = None):
+        self.docker = docker
+        self.base = base or pool_dir()
+
+    def _run(
+        self, args: list[str], env: dict[str, str] | None = None
+    ) -> subprocess.CompletedProcess[str]:
+        return subprocess.run(
+            [self.docker, *args],
+            capture_output=True,
+            text=True,
+            env={**os.environ, **env} if env else None,
+            check=False,
+        )
+
+    def inspect(self, container: str) -> str:
+        """컨테이너 상태 (없으면 "missing")"""
+        result = self._run(["container", "inspect", "--format", "{{.State.Status}}", container])
+        return result.stdout.strip() if result.returncode == 0 else "missing"
+
+    def up(self, server: str, config: dict[str, Any], size: int) -> PoolState:
+        """서버의 pool을 size개로 맞춤 (설정이 바뀌었으면 기존 컨테이너를 지우고 다시 생성)
+
+        Raises:
+            ValueError: `docker run` 서버가 아님
+            RuntimeError: docker create 실패
+        """
+        digest = config_hash(config)
+        previous = PoolState.load(server, self.base)
+        names = [container_name(server, i) for i in range(size)]
+        # 기록이 없거나 설정이 바뀌었으면 같은 이름의 기존 컨테이너도 다시 만든다
+        fresh = previous is not None and previous.config_hash == digest
+        for container in sorted(set(previous.containers if previous else []) - set(names)):
+            self._run(["rm", "-f", container])
+
+        env = config.get("env") or {}
+        for container in names:
+            if self.inspect(container) != "missing":
+                if fresh:
+                    continue
+                self._run(["rm", "-f", container])
+            result = self._run(create_args(config, container, server), env=env)
+            if result.returncode != 0:
+                raise RuntimeError(
+                    f"docker create failed for {server}: {result.stderr.strip() or result.stdout}"
+                )
+        state = PoolState(server, digest, names)
+        state.save(self.base)
+        return state
+
+    def down(self, server: str) -> int:
+        """서버의 pool 컨테이너 삭제
+
+        Returns:
+            삭제를 요청한 컨테이너 수
+        """
+        state = PoolState.load(server, self.base)
+        if state is None:
+            return 0
+        for container in state.containers:
+            self._run(["rm", "-f", container])
+        PoolState.remove(server, self.base)
+        return len(state.containers)
+
+    def status(self, server: str) -> list[ContainerStatus]:
+        state = PoolState.load(server, self.base)
+        if state is None:
+            return []
+        return [
+            ContainerStatus(
+                server, container, self.inspect(container), _is_locked(self._lock_path(container))
+            )
+            for container in state.containers
+        ]
+
+    def _lock_path(self, container: str) -> Path:
+        return self.base / f"{container}.lock"
+
+    def acquire(self, server: str, config: dict[str, Any]) -> tuple[str, int] | None:
+        """비어 있는 pool 컨테이너 하나를 잠금
+
+        잠금 fd는 exec 후에도 유지되도록 상속 가능하게 열어 두므로, `docker start -ai`가
+        끝날 때까지(= 클라이언트 세션 동안) 다른 클라이언트가 같은 컨테이너를 고르지 않는다.
+
+        Returns:
+            (컨테이너 이름, 잠금 fd). pool이 없거나 설정이 바뀌었거나 모두 사용 중이면 None
+        """
+        state = PoolState.load(server, self.base)
+        if state is None or state.config_hash != config_hash(config):
+            return None
+        self.base.mkdir(parents=True, exist_ok=True)
+        for container in state.containers:
+            fd = os.open(self._lock_path(container), os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                os.close(fd)
+                continue
+            os.set_inheritable(fd, True)
+            return container, fd
+        return None
+
+    def attach_argv(self, container: str) -> list[str]:
+        """pool 컨테이너에 stdio를 붙이는 명령 (`docker start -ai <container>`)"""
+        return [self.docker, "start", "-ai", container]
+
+
+def _is_locked(path: Path) -> bool:
+    if not path.exists():
+        return False
+    fd = os.open(path, os.O_RDWR)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return True
+    else:
+        with contextlib.suppress(OSError):
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        return False
+    finally:
+        os.close(fd)
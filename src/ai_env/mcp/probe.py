@@ -0,0 +1,372 @@
+"""Concurrent MCP server health probe (initialize + tools/list handshake)."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import os
+import signal
+import tempfile
+import time
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Literal
+from urllib.parse import urljoin
+
+import httpx
+
+from .generator import MCPConfigGenerator
+from .pool import is_docker_run
+from .resources import container_rss, process_group_rss
+
+PROTOCOL_VERSION = "2024-11-05"
+CLIENT_INFO = {"name": "ai-env-probe", "version": "0.1.0"}
+DEFAULT_TIMEOUT = 60.0  # 초 (서버별 startup_timeout_sec가 있으면 그 값)
+DEFAULT_CONCURRENCY = 16
+# 종료 시 stdin을 닫고 기다리는 시간 → SIGTERM → SIGKILL
+SHUTDOWN_GRACE = 2.0
+STDERR_TAIL = 2048
+# tools/list 응답이 한 줄로 크게 올 수 있음
+STREAM_LIMIT = 16 * 1024 * 1024
+
+ProbeStatus = Literal["ok", "failed", "timeout", "skipped"]
+
+
+@dataclass
+class ProbeResult:
+    """MCP 서버 하나의 probe 결과"""
+
+    name: str
+    type: str
+    status: ProbeStatus = "ok"
+    ready_seconds: float | None = None  # 기동(연결) → initialize 응답
+    tools: int | None = None
+    server_info: str | None = None  # serverInfo.name/version
+    error: str | None = None
+    elapsed: float = 0.0  # 종료까지 포함한 전체 시간
+    # tools/list 직후 메모리 사용량 (프로세스 그룹 RSS 합, docker run이면 컨테이너 사용량)
+    rss_bytes: int | None = None
+    # stdio 서버의 initialize 결과 + 전체 도구 목록 (mcp shim의 캐시용, to_dict에는 미포함)
+    catalog: dict[str, Any] | None = field(default=None, repr=False)
+
+    @property
+    def ok(self) -> bool:
+        return self.status in ("ok", "skipped")
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "type": self.type,
+            "status": self.status,
+            "ready_seconds": round(self.ready_seconds, 3)
+            if self.ready_seconds is not None
+            else None,
+            "tools": self.tools,
+            "server_info": self.server_info,
+            "error": self.error,
+            "elapsed": round(self.elapsed, 3),
+            "rss_bytes": self.rss_bytes,
+        }
+
+
+class _ProbeError(Exception):
+    pass
+
+
+def _request(request_id: int, method: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
+    message: dict[str, Any] = {"jsonrpc": "2.0", "id": request_id, "method": method}
+    if params is not None:
+        message["params"] = params
+    return message
+
+
+_INITIALIZE = _request(
+    1,
+    "initialize",
+    {"protocolVersion": PROTOCOL_VERSION, "capabilities": {}, "clientInfo": CLIENT_INFO},
+)
+_INITIALIZED = {"jsonrpc": "2.0", "method": "notifications/initialized"}
+_TOOLS_LIST = _request(2, "tools/list", {})
+# 도구 목록 페이지 최대 수 (nextCursor가 끝나지 않는 서버 방어)
+MAX_TOOL_PAGES = 20
+
+
+def _match_response(message: Any, request_id: int) -> dict[str, Any] | None:
+    """request_id에 대한 응답이면 result 반환 (알림/다른 요청은 None)
+
+    Raises:
+        _ProbeError: JSON-RPC 에러 응답
+    """
+    if not isinstance(message, dict) or message.get("id") != request_id:
+        return None
+    if "error" in message:
+        error = message["error"]
+        detail = error.get("message", error) if isinstance(error, dict) else error
+        raise _ProbeError(f"JSON-RPC error: {detail}")
+    result = message.get("result")
+    return result if isinstance(result, dict) else {}
+
+
+def _describe_server(result: dict[str, Any]) -> str | None:
+    info = result.get("serverInfo")
+    if not isinstance(info, dict) or not info.get("name"):
+        return None
+    return f"{info['name']} {info.get('version', '')}".strip()
+
+
+# ── stdio ──
+
+
+async def _read_response(stdout: asyncio.StreamReader, request_id: int) -> dict[str, Any]:
+    """stdout에서 request_id 응답이 올 때까지 읽기 (로그 줄/알림은 건너뜀)"""
+    while True:
+        line = await stdout.readline()
+        if not line:
+            raise _ProbeError("server closed stdout")
+        try:
+            message = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        result = _match_response(message, request_id)
+        if result is not None:
+            return result
+
+
+async def _drain_stderr(stderr: asyncio.StreamReader, tail: bytearray) -> None:
+    """stderr를 계속 읽어 파이프가 막히지 않게 하고 마지막 부분만 보관"""
+    while chunk := await stderr.read(4096):
+        tail.extend(chunk)
+        del tail[:-STDERR_TAIL]
+
+
+async def terminate(proc: asyncio.subprocess.Process) -> None:
+    """stdin을 닫아 정상 종료를 기다리고, 안 끝나면 프로세스 그룹에 SIGTERM → SIGKILL"""
+    if proc.stdin is not None and not proc.stdin.is_closing():
+        proc.stdin.close()
+    for sig in (None, signal.SIGTERM, signal.SIGKILL):
+        if sig is not None:
+            with contextlib.suppress(ProcessLookupError):
+                os.killpg(proc.pid, sig)
+        try:
+            await asyncio.wait_for(proc.wait(), SHUTDOWN_GRACE)
+            return
+        except TimeoutError:
+            continue
+
+
+async def spawn(
+    config: dict[str, Any], stderr: int | None = asyncio.subprocess.PIPE
+) -> asyncio.subprocess.Process:
+    """stdio 서버 기동 (resolve_server 결과 사용, 새 프로세스 그룹)
+
+    Args:
+        config: resolve_server 결과 ({"command", "args", "env"?})
+        stderr: 서버 stderr 처리 (None이면 호출 프로세스의 stderr를 그대로 사용)
+
+    Raises:
+        OSError: 실행 파일이 없거나 실행할 수 없음
+    """
+    return await asyncio.create_subprocess_exec(
+        config["command"],
+        *config.get("args", []),
+        env={**os.environ, **config.get("env", {})},
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=stderr,
+        start_new_session=True,  # docker run 등 자식 프로세스까지 함께 종료
+        limit=STREAM_LIMIT,
+    )
+
+
+async def _send(proc: asyncio.subprocess.Process, message: dict[str, Any]) -> None:
+    assert proc.stdin is not None
+    proc.stdin.write(json.dumps(message).encode() + b"\n")
+    await proc.stdin.drain()
+
+
+async def probe_stdio(name: str, config: dict[str, Any]) -> ProbeResult:
+    """stdio 서버를 기동해 initialize + tools/list 후 종료
+
+    취소(타임아웃)되어도 프로세스 그룹을 정리한다.
+    """
+    result = ProbeResult(name, "stdio")
+    # docker run이면 컨테이너 메모리 사용량을 docker stats로 읽기 위해 컨테이너 id를 기록
+    workdir = tempfile.TemporaryDirectory(prefix="ai-env-probe-") if is_docker_run(config) else None
+    cidfile = Path(workdir.name) / "cid" if workdir is not None else None
+    if cidfile is not None:
+        config = {**config, "args": ["run", "--cidfile", str(cidfile), *config["args"][1:]]}
+    start = time.perf_counter()
+    try:
+        proc = await spawn(config)
+    except OSError as e:
+        if workdir is not None:
+            workdir.cleanup()
+        result.status = "failed"
+        result.error = f"failed to start {config['command']}: {e.strerror or e}"
+        result.elapsed = time.perf_counter() - start
+        return result
+
+    assert proc.stdout is not None
+    assert proc.stderr is not None
+    stderr_tail = bytearray()
+    drain = asyncio.create_task(_drain_stderr(proc.stderr, stderr_tail))
+    try:
+        await _send(proc, _INITIALIZE)
+        init = await _read_response(proc.stdout, 1)
+        result.ready_seconds = time.perf_counter() - start
+        result.server_info = _describe_server(init)
+        await _send(proc, _INITIALIZED)
+        tools: list[Any] = []
+        cursor = None
+        for page in range(MAX_TOOL_PAGES):
+            request_id = 2 + page
+            params: dict[str, Any] = {"cursor": cursor} if cursor else {}
+            await _send(proc, _request(request_id, "tools/list", params))
+            listing = await _read_response(proc.stdout, request_id)
+            tools += listing.get("tools", [])
+            cursor = listing.get("nextCursor")
+            if not cursor:
+                break
+        result.tools = len(tools)
+        result.catalog = {"initialize": init, "tools": tools}
+        if cidfile is not None:
+            result.rss_bytes = await container_rss(config["command"], cidfile)
+        else:
+            result.rss_bytes = await process_group_rss(proc.pid)
+    except (_ProbeError, OSError) as e:
+        result.status = "failed"
+        stderr = stderr_tail.decode(errors="replace").strip().splitlines()
+        result.error = f"{e}: {stderr[-1]}" if stderr else str(e)
+    finally:
+        await terminate(proc)
+        drain.cancel()
+        if workdir is not None:
+            workdir.cleanup()
+        result.elapsed = time.perf_counter() - start
+    return result
+
+
+# ── SSE ──
+
+
+async def _sse_events(response: httpx.Response) -> AsyncIterator[tuple[str, str]]:
+    """SSE 스트림을 (event, data) 쌍으로 파싱"""
+    event = "message"
+    data: list[str] = []
+    async for line in response.aiter_lines():
+        if not line:
+            if data:
+                yield event, "\n".join(data)
+            event, data = "message", []
+        elif line.startswith("event:"):
+            event = line[6:].strip()
+        elif line.startswith("data:"):
+            data.append(line[5:].lstrip())
+
+
+async def probe_sse(name: str, config: dict[str, Any]) -> ProbeResult:
+    """SSE 서버에 연결해 endpoint 이벤트를 받고 initialize + tools/list"""
+    result = ProbeResult(name, "sse")
+    start = time.perf_counter()
+    url = config["url"]
+    try:
+        async with (
+            httpx.AsyncClient(timeout=httpx.Timeout(None, connect=30.0)) as client,
+            client.stream("GET", url, headers={"Accept": "text/event-stream"}) as response,
+        ):
+            response.raise_for_status()
+            events = _sse_events(response)
+            endpoint: str | None = None
+            async for event, data in events:
+                if event == "endpoint":
+                    endpoint = urljoin(url, data)
+                    break
+            if endpoint is None:
+                raise _ProbeError("stream closed before endpoint event")
+
+            pending = [(_INITIALIZE, 1), (_TOOLS_LIST, 2)]
+            for message, request_id in pending:
+                (await client.post(endpoint, json=message)).raise_for_status()
+                async for event, data in events:
+                    if event != "message":
+                        continue
+                    response_result = _match_response(json.loads(data), request_id)
+                    if response_result is None:
+                        continue
+                    if request_id == 1:
+                        result.ready_seconds = time.perf_counter() - start
+                        result.server_info = _describe_server(response_result)
+                        await client.post(endpoint, json=_INITIALIZED)
+                    else:
+                        result.tools = len(response_result.get("tools", []))
+                    break
+                else:
+                    raise _ProbeError("stream closed before response")
+    except (_ProbeError, httpx.HTTPError, json.JSONDecodeError) as e:
+        result.status = "failed"
+        result.error = str(e) or type(e).__name__
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+# ── 동시 실행 ──
+
+
+async def probe_servers(
+    generator: MCPConfigGenerator,
+    names: list[str] | None = None,
+    *,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    timeout: float | None = None,
+    on_progress: Callable[[ProbeResult], None] | None = None,
+) -> list[ProbeResult]:
+    """활성 MCP 서버들을 동시에 probe
+
+    전체 소요 시간은 대략 가장 느린 서버 하나의 기동 시간이다.
+
+    Args:
+        generator: 서버 설정 해석에 쓸 generator (env 치환 결과 공유)
+        names: probe할 서버 이름 (None이면 활성 서버 전체)
+        concurrency: 동시에 기동할 서버 수
+        timeout: 서버별 제한 시간 (None이면 startup_timeout_sec 또는 DEFAULT_TIMEOUT)
+        on_progress: 서버 하나가 끝날 때마다 호출 (완료 순서)
+
+    Returns:
+        mcp_servers.yaml 순서의 결과 목록
+
+    Raises:
+        ValueError: mcp_servers.yaml에 없는 서버 이름
+    """
+    servers = generator.mcp_config.mcp_servers
+    if names is None:
+        names = [name for name, server in servers.items() if server.enabled]
+    unknown = [name for name in names if name not in servers]
+    if unknown:
+        raise ValueError(f"Unknown MCP server(s): {', '.join(unknown)}")
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _probe(name: str) -> ProbeResult:
+        server = servers[name]
+        config = generator.resolve_server(name)
+        if config is None:
+            reason = "disabled" if not server.enabled else f"{server.url_env} not set"
+            result = ProbeResult(name, server.type, "skipped", error=reason)
+        else:
+            limit = timeout or server.startup_timeout_sec or DEFAULT_TIMEOUT
+            probe = probe_sse if server.type == "sse" else probe_stdio
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    result = await asyncio.wait_for(probe(name, config), limit)
+                except TimeoutError:
+                    result = ProbeResult(
+                        name, server.type, "timeout", error=f"no response in {limit:g}s"
+                    )
+                    result.elapsed = time.perf_counter() - start
+        if on_progress is not None:
+            on_progress(result)
+        return result
+
+    return list(await asyncio.gather(*(_probe(name) for name in names)))
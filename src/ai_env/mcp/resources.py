@@ -0,0 +1,152 @@
+"""Per-server resource limits (docker run flags / native wrappers) and RSS measurement."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import re
+from pathlib import Path
+from typing import Any
+
+from ..core.config import MCPResourceLimits, MCPResourcesConfig, MCPServerConfig
+
+_SIZE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([kmgt]?)(?:i?b)?\s*$", re.IGNORECASE)
+_UNITS = {"": 1, "k": 1024, "m": 1024**2, "g": 1024**3, "t": 1024**4}
+
+# docker run 자원 플래그 (mcp_servers.yaml args에 이미 있으면 그 값을 그대로 둠)
+_DOCKER_FLAGS = {"cpus": ("--cpus",), "memory": ("--memory", "-m"), "pids": ("--pids-limit",)}
+
+
+def parse_size(value: str) -> int:
+    """크기 문자열을 바이트로 ("512m", "1.5GiB", "2048" — 단위는 1024 기준)
+
+    Raises:
+        ValueError: 형식이 잘못됨
+    """
+    match = _SIZE.match(value)
+    if match is None:
+        raise ValueError(f"Invalid size: {value!r}")
+    return int(float(match.group(1)) * _UNITS[match.group(2).lower()])
+
+
+def effective_limits(
+    name: str, server: MCPServerConfig, config: MCPResourcesConfig
+) -> MCPResourceLimits | None:
+    """서버에 적용할 자원 제한 (profile 값 위에 서버에 직접 지정한 값을 덮어씀)
+
+    서버에 resources가 없으면 default_profile을 쓴다.
+
+    Returns:
+        제한이 하나도 없으면 None
+
+    Raises:
+        ValueError: settings.yaml에 없는 profile
+    """
+    own = server.resources
+    profile = own.profile if own is not None and own.profile else config.default_profile
+    values: dict[str, Any] = {}
+    if profile:
+        if profile not in config.profiles:
+            raise ValueError(f"MCP server {name}: unknown resource profile {profile!r}")
+        values.update(config.profiles[profile].model_dump(exclude_none=True))
+    if own is not None:
+        values.update(own.model_dump(exclude_none=True))
+    values.pop("profile", None)
+    if not values:
+        return None
+    return MCPResourceLimits(**values)
+
+
+def docker_limit_args(args: list[str], limits: MCPResourceLimits) -> list[str]:
+    """`docker run` 인자에 --cpus/--memory/--pids-limit 추가 (run 바로 뒤)"""
+    present = {arg.split("=", 1)[0] for arg in args}
+    flags: list[str] = []
+    values = {
+        "cpus": f"{limits.cpus:g}" if limits.cpus is not None else None,
+        "memory": str(parse_size(limits.memory)) if limits.memory is not None else None,
+        "pids": str(limits.pids) if limits.pids is not None else None,
+    }
+    for key, value in values.items():
+        names = _DOCKER_FLAGS[key]
+        if value is not None and not present.intersection(names):
+            flags += [names[0], value]
+    return [args[0], *flags, *args[1:]]
+
+
+def native_wrapper(
+    command: str, args: list[str], limits: MCPResourceLimits, mode: str
+) -> tuple[str, list[str]]:
+    """docker가 아닌 명령을 자원 제한 wrapper로 감쌈
+
+    - prlimit: 메모리는 주소 공간(RLIMIT_AS), pids는 사용자 전체 프로세스 수(RLIMIT_NPROC)라
+      근사치이며 CPU 제한은 없다. Node 같은 런타임은 큰 가상 메모리를 예약하므로 여유 있게 설정
+    - systemd-run: `--user --scope` cgroup으로 MemoryMax/TasksMax/CPUQuota를 정확히 적용 (Linux)
+
+    Returns:
+        (command, args). 적용할 제한이 없거나 mode가 off면 그대로
+    """
+    memory = parse_size(limits.memory) if limits.memory is not None else None
+    options: list[str] = []
+    if mode == "prlimit":
+        if memory is not None:
+            options.append(f"--as={memory}")
+        if limits.pids is not None:
+            options.append(f"--nproc={limits.pids}")
+    elif mode == "systemd-run":
+        properties = []
+        if memory is not None:
+            properties.append(f"MemoryMax={memory}")
+        if limits.pids is not None:
+            properties.append(f"TasksMax={limits.pids}")
+        if limits.cpus is not None:
+            properties.append(f"CPUQuota={round(limits.cpus * 100)}%")
+        if properties:
+            options = ["--user", "--scope", "--quiet", "--collect"]
+            for prop in properties:
+                options += ["-p", prop]
+    if not options:
+        return command, args
+    return mode, [*options, "--", command, *args]
+
+
+# ── RSS 측정 ──
+
+
+async def _output(*argv: str) -> str | None:
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *argv, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL
+        )
+    except OSError:
+        return None
+    stdout, _ = await proc.communicate()
+    return stdout.decode(errors="replace") if proc.returncode == 0 else None
+
+
+async def process_group_rss(pgid: int) -> int | None:
+    """프로세스 그룹 전체의 RSS 합 (바이트, `ps` 사용 — Linux/macOS 공통)"""
+    output = await _output("ps", "-A", "-o", "pgid=,rss=")
+    if output is None:
+        return None
+    total = 0
+    found = False
+    for line in output.splitlines():
+        fields = line.split()
+        if len(fields) == 2 and fields[0] == str(pgid) and fields[1].isdigit():
+            total += int(fields[1]) * 1024
+            found = True
+    return total if found else None
+
+
+async def container_rss(docker: str, cidfile: Path) -> int | None:
+    """`docker run --cidfile`로 기록된 컨테이너의 메모리 사용량 (docker stats, 바이트)"""
+    with contextlib.suppress(OSError):
+        container = cidfile.read_text().strip()
+        if container:
+            output = await _output(
+                docker, "stats", "--no-stream", "--format", "{{.MemUsage}}", container
+            )
+            if output:
+                with contextlib.suppress(ValueError):
+                    return parse_size(output.split("/", 1)[0])
+    return None
@@ -0,0 +1,239 @@
+"""Lazy-start stdio MCP shim: answer initialize/list requests from cache, spawn on first use."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import sys
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from .catalog import save_catalog
+from .hub import socket_path
+from .probe import STREAM_LIMIT, spawn, terminate
+
+# shim이 실제 서버에 보내는 initialize 요청 id (클라이언트 id와 겹치지 않게)
+_SHIM_INIT_ID = "ai-env-shim-initialize"
+_SHIM_TOOLS_ID = "ai-env-shim-tools"
+# 캐시로 응답하는 목록 메서드 → 결과/카탈로그 키 (카탈로그에 없으면 빈 목록)
+# 클라이언트는 시작할 때 initialize capabilities를 보고 목록을 모두 요청하므로 기동하지 않고 응답
+_LIST_METHODS = {
+    "tools/list": "tools",
+    "resources/list": "resources",
+    "resources/templates/list": "resourceTemplates",
+    "prompts/list": "prompts",
+}
+# 기동 후 빈 목록으로 응답했던 목록이 있으면 보내는 알림
+_LIST_CHANGED = {
+    "resources": "notifications/resources/list_changed",
+    "resourceTemplates": "notifications/resources/list_changed",
+    "prompts": "notifications/prompts/list_changed",
+}
+# 캐시만으로 응답하는 메서드 (그 외 요청이 오면 실제 서버를 기동)
+_LOCAL_METHODS = {"initialize", "ping", *_LIST_METHODS}
+
+
+def _encode(message: dict[str, Any]) -> bytes:
+    return json.dumps(message, separators=(",", ":")).encode() + b"\n"
+
+
+class LazyServer:
+    """캐시로 initialize/목록 요청에 응답하다가 첫 실제 요청에서 서버를 기동하는 shim
+
+    resources/prompts 목록은 카탈로그에 없으면 빈 목록으로 응답하고, 기동 후 해당
+    list_changed 알림을 보내 클라이언트가 실제 서버에서 다시 받게 한다.
+    실제 서버에는 클라이언트가 보낸 initialize params로 shim 전용 id의 initialize를 보내고,
+    그 뒤로는 메시지를 그대로 중계한다 (id 변환 없음). 기동 후 도구 목록이 캐시와 다르면
+    캐시를 갱신하고 클라이언트에 notifications/tools/list_changed를 보낸다.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        config: dict[str, Any],
+        catalog: dict[str, Any],
+        write: Callable[[bytes | None], None],
+        catalog_base: Path | None = None,
+        hub_base: Path | None = None,
+    ):
+        self.name = name
+        self.config = config
+        self.catalog = catalog
+        self.write = write  # 클라이언트로 보낼 바이트 (None이면 연결 종료)
+        self.catalog_base = catalog_base
+        self.hub_base = hub_base
+        self.started = False
+        self._init_params: dict[str, Any] = {}
+        self._buffer: list[dict[str, Any]] = []
+        self._guessed: set[str] = set()  # 카탈로그 없이 빈 목록으로 응답한 키
+        self._server_writer: Callable[[bytes], Any] = lambda _data: None
+        self._proc: asyncio.subprocess.Process | None = None
+        self._ready = asyncio.Event()
+        self._tasks: list[asyncio.Task[None]] = []
+
+    def _reply(self, msg_id: Any, result: dict[str, Any]) -> None:
+        self.write(_encode({"jsonrpc": "2.0", "id": msg_id, "result": result}))
+
+    async def handle(self, message: dict[str, Any]) -> None:
+        """클라이언트 메시지 하나 처리"""
+        method = message.get("method")
+        # 기동 전 알림/응답은 실제 서버와 무관하므로 버림 (initialized는 기동 시 shim이 보냄)
+        if not self.started and (method in _LOCAL_METHODS or "id" not in message or not method):
+            self._answer_locally(message)
+            return
+        if not self.started:
+            self.started = True
+            self._buffer.append(message)
+            await self._start()
+            return
+        if not self._ready.is_set():
+            self._buffer.append(message)
+            return
+        self._server_writer(_encode(message))
+
+    def _answer_locally(self, message: dict[str, Any]) -> None:
+        method = message.get("method")
+        msg_id = message.get("id")
+        if method == "initialize":
+            self._init_params = message.get("params") or {}
+            self._reply(msg_id, self.catalog["initialize"])
+        elif method in _LIST_METHODS:
+            key = _LIST_METHODS[method]
+            if key not in self.catalog:
+                self._guessed.add(key)
+            self._reply(msg_id, {key: self.catalog.get(key, [])})
+        elif method == "ping":
+            self._reply(msg_id, {})
+
+    async def _connect(self) -> tuple[asyncio.StreamReader, Callable[[bytes], Any]]:
+        """hub가 떠 있으면 hub 소켓, 아니면 서버를 직접 기동"""
+        path = socket_path(self.name, self.hub_base)
+        if path.exists():
+            with contextlib.suppress(OSError):
+                reader, writer = await asyncio.open_unix_connection(str(path), limit=STREAM_LIMIT)
+                return reader, writer.write
+        self._proc = await spawn(self.config, stderr=None)
+        assert self._proc.stdout is not None
+        assert self._proc.stdin is not None
+        return self._proc.stdout, self._proc.stdin.write
+
+    async def _start(self) -> None:
+        try:
+            reader, write = await self._connect()
+        except OSError as e:
+            error = {"code": -32603, "message": f"failed to start {self.name}: {e}"}
+            for message in self._buffer:
+                if "id" in message:
+                    self.write(_encode({"jsonrpc": "2.0", "id": message["id"], "error": error}))
+            self.write(None)
+            return
+        self._server_writer = write
+        write(
+            _encode(
+                {
+                    "jsonrpc": "2.0",
+                    "id": _SHIM_INIT_ID,
+                    "method": "initialize",
+                    "params": self._init_params,
+                }
+            )
+        )
+        self._tasks.append(asyncio.create_task(self._pump(reader)))
+
+    async def _pump(self, reader: asyncio.StreamReader) -> None:
+        """서버 출력 → 클라이언트 (shim 내부 요청의 응답은 가로챔)"""
+        while line := await reader.readline():
+            try:
+                message = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if not isinstance(message, dict):
+                continue
+            if message.get("id") == _SHIM_INIT_ID and "method" not in message:
+                self._on_server_initialized()
+                continue
+            if message.get("id") == _SHIM_TOOLS_ID and "method" not in message:
+                self._on_server_tools(message.get("result") or {})
+                continue
+            self.write(_encode(message))
+        # 서버 종료 → 클라이언트도 종료 (클라이언트가 서버를 다시 띄움)
+        self.write(None)
+
+    def _on_server_initialized(self) -> None:
+        self._server_writer(_encode({"jsonrpc": "2.0", "method": "notifications/initialized"}))
+        for message in self._buffer:
+            self._server_writer(_encode(message))
+        self._buffer.clear()
+        self._ready.set()
+        self._server_writer(
+            _encode({"jsonrpc": "2.0", "id": _SHIM_TOOLS_ID, "method": "tools/list"})
+        )
+        for notification in sorted({_LIST_CHANGED[k] for k in self._guessed if k in _LIST_CHANGED}):
+            self.write(_encode({"jsonrpc": "2.0", "method": notification}))
+
+    def _on_server_tools(self, result: dict[str, Any]) -> None:
+        tools = result.get("tools", [])
+        if result.get("nextCursor") or tools == self.catalog.get("tools"):
+            return  # 여러 페이지면 다음 probe에서 갱신
+        self.catalog = {**self.catalog, "tools": tools}
+        with contextlib.suppress(OSError):
+            save_catalog(self.name, self.catalog, self.catalog_base)
+        self.write(_encode({"jsonrpc": "2.0", "method": "notifications/tools/list_changed"}))
+
+    async def close(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        if self._proc is not None:
+            await terminate(self._proc)
+
+
+async def run_shim(
+    name: str,
+    config: dict[str, Any],
+    catalog: dict[str, Any],
+    stdin: asyncio.StreamReader | None = None,
+    write: Callable[[bytes], None] | None = None,
+) -> None:
+    """stdin의 JSON-RPC를 LazyServer로 처리 (stdin EOF 또는 서버 종료까지)
+
+    Args:
+        stdin/write: 테스트용 입출력 (None이면 프로세스 stdin/stdout)
+    """
+    loop = asyncio.get_running_loop()
+    if stdin is None:
+        stdin = asyncio.StreamReader(limit=STREAM_LIMIT)
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(stdin), sys.stdin)
+    done = asyncio.Event()
+
+    def _stdout(data: bytes) -> None:
+        sys.stdout.buffer.write(data)
+        sys.stdout.buffer.flush()
+
+    output = write or _stdout
+
+    def _emit(data: bytes | None) -> None:
+        if data is None:
+            done.set()
+        else:
+            output(data)
+
+    shim = LazyServer(name, config, catalog, _emit)
+
+    async def _read_client() -> None:
+        while line := await stdin.readline():
+            try:
+                message = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(message, dict):
+                await shim.handle(message)
+        done.set()
+
+    reader = asyncio.create_task(_read_client())
+    try:
+        await done.wait()
+    finally:
+        reader.cancel()
+        await shim.close()
@@ -0,0 +1,418 @@
+"""Transparent stdio MCP tap (per-call metrics, transcripts) and transcript replay."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import os
+import sys
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import IO, Any, Literal
+
+from ..core.config import get_state_dir
+from .latency import percentile
+from .probe import STREAM_LIMIT, spawn, terminate
+
+TAP_DIR_NAME = "mcp_tap"
+TRANSCRIPT_DIR_NAME = "transcripts"
+DEFAULT_REPLAY_TIMEOUT = 60.0
+
+Direction = Literal["client", "server"]
+
+
+def tap_dir() -> Path:
+    """호출 로그/트랜스크립트 디렉토리 (~/.ai-env/mcp_tap)"""
+    return get_state_dir() / TAP_DIR_NAME
+
+
+def calls_log_path(name: str, base: Path | None = None) -> Path:
+    """서버별 호출 로그 (JSONL, 호출 하나당 한 줄)"""
+    return (base or tap_dir()) / f"{name}.jsonl"
+
+
+def _call_target(message: dict[str, Any]) -> str | None:
+    """요청 대상 이름 (tools/call·prompts/get의 name, resources/read의 uri)"""
+    params = message.get("params")
+    if not isinstance(params, dict):
+        return None
+    value = params.get("name") or params.get("uri")
+    return value if isinstance(value, str) else None
+
+
+def _id_key(msg_id: Any) -> str:
+    return json.dumps(msg_id, sort_keys=True)
+
+
+@dataclass
+class CallRecord:
+    """요청 하나의 지연 시간과 크기"""
+
+    ts: float  # 요청 시각 (epoch)
+    server: str
+    direction: Direction  # 요청을 보낸 쪽 (server면 sampling 등 서버 → 클라이언트 요청)
+    method: str
+    tool: str | None
+    latency_ms: float | None  # 응답을 받지 못하고 끝났으면 None
+    request_bytes: int
+    response_bytes: int | None
+    error: str | None = None  # JSON-RPC 에러 메시지 또는 "closed"
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+class TapRecorder:
+    """양방향 JSON-RPC 줄을 관찰해 요청/응답을 짝지어 호출 기록을 남김
+
+    메시지는 건드리지 않는다 (호출자가 원래 바이트를 그대로 전달).
+    """
+
+    def __init__(
+        self,
+        server: str,
+        log: IO[str] | None = None,
+        transcript: IO[str] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        wall: Callable[[], float] = time.time,
+    ):
+        self.server = server
+        self.log = log
+        self.transcript = transcript
+        self.records: list[CallRecord] = []
+        self._clock = clock
+        self._wall = wall
+        self._start = clock()
+        self._pending: dict[tuple[Direction, str], tuple[float, float, str, str | None, int]] = {}
+        if transcript is not None:
+            self._write(transcript, {"type": "header", "server": server, "started": wall()})
+
+    @staticmethod
+    def _write(stream: IO[str], entry: dict[str, Any]) -> None:
+        stream.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        stream.flush()
+
+    def observe(self, direction: Direction, raw: bytes) -> None:
+        """direction 쪽이 보낸 줄 하나 (JSON이 아니면 무시)"""
+        try:
+            message = json.loads(raw)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            return
+        if not isinstance(message, dict):
+            return
+        now = self._clock()
+        if self.transcript is not None:
+            entry = {"type": "message", "dir": direction, "t": round(now - self._start, 6)}
+            self._write(self.transcript, {**entry, "message": message})
+        if "id" not in message:
+            return
+        method = message.get("method")
+        if isinstance(method, str):
+            key = (direction, _id_key(message["id"]))
+            self._pending[key] = (now, self._wall(), method, _call_target(message), len(raw))
+            return
+        requester: Direction = "server" if direction == "client" else "client"
+        pending = self._pending.pop((requester, _id_key(message["id"])), None)
+        if pending is None:
+            return
+        started, ts, method, tool, request_bytes = pending
+        error = message.get("error")
+        self._emit(
+            CallRecord(
+                ts=ts,
+                server=self.server,
+                direction=requester,
+                method=method,
+                tool=tool,
+                latency_ms=round((now - started) * 1000, 3),
+                request_bytes=request_bytes,
+                response_bytes=len(raw),
+                error=str(error.get("message", error)) if isinstance(error, dict) else None,
+            )
+        )
+
+    def _emit(self, record: CallRecord) -> None:
+        self.records.append(record)
+        if self.log is not None:
+            self._write(self.log, record.to_dict())
+
+    def close(self) -> None:
+        """응답 없이 끝난 요청 기록"""
+        for (direction, _key), (_started, ts, method, tool, size) in self._pending.items():
+            self._emit(
+                CallRecord(ts, self.server, direction, method, tool, None, size, None, "closed")
+            )
+        self._pending.clear()
+
+
+async def run_tap(
+    name: str,
+    config: dict[str, Any],
+    record: bool = False,
+    base: Path | None = None,
+    stdin: asyncio.StreamReader | None = None,
+    write: Callable[[bytes], None] | None = None,
+) -> None:
+    """서버를 띄우고 stdio를 그대로 중계하면서 호출 기록 (stdin EOF 또는 서버 종료까지)
+
+    Args:
+        record: True면 전체 메시지를 transcripts/<name>-<시각>-<pid>.jsonl에 저장 (mcp replay 입력)
+        stdin/write: 테스트용 입출력 (None이면 프로세스 stdin/stdout)
+    """
+    loop = asyncio.get_running_loop()
+    if stdin is None:
+        stdin = asyncio.StreamReader(limit=STREAM_LIMIT)
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(stdin), sys.stdin)
+
+    def _stdout(data: bytes) -> None:
+        sys.stdout.buffer.write(data)
+        sys.stdout.buffer.flush()
+
+    output = write or _stdout
+    directory = base or tap_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    with contextlib.ExitStack() as stack:
+        log = stack.enter_context(open(calls_log_path(name, directory), "a", encoding="utf-8"))
+        transcript = None
+        if record:
+            transcripts = directory / TRANSCRIPT_DIR_NAME
+            transcripts.mkdir(exist_ok=True)
+            stamp = time.strftime("%Y%m%d-%H%M%S")
+            path = transcripts / f"{name}-{stamp}-{os.getpid()}.jsonl"
+            transcript = stack.enter_context(open(path, "w", encoding="utf-8"))
+        recorder = TapRecorder(name, log, transcript)
+        proc = await spawn(config, stderr=None)
+        assert proc.stdin is not None
+        assert proc.stdout is not None
+        server_in, server_out = proc.stdin, proc.stdout
+
+        async def _client_to_server() -> None:
+            while line := await stdin.readline():
+                recorder.observe("client", line)
+                server_in.write(line)
+                with contextlib.suppress(ConnectionError):
+                    await server_in.drain()
+
+        async def _server_to_client() -> None:
+            while line := await server_out.readline():
+                recorder.observe("server", line)
+                output(line)
+
+        upstream = asyncio.create_task(_client_to_server())
+        downstream = asyncio.create_task(_server_to_client())
+        try:
+            await asyncio.wait({upstream, downstream}, return_when=asyncio.FIRST_COMPLETED)
+            if upstream.done():
+                # 클라이언트 EOF → 서버 stdin을 닫고 남은 응답을 마저 전달
+                await terminate(proc)
+                with contextlib.suppress(asyncio.CancelledError):
+                    await downstream
+        finally:
+            upstream.cancel()
+            downstream.cancel()
+            await terminate(proc)
+            recorder.close()
+
+
+def read_calls(
+    names: Iterable[str] | None = None, base: Path | None = None
+) -> list[dict[str, Any]]:
+    """호출 로그 읽기 (names가 None이면 모든 서버, 깨진 줄은 건너뜀)"""
+    directory = base or tap_dir()
+    paths = (
+        [calls_log_path(name, directory) for name in names]
+        if names is not None
+        else sorted(directory.glob("*.jsonl"))
+    )
+    records = []
+    for path in paths:
+        with contextlib.suppress(OSError), open(path, encoding="utf-8") as f:
+            for line in f:
+                with contextlib.suppress(json.JSONDecodeError):
+                    entry = json.loads(line)
+                    if isinstance(entry, dict):
+                        records.append(entry)
+    return records
+
+
+@dataclass
+class CallSummary:
+    """(서버, 메서드, 도구)별 호출 통계"""
+
+    server: str
+    method: str
+    tool: str | None
+    calls: int
+    errors: int
+    p50_ms: float | None
+    p95_ms: float | None
+    max_ms: float | None
+    avg_request_bytes: float
+    avg_response_bytes: float | None
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def summarize_calls(records: Iterable[dict[str, Any]]) -> list[CallSummary]:
+    """호출 기록을 묶어 지연 시간 백분위수와 평균 크기 계산 (p95가 큰 순)"""
+    groups: dict[tuple[str, str, str | None], list[dict[str, Any]]] = {}
+    for record in records:
+        key = (record.get("server", "?"), record.get("method", "?"), record.get("tool"))
+        groups.setdefault(key, []).append(record)
+    summaries = []
+    for (server, method, tool), group in groups.items():
+        latencies = [r["latency_ms"] for r in group if r.get("latency_ms") is not None]
+        responses = [r["response_bytes"] for r in group if r.get("response_bytes") is not None]
+        summaries.append(
+            CallSummary(
+                server=server,
+                method=method,
+                tool=tool,
+                calls=len(group),
+                errors=sum(r.get("error") is not None for r in group),
+                p50_ms=percentile(latencies, 50) if latencies else None,
+                p95_ms=percentile(latencies, 95) if latencies else None,
+                max_ms=max(latencies) if latencies else None,
+                avg_request_bytes=round(
+                    sum(r.get("request_bytes", 0) for r in group) / len(group), 1
+                ),
+                avg_response_bytes=round(sum(responses) / len(responses), 1) if responses else None,
+            )
+        )
+    summaries.sort(key=lambda s: -(s.p95_ms or 0))
+    return summaries
+
+
+# ── replay ──
+
+
+def load_transcript(path: Path) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+    """트랜스크립트 (header, message 항목 목록)
+
+    Raises:
+        ValueError: header가 없거나 JSON이 아님
+    """
+    header: dict[str, Any] | None = None
+    entries = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid transcript line in {path}: {e}") from e
+            if entry.get("type") == "header":
+                header = entry
+            elif entry.get("type") == "message" and isinstance(entry.get("message"), dict):
+                entries.append(entry)
+    if header is None:
+        raise ValueError(f"Not an ai-env MCP transcript (no header): {path}")
+    return header, entries
+
+
+@dataclass
+class ReplayCall:
+    """재생한 요청 하나의 기록/재생 지연 시간"""
+
+    method: str
+    tool: str | None
+    recorded_ms: float | None
+    replay_ms: float | None
+    error: str | None = None
+
+    @property
+    def delta_ms(self) -> float | None:
+        if self.recorded_ms is None or self.replay_ms is None:
+            return None
+        return round(self.replay_ms - self.recorded_ms, 3)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {**asdict(self), "delta_ms": self.delta_ms}
+
+
+def _recorded_latencies(entries: list[dict[str, Any]]) -> dict[str, float]:
+    """클라이언트 요청 id → 기록된 지연 시간(ms)"""
+    sent: dict[str, float] = {}
+    latencies: dict[str, float] = {}
+    for entry in entries:
+        message = entry["message"]
+        if "id" not in message:
+            continue
+        key = _id_key(message["id"])
+        if entry["dir"] == "client" and "method" in message:
+            sent[key] = entry["t"]
+        elif entry["dir"] == "server" and "method" not in message and key in sent:
+            latencies[key] = round((entry["t"] - sent.pop(key)) * 1000, 3)
+    return latencies
+
+
+async def replay_transcript(
+    config: dict[str, Any],
+    entries: list[dict[str, Any]],
+    timeout: float = DEFAULT_REPLAY_TIMEOUT,
+) -> list[ReplayCall]:
+    """기록된 클라이언트 메시지를 새 서버 프로세스에 순서대로 보내고 요청별 지연 시간 측정
+
+    요청은 응답을 받은 뒤 다음 메시지를 보낸다 (동시 요청도 순차 재생). 재생 중 서버가 보내는
+    요청(sampling 등)에는 method not found 에러로 답한다.
+    """
+    recorded = _recorded_latencies(entries)
+    calls: list[ReplayCall] = []
+    proc = await spawn(config, stderr=asyncio.subprocess.DEVNULL)
+    assert proc.stdin is not None
+    assert proc.stdout is not None
+    server_in, server_out = proc.stdin, proc.stdout
+
+    async def _await_response(msg_id: Any) -> dict[str, Any]:
+        while True:
+            line = await server_out.readline()
+            if not line:
+                raise ConnectionError("server closed stdout")
+            try:
+                message = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if not isinstance(message, dict):
+                continue
+            if "method" in message and "id" in message:
+                error = {"code": -32601, "message": "not supported during replay"}
+                reply = {"jsonrpc": "2.0", "id": message["id"], "error": error}
+                server_in.write(json.dumps(reply).encode() + b"\n")
+                continue
+            if "method" not in message and message.get("id") == msg_id:
+                return message
+
+    try:
+        for entry in entries:
+            message = entry["message"]
+            if entry["dir"] != "client" or ("method" not in message and "id" in message):
+                continue  # 서버 메시지와 서버 요청에 대한 클라이언트 응답은 재생하지 않음
+            server_in.write(json.dumps(message).encode() + b"\n")
+            await server_in.drain()
+            if "id" not in message:
+                continue
+            call = ReplayCall(
+                method=message["method"],
+                tool=_call_target(message),
+                recorded_ms=recorded.get(_id_key(message["id"])),
+                replay_ms=None,
+            )
+            calls.append(call)
+            started = time.monotonic()
+            try:
+                response = await asyncio.wait_for(_await_response(message["id"]), timeout)
+            except (TimeoutError, ConnectionError) as e:
+                call.error = "timeout" if isinstance(e, TimeoutError) else str(e)
+                break
+            call.replay_ms = round((time.monotonic() - started) * 1000, 3)
+            error = response.get("error")
+            if isinstance(error, dict):
+                call.error = str(error.get("message", error))
+    finally:
+        await terminate(proc)
+    return calls
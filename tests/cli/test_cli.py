@@ -1,10 +1,13 @@
 """Tests for ai-env CLI commands."""
 
+import json
 import os
-from unittest.mock import MagicMock, patch
+import threading
+from unittest.mock import ANY, AsyncMock, MagicMock, patch
 
 import pytest
 from ai_env.cli import main
+from ai_env.core.team_skills import TeamRepoUpdate
 from click.testing import CliRunner
 
 
@@ -67,7 +70,7 @@ def test_generate_all_command(runner):
 
         mock_generator.assert_called_once()
         instance = mock_generator.return_value
-        instance.save_all.assert_called_once_with(dry_run=True)
+        instance.save_all.assert_called_once_with(dry_run=True, writer=ANY)
 
 
 def test_project_sync_codex_command(runner, tmp_path):
@@ -82,3 +85,300 @@ def test_project_sync_codex_command(runner, tmp_path):
     assert result.exit_code == 0, f"Command failed with output: {result.output}"
     mock_sync.assert_called_once()
     assert "Project Claude" in result.output
+
+
+def test_sync_runs_global_stages_with_jobs(runner, tmp_path):
+    """sync는 글로벌 스테이지를 실행하고 고정 순서로 결과를 출력한다."""
+    with (
+        patch("ai_env.cli.sync_cmd.get_secrets_manager") as mock_sm,
+        patch("ai_env.cli.sync_cmd.get_project_root", return_value=tmp_path),
+        patch("ai_env.cli.sync_cmd.sync_claude_global_config") as mock_claude,
+        patch("ai_env.cli.sync_cmd.sync_codex_global_config") as mock_codex,
+        patch("ai_env.cli.sync_cmd.sync_gemini_global_config") as mock_gemini,
+        patch("ai_env.cli.sync_cmd.plan_global_sync") as mock_plan,
+    ):
+        mock_sm.return_value.env_file = tmp_path / ".env"
+        claude_plan = MagicMock(group="claude")
+        codex_plan = MagicMock(group="codex")
+        mock_plan.return_value.skills = [claude_plan, codex_plan]
+        mock_claude.return_value = {"CLAUDE.md": "/home/.claude/CLAUDE.md"}
+        mock_codex.return_value = {"AGENTS.md": "/home/.codex/AGENTS.md"}
+        mock_gemini.return_value = {}
+
+        result = runner.invoke(main, ["sync", "--claude-only", "--jobs", "3"])
+
+    assert result.exit_code == 0, f"Command failed with output: {result.output}"
+    catalog = mock_claude.call_args.kwargs["catalog"]
+    mock_claude.assert_called_once_with(
+        dry_run=False,
+        skills_include=None,
+        skills_exclude=None,
+        catalog=catalog,
+        writer=ANY,
+        copy_mode=None,
+        skills_plan=claude_plan,
+    )
+    # 스킬 계획은 한 번 세워 스테이지에 넘기고 스테이지는 다시 계획하지 않음
+    assert mock_plan.call_args.args[3] is catalog
+    assert mock_codex.call_args.kwargs["skills_plan"] is codex_plan
+    assert "skills_plan" not in mock_gemini.call_args.kwargs
+    # 스킬 카탈로그와 출력 writer는 한 번만 만들어 모든 스테이지가 공유
+    writer = mock_claude.call_args.kwargs["writer"]
+    assert mock_codex.call_args.kwargs["writer"] is writer
+    assert mock_codex.call_args.kwargs["catalog"] is catalog
+    assert mock_gemini.call_args.kwargs["catalog"] is catalog
+    assert result.output.index("Claude Code Global") < result.output.index("Codex CLI Global")
+    assert "workers=3" in result.output
+    assert "No files to sync" in result.output
+
+
+def test_sync_reports_team_repo_updates(runner, tmp_path):
+    """팀 레포 pull 결과를 집계해 출력하고, 실패한 레포는 sync 끝에 경고한다."""
+    updates = [
+        TeamRepoUpdate("cde-skills", tmp_path, "updated", "a → b", None, "a", "b", 2),
+        TeamRepoUpdate("cde-ranking-skills", tmp_path, "failed", "merge conflict"),
+    ]
+    with (
+        patch("ai_env.cli.sync_cmd.get_secrets_manager") as mock_sm,
+        patch("ai_env.cli.sync_cmd.get_project_root", return_value=tmp_path),
+        patch("ai_env.cli.sync_cmd.update_team_skill_repos", return_value=updates),
+        patch("ai_env.cli.sync_cmd.plan_global_sync"),
+        patch("ai_env.cli.sync_cmd.sync_claude_global_config", return_value={}),
+        patch("ai_env.cli.sync_cmd.sync_codex_global_config", return_value={}),
+        patch("ai_env.cli.sync_cmd.sync_gemini_global_config", return_value={}),
+    ):
+        mock_sm.return_value.env_file = tmp_path / ".env"
+        result = runner.invoke(main, ["sync", "--claude-only", "--skills-all"])
+
+    assert result.exit_code == 0, result.output
+    assert "2 repo(s): 1 failed, 1 updated · 2 files changed" in result.output
+    assert "Team repos not updated, synced their current checkout: cde-ranking-skills" in (
+        result.output
+    )
+
+
+def test_sync_scans_skills_after_team_pull_and_overlaps_mcp(runner, tmp_path):
+    """팀 레포 pull이 끝난 뒤 스킬을 스캔하고, MCP 생성은 pull을 기다리지 않는다."""
+    events: list[str] = []
+    mcp_done = threading.Event()
+
+    def fake_pull(*_args, **_kwargs):
+        assert mcp_done.wait(timeout=5), "mcp stage waited for the team pull"
+        events.append("team")
+        return []
+
+    def fake_mcp(*_args):
+        events.append("mcp")
+        mcp_done.set()
+        return {}, None
+
+    def fake_scan(*_args):
+        events.append("scan")
+        return MagicMock()
+
+    with (
+        patch("ai_env.cli.sync_cmd.get_secrets_manager") as mock_sm,
+        patch("ai_env.cli.sync_cmd.get_project_root", return_value=tmp_path),
+        patch("ai_env.cli.sync_cmd.load_mcp_config") as mock_mcp_config,
+        patch("ai_env.cli.sync_cmd.update_team_skill_repos", side_effect=fake_pull),
+        patch("ai_env.cli.sync_cmd.SkillCatalog.scan", side_effect=fake_scan),
+        patch("ai_env.cli.sync_cmd._sync_mcp_outputs", side_effect=fake_mcp),
+        patch("ai_env.cli.sync_cmd.plan_global_sync"),
+        patch("ai_env.cli.sync_cmd.sync_claude_global_config", return_value={}),
+        patch("ai_env.cli.sync_cmd.sync_codex_global_config", return_value={}),
+        patch("ai_env.cli.sync_cmd.sync_gemini_global_config", return_value={}),
+    ):
+        mock_sm.return_value.env_file = tmp_path / ".env"
+        mock_mcp_config.return_value.mcp_servers = {}
+        result = runner.invoke(main, ["sync", "--skills-all", "--jobs", "2"])
+
+    assert result.exit_code == 0, result.output
+    assert events == ["mcp", "team", "scan"]
+    assert "critical path: team → skills →" in result.output
+
+
+def test_sync_dry_run_prints_plan_json(runner, tmp_path):
+    """sync --dry-run --json은 아무것도 쓰지 않고 변경 계획을 JSON으로 출력한다."""
+    project_root = tmp_path / "ai-env"
+    skill = project_root / ".claude" / "skills" / "my-skill"
+    skill.mkdir(parents=True)
+    (skill / "SKILL.md").write_text("---\nname: my-skill\n---\nbody\n")
+    home = tmp_path / "home"
+    home.mkdir()
+
+    with (
+        patch("ai_env.cli.sync_cmd.get_project_root", return_value=project_root),
+        patch("pathlib.Path.home", return_value=home),
+    ):
+        result = runner.invoke(main, ["sync", "--skills-only", "--dry-run", "--json"])
+
+    assert result.exit_code == 0, f"Command failed with output: {result.output}"
+    plan = json.loads(result.output)
+    targets = sorted(op["target"] for op in plan["ops"])
+    assert targets == [
+        str(home / ".claude" / "skills" / "my-skill" / "SKILL.md"),
+        str(home / ".codex" / "skills" / "my-skill" / "SKILL.md"),
+    ]
+    assert plan["totals"]["create"]["count"] == 2
+    assert not (home / ".claude").exists()
+
+
+def test_store_gc_json(runner, tmp_path):
+    """store gc --json은 삭제 결과를 JSON으로 출력한다 (state dir은 conftest가 격리)."""
+    result = runner.invoke(main, ["store", "gc", "--dry-run", "--json"])
+
+    assert result.exit_code == 0, f"Command failed with output: {result.output}"
+    assert json.loads(result.output) == {
+        "removed": [],
+        "kept": 0,
+        "freed_bytes": 0,
+        "pruned_refs": 0,
+    }
+
+
+def test_sync_homes_reports_each_home(runner, tmp_path):
+    """sync --homes는 roster의 홈별 결과를 출력하고, 실패한 홈이 있으면 종료 코드 1."""
+    from ai_env.core.homes import HomeSyncResult
+
+    roster = tmp_path / "roster.yaml"
+    roster.write_text("homes:\n  - user: alice\n  - user: bob\n")
+    results = [
+        HomeSyncResult("alice", tmp_path / "alice", written=[tmp_path / "alice" / "x"]),
+        HomeSyncResult("bob", tmp_path / "bob", error="Unknown user in roster: bob"),
+    ]
+
+    def fake_sync_homes(roster, fanout, dry_run, max_workers, on_progress):
+        for result in results:
+            on_progress(result)
+        return results
+
+    with (
+        patch("ai_env.cli.sync_cmd.build_fanout") as mock_fanout,
+        patch("ai_env.cli.sync_cmd.sync_homes", side_effect=fake_sync_homes),
+    ):
+        result = runner.invoke(main, ["sync", "--homes", str(roster), "--mcp-only"])
+
+    assert result.exit_code == 1
+    assert mock_fanout.call_args.args[-1] == ("mcp",)
+    assert "alice: 1 files" in result.output
+    assert "Unknown user in roster: bob" in result.output
+
+
+def test_project_sync_all_json(runner, tmp_path):
+    """project sync --all은 워크스페이스의 모든 프로젝트를 동기화하고 집계를 JSON으로 출력한다."""
+    for name in ("alpha", "beta"):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "CLAUDE.md").write_text("# Claude")
+
+    result = runner.invoke(
+        main, ["project", "sync", "--all", str(tmp_path), "--agents-only", "--json"]
+    )
+
+    assert result.exit_code == 0, f"Command failed with output: {result.output}"
+    report = json.loads(result.output)
+    assert [p["project"] for p in report["projects"]] == [
+        str((tmp_path / "alpha").resolve()),
+        str((tmp_path / "beta").resolve()),
+    ]
+    assert report["status_counts"] == {"linked": 2}
+    assert (tmp_path / "alpha" / "AGENTS.md").is_symlink()
+
+
+def test_mcp_probe_json(runner):
+    """mcp probe --json은 서버별 결과를 출력하고, 실패한 서버가 있으면 종료 코드 1."""
+    from ai_env.mcp.probe import ProbeResult
+
+    results = [
+        ProbeResult("fetch", "stdio", ready_seconds=0.4, tools=3),
+        ProbeResult("github", "stdio", "timeout", error="no response in 30s"),
+    ]
+
+    with (
+        patch("ai_env.cli.mcp_cmd.MCPConfigGenerator"),
+        patch("ai_env.cli.mcp_cmd.probe_servers", new=AsyncMock(return_value=results)) as probe,
+    ):
+        result = runner.invoke(main, ["mcp", "probe", "fetch", "github", "--json", "-j", "2"])
+
+    assert result.exit_code == 1
+    assert probe.call_args.args[1] == ["fetch", "github"]
+    assert probe.call_args.kwargs["concurrency"] == 2
+    output = json.loads(result.output)
+    assert [r["status"] for r in output] == ["ok", "timeout"]
+    assert output[0]["tools"] == 3
+
+
+def test_mcp_latency_json(runner):
+    """mcp latency --json은 서버별 적용 제한 시간과 출처를 출력한다."""
+    from ai_env.core.config import MCPConfig, MCPServerConfig
+
+    mcp_config = MCPConfig(
+        mcp_servers={
+            "fetch": MCPServerConfig(command="uvx", targets=["codex"]),
+            "github": MCPServerConfig(command="docker", startup_timeout_sec=45),
+        }
+    )
+
+    with patch("ai_env.mcp.generator.load_mcp_config", return_value=mcp_config):
+        result = runner.invoke(main, ["mcp", "latency", "--json"])
+
+    assert result.exit_code == 0, f"Command failed with output: {result.output}"
+    servers = {row["server"]: row for row in json.loads(result.output)["servers"]}
+    assert servers["fetch"]["timeout_sec"] == 30
+    assert servers["fetch"]["source"] == "default"
+    assert servers["github"]["timeout_sec"] == 45
+    assert servers["github"]["source"] == "yaml"
+
+
+def test_mcp_footprint_json_uses_cached_catalog(runner):
+    """mcp footprint --json은 캐시된 카탈로그로 도구별 토큰과 타겟별 필터 결과를 출력한다."""
+    from ai_env.core.config import MCPConfig, MCPServerConfig
+    from ai_env.mcp.catalog import save_catalog
+
+    tools = [
+        {"name": "search", "description": "x" * 400, "inputSchema": {"type": "object"}},
+        {"name": "create_issue", "description": "y" * 40, "inputSchema": {"type": "object"}},
+    ]
+    save_catalog("github", {"initialize": {}, "tools": tools})
+    mcp_config = MCPConfig(
+        mcp_servers={
+            "github": MCPServerConfig(
+                command="docker",
+                targets=["codex", "claude_desktop"],
+                tool_deny={"codex": ["search"]},
+            )
+        }
+    )
+
+    with (
+        patch("ai_env.mcp.generator.load_mcp_config", return_value=mcp_config),
+        patch("ai_env.cli.mcp_cmd.probe_servers") as probe,
+    ):
+        result = runner.invoke(main, ["mcp", "footprint", "--json"])
+
+    assert result.exit_code == 0, f"Command failed with output: {result.output}"
+    probe.assert_not_called()
+    (github,) = json.loads(result.output)
+    assert github["tools"] == 2
+    assert list(github["tool_tokens"]) == ["search", "create_issue"]
+    assert github["targets"]["claude_desktop"] == github["tokens"]
+    assert github["targets"]["codex"] == github["tool_tokens"]["create_issue"]
+
+
+def test_mcp_calls_json_summarizes_tap_log(runner):
+    """mcp calls --json은 tap 기록을 (서버, 메서드, 도구)별로 집계한다."""
+    from ai_env.mcp.tap import calls_log_path, tap_dir
+
+    tap_dir().mkdir(parents=True)
+    records = [
+        {"server": "fetch", "method": "tools/call", "tool": "fetch", "latency_ms": ms,
+         "request_bytes": 80, "response_bytes": 4000, "error": None}
+        for ms in (100.0, 300.0)
+    ]  # fmt: skip
+    calls_log_path("fetch").write_text("".join(json.dumps(r) + "\n" for r in records))
+
+    result = runner.invoke(main, ["mcp", "calls", "--json"])
+
+    assert result.exit_code == 0, f"Command failed with output: {result.output}"
+    (summary,) = json.loads(result.output)
+    assert (summary["server"], summary["tool"], summary["calls"]) == ("fetch", "fetch", 2)
+    assert summary["max_ms"] == 300.0
@@ -1,2 +1,10 @@
 # pytest configuration
 # pythonpath = ["src"] is set in pyproject.toml [tool.pytest.ini_options]
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _isolated_state_dir(tmp_path_factory, monkeypatch):
+    """테스트가 실제 ~/.ai-env (정규화 캐시 등)에 쓰지 않도록 상태 디렉토리를 격리."""
+    monkeypatch.setenv("AI_ENV_STATE_DIR", str(tmp_path_factory.mktemp("ai-env-state")))
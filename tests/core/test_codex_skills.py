@@ -2,9 +2,25 @@
 
 from __future__ import annotations
 
+import functools
 from pathlib import Path
+from unittest.mock import patch
 
-from ai_env.core.codex_skills import copy_skill_tree_for_codex, normalize_skill_markdown_for_codex
+import pytest
+
+from ai_env.core import codex_skills
+from ai_env.core.codex_skills import (
+    NormalizedSkillCache,
+    copy_skill_file_for_codex,
+    copy_skill_tree_for_codex,
+    default_normalized_skill_cache,
+    normalize_skill_files,
+    normalize_skill_markdown_for_codex,
+    write_normalized_skill_markdown,
+)
+from ai_env.core.skill_catalog import SkillCatalog
+from ai_env.core.sync_manifest import copy_file
+from ai_env.core.sync_plan import apply_skills_plan, plan_skills
 
 
 def test_normalize_skill_markdown_for_codex_repairs_invalid_frontmatter() -> None:
@@ -66,3 +82,119 @@ description: 랭킹 피처 추가/수정 가이드.
     assert "description:" in normalized
     assert "새 시그널 추가" in normalized
     assert (target / "scripts" / "helper.py").exists()
+
+
+def test_normalized_skill_cache_skips_unchanged_skill_md(tmp_path: Path) -> None:
+    """내용이 같은 SKILL.md는 캐시에서 가져오고 정규화를 다시 하지 않는다."""
+    cache = NormalizedSkillCache(tmp_path / "cache")
+    source = tmp_path / "src" / "my-skill" / "SKILL.md"
+    source.parent.mkdir(parents=True)
+    source.write_text("---\nname: my-skill\ndescription: 설명\n---\n\nbody\n")
+    targets = [tmp_path / f"dst{i}" / "my-skill" / "SKILL.md" for i in range(2)]
+
+    with patch.object(
+        codex_skills, "_normalized_header", wraps=codex_skills._normalized_header
+    ) as spy:
+        for target in targets:
+            target.parent.mkdir(parents=True)
+            copy_skill_file_for_codex(source, target, cache=cache)
+
+    assert spy.call_count == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert targets[0].read_text() == targets[1].read_text()
+    assert targets[1].read_text().startswith("---\nname: my-skill\n")
+
+
+def test_normalized_skill_cache_key_includes_version_and_name(monkeypatch) -> None:
+    """정규화기 버전이나 스킬 이름이 바뀌면 다른 캐시 키를 사용한다."""
+    key = NormalizedSkillCache.key("head-digest", "a")
+
+    assert NormalizedSkillCache.key("head-digest", "b") != key
+    monkeypatch.setattr(codex_skills, "NORMALIZER_VERSION", codex_skills.NORMALIZER_VERSION + 1)
+    assert NormalizedSkillCache.key("head-digest", "a") != key
+
+
+def test_normalize_skill_files_processes_misses_on_pool(tmp_path: Path) -> None:
+    """SKILL.md는 워커 풀에서 정규화하고 결과는 직접 정규화와 같다."""
+    cache = NormalizedSkillCache(tmp_path / "cache")
+    skill_mds = []
+    for i in range(5):
+        skill_md = tmp_path / "skills" / f"skill-{i}" / "SKILL.md"
+        skill_md.parent.mkdir(parents=True)
+        skill_md.write_text(f"# skill {i}\n\ndescription {i}\n")
+        skill_mds.append(skill_md)
+
+    normalize_skill_files(skill_mds, cache=cache, max_workers=3)
+
+    assert cache.misses == 5
+    for i, skill_md in enumerate(skill_mds):
+        expected = normalize_skill_markdown_for_codex(
+            f"# skill {i}\n\ndescription {i}\n", f"skill-{i}"
+        )
+        assert skill_md.read_text() == expected
+
+
+def test_codex_plan_normalizes_misses_before_applying(tmp_path: Path) -> None:
+    """Codex 스킬 계획은 바뀐 SKILL.md 헤더를 먼저 한꺼번에 만들고, 적용할 때는 캐시만 읽는다."""
+    project_root = tmp_path / "ai-env"
+    for i in range(3):
+        skill = project_root / ".claude" / "skills" / f"skill-{i}"
+        skill.mkdir(parents=True)
+        (skill / "SKILL.md").write_text(f"# skill {i}\n\ndescription {i}\n")
+    codex_copy = functools.partial(copy_skill_file_for_codex, copy_file_fn=copy_file)
+    plan = plan_skills(SkillCatalog.scan(project_root), tmp_path / "codex", codex_copy)
+
+    with patch(
+        "ai_env.core.sync_plan.prime_normalized_skill_cache",
+        wraps=codex_skills.prime_normalized_skill_cache,
+    ) as prime:
+        apply_skills_plan(plan)
+
+    (skill_mds,) = prime.call_args.args
+    assert sorted(name for _source, name in skill_mds) == ["skill-0", "skill-1", "skill-2"]
+    cache = default_normalized_skill_cache()
+    assert (cache.misses, cache.hits) == (3, 3)
+    assert (
+        (tmp_path / "codex" / "skill-1" / "SKILL.md").read_text().startswith("---\nname: skill-1\n")
+    )
+
+
+def test_write_normalized_skill_markdown_streams_body(tmp_path: Path, monkeypatch) -> None:
+    """본문은 청크 단위로 흘려 쓰며 결과는 문자열 정규화와 바이트 단위로 같다."""
+    monkeypatch.setattr(codex_skills, "_STREAM_CHUNK", 7)
+    body = "".join(f"line {i}\r\n" for i in range(200))
+    raw = f"---\nname: big\ndescription: |\n  큰 스킬\n---\n\n  {body}\n\n"
+    source = tmp_path / "src" / "SKILL.md"
+    source.parent.mkdir()
+    source.write_bytes(raw.encode())
+    target = tmp_path / "big" / "SKILL.md"
+    target.parent.mkdir()
+
+    write_normalized_skill_markdown(source, target, "big", NormalizedSkillCache(tmp_path / "c"))
+
+    content = raw.replace("\r\n", "\n")
+    assert target.read_bytes().decode() == normalize_skill_markdown_for_codex(content, "big")
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [
+        "---\n\n---\nname: other\n---\nbody\n",  # 빈 줄뿐인 frontmatter
+        "---  \n\t\n---  \nname: other\n---\nbody\n",  # 공백 붙은 첫 줄 + 빈 줄뿐인 블록
+        " ---\nname: other\n---\nbody\n",  # 앞 공백이 있으면 frontmatter가 아님
+        "---\n---\nname: other\n---\nbody\n",  # 빈 블록 뒤의 닫는 줄
+        "---\rname: other\r---\rbody\r",  # CR만 쓰는 줄바꿈
+    ],
+)
+def test_write_normalized_skill_markdown_matches_regex_on_edge_heads(
+    tmp_path: Path, raw: str
+) -> None:
+    """정규식과 다르게 읽힐 수 있는 앞부분은 문자열 정규화와 같은 결과를 낸다."""
+    source = tmp_path / "SKILL.md"
+    source.write_bytes(raw.encode())
+    target = tmp_path / "out.md"
+
+    write_normalized_skill_markdown(source, target, "edge", NormalizedSkillCache(tmp_path / "c"))
+
+    content = raw.replace("\r\n", "\n").replace("\r", "\n")
+    assert target.read_text() == normalize_skill_markdown_for_codex(content, "edge")
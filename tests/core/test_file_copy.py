@@ -0,0 +1,105 @@
+"""Tests for file copy strategies."""
+
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from ai_env.core.file_copy import FileCopier
+from ai_env.core.sync import _sync_hooks, safe_copytree
+
+
+def test_unknown_mode_raises():
+    """지원하지 않는 모드는 ValueError."""
+    with pytest.raises(ValueError, match="Unknown copy mode"):
+        FileCopier("symlink")
+
+
+@pytest.mark.parametrize("mode", ["copy", "reflink", "hardlink", "auto"])
+def test_all_modes_produce_identical_content(tmp_path, mode):
+    """어떤 전략이든 결과 내용은 같고, 실패하면 일반 복사로 fallback한다."""
+    src = tmp_path / "src.md"
+    src.write_text("hello\n")
+    dst = tmp_path / "out" / "dst.md"
+    dst.parent.mkdir()
+
+    copier = FileCopier(mode)
+    assert copier(src, dst) == str(dst)
+
+    assert dst.read_text() == "hello\n"
+    assert sum(copier.strategies.values()) == 1
+    assert not list(dst.parent.glob(".*ai-env-tmp"))
+
+
+def test_hardlink_mode_shares_inode(tmp_path):
+    """hardlink 모드는 같은 디바이스에서 inode를 공유한다."""
+    src = tmp_path / "src.md"
+    src.write_text("hello\n")
+    dst = tmp_path / "dst.md"
+
+    copier = FileCopier("hardlink")
+    copier(src, dst)
+
+    assert os.path.samefile(src, dst)
+    assert copier.describe() == "hardlink"
+
+
+def test_overwrite_does_not_modify_linked_source(tmp_path):
+    """하드링크된 대상에 다시 복사해도 다른 소스 파일 내용이 바뀌지 않는다."""
+    old_src = tmp_path / "old.md"
+    old_src.write_text("old\n")
+    new_src = tmp_path / "new.md"
+    new_src.write_text("new\n")
+    dst = tmp_path / "dst.md"
+
+    copier = FileCopier("hardlink", allow_hardlink=False)
+    FileCopier("hardlink")(old_src, dst)
+    copier(new_src, dst)
+
+    assert dst.read_text() == "new\n"
+    assert old_src.read_text() == "old\n"
+
+
+def test_annotate_only_for_non_default_mode(tmp_path):
+    """기본 copy 모드에서는 결과 설명을 바꾸지 않는다."""
+    src = tmp_path / "a.md"
+    src.write_text("a")
+
+    plain = FileCopier()
+    plain(src, tmp_path / "b.md")
+    assert plain.annotate("skills/ (1 items)") == "skills/ (1 items)"
+
+    linked = FileCopier("hardlink")
+    linked(src, tmp_path / "c.md")
+    assert linked.annotate("skills/ (1 items)") == "skills/ (1 items) [hardlink]"
+
+
+def test_safe_copytree_uses_copier(tmp_path):
+    """safe_copytree는 지정한 copier로 파일을 복사한다."""
+    src = tmp_path / "src"
+    (src / "sub").mkdir(parents=True)
+    (src / "a.md").write_text("a")
+    (src / "sub" / "b.md").write_text("b")
+
+    copier = FileCopier("hardlink")
+    safe_copytree(src, tmp_path / "dst", copier)
+
+    assert os.path.samefile(src / "sub" / "b.md", tmp_path / "dst" / "sub" / "b.md")
+    assert copier.strategies["hardlink"] == 2
+
+
+def test_hooks_never_hardlinked(tmp_path):
+    """hooks/는 chmod 대상이므로 hardlink 모드에서도 복사한다."""
+    src = tmp_path / "hooks"
+    src.mkdir()
+    (src / "notify.sh").write_text("#!/bin/sh\n")
+    os.chmod(src / "notify.sh", 0o644)
+    dst = tmp_path / "out" / "hooks"
+
+    desc, count = _sync_hooks(src, dst, dry_run=False, copier=FileCopier("hardlink"))
+
+    assert count == 1
+    assert not os.path.samefile(src / "notify.sh", dst / "notify.sh")
+    assert (src / "notify.sh").stat().st_mode & 0o777 == 0o644
+    assert desc.startswith("hooks/ (1 scripts)")
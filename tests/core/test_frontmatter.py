@@ -0,0 +1,43 @@
+"""Tests for the streaming frontmatter reader."""
+
+from __future__ import annotations
+
+import io
+
+from ai_env.core.frontmatter import read_frontmatter_text, read_markdown_head
+
+
+def test_read_markdown_head_stops_after_frontmatter():
+    """닫는 --- 줄까지만 읽고 본문 시작 위치를 돌려준다."""
+    header = b"---\nname: a\ndescription: b\n---\n"
+    f = io.BytesIO(header + b"x" * 100_000)
+
+    head = read_markdown_head(f)
+
+    assert head.frontmatter == "name: a\ndescription: b"
+    assert head.body_offset == len(header)
+    assert f.tell() == len(header)
+
+
+def test_read_markdown_head_respects_byte_cap():
+    """max_bytes 안에서 닫히지 않으면 frontmatter가 없는 것으로 본다."""
+    f = io.BytesIO(b"---\n" + b"k: v\n" * 100 + b"---\nbody")
+
+    head = read_markdown_head(f, max_bytes=64)
+
+    assert head.frontmatter is None
+    assert head.body_offset == 0
+
+
+def test_read_markdown_head_without_frontmatter():
+    """첫 줄이 ---가 아니거나 블록이 비어 있으면 frontmatter 없음."""
+    assert read_markdown_head(io.BytesIO(b"# title\n---\nname: a\n---\n")).frontmatter is None
+    assert read_markdown_head(io.BytesIO(b"---\n---\nbody\n")).frontmatter is None
+
+
+def test_read_frontmatter_text_crlf(tmp_path):
+    """CRLF 파일도 read_text()와 같이 \\n으로 정규화한다."""
+    path = tmp_path / "SKILL.md"
+    path.write_bytes(b"---\r\nname: a\r\n---\r\nbody\r\n")
+
+    assert read_frontmatter_text(path) == "---\nname: a\n---\n"
@@ -0,0 +1,212 @@
+"""Tests for fan-out sync into multiple home directories."""
+
+from __future__ import annotations
+
+import os
+import pwd
+import stat
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from ai_env.core.config import MCPConfig, MCPServerConfig, Settings
+from ai_env.core.homes import (
+    HomeEntry,
+    HomeFanout,
+    HomeRoster,
+    build_fanout,
+    load_roster,
+    sync_homes,
+)
+from ai_env.core.skill_catalog import SkillCatalog
+from ai_env.core.skill_store import SkillStore
+
+
+def _make_project(root: Path) -> Path:
+    global_dir = root / ".claude" / "global"
+    global_dir.mkdir(parents=True)
+    (global_dir / "CLAUDE.md").write_text("# Global\n")
+    (global_dir / "settings.json.template").write_text('{"env": {"TOKEN": "${API_TOKEN}"}}\n')
+    skill = root / ".claude" / "skills" / "my-skill"
+    skill.mkdir(parents=True)
+    (skill / "SKILL.md").write_text("---\nname: my-skill\ndescription: test\n---\nbody\n")
+    return root
+
+
+def _fanout(project_root: Path, store: SkillStore | None = None) -> HomeFanout:
+    mcp_config = MCPConfig(
+        mcp_servers={
+            "github": MCPServerConfig(
+                command="gh-mcp", env_keys=["API_TOKEN"], targets=["codex", "gemini"]
+            )
+        }
+    )
+    return HomeFanout(
+        catalog=SkillCatalog.scan(project_root),
+        settings=Settings(cmux_enabled=False),
+        mcp_config=mcp_config,
+        store=store,
+    )
+
+
+def _roster(tmp_path: Path, users: list[str]) -> HomeRoster:
+    homes = []
+    for user in users:
+        home = tmp_path / "homes" / user
+        (home / ".ai-env").mkdir(parents=True)
+        (home / ".ai-env" / ".env").write_text(f"API_TOKEN=token-{user}\n")
+        homes.append(HomeEntry(user=user, home=str(home)))
+    return HomeRoster(homes=homes)
+
+
+def test_sync_homes_renders_per_user_secrets(tmp_path):
+    """홈마다 사용자 .env로 settings.json/MCP 설정을 렌더링하고 시크릿 파일은 0600으로 쓴다."""
+    project_root = _make_project(tmp_path / "ai-env")
+    user = pwd.getpwuid(os.getuid()).pw_name
+    roster = _roster(tmp_path, [user])
+    roster.homes.append(HomeEntry(user=user, home=str(tmp_path / "homes" / "second")))
+    (tmp_path / "homes" / "second" / ".ai-env").mkdir(parents=True)
+    (tmp_path / "homes" / "second" / ".ai-env" / ".env").write_text("API_TOKEN=token-second\n")
+
+    with (
+        patch("ai_env.core.sync.get_project_root", return_value=project_root),
+        patch.dict(os.environ, {"API_TOKEN": "admin-token"}),
+    ):
+        results = sync_homes(roster, _fanout(project_root), max_workers=2)
+
+    assert [r.ok for r in results] == [True, True]
+    for name in (user, "second"):
+        home = tmp_path / "homes" / name
+        assert (home / ".claude" / "CLAUDE.md").read_text() == "# Global\n"
+        assert (home / ".codex" / "skills" / "my-skill" / "SKILL.md").exists()
+        assert "## Available Skills" in (home / ".gemini" / "GEMINI.md").read_text()
+        settings_json = home / ".claude" / "settings.json"
+        assert f"token-{name}" in settings_json.read_text()
+        assert stat.S_IMODE(settings_json.stat().st_mode) == 0o600
+        codex_config = (home / ".codex" / "config.toml").read_text()
+        # 실행자의 환경변수가 다른 사용자 설정에 섞이지 않음
+        assert f'API_TOKEN = "token-{name}"' in codex_config
+        assert "admin-token" not in codex_config
+        # 프로젝트 로컬 출력은 홈 fan-out 대상이 아님
+        assert not (home / "generated").exists()
+
+
+def test_sync_homes_shares_skill_store(tmp_path):
+    """roster의 store를 쓰면 모든 홈의 스킬이 같은 store 객체를 링크한다."""
+    project_root = _make_project(tmp_path / "ai-env")
+    user = pwd.getpwuid(os.getuid()).pw_name
+    roster = HomeRoster(
+        homes=[
+            HomeEntry(user=user, home=str(tmp_path / "homes" / "a")),
+            HomeEntry(user=user, home=str(tmp_path / "homes" / "b")),
+        ]
+    )
+    store = SkillStore(tmp_path / "store")
+
+    with patch("ai_env.core.sync.get_project_root", return_value=project_root):
+        results = sync_homes(roster, _fanout(project_root, store), max_workers=2)
+
+    assert all(r.ok for r in results)
+    links = {os.readlink(tmp_path / "homes" / h / ".claude" / "skills" / "my-skill") for h in "ab"}
+    assert len(links) == 1
+    assert store.stats().refs == 4  # 홈 2개 × (Claude + Codex)
+
+
+def test_sync_homes_reports_unknown_user(tmp_path):
+    """시스템에 없는 사용자는 실패로 보고하고 나머지 홈은 계속 동기화한다."""
+    project_root = _make_project(tmp_path / "ai-env")
+    user = pwd.getpwuid(os.getuid()).pw_name
+    roster = HomeRoster(
+        homes=[
+            HomeEntry(user="no-such-user-ai-env"),
+            HomeEntry(user=user, home=str(tmp_path / "homes" / "ok")),
+        ]
+    )
+
+    with patch("ai_env.core.sync.get_project_root", return_value=project_root):
+        results = sync_homes(roster, _fanout(project_root))
+
+    assert not results[0].ok
+    assert "no-such-user-ai-env" in (results[0].error or "")
+    assert results[1].ok
+    assert (tmp_path / "homes" / "ok" / ".claude" / "CLAUDE.md").exists()
+
+
+@pytest.mark.skipif(os.geteuid() != 0, reason="chown requires root")
+def test_sync_homes_chowns_to_user(tmp_path):
+    """root로 실행하면 홈에 쓴 파일과 만든 디렉토리를 사용자 소유로 바꾼다."""
+    project_root = _make_project(tmp_path / "ai-env")
+    daemon = pwd.getpwnam("daemon")
+    roster = HomeRoster(homes=[HomeEntry(user="daemon", home=str(tmp_path / "homes" / "d"))])
+
+    with patch("ai_env.core.sync.get_project_root", return_value=project_root):
+        results = sync_homes(roster, _fanout(project_root))
+
+    assert results[0].ok, results[0].error
+    home = tmp_path / "homes" / "d"
+    for path in (
+        home / ".claude",
+        home / ".claude" / "settings.json",
+        home / ".codex" / "skills" / "my-skill" / "SKILL.md",
+    ):
+        assert path.lstat().st_uid == daemon.pw_uid
+
+
+def test_load_roster(tmp_path):
+    """roster YAML을 읽고, 파일이 없으면 ValueError."""
+    path = tmp_path / "roster.yaml"
+    path.write_text("store_dir: /srv/ai-env/store\nhomes:\n  - user: alice\n    home: /home/a\n")
+
+    roster = load_roster(path)
+
+    assert roster.store_dir == "/srv/ai-env/store"
+    assert roster.homes[0].user == "alice"
+    with pytest.raises(ValueError, match="Roster not found"):
+        load_roster(tmp_path / "missing.yaml")
+
+
+@pytest.mark.skipif(os.geteuid() != 0, reason="ownership checks apply when running as root")
+def test_sync_homes_refuses_symlinked_config_dir(tmp_path):
+    """root로 실행할 때 사용자가 ~/.claude를 홈 밖으로 링크해 두면 아무것도 쓰지 않는다."""
+    project_root = _make_project(tmp_path / "ai-env")
+    daemon = pwd.getpwnam("daemon")
+    home = tmp_path / "homes" / "d"
+    home.mkdir(parents=True)
+    os.chown(home, daemon.pw_uid, daemon.pw_gid)
+    outside = tmp_path / "etc"
+    outside.mkdir()
+    (home / ".claude").symlink_to(outside)
+    os.lchown(home / ".claude", daemon.pw_uid, daemon.pw_gid)
+    roster = HomeRoster(homes=[HomeEntry(user="daemon", home=str(home))])
+
+    with patch("ai_env.core.sync.get_project_root", return_value=project_root):
+        results = sync_homes(roster, _fanout(project_root))
+
+    assert not results[0].ok
+    assert "symlink" in (results[0].error or "")
+    assert list(outside.iterdir()) == []
+    assert not (home / ".codex").exists()
+
+
+def test_build_fanout_requires_readable_shared_store(tmp_path):
+    """store를 켠 --homes는 roster store_dir이 필요하고, 다른 사용자가 읽을 수 있어야 한다."""
+    project_root = _make_project(tmp_path / "ai-env")
+    settings = Settings(sync={"skill_store": True})
+    with pytest.raises(ValueError, match="store_dir"):
+        build_fanout(project_root, HomeRoster(), settings)
+
+    with tempfile.TemporaryDirectory() as shared:
+        Path(shared).chmod(0o755)
+        private = Path(shared) / "private"
+        private.mkdir(mode=0o700)
+        roster = HomeRoster(store_dir=str(private / "store"))
+        with pytest.raises(ValueError, match="not reachable by other users"):
+            build_fanout(project_root, roster, settings)
+
+        private.chmod(0o755)
+        with patch("ai_env.core.homes.load_mcp_config", return_value=MCPConfig()):
+            fanout = build_fanout(project_root, roster, settings)
+        assert fanout.store is not None
+        assert fanout.store.root == private / "store"
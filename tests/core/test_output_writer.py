@@ -0,0 +1,83 @@
+"""Tests for the write-if-changed output writer."""
+
+from __future__ import annotations
+
+import os
+import stat
+from unittest.mock import MagicMock
+
+from ai_env.core.config import MCPConfig, Settings
+from ai_env.core.output_writer import OutputWriter, annotate
+from ai_env.mcp.generator import MCPConfigGenerator
+
+
+def test_unchanged_content_is_not_rewritten(tmp_path):
+    """내용이 같으면 파일을 건드리지 않아 mtime/inode가 유지된다."""
+    path = tmp_path / "settings.json"
+    path.write_text('{"a": 1}')
+    os.utime(path, (1_000_000, 1_000_000))
+    inode = path.stat().st_ino
+
+    writer = OutputWriter()
+    result = writer.write_text(path, '{"a": 1}')
+
+    assert result.status == "unchanged"
+    assert path.stat().st_mtime == 1_000_000
+    assert path.stat().st_ino == inode
+    assert annotate("settings.json", result) == "settings.json (unchanged)"
+
+
+def test_changed_content_is_replaced_atomically(tmp_path):
+    """내용이 바뀌면 임시 파일 + rename으로 교체하고 기존 권한을 유지한다."""
+    path = tmp_path / "config.toml"
+    path.write_text("old")
+    path.chmod(0o640)
+
+    writer = OutputWriter()
+    result = writer.write_text(path, "new")
+
+    assert result.status == "written"
+    assert path.read_text() == "new"
+    assert stat.S_IMODE(path.stat().st_mode) == 0o640
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["config.toml"]
+
+
+def test_write_follows_symlink(tmp_path):
+    """심볼릭 링크 대상 파일에 쓰고 링크 자체는 유지한다."""
+    real = tmp_path / "dotfiles" / "settings.json"
+    real.parent.mkdir()
+    real.write_text("old")
+    link = tmp_path / "settings.json"
+    link.symlink_to(real)
+
+    OutputWriter().write_text(link, "new")
+
+    assert link.is_symlink()
+    assert real.read_text() == "new"
+
+
+def test_dry_run_reports_without_writing(tmp_path):
+    """dry_run이면 쓸지 여부만 보고한다."""
+    path = tmp_path / "new.json"
+    writer = OutputWriter(dry_run=True)
+
+    result = writer.write_text(path, "{}")
+
+    assert result.status == "written"
+    assert not path.exists()
+    assert writer.counts() == {"written": 1, "unchanged": 0}
+
+
+def test_generator_second_save_is_unchanged(tmp_path):
+    """MCP 설정을 두 번 저장하면 두 번째는 모든 파일이 unchanged."""
+    secrets = MagicMock()
+    secrets.get.side_effect = lambda key, default="": default
+    generator = MCPConfigGenerator(secrets, MCPConfig(), Settings())
+
+    first = OutputWriter()
+    generator.save_all(home=tmp_path, writer=first)
+    second = OutputWriter()
+    saved = generator.save_all(home=tmp_path, writer=second)
+
+    assert first.counts() == {"written": len(saved), "unchanged": 0}
+    assert second.counts() == {"written": 0, "unchanged": len(saved)}
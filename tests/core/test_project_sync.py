@@ -4,7 +4,11 @@ from __future__ import annotations
 
 from pathlib import Path
 
-from ai_env.core.project_sync import sync_project_claude_to_codex
+from ai_env.core.project_sync import (
+    discover_projects,
+    sync_project_claude_to_codex,
+    sync_workspace,
+)
 
 
 def test_sync_project_claude_to_codex_links_files(tmp_path: Path) -> None:
@@ -89,3 +93,70 @@ def test_sync_project_claude_to_codex_dry_run(tmp_path: Path) -> None:
     assert [result.status for result in results] == ["linked", "copied"]
     assert not (project_dir / "AGENTS.md").exists()
     assert not (project_dir / ".codex" / "skills").exists()
+
+
+def _make_claude_project(project_dir: Path, with_skill: bool = True) -> Path:
+    project_dir.mkdir(parents=True, exist_ok=True)
+    (project_dir / "CLAUDE.md").write_text("# Project Claude")
+    if with_skill:
+        skill = project_dir / ".claude" / "skills" / "research"
+        skill.mkdir(parents=True)
+        (skill / "SKILL.md").write_text("# research")
+    return project_dir
+
+
+def test_discover_projects_honors_gitignore_and_depth(tmp_path: Path) -> None:
+    """CLAUDE.md 또는 .claude/skills가 있는 디렉토리를 찾고 .gitignore/깊이 제한을 지킨다."""
+    root = tmp_path / "work"
+    _make_claude_project(root / "api")
+    skills_only = root / "group" / "web" / ".claude" / "skills"
+    skills_only.mkdir(parents=True)
+    _make_claude_project(root / "api" / "packages" / "sdk", with_skill=False)
+    _make_claude_project(root / "build" / "copy", with_skill=False)
+    _make_claude_project(root / "node_modules" / "dep", with_skill=False)
+    _make_claude_project(root / "a" / "b" / "c" / "deep", with_skill=False)
+    (root / ".gitignore").write_text("# generated\nbuild/\n")
+
+    found = discover_projects(root, max_depth=3)
+
+    assert found == sorted(
+        [root / "api", root / "api" / "packages" / "sdk", root / "group" / "web"]
+    )
+    assert root / "a" / "b" / "c" / "deep" in discover_projects(root, max_depth=4)
+    assert root / "build" / "copy" in discover_projects(root, respect_gitignore=False)
+
+
+def test_sync_workspace_aggregates_per_project_results(tmp_path: Path) -> None:
+    """모든 프로젝트를 동기화하고 프로젝트별 결과/시간과 상태 집계를 돌려준다."""
+    root = tmp_path / "work"
+    for name in ("one", "two", "three"):
+        _make_claude_project(root / name)
+    progress: list[Path] = []
+
+    report = sync_workspace(root, max_workers=2, on_progress=lambda r: progress.append(r.project))
+
+    assert [r.project for r in report.projects] == sorted(root / n for n in ("one", "three", "two"))
+    assert sorted(progress) == [r.project for r in report.projects]
+    assert report.status_counts() == {"linked": 3, "copied": 3}
+    assert all(r.ok and r.elapsed >= 0 for r in report.projects)
+    for name in ("one", "two", "three"):
+        assert (root / name / "AGENTS.md").is_symlink()
+        assert (root / name / ".codex" / "skills" / "research" / "SKILL.md").exists()
+    assert report.to_dict()["errors"] == 0
+
+
+def test_sync_workspace_reports_undecodable_skill_and_continues(tmp_path: Path) -> None:
+    """UTF-8이 아닌 SKILL.md는 그 프로젝트의 오류로만 기록하고 나머지는 계속 동기화한다."""
+    root = tmp_path / "work"
+    _make_claude_project(root / "bad")
+    _make_claude_project(root / "good")
+    (root / "bad" / ".claude" / "skills" / "research" / "SKILL.md").write_bytes(b"# \xff\xfe\n")
+
+    report = sync_workspace(root, use_copy=True)
+
+    bad, good = report.projects
+    assert not bad.ok
+    assert "utf-8" in (bad.error or "")
+    assert good.ok
+    assert (root / "good" / ".codex" / "skills" / "research" / "SKILL.md").exists()
+    assert report.to_dict()["errors"] == 1
@@ -0,0 +1,64 @@
+"""Tests for the shared skill catalog."""
+
+from unittest.mock import patch
+
+from ai_env.core.skill_catalog import SkillCatalog
+from ai_env.core.sync import _build_skills_index, _sync_skills_merged
+
+
+def _make_project(tmp_path):
+    project_root = tmp_path / "ai-env"
+    personal = project_root / ".claude" / "skills" / "git-worktree"
+    personal.mkdir(parents=True)
+    (personal / "SKILL.md").write_text("---\nname: git-worktree\ndescription: Worktrees\n---\n")
+
+    team_real = tmp_path / "cde-skills-repo"
+    nested = team_real / ".claude" / "skills" / "spark-debug"
+    nested.mkdir(parents=True)
+    (nested / "SKILL.md").write_text("---\nname: spark-debug\ndescription: Spark\n---\n")
+    (project_root / "cde-skills").symlink_to(team_real)
+    return project_root
+
+
+def test_scan_records_layout_and_origin(tmp_path):
+    """스캔 결과에 구조(layout)와 출처(origin)가 기록된다."""
+    project_root = _make_project(tmp_path)
+
+    catalog = SkillCatalog.scan(project_root, skills_include=["cde-skills"])
+
+    assert [(e.name, e.layout, e.origin) for e in catalog.entries] == [
+        ("git-worktree", "personal", "personal"),
+        ("spark-debug", "nested", "cde-skills"),
+    ]
+
+
+def test_summary_and_files_read_once(tmp_path):
+    """SKILL.md와 파일 목록은 여러 소비자가 사용해도 한 번만 읽는다."""
+    project_root = _make_project(tmp_path)
+    catalog = SkillCatalog.scan(project_root, skills_include=["cde-skills"])
+
+    with (
+        patch("ai_env.core.skill_catalog.parse_skill_summary", return_value=("n", "d")) as parse,
+        patch(
+            "ai_env.core.skill_catalog.list_source_files",
+            side_effect=lambda src: [],
+        ) as walk,
+    ):
+        _build_skills_index(project_root, catalog=catalog)
+        _build_skills_index(project_root, catalog=catalog)
+        _sync_skills_merged(project_root, tmp_path / "claude", False, catalog=catalog)
+        _sync_skills_merged(project_root, tmp_path / "codex", False, catalog=catalog)
+
+    assert parse.call_count == 2
+    assert walk.call_count == 2
+
+
+def test_fingerprint_changes_with_content(tmp_path):
+    """파일 내용(크기/mtime)이 바뀌면 지문이 바뀐다."""
+    project_root = _make_project(tmp_path)
+    before = SkillCatalog.scan(project_root).entries[0].fingerprint
+
+    skill_md = project_root / ".claude" / "skills" / "git-worktree" / "SKILL.md"
+    skill_md.write_text(skill_md.read_text() + "more\n")
+
+    assert SkillCatalog.scan(project_root).entries[0].fingerprint != before
@@ -0,0 +1,139 @@
+"""Tests for the content-addressed skill store."""
+
+from __future__ import annotations
+
+import functools
+import os
+from pathlib import Path
+
+from ai_env.core.codex_skills import NORMALIZER_VERSION, copy_skill_file_for_codex
+from ai_env.core.skill_catalog import SkillCatalog
+from ai_env.core.skill_store import SkillStore, output_version
+from ai_env.core.sync import _sync_skill_subset
+from ai_env.core.sync_manifest import copy_file
+from ai_env.core.sync_plan import apply_skills_plan, plan_skills
+
+
+def _make_project(root: Path) -> Path:
+    skill = root / ".claude" / "skills" / "my-skill"
+    skill.mkdir(parents=True)
+    (skill / "SKILL.md").write_text("---\nname: my-skill\ndescription: test\n---\nbody\n")
+    (skill / "notes.md").write_text("notes\n")
+    return skill
+
+
+def _objects(store: SkillStore) -> list[str]:
+    return sorted(p.name for p in store.root.iterdir() if len(p.name) == 64)
+
+
+def test_store_shares_one_object_across_targets(tmp_path):
+    """같은 스킬을 여러 대상에 동기화해도 객체는 하나이고 대상은 심볼릭 링크가 된다."""
+    project_root = tmp_path / "ai-env"
+    _make_project(project_root)
+    catalog = SkillCatalog.scan(project_root)
+    store = SkillStore(tmp_path / "store")
+
+    for name in ("home-a", "home-b"):
+        apply_skills_plan(plan_skills(catalog, tmp_path / name / "skills", copy_file, store=store))
+
+    assert len(_objects(store)) == 1
+    for name in ("home-a", "home-b"):
+        link = tmp_path / name / "skills" / "my-skill"
+        assert link.is_symlink()
+        assert (link / "notes.md").read_text() == "notes\n"
+    assert store.stats().refs == 2
+
+
+def test_store_objects_are_read_only_and_source_stays_writable(tmp_path):
+    """객체 파일은 읽기 전용이고, hardlink 복사 전략이어도 소스 권한은 바뀌지 않는다."""
+    project_root = tmp_path / "ai-env"
+    skill = _make_project(project_root)
+    store = SkillStore(tmp_path / "store")
+
+    def hardlink(src: Path, dst: Path) -> None:
+        os.link(src, dst)
+
+    apply_skills_plan(
+        plan_skills(SkillCatalog.scan(project_root), tmp_path / "skills", hardlink, store=store)
+    )
+
+    target = tmp_path / "skills" / "my-skill" / "notes.md"
+    assert target.stat().st_mode & 0o222 == 0
+    assert (skill / "notes.md").stat().st_mode & 0o200
+
+
+def test_store_relinks_on_change_and_gc_removes_orphans(tmp_path):
+    """소스가 바뀌면 새 객체로 링크를 바꾸고, gc는 참조 없는 이전 객체만 지운다."""
+    project_root = tmp_path / "ai-env"
+    skill = _make_project(project_root)
+    store = SkillStore(tmp_path / "store")
+    dst = tmp_path / "skills"
+
+    apply_skills_plan(plan_skills(SkillCatalog.scan(project_root), dst, copy_file, store=store))
+    first = _objects(store)
+    # 변경이 없으면 같은 객체를 그대로 사용
+    apply_skills_plan(plan_skills(SkillCatalog.scan(project_root), dst, copy_file, store=store))
+    assert _objects(store) == first
+
+    (skill / "notes.md").write_text("notes v2\n")
+    apply_skills_plan(plan_skills(SkillCatalog.scan(project_root), dst, copy_file, store=store))
+    assert len(_objects(store)) == 2
+    assert (dst / "my-skill" / "notes.md").read_text() == "notes v2\n"
+
+    # 유예 시간 안의 객체는 남긴다
+    assert store.gc(grace=3600).removed == []
+    result = store.gc(grace=0)
+    assert result.removed == first
+    assert _objects(store) != first
+    assert (dst / "my-skill" / "notes.md").read_text() == "notes v2\n"
+
+
+def test_store_gc_prunes_stale_refs(tmp_path):
+    """링크가 사라지거나 다른 곳을 가리키면 gc가 참조를 정리하고 객체를 지운다."""
+    project_root = tmp_path / "ai-env"
+    _make_project(project_root)
+    store = SkillStore(tmp_path / "store")
+    dst = tmp_path / "skills"
+    apply_skills_plan(plan_skills(SkillCatalog.scan(project_root), dst, copy_file, store=store))
+
+    (dst / "my-skill").unlink()
+    dry = store.gc(dry_run=True, grace=0)
+    assert len(dry.removed) == 1
+    assert len(_objects(store)) == 1
+
+    result = store.gc(grace=0)
+    assert result.pruned_refs == 1
+    assert _objects(store) == []
+
+
+def test_output_version_separates_codex_objects():
+    """Codex 정규화 결과는 정규화기 버전을 포함해 일반 복사와 다른 객체로 저장된다."""
+    codex_copy = functools.partial(copy_skill_file_for_codex, copy_file_fn=copy_file)
+
+    assert output_version(codex_copy) != output_version(copy_file)
+    assert output_version(codex_copy).endswith(f":v{NORMALIZER_VERSION}")
+
+
+def test_watch_resync_relinks_to_new_store_object(tmp_path):
+    """watch 재동기화도 store를 거쳐 새 객체로 링크를 바꾸고 기존 객체는 건드리지 않는다."""
+    project_root = tmp_path / "ai-env"
+    skill = _make_project(project_root)
+    store = SkillStore(tmp_path / "store")
+    dst = tmp_path / "skills"
+    apply_skills_plan(plan_skills(SkillCatalog.scan(project_root), dst, copy_file, store=store))
+    old_target = (dst / "my-skill").resolve()
+
+    (skill / "notes.md").write_text("edited\n")
+    changed = _sync_skill_subset(
+        dst, SkillCatalog.scan(project_root), {"my-skill"}, copy_file, store
+    )
+
+    assert changed == ["my-skill"]
+    assert (dst / "my-skill").is_symlink()
+    assert (dst / "my-skill" / "notes.md").read_text() == "edited\n"
+    assert (old_target / "notes.md").read_text() == "notes\n"
+    assert len(_objects(store)) == 2
+    assert (
+        _sync_skill_subset(dst, SkillCatalog.scan(project_root), {"my-skill"}, copy_file, store)
+        == []
+    )
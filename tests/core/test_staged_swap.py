@@ -0,0 +1,149 @@
+"""Tests for staged directory swap."""
+
+from __future__ import annotations
+
+import os
+import shutil
+import time
+from pathlib import Path
+
+import pytest
+
+from ai_env.core import staged_swap
+from ai_env.core.staged_swap import (
+    STAGING_PREFIX,
+    materialize,
+    swap_into_place,
+    sweep_stale_staging,
+    wait_for_cleanup,
+)
+from ai_env.core.sync import safe_copytree
+from ai_env.core.sync_manifest import SyncManifest, copy_file, sync_tree_incremental, writer_id
+
+
+def _staging_roots(parent: Path) -> list[Path]:
+    wait_for_cleanup()
+    return [p for p in parent.iterdir() if p.name.startswith(STAGING_PREFIX)]
+
+
+@pytest.mark.parametrize("exchange", [True, False])
+def test_swap_replaces_existing_directory(tmp_path, monkeypatch, exchange):
+    """RENAME_EXCHANGE 지원 여부와 관계없이 교체 결과는 같다."""
+    if not exchange:
+        monkeypatch.setattr(staged_swap, "exchange_paths", lambda a, b: False)
+    dst = tmp_path / "skill"
+    dst.mkdir()
+    (dst / "old.md").write_text("old")
+    staging = tmp_path / "stage" / "skill"
+    staging.mkdir(parents=True)
+    (staging / "new.md").write_text("new")
+
+    swap_into_place(staging, dst)
+
+    assert [p.name for p in dst.iterdir()] == ["new.md"]
+    assert list((tmp_path / "stage").rglob("old.md"))
+
+
+def test_materialize_failure_keeps_previous_tree(tmp_path):
+    """staging 생성이 실패하면 기존 대상은 그대로 남고 staging은 정리된다."""
+    dst = tmp_path / "skill"
+    dst.mkdir()
+    (dst / "SKILL.md").write_text("v1")
+
+    def _build(staging: Path) -> None:
+        staging.mkdir()
+        (staging / "SKILL.md").write_text("v2")
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        materialize(dst, _build)
+
+    assert (dst / "SKILL.md").read_text() == "v1"
+    assert _staging_roots(tmp_path) == []
+
+
+def test_fallback_swap_failure_restores_previous_tree(tmp_path, monkeypatch):
+    """RENAME_EXCHANGE 없이 교체하다 실패하면 이전 트리를 되돌려 놓는다."""
+    monkeypatch.setattr(staged_swap, "exchange_paths", lambda a, b: False)
+    dst = tmp_path / "skill"
+    dst.mkdir()
+    (dst / "SKILL.md").write_text("v1")
+    real_rename = os.rename
+
+    def _rename(src, target):
+        if Path(target) == dst and Path(src).name == "skill":
+            raise OSError("rename failed")
+        real_rename(src, target)
+
+    monkeypatch.setattr(staged_swap.os, "rename", _rename)
+
+    def _build(staging: Path) -> None:
+        staging.mkdir()
+        (staging / "SKILL.md").write_text("v2")
+
+    with pytest.raises(OSError, match="rename failed"):
+        materialize(dst, _build)
+
+    assert (dst / "SKILL.md").read_text() == "v1"
+    assert _staging_roots(tmp_path) == []
+
+
+def test_safe_copytree_never_exposes_partial_tree(tmp_path):
+    """복사 중에도 대상은 이전 트리 전체를 유지하고, 교체 후 이전 세대는 삭제된다."""
+    src = tmp_path / "src"
+    src.mkdir()
+    for i in range(3):
+        (src / f"{i}.md").write_text("new")
+    dst = tmp_path / "out" / "commands"
+    dst.mkdir(parents=True)
+    for i in range(3):
+        (dst / f"{i}.md").write_text("old")
+
+    observed: list[list[str]] = []
+
+    def _copy(s: str, d: str) -> str:
+        observed.append(sorted(p.read_text() for p in dst.iterdir()))
+        return shutil.copy2(s, d)
+
+    safe_copytree(src, dst, copier=_copy)  # type: ignore[arg-type]
+
+    assert observed == [["old", "old", "old"]] * 3
+    assert sorted(p.read_text() for p in dst.iterdir()) == ["new", "new", "new"]
+    assert _staging_roots(dst.parent) == []
+
+
+def test_incremental_sync_swaps_and_links_unchanged_files(tmp_path):
+    """변경된 스킬은 staging에서 재구성되고, 유지 파일은 기존 대상을 하드링크한다."""
+    src = tmp_path / "src" / "my-skill"
+    src.mkdir(parents=True)
+    (src / "SKILL.md").write_text("v1")
+    (src / "big.bin").write_bytes(b"x" * 1024)
+    target_root = tmp_path / "target"
+
+    manifest = SyncManifest.load(target_root, writer_id(copy_file))
+    sync_tree_incremental(src, target_root / "my-skill", manifest)
+    big_inode = (target_root / "my-skill" / "big.bin").stat().st_ino
+
+    (src / "SKILL.md").write_text("v2")
+    stats = sync_tree_incremental(src, target_root / "my-skill", manifest)
+
+    assert stats.copied == 1
+    assert (target_root / "my-skill" / "SKILL.md").read_text() == "v2"
+    assert (target_root / "my-skill" / "big.bin").stat().st_ino == big_inode
+    assert _staging_roots(target_root) == []
+
+
+def test_sweep_removes_only_stale_staging(tmp_path):
+    """오래된 staging 루트만 정리하고 진행 중인 것은 남긴다."""
+    stale = tmp_path / f"{STAGING_PREFIX}stale"
+    fresh = tmp_path / f"{STAGING_PREFIX}fresh"
+    stale.mkdir()
+    fresh.mkdir()
+    old = time.time() - 7200
+    os.utime(stale, (old, old))
+
+    assert sweep_stale_staging(tmp_path) == 1
+    wait_for_cleanup()
+
+    assert not stale.exists()
+    assert fresh.exists()
@@ -4,16 +4,20 @@ import stat
 from unittest.mock import MagicMock, patch
 
 import pytest
+from ai_env.core.file_copy import FileCopier
+from ai_env.core.skill_catalog import SkillCatalog
 from ai_env.core.sync import (
     _build_skills_index,
     _collect_skill_sources,
     _extract_skill_summary,
     _sync_file_or_dir,
     _sync_skills_merged,
+    plan_global_sync,
     sync_claude_global_config,
     sync_codex_global_config,
     sync_gemini_global_config,
 )
+from ai_env.core.sync_manifest import plan_tree_incremental as real_plan
 
 
 @pytest.fixture()
@@ -39,6 +43,24 @@ def test_sync_file_copy(tmp_path):
     assert dst.read_text() == "content"
 
 
+def test_sync_user_editable_files_never_hardlink(tmp_path):
+    """CLAUDE.md와 commands/는 hardlink 모드여도 저장소 원본과 inode를 공유하지 않는다."""
+    src = tmp_path / "CLAUDE.md"
+    src.write_text("global")
+    commands = tmp_path / "commands"
+    commands.mkdir()
+    (commands / "review.md").write_text("review")
+    dst = tmp_path / "home"
+
+    _sync_file_or_dir(src, dst / "CLAUDE.md", copier=FileCopier("hardlink"))
+    _sync_file_or_dir(commands, dst / "commands", copier=FileCopier("hardlink"))
+
+    assert not (dst / "CLAUDE.md").samefile(src)
+    assert not (dst / "commands" / "review.md").samefile(commands / "review.md")
+    (dst / "CLAUDE.md").write_text("edited")
+    assert src.read_text() == "global"
+
+
 def test_sync_directory_copy(tmp_path):
     """Test directory recursive copy."""
     src = tmp_path / "source"
@@ -208,6 +230,26 @@ def test_sync_skills_merged(tmp_path):
     assert (dst / "trino-analyst" / "SKILL.md").exists()
 
 
+def test_sync_skills_merged_applies_given_plan(tmp_path):
+    """미리 세운 계획을 주면 다시 계획하지 않고 그대로 실행한다."""
+    project_root = tmp_path / "ai-env"
+    (project_root / ".claude" / "skills" / "mcp-config").mkdir(parents=True)
+    (project_root / ".claude" / "skills" / "mcp-config" / "SKILL.md").write_text("# MCP")
+    dst = tmp_path / "target-skills"
+
+    with (
+        patch("ai_env.core.sync.get_project_root", return_value=project_root),
+        patch("ai_env.core.sync.Path.home", return_value=tmp_path),
+    ):
+        (plan,) = plan_global_sync(targets=("claude",)).skills
+    with patch("ai_env.core.sync.plan_skills", side_effect=AssertionError("re-planned")):
+        _desc, count = _sync_skills_merged(project_root, dst, dry_run=False, plan=plan)
+
+    assert count == 1
+    assert not dst.exists()
+    assert (tmp_path / ".claude" / "skills" / "mcp-config" / "SKILL.md").exists()
+
+
 def _setup_multi_team_skills(tmp_path):
     """테스트용 multi-team skills 환경 생성 헬퍼."""
     project_root = tmp_path / "ai-env"
@@ -847,3 +889,87 @@ def test_sync_cmux_hooks_excluded_when_disabled(tmp_path, mock_secrets_manager):
     session_hooks = settings["hooks"]["SessionStart"][0]["hooks"]
     assert len(session_hooks) == 1
     assert "session_start.sh" in session_hooks[0]["command"]
+
+
+def test_sync_skills_merged_is_incremental(tmp_path):
+    """두 번째 동기화는 변경된 스킬 파일만 복사하고 외부 스킬은 유지한다."""
+    project_root = tmp_path / "ai-env"
+    skills_dir = project_root / ".claude" / "skills"
+    (skills_dir / "alpha").mkdir(parents=True)
+    (skills_dir / "alpha" / "SKILL.md").write_text("# alpha")
+    (skills_dir / "beta").mkdir()
+    (skills_dir / "beta" / "SKILL.md").write_text("# beta")
+
+    dst = tmp_path / "target-skills"
+    (dst / "external").mkdir(parents=True)
+    (dst / "external" / "SKILL.md").write_text("# external")
+
+    copied: list[str] = []
+
+    def _recording_copy(src, target):
+        copied.append(src.parent.name)
+        target.write_bytes(src.read_bytes())
+
+    _sync_skills_merged(project_root, dst, dry_run=False, copy_file_fn=_recording_copy)
+    assert sorted(copied) == ["alpha", "beta"]
+
+    copied.clear()
+    (skills_dir / "beta" / "SKILL.md").write_text("# beta v2")
+    _sync_skills_merged(project_root, dst, dry_run=False, copy_file_fn=_recording_copy)
+
+    assert copied == ["beta"]
+    assert (dst / "beta" / "SKILL.md").read_text() == "# beta v2"
+    assert (dst / "external" / "SKILL.md").exists()
+
+
+def test_sync_skills_merged_skips_unchanged_team_tree(tmp_path):
+    """팀 레포의 git tree가 그대로면 레포 전체를 건너뛰고, 커밋/작업 트리 변경 시 다시 동기화한다."""
+    import subprocess
+
+    def _git(*args):
+        subprocess.run(
+            ["git", "-c", "user.name=t", "-c", "user.email=t@t", *args],
+            cwd=team_repo,
+            check=True,
+            capture_output=True,
+        )
+
+    project_root = tmp_path / "ai-env"
+    (project_root / ".claude" / "skills").mkdir(parents=True)
+    team_repo = tmp_path / "cde-skills-repo"
+    (team_repo / "skills" / "spark-debug").mkdir(parents=True)
+    (team_repo / "skills" / "spark-debug" / "SKILL.md").write_text("# spark")
+    _git("init", "-q")
+    _git("add", ".")
+    _git("commit", "-q", "-m", "init")
+    (project_root / "cde-skills").symlink_to(team_repo)
+
+    dst = tmp_path / "target-skills"
+    walked: list[str] = []
+
+    def _recording_plan(src, *args, **kwargs):
+        walked.append(src.name)
+        return real_plan(src, *args, **kwargs)
+
+    def _sync():
+        walked.clear()
+        catalog = SkillCatalog.scan(project_root, skills_include=["cde-skills"])
+        with patch("ai_env.core.sync_plan.plan_tree_incremental", side_effect=_recording_plan):
+            _sync_skills_merged(project_root, dst, dry_run=False, catalog=catalog)
+
+    _sync()
+    assert walked == ["spark-debug"]
+
+    _sync()
+    assert walked == []
+
+    (team_repo / "skills" / "spark-debug" / "SKILL.md").write_text("# spark v2")
+    _sync()
+    assert walked == ["spark-debug"]  # dirty worktree
+
+    _git("commit", "-q", "-am", "v2")
+    _sync()
+    assert walked == ["spark-debug"]  # 새 tree oid 기록
+    _sync()
+    assert walked == []
+    assert (dst / "spark-debug" / "SKILL.md").read_text() == "# spark v2"
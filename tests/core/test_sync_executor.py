@@ -0,0 +1,91 @@
+"""Tests for the parallel sync stage executor."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from ai_env.core.sync_executor import SyncStage, run_stages
+
+
+def test_independent_stages_run_concurrently():
+    """독립 스테이지는 동시에 실행된다."""
+    barrier = threading.Barrier(3, timeout=5)
+
+    def _stage(label: str):
+        def _run() -> str:
+            barrier.wait()  # 3개가 동시에 실행 중이어야 통과
+            return label
+
+        return _run
+
+    stages = [SyncStage(name, _stage(name)) for name in ("claude", "codex", "gemini")]
+    report = run_stages(stages, max_workers=3)
+
+    assert {name: r.result for name, r in report.results.items()} == {
+        "claude": "claude",
+        "codex": "codex",
+        "gemini": "gemini",
+    }
+    assert not report.errors
+
+
+def test_dependencies_run_in_order_and_critical_path():
+    """의존 스테이지는 선행 스테이지 완료 후 실행되고 critical path에 포함된다."""
+    order: list[str] = []
+
+    def _stage(label: str, delay: float):
+        def _run() -> None:
+            time.sleep(delay)
+            order.append(label)
+
+        return _run
+
+    stages = [
+        SyncStage("catalog", _stage("catalog", 0.05)),
+        SyncStage("claude", _stage("claude", 0.05), depends_on=("catalog",)),
+        SyncStage("mcp", _stage("mcp", 0.0)),
+    ]
+    report = run_stages(stages, max_workers=4)
+
+    assert order.index("catalog") < order.index("claude")
+    assert report.critical_path == ["catalog", "claude"]
+    assert report.critical_path_seconds >= 0.1
+
+
+def test_failed_stage_skips_dependents():
+    """실패한 스테이지의 후속 스테이지는 실행하지 않는다."""
+    ran: list[str] = []
+
+    def _fail() -> None:
+        raise OSError("disk full")
+
+    stages = [
+        SyncStage("a", _fail),
+        SyncStage("b", lambda: ran.append("b"), depends_on=("a",)),
+        SyncStage("c", lambda: ran.append("c")),
+    ]
+    report = run_stages(stages, max_workers=2)
+
+    assert isinstance(report.results["a"].error, OSError)
+    assert report.results["b"].skipped
+    assert ran == ["c"]
+    assert [r.name for r in report.errors] == ["a"]
+
+
+def test_cycle_is_rejected():
+    """순환 의존성은 ValueError."""
+    stages = [
+        SyncStage("a", lambda: None, depends_on=("b",)),
+        SyncStage("b", lambda: None, depends_on=("a",)),
+    ]
+    with pytest.raises(ValueError, match="Circular"):
+        run_stages(stages)
+
+
+def test_unknown_dependency_is_rejected():
+    """존재하지 않는 의존성은 ValueError."""
+    with pytest.raises(ValueError, match="unknown stage"):
+        run_stages([SyncStage("a", lambda: None, depends_on=("missing",))])
@@ -0,0 +1,154 @@
+"""Tests for incremental manifest-based tree sync."""
+
+from __future__ import annotations
+
+import os
+import shutil
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from ai_env.core.sync_manifest import (
+    MANIFEST_FILENAME,
+    SyncManifest,
+    copy_file,
+    sync_tree_incremental,
+    writer_id,
+)
+
+
+def _make_skill(root: Path, name: str = "my-skill") -> Path:
+    skill = root / name
+    (skill / "scripts").mkdir(parents=True)
+    (skill / "SKILL.md").write_text("# skill\n")
+    (skill / "scripts" / "run.py").write_text("print('hi')\n")
+    return skill
+
+
+def _load(target_root: Path) -> SyncManifest:
+    return SyncManifest.load(target_root, writer_id(copy_file))
+
+
+def test_first_sync_copies_all_and_persists_manifest(tmp_path):
+    """첫 동기화는 전체 복사 후 매니페스트를 저장한다."""
+    src = _make_skill(tmp_path / "src")
+    target_root = tmp_path / "target"
+
+    manifest = _load(target_root)
+    stats = sync_tree_incremental(src, target_root / src.name, manifest)
+    manifest.save()
+
+    assert stats.copied == 2
+    assert (target_root / "my-skill" / "scripts" / "run.py").read_text() == "print('hi')\n"
+    reloaded = _load(target_root)
+    assert set(reloaded.files) == {"my-skill/SKILL.md", "my-skill/scripts/run.py"}
+    assert (target_root / MANIFEST_FILENAME).exists()
+
+
+def test_noop_sync_copies_nothing(tmp_path):
+    """변경이 없으면 복사 함수를 호출하지 않는다."""
+    src = _make_skill(tmp_path / "src")
+    target_root = tmp_path / "target"
+
+    manifest = _load(target_root)
+    sync_tree_incremental(src, target_root / src.name, manifest)
+    manifest.save()
+
+    copy_fn = MagicMock(side_effect=shutil.copy2)
+    manifest = _load(target_root)
+    stats = sync_tree_incremental(src, target_root / src.name, manifest, copy_fn)
+
+    copy_fn.assert_not_called()
+    assert stats.unchanged == 2
+    assert not stats.changed
+    assert not manifest.dirty
+
+
+def test_only_changed_and_removed_files_are_touched(tmp_path):
+    """변경된 파일만 복사하고 삭제된 파일만 제거한다."""
+    src = _make_skill(tmp_path / "src")
+    target_root = tmp_path / "target"
+
+    manifest = _load(target_root)
+    sync_tree_incremental(src, target_root / src.name, manifest)
+    manifest.save()
+
+    (src / "SKILL.md").write_text("# skill v2\n")
+    (src / "scripts" / "run.py").unlink()
+    (src / "scripts").rmdir()
+
+    copy_fn = MagicMock(side_effect=shutil.copy2)
+    manifest = _load(target_root)
+    stats = sync_tree_incremental(src, target_root / src.name, manifest, copy_fn)
+    manifest.save()
+
+    assert stats.copied == 1
+    assert stats.removed == 1
+    copy_fn.assert_called_once()
+    assert (target_root / "my-skill" / "SKILL.md").read_text() == "# skill v2\n"
+    assert not (target_root / "my-skill" / "scripts").exists()
+
+
+def test_touched_but_identical_file_is_not_copied(tmp_path):
+    """mtime만 바뀐 파일은 해시 비교 후 복사하지 않는다."""
+    src = _make_skill(tmp_path / "src")
+    target_root = tmp_path / "target"
+
+    manifest = _load(target_root)
+    sync_tree_incremental(src, target_root / src.name, manifest)
+    manifest.save()
+
+    st = (src / "SKILL.md").stat()
+    os.utime(src / "SKILL.md", ns=(st.st_atime_ns, st.st_mtime_ns + 10_000_000_000))
+
+    copy_fn = MagicMock(side_effect=shutil.copy2)
+    manifest = _load(target_root)
+    stats = sync_tree_incremental(src, target_root / src.name, manifest, copy_fn)
+
+    copy_fn.assert_not_called()
+    assert stats.unchanged == 2
+    assert manifest.dirty  # 새 mtime 기록
+
+
+def test_missing_target_file_is_restored(tmp_path):
+    """대상 파일이 사라졌으면 기록이 있어도 다시 복사한다."""
+    src = _make_skill(tmp_path / "src")
+    target_root = tmp_path / "target"
+
+    manifest = _load(target_root)
+    sync_tree_incremental(src, target_root / src.name, manifest)
+    manifest.save()
+
+    (target_root / "my-skill" / "SKILL.md").unlink()
+
+    manifest = _load(target_root)
+    stats = sync_tree_incremental(src, target_root / src.name, manifest)
+
+    assert stats.copied == 1
+    assert (target_root / "my-skill" / "SKILL.md").exists()
+
+
+def test_untracked_target_is_replaced_on_first_sync(tmp_path):
+    """매니페스트에 없는 기존 대상은 제거 후 새로 복사한다."""
+    src = _make_skill(tmp_path / "src")
+    target_root = tmp_path / "target"
+    (target_root / "my-skill").mkdir(parents=True)
+    (target_root / "my-skill" / "stale.md").write_text("old")
+
+    manifest = _load(target_root)
+    sync_tree_incremental(src, target_root / src.name, manifest)
+
+    assert not (target_root / "my-skill" / "stale.md").exists()
+    assert (target_root / "my-skill" / "SKILL.md").exists()
+
+
+def test_writer_change_invalidates_manifest(tmp_path):
+    """복사 함수가 바뀌면 기존 기록을 무시한다."""
+    src = _make_skill(tmp_path / "src")
+    target_root = tmp_path / "target"
+
+    manifest = _load(target_root)
+    sync_tree_incremental(src, target_root / src.name, manifest)
+    manifest.save()
+
+    other = SyncManifest.load(target_root, "other.writer")
+    assert other.files == {}
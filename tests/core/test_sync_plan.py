@@ -0,0 +1,157 @@
+"""Tests for sync change planning (plan → apply)."""
+
+from __future__ import annotations
+
+import os
+import shutil
+from pathlib import Path
+
+from ai_env.core.skill_catalog import SkillCatalog
+from ai_env.core.staged_swap import wait_for_cleanup
+from ai_env.core.sync import _plan_hooks
+from ai_env.core.sync_manifest import copy_file
+from ai_env.core.sync_plan import (
+    PlanOp,
+    SyncPlan,
+    apply_skills_plan,
+    apply_skills_plans,
+    content_op,
+    file_op,
+    plan_skills,
+)
+
+
+def _make_project(root: Path) -> Path:
+    skill = root / ".claude" / "skills" / "my-skill"
+    (skill / "scripts").mkdir(parents=True)
+    (skill / "SKILL.md").write_text("# skill\n")
+    (skill / "scripts" / "run.py").write_text("print('hi')\n")
+    return skill
+
+
+def _kinds(ops: list[PlanOp]) -> dict[str, str]:
+    return {op.target.name: op.kind for op in ops}
+
+
+def test_plan_skills_reports_ops_without_writing(tmp_path):
+    """계획 단계는 대상에 아무것도 쓰지 않고 create 작업과 바이트 합계를 계산한다."""
+    project_root = tmp_path / "ai-env"
+    _make_project(project_root)
+    dst = tmp_path / "target"
+
+    plan = SyncPlan()
+    plan.add_skills(plan_skills(SkillCatalog.scan(project_root), dst, copy_file))
+
+    assert not dst.exists()
+    assert _kinds(plan.ops) == {"SKILL.md": "create", "run.py": "create"}
+    totals = plan.totals()
+    assert totals["create"] == {"count": 2, "bytes": len("# skill\n") + len("print('hi')\n")}
+    assert totals["delete"]["count"] == 0
+
+
+def test_plan_skills_update_and_delete_after_apply(tmp_path):
+    """적용 후에는 변경된 파일만 update, 사라진 파일만 delete로 계획된다."""
+    project_root = tmp_path / "ai-env"
+    skill = _make_project(project_root)
+    dst = tmp_path / "target"
+    apply_skills_plan(plan_skills(SkillCatalog.scan(project_root), dst, copy_file))
+    assert (dst / "my-skill" / "scripts" / "run.py").exists()
+
+    assert plan_skills(SkillCatalog.scan(project_root), dst, copy_file).ops == []
+
+    (skill / "SKILL.md").write_text("# skill v2\n")
+    (skill / "scripts" / "run.py").unlink()
+    plan = plan_skills(SkillCatalog.scan(project_root), dst, copy_file)
+    assert _kinds(plan.ops) == {"SKILL.md": "update", "run.py": "delete"}
+
+    apply_skills_plan(plan)
+    assert (dst / "my-skill" / "SKILL.md").read_text() == "# skill v2\n"
+    assert not (dst / "my-skill" / "scripts" / "run.py").exists()
+
+
+def test_plan_skills_first_sync_reports_stale_target_files(tmp_path):
+    """매니페스트가 없는 첫 동기화는 대상 트리를 교체하므로 기존 잔여 파일도 delete로 보고한다."""
+    project_root = tmp_path / "ai-env"
+    _make_project(project_root)
+    dst = tmp_path / "target"
+    (dst / "my-skill").mkdir(parents=True)
+    (dst / "my-skill" / "old.md").write_text("stale")
+
+    plan = plan_skills(SkillCatalog.scan(project_root), dst, copy_file)
+
+    assert _kinds(plan.ops)["old.md"] == "delete"
+
+
+def test_plan_skills_removes_skills_dropped_from_source(tmp_path):
+    """소스에서 사라진 스킬은 관리하던 것만 delete로 계획하고 실행 시 디렉토리와 기록을 지운다."""
+    project_root = tmp_path / "ai-env"
+    skill = _make_project(project_root)
+    dropped = skill.parent / "old-skill"
+    dropped.mkdir()
+    (dropped / "SKILL.md").write_text("# old\n")
+    dst = tmp_path / "target"
+    apply_skills_plan(plan_skills(SkillCatalog.scan(project_root), dst, copy_file))
+    (dst / "user-skill").mkdir()  # 사용자가 대상에 직접 만든 디렉토리
+
+    shutil.rmtree(dropped)
+    plan = plan_skills(SkillCatalog.scan(project_root), dst, copy_file)
+
+    assert plan.removed == ["old-skill"]
+    assert [(op.kind, op.target) for op in plan.ops] == [
+        ("delete", dst / "old-skill" / "SKILL.md")
+    ]
+
+    apply_skills_plan(plan)
+    wait_for_cleanup()
+    assert not (dst / "old-skill").exists()
+    assert (dst / "my-skill" / "SKILL.md").exists()
+    assert (dst / "user-skill").is_dir()
+    assert plan_skills(SkillCatalog.scan(project_root), dst, copy_file).removed == []
+    assert not [path for path in dst.iterdir() if path.name.startswith(".ai-env-staging")]
+
+
+def test_apply_skills_plans_multiple_targets(tmp_path):
+    """여러 대상 계획을 한 번에 실행한다 (같은 장치는 순차)."""
+    project_root = tmp_path / "ai-env"
+    _make_project(project_root)
+    catalog = SkillCatalog.scan(project_root)
+    plans = [plan_skills(catalog, tmp_path / name, copy_file) for name in ("a", "b")]
+
+    apply_skills_plans(plans, max_workers=2)
+
+    for name in ("a", "b"):
+        assert (tmp_path / name / "my-skill" / "SKILL.md").read_text() == "# skill\n"
+
+
+def test_file_and_content_ops_skip_identical(tmp_path):
+    """내용이 같으면 작업을 만들지 않는다."""
+    src = tmp_path / "src.md"
+    dst = tmp_path / "dst.md"
+    src.write_text("same")
+
+    assert file_op(src, dst).kind == "create"
+    dst.write_text("same")
+    assert file_op(src, dst) is None
+    dst.write_text("diff")
+    assert file_op(src, dst).kind == "update"
+
+    assert content_op("diff", dst) is None
+    assert content_op("new content", dst).size == len("new content")
+
+
+def test_plan_hooks_chmod_and_cmux(tmp_path):
+    """hooks 계획은 실행 권한이 없는 .sh에 chmod를 추가하고, cmux 비활성화 시 제외/삭제한다."""
+    src = tmp_path / "hooks"
+    src.mkdir()
+    (src / "notify.sh").write_text("#!/bin/sh\n")
+    os.chmod(src / "notify.sh", 0o644)
+    (src / "cmux_notify.sh").write_text("#!/bin/sh\n")
+    dst = tmp_path / "target-hooks"
+    dst.mkdir()
+    (dst / "cmux_notify.sh").write_text("#!/bin/sh\n")
+
+    plan = SyncPlan()
+    _plan_hooks(src, dst, cmux_enabled=False, plan=plan, group="claude")
+
+    ops = {(op.kind, op.target.name) for op in plan.ops}
+    assert ops == {("create", "notify.sh"), ("chmod", "notify.sh"), ("delete", "cmux_notify.sh")}
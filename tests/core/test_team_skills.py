@@ -0,0 +1,122 @@
+"""Tests for concurrent team skill repo updates (local bare repos)."""
+
+import subprocess
+import time
+
+import pytest
+
+from ai_env.core import team_skills
+from ai_env.core.team_skills import update_team_skill_repos
+
+
+def _git(cwd, *args):
+    subprocess.run(
+        ["git", "-c", "user.name=t", "-c", "user.email=t@t", *args],
+        cwd=cwd,
+        check=True,
+        capture_output=True,
+    )
+
+
+def _make_team_repo(tmp_path, project_root, name, branch="develop"):
+    """bare origin + clone을 만들고 project_root/<name> 심링크로 연결."""
+    origin = tmp_path / f"{name}-origin.git"
+    seed = tmp_path / f"{name}-seed"
+    clone = tmp_path / f"{name}-clone"
+    _git(tmp_path, "init", "--bare", "-b", "develop", str(origin))
+    _git(tmp_path, "clone", str(origin), str(seed))
+    (seed / "skill-a").mkdir()
+    (seed / "skill-a" / "SKILL.md").write_text("# a\n")
+    _git(seed, "add", ".")
+    _git(seed, "commit", "-m", "init")
+    _git(seed, "push", "origin", "HEAD:develop")
+    _git(tmp_path, "clone", "-b", "develop", str(origin), str(clone))
+    if branch != "develop":
+        _git(clone, "checkout", "-b", branch)
+    (project_root / name).symlink_to(clone)
+    return seed, clone
+
+
+def _push_change(seed, *files):
+    for rel in files:
+        path = seed / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(f"{rel}\n")
+    _git(seed, "add", ".")
+    _git(seed, "commit", "-m", "change")
+    _git(seed, "push", "origin", "HEAD:develop")
+
+
+@pytest.fixture
+def project_root(tmp_path):
+    root = tmp_path / "ai-env"
+    root.mkdir()
+    return root
+
+
+def test_pull_records_heads_and_changed_files(tmp_path, project_root):
+    """develop 브랜치 레포는 pull 후 이전/새 HEAD와 변경 파일 수를 기록한다."""
+    seed, _clone = _make_team_repo(tmp_path, project_root, "cde-skills")
+    _push_change(seed, "skill-a/SKILL.md", "skill-b/SKILL.md")
+
+    [update] = update_team_skill_repos(project_root, skills_exclude=[])
+
+    assert update.status == "updated"
+    assert update.changed
+    assert update.files_changed == 2
+    assert update.old_head != update.new_head
+    assert update.elapsed >= 0
+
+
+def test_up_to_date_and_non_develop_branch(tmp_path, project_root):
+    """변경 없는 레포는 up-to-date, 작업 브랜치는 pull하지 않는다."""
+    _make_team_repo(tmp_path, project_root, "cde-skills")
+    seed, _clone = _make_team_repo(tmp_path, project_root, "cde-ranking-skills", branch="feat")
+    _push_change(seed, "skill-a/SKILL.md")
+
+    updates = {u.name: u for u in update_team_skill_repos(project_root, skills_exclude=[])}
+
+    assert updates["cde-skills"].status == "up-to-date"
+    assert not updates["cde-skills"].changed
+    assert updates["cde-ranking-skills"].status == "skipped"
+    assert updates["cde-ranking-skills"].branch == "feat"
+    assert not updates["cde-ranking-skills"].changed
+
+
+def test_not_a_git_repo_and_include_filter(tmp_path, project_root):
+    """git 레포가 아니면 skipped, include 필터 밖의 레포는 건드리지 않는다."""
+    (tmp_path / "plain").mkdir()
+    (project_root / "cde-skills").symlink_to(tmp_path / "plain")
+    (tmp_path / "other").mkdir()
+    (project_root / "cde-other-skills").symlink_to(tmp_path / "other")
+
+    updates = update_team_skill_repos(project_root, skills_include=["cde-skills"])
+
+    assert [(u.name, u.status) for u in updates] == [("cde-skills", "skipped")]
+
+
+def test_slow_remote_times_out_without_blocking_others(tmp_path, project_root, monkeypatch):
+    """느린 레포는 제한 시간 후 timeout으로 기록되고, 다른 레포는 동시에 처리된다."""
+    _make_team_repo(tmp_path, project_root, "cde-fast-skills")
+    _make_team_repo(tmp_path, project_root, "cde-slow-skills")
+
+    fake_git = tmp_path / "fake-git"
+    fake_git.write_text(
+        '#!/bin/sh\ncase "$PWD" in *cde-slow*) [ "$1" = pull ] && sleep 30;; esac\nexec git "$@"\n'
+    )
+    fake_git.chmod(0o755)
+    monkeypatch.setattr(team_skills, "_GIT", str(fake_git))
+
+    progress = []
+    started = time.monotonic()
+    updates = update_team_skill_repos(
+        project_root, skills_exclude=[], timeout=1.0, on_progress=progress.append
+    )
+    elapsed = time.monotonic() - started
+
+    by_name = {u.name: u for u in updates}
+    assert by_name["cde-slow-skills"].status == "timeout"
+    assert not by_name["cde-slow-skills"].ok
+    assert by_name["cde-fast-skills"].status == "up-to-date"
+    assert [u.name for u in progress] == ["cde-fast-skills", "cde-slow-skills"]
+    assert elapsed < 10
@@ -0,0 +1,109 @@
+"""Tests for watch mode (per-skill re-sync)."""
+
+import sys
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from ai_env.core.skill_catalog import SkillCatalog
+from ai_env.core.watch import WatchPlan, classify_changes, run_watch
+
+
+def _make_project(tmp_path):
+    project_root = tmp_path / "ai-env"
+    for name in ("alpha", "beta"):
+        skill = project_root / ".claude" / "skills" / name
+        skill.mkdir(parents=True)
+        (skill / "SKILL.md").write_text(f"---\nname: {name}\ndescription: {name} skill\n---\n")
+    (project_root / ".claude" / "global").mkdir()
+    (project_root / ".claude" / "global" / "CLAUDE.md").write_text("# global\n")
+    (project_root / ".claude" / "commands").mkdir()
+    return project_root
+
+
+def test_classify_changes_maps_paths_to_targets(tmp_path):
+    """변경 경로를 스킬 이름과 설정 항목으로 분류한다."""
+    project_root = _make_project(tmp_path)
+    catalog = SkillCatalog.scan(project_root)
+    claude = project_root / ".claude"
+
+    plan = classify_changes(
+        [
+            claude / "skills" / "alpha" / "scripts" / "run.py",
+            claude / "skills" / "beta" / "SKILL.md",
+            claude / "skills" / "beta" / ".SKILL.md.swp",
+            claude / "commands" / "review.md",
+            claude / "global" / "settings.json.template",
+        ],
+        project_root,
+        catalog,
+    )
+
+    assert plan == WatchPlan(
+        skills={"alpha", "beta"}, skills_index=True, settings=True, commands=True
+    )
+
+
+def test_classify_ignores_editor_temp_files(tmp_path):
+    """에디터 임시 파일만 바뀌면 계획이 비어 있다."""
+    project_root = _make_project(tmp_path)
+    catalog = SkillCatalog.scan(project_root)
+    skill = project_root / ".claude" / "skills" / "alpha"
+
+    plan = classify_changes([skill / "SKILL.md~", skill / "4913"], project_root, catalog)
+
+    assert plan.empty
+
+
+@pytest.mark.parametrize(
+    "polling",
+    [
+        True,
+        pytest.param(
+            False,
+            marks=pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify"),
+        ),
+    ],
+)
+def test_run_watch_resyncs_only_changed_skill(tmp_path, polling):
+    """스킬 하나를 수정하면 그 스킬만 Claude/Codex 대상에 반영된다."""
+    project_root = _make_project(tmp_path)
+    home = tmp_path / "home"
+    synced: list[list[str]] = []
+    done = threading.Event()
+    stop = threading.Event()
+
+    def _on_sync(messages, _elapsed):
+        synced.append(messages)
+        done.set()
+
+    with (
+        patch.object(Path, "home", return_value=home),
+        patch("ai_env.core.sync.get_project_root", return_value=project_root),
+    ):
+        thread = threading.Thread(
+            target=run_watch,
+            args=(project_root,),
+            kwargs={"polling": polling, "debounce": 0.05, "on_sync": _on_sync, "stop": stop},
+        )
+        thread.start()
+        try:
+            # 감시 시작 대기 후 수정
+            threading.Event().wait(0.3)
+            skill_md = project_root / ".claude" / "skills" / "alpha" / "SKILL.md"
+            skill_md.write_text("---\nname: alpha\ndescription: updated\n---\n")
+            assert done.wait(5), "watch did not sync"
+        finally:
+            stop.set()
+            thread.join(5)
+
+    messages = synced[0]
+    assert "claude skills: alpha" in messages
+    assert "codex skills: alpha" in messages
+    assert (
+        "description: updated" in (home / ".claude" / "skills" / "alpha" / "SKILL.md").read_text()
+    )
+    assert not (home / ".claude" / "skills" / "beta").exists()
+    assert "updated" in (home / ".codex" / "AGENTS.md").read_text()
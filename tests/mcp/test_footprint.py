@@ -0,0 +1,118 @@
+"""Tests for MCP tool footprint estimates and per-target tool filters."""
+
+from __future__ import annotations
+
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from ai_env.core.config import MCPConfig, MCPServerConfig, Settings
+from ai_env.mcp.catalog import save_catalog
+from ai_env.mcp.footprint import (
+    estimate_tokens,
+    expand_patterns,
+    is_selected,
+    server_footprint,
+    tool_patterns,
+)
+from ai_env.mcp.generator import MCPConfigGenerator
+
+TOOLS = [
+    {"name": "get_issue", "description": "Get an issue", "inputSchema": {"type": "object"}},
+    {"name": "create_issue", "description": "Create an issue", "inputSchema": {}},
+    {"name": "delete_repo", "description": "Delete a repository", "inputSchema": {}},
+]
+
+
+def _generator(server: MCPServerConfig) -> MCPConfigGenerator:
+    secrets = MagicMock()
+    secrets.get.side_effect = lambda key, default="": default
+    secrets.substitute.side_effect = lambda value: value
+    return MCPConfigGenerator(secrets, MCPConfig(mcp_servers={"github": server}), Settings())
+
+
+def test_estimate_tokens_uses_compact_json_length():
+    """토큰 추정은 압축 JSON 길이 / 4 (올림)."""
+    tool = {"name": "a" * 10}
+    assert estimate_tokens(tool) == -(-len(json.dumps(tool, separators=(",", ":"))) // 4)
+
+
+def test_target_allow_overrides_wildcard_and_deny_accumulates():
+    """allow는 타겟 키가 "*"보다 우선하고 deny는 합쳐진다."""
+    server = MCPServerConfig(
+        tool_allow={"*": ["get_*"], "codex": ["*_issue"]},
+        tool_deny={"*": ["delete_*"], "codex": ["create_issue"]},
+    )
+
+    assert tool_patterns(server, "gemini") == (["get_*"], ["delete_*"])
+    assert tool_patterns(server, "codex") == (["*_issue"], ["delete_*", "create_issue"])
+    assert is_selected("get_issue", ["*_issue"], ["create_issue"])
+    assert not is_selected("create_issue", ["*_issue"], ["create_issue"])
+
+
+def test_expand_patterns_needs_catalog_for_globs():
+    """glob은 카탈로그 도구 이름으로 확장하고, 카탈로그가 없으면 정확한 이름만 남긴다."""
+    names = [t["name"] for t in TOOLS]
+    assert expand_patterns(["*_issue", "get_issue"], names) == ["get_issue", "create_issue"]
+    assert expand_patterns(["*_issue", "search"], None) == ["search"]
+
+
+def test_server_footprint_per_target():
+    """필터를 지원하는 타겟만 필터 적용 후 토큰으로 계산한다."""
+    server = MCPServerConfig(targets=["codex", "claude_desktop"], tool_deny={"*": ["delete_repo"]})
+
+    fp = server_footprint("github", server, {"initialize": {}, "tools": TOOLS})
+
+    assert fp.tokens == sum(estimate_tokens(t) for t in TOOLS)
+    assert fp.targets["claude_desktop"] == fp.tokens
+    assert fp.targets["codex"] == fp.tokens - fp.tools["delete_repo"]
+    assert not server_footprint("github", server, None).cached
+
+
+def test_generator_applies_filters_per_client():
+    """codex는 enabled/disabled_tools, gemini는 include/excludeTools, claude_local은 deny 규칙."""
+    save_catalog("github", {"initialize": {}, "tools": TOOLS})
+    server = MCPServerConfig(
+        command="docker",
+        targets=["codex", "gemini", "claude_local", "claude_desktop"],
+        tool_allow={"codex": ["*_issue"]},
+        tool_deny={"*": ["delete_*"]},
+    )
+    gen = _generator(server)
+
+    codex = gen.generate_codex()
+    gemini = gen.generate_gemini()["mcpServers"]["github"]
+    deny = gen.generate_claude_local()["permissions"]["deny"]
+
+    assert 'enabled_tools = ["get_issue", "create_issue"]' in codex
+    assert 'disabled_tools = ["delete_repo"]' in codex
+    assert gemini["excludeTools"] == ["delete_repo"]
+    assert "includeTools" not in gemini
+    assert "mcp__github__delete_repo" in deny
+    assert "mcp__github__get_issue" not in deny
+    assert "excludeTools" not in gen.generate_claude_desktop()["mcpServers"]["github"]
+
+
+def test_glob_allow_without_catalog_keeps_all_tools():
+    """카탈로그가 없으면 glob allow를 빈 목록으로 만들지 않고 allow 키를 뺀 뒤 경고한다."""
+    server = MCPServerConfig(
+        command="docker",
+        targets=["codex", "gemini", "claude_local"],
+        tool_allow={"*": ["get_*"]},
+        tool_deny={"*": ["delete_repo", "admin_*"]},
+    )
+    gen = _generator(server)
+
+    with pytest.warns(UserWarning, match="no tool catalog"):
+        codex = gen.generate_codex()
+    with pytest.warns(UserWarning, match="get_\\*"):
+        gemini = gen.generate_gemini()["mcpServers"]["github"]
+    with pytest.warns(UserWarning, match="claude_local"):
+        deny = gen.generate_claude_local()["permissions"]["deny"]
+
+    assert "enabled_tools" not in codex
+    assert 'disabled_tools = ["delete_repo"]' in codex
+    assert "includeTools" not in gemini
+    assert gemini["excludeTools"] == ["delete_repo"]
+    assert "mcp__github__delete_repo" in deny
@@ -2,8 +2,8 @@
 
 from unittest.mock import MagicMock, patch
 
-from ai_env.core.config import MCPServerConfig, Settings
-from ai_env.mcp.generator import MCPConfigGenerator
+from ai_env.core.config import MCPConfig, MCPServerConfig, Settings
+from ai_env.mcp.generator import MCPConfigGenerator, _renderer_sources
 
 
 class TestGenerateCodexConfig:
@@ -119,3 +119,91 @@ class TestGenerateCodexConfig:
         assert "[env]" in result
         assert "teammateMode" not in result  # teammateMode는 제거됨
         assert 'CLAUDE_CODE_EXPERIMENTAL_AGENT_TEAMS = "1"' in result
+
+
+class TestRenderGraph:
+    """렌더 그래프(서버 해석/타겟 출력 캐시) 테스트"""
+
+    def _make_generator(self, mcp_servers: dict[str, MCPServerConfig]) -> MCPConfigGenerator:
+        secrets = MagicMock()
+        secrets.get.side_effect = lambda key, default="": {"TEST_TOKEN": "token"}.get(key, default)
+        secrets.substitute.side_effect = lambda value: value
+        secrets.export_to_shell.return_value = ""
+        return MCPConfigGenerator(secrets, MCPConfig(mcp_servers=mcp_servers), Settings())
+
+    def test_server_resolved_once_across_targets(self):
+        """여러 타겟에 배포되는 서버도 환경변수 치환은 한 번만 한다."""
+        gen = self._make_generator(
+            {
+                "shared": MCPServerConfig(
+                    command="npx",
+                    args=["-y", "@example/mcp"],
+                    env_keys=["TEST_TOKEN"],
+                    targets=["claude_desktop", "antigravity", "codex", "gemini"],
+                ),
+                "off": MCPServerConfig(enabled=False, command="x", targets=["codex"]),
+            }
+        )
+
+        gen.render_all(names=["claude_desktop", "antigravity", "codex_global", "gemini_local"])
+
+        assert gen.secrets.substitute.call_count == 2  # args 2개, 서버당 한 번
+        assert gen._servers_for_target("codex") == ["shared"]
+        assert "startup_timeout_sec" not in gen.generate_claude_desktop()["mcpServers"]["shared"]
+
+    def test_target_config_mutation_does_not_leak(self):
+        """한 타겟의 설정(args/env)을 고쳐도 다른 타겟과 해석 캐시는 그대로다."""
+        gen = self._make_generator(
+            {
+                "shared": MCPServerConfig(
+                    command="npx",
+                    args=["-y", "@example/mcp"],
+                    env_keys=["TEST_TOKEN"],
+                    targets=["claude_desktop", "gemini"],
+                ),
+            }
+        )
+        server = gen.mcp_config.mcp_servers["shared"]
+
+        first = gen._build_server_config("shared", server, "claude_desktop")
+        assert first is not None
+        first["args"].append("--mutated")
+        first["env"]["TEST_TOKEN"] = "changed"
+
+        for config in (
+            gen._build_server_config("shared", server, "gemini"),
+            gen._build_server_config("shared", server, "claude_desktop"),
+            gen.resolve_server("shared"),
+        ):
+            assert config is not None
+            assert config["args"] == ["-y", "@example/mcp"]
+            assert config["env"] == {"TEST_TOKEN": "token"}
+
+    def test_renderer_digest_covers_render_modules(self):
+        """생성 결과에 영향을 주는 모듈이 바뀌면 fingerprint도 바뀌도록 모두 해시한다."""
+        sources = _renderer_sources()
+
+        assert all(path.is_file() for path in sources)
+        assert {
+            "generator.py",
+            "vibe.py",
+            "catalog.py",
+            "footprint.py",
+            "latency.py",
+            "pool.py",
+            "resources.py",
+            "shim.py",
+            "tap.py",
+            "config.py",
+        } <= {path.name for path in sources}
+
+    def test_outputs_sharing_a_renderer_are_rendered_once(self):
+        """codex_global/codex_local처럼 같은 내용은 한 번만 생성해 재사용한다."""
+        gen = self._make_generator({})
+
+        with patch.object(gen, "generate_codex", wraps=gen.generate_codex) as spy:
+            outputs = {name: text for name, _path, text in gen.render_all()}
+            gen.render("codex_local")
+
+        assert spy.call_count == 1
+        assert outputs["codex_global"] == outputs["codex_local"]
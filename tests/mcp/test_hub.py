@@ -0,0 +1,98 @@
+"""Tests for the shared stdio MCP hub."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import sys
+import textwrap
+from unittest.mock import MagicMock
+
+from ai_env.core.config import MCPConfig, MCPHubConfig, MCPServerConfig, Settings
+from ai_env.mcp.generator import MCPConfigGenerator
+from ai_env.mcp.hub import MCPHub, connect, socket_path
+
+FAKE_SERVER = textwrap.dedent(
+    """
+    import json, sys
+    initialized = 0
+    for line in sys.stdin:
+        msg = json.loads(line)
+        method = msg.get("method")
+        if method == "initialize":
+            initialized += 1
+            result = {"protocolVersion": "2024-11-05", "capabilities": {},
+                      "serverInfo": {"name": "fake", "version": "1.0"}}
+        elif method == "tools/call":
+            result = {"content": [{"type": "text", "text": msg["params"]["arguments"]["text"]}]}
+        elif method == "stats":
+            result = {"initialize_calls": initialized}
+        else:
+            continue
+        print(json.dumps({"jsonrpc": "2.0", "id": msg["id"], "result": result}), flush=True)
+    """
+)
+
+
+async def _request(conn, message: dict) -> dict:
+    reader, writer = conn
+    writer.write(json.dumps(message).encode() + b"\n")
+    await writer.drain()
+    return json.loads(await asyncio.wait_for(reader.readline(), 10))
+
+
+async def test_hub_multiplexes_clients_onto_one_server(tmp_path):
+    """두 클라이언트가 같은 id를 써도 응답이 섞이지 않고, 서버는 한 번만 기동/initialize된다."""
+    script = tmp_path / "fake_server.py"
+    script.write_text(FAKE_SERVER)
+    base = tmp_path / "hub"
+    hub = MCPHub({"fake": {"command": sys.executable, "args": [str(script)]}}, base=base)
+    await hub.start()
+    try:
+        path = str(socket_path("fake", base))
+        a = await asyncio.open_unix_connection(path)
+        b = await asyncio.open_unix_connection(path)
+        init = {"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {}}
+
+        init_a, init_b = await asyncio.gather(_request(a, init), _request(b, init))
+        call = {"jsonrpc": "2.0", "id": 7, "method": "tools/call"}
+        reply_a, reply_b = await asyncio.gather(
+            _request(a, {**call, "params": {"name": "echo", "arguments": {"text": "from-a"}}}),
+            _request(b, {**call, "params": {"name": "echo", "arguments": {"text": "from-b"}}}),
+        )
+        stats = await _request(a, {"jsonrpc": "2.0", "id": "s", "method": "stats"})
+    finally:
+        await hub.stop()
+
+    assert init_a["id"] == init_b["id"] == 1
+    assert init_a["result"]["serverInfo"]["name"] == "fake"
+    assert init_b["result"] == init_a["result"]
+    assert (reply_a["id"], reply_a["result"]["content"][0]["text"]) == (7, "from-a")
+    assert (reply_b["id"], reply_b["result"]["content"][0]["text"]) == (7, "from-b")
+    assert stats == {"jsonrpc": "2.0", "id": "s", "result": {"initialize_calls": 1}}
+    assert hub.backends["fake"].spawn_count == 1
+    assert not socket_path("fake", base).exists()
+
+
+def test_generator_emits_connector_for_hub_servers(tmp_path):
+    """mcp_hub.enabled면 stdio 서버는 connector 명령으로, SSE는 그대로 생성한다."""
+    secrets = MagicMock()
+    secrets.get.side_effect = lambda key, default="": {"TOKEN": "t", "URL": "http://x"}.get(
+        key, default
+    )
+    secrets.substitute.side_effect = lambda value: value
+    servers = {
+        "github": MCPServerConfig(command="docker", env_keys=["TOKEN"], targets=["codex"]),
+        "remote": MCPServerConfig(type="sse", url_env="URL", targets=["codex"]),
+    }
+    settings = Settings(mcp_hub=MCPHubConfig(enabled=True, connect_command="/opt/ai-env"))
+    gen = MCPConfigGenerator(secrets, MCPConfig(mcp_servers=servers), settings)
+
+    codex = gen.generate_codex()
+
+    assert 'command = "/opt/ai-env"' in codex
+    assert 'args = ["mcp", "connect", "github"]' in codex
+    assert "TOKEN" not in codex  # 시크릿은 hub 프로세스에만
+    assert 'url = "http://x"' in codex
+    assert gen.resolve_server("github")["command"] == "docker"
+    assert connect("github", tmp_path / "no-hub") is False
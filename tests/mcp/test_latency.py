@@ -0,0 +1,95 @@
+"""Tests for MCP startup latency history and adaptive timeouts."""
+
+from __future__ import annotations
+
+import sqlite3
+from unittest.mock import MagicMock
+
+import pytest
+
+from ai_env.core.config import MCPConfig, MCPServerConfig, MCPTimeoutConfig, Settings
+from ai_env.mcp.generator import MCPConfigGenerator
+from ai_env.mcp.latency import LatencyStore, percentile
+from ai_env.mcp.probe import ProbeResult
+
+
+def test_percentile_nearest_rank():
+    """nearest-rank 방식 백분위수."""
+    values = [float(v) for v in range(1, 21)]
+
+    assert percentile(values, 50) == 10.0
+    assert percentile(values, 95) == 19.0
+    assert percentile(values, 100) == 20.0
+
+
+def test_store_suggests_timeout_from_recent_samples(tmp_path):
+    """최근 window개 샘플의 백분위수 × margin을 [min_sec, max_sec]로 제한해 제안한다."""
+    store = LatencyStore(tmp_path / "latency.sqlite3")
+    config = MCPTimeoutConfig(percentile=90, margin=2.0, window=10, min_samples=3)
+    store.record([("slow", 100.0, "ok")], now=1.0)  # window 밖의 오래된 샘플
+    store.record([("slow", float(s), "ok") for s in range(11, 21)], now=2.0)
+    store.record([("fast", 0.5, "ok")] * 5, now=2.0)
+    store.record([("rare", 1.0, "ok")], now=2.0)
+
+    timeouts = store.timeouts(config)
+
+    assert timeouts["slow"] == 38  # p90=19s × 2
+    assert timeouts["fast"] == config.min_sec
+    assert "rare" not in timeouts  # 샘플 부족
+
+
+def test_store_closes_connections(tmp_path, monkeypatch):
+    """record/history는 사용한 sqlite 연결을 닫는다."""
+    store = LatencyStore(tmp_path / "latency.sqlite3")
+    opened: list[sqlite3.Connection] = []
+    connect = store._connect
+
+    def tracking_connect() -> sqlite3.Connection:
+        conn = connect()
+        opened.append(conn)
+        return conn
+
+    monkeypatch.setattr(store, "_connect", tracking_connect)
+    store.record([("slow", 1.0, "ok")], now=1.0)
+    assert store.history(10) == {"slow": [(1.0, "ok")]}
+
+    assert len(opened) == 2
+    for conn in opened:
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+
+
+def test_timeouts_raise_next_limit(tmp_path):
+    """timeout된 probe는 제한 시간을 하한값으로 기록해 다음 제한 시간을 늘린다."""
+    store = LatencyStore(tmp_path / "latency.sqlite3")
+    results = [ProbeResult("docker", "stdio", "timeout", elapsed=30.0)] * 4
+    results.append(ProbeResult("docker", "stdio", ready_seconds=12.0))
+    results.append(ProbeResult("broken", "stdio", "failed", error="boom"))
+
+    assert store.record_probe(results) == 5
+    summary = store.summarize(MCPTimeoutConfig(min_samples=5))["docker"]
+
+    assert summary.timeouts == 4
+    assert summary.suggested == 45  # p95=30s × 1.5
+
+
+def test_generator_uses_measured_timeout_when_adaptive(tmp_path):
+    """adaptive면 측정 기반 값을 쓰고, yaml의 startup_timeout_sec는 그대로 우선한다."""
+    store = LatencyStore(tmp_path / "latency.sqlite3")
+    store.record([("measured", 40.0, "ok"), ("pinned", 40.0, "ok")] * 5)
+    servers = {
+        "measured": MCPServerConfig(command="a", targets=["codex"]),
+        "pinned": MCPServerConfig(command="b", targets=["codex"], startup_timeout_sec=45),
+        "unknown": MCPServerConfig(command="c", targets=["codex"]),
+    }
+    secrets = MagicMock()
+    secrets.get.side_effect = lambda key, default="": default
+    secrets.substitute.side_effect = lambda value: value
+
+    def _timeouts(adaptive: bool) -> dict[str, int]:
+        settings = Settings(mcp_timeouts=MCPTimeoutConfig(adaptive=adaptive))
+        gen = MCPConfigGenerator(secrets, MCPConfig(mcp_servers=servers), settings, store)
+        return {n: gen.startup_timeout(n, s) for n, s in servers.items()}
+
+    assert _timeouts(adaptive=True) == {"measured": 60, "pinned": 45, "unknown": 30}
+    assert _timeouts(adaptive=False) == {"measured": 30, "pinned": 45, "unknown": 30}
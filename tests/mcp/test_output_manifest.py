@@ -0,0 +1,114 @@
+"""Tests for incremental MCP output regeneration (input fingerprints + manifest)."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+from ai_env.core.config import MCPConfig, MCPServerConfig, Settings
+from ai_env.core.output_writer import OutputWriter
+from ai_env.core.secrets import SecretsManager
+from ai_env.mcp.generator import MCPConfigGenerator
+from ai_env.mcp.output_manifest import OutputManifest
+
+SERVERS = {
+    "github": MCPServerConfig(
+        command="npx",
+        args=["-y", "@modelcontextprotocol/server-github"],
+        env_keys=["GITHUB_TOKEN"],
+        targets=["claude_desktop", "codex"],
+    ),
+    "notion": MCPServerConfig(
+        command="npx",
+        args=["-y", "notion-mcp", "--key", "${NOTION_KEY}"],
+        targets=["gemini", "antigravity"],
+    ),
+}
+
+
+def _generator(tmp_path, env: dict[str, str]) -> MCPConfigGenerator:
+    env_file = tmp_path / ".env"
+    env_file.write_text("".join(f"{key}={value}\n" for key, value in env.items()))
+    secrets = SecretsManager(env_file, inherit_environ=False)
+    return MCPConfigGenerator(secrets, MCPConfig(mcp_servers=SERVERS), Settings())
+
+
+def _save(generator, home, manifest_path, dry_run=False) -> dict[str, str]:
+    writer = OutputWriter(dry_run=dry_run)
+    saved = generator.save_all(
+        home=home, writer=writer, manifest=OutputManifest.load(manifest_path)
+    )
+    statuses = {str(result.path): result.status for result in writer.results}
+    return {name: statuses[str(path)] for name, path in saved.items()}
+
+
+def test_rotating_a_token_regenerates_only_its_targets(tmp_path):
+    """GITHUB_TOKEN을 바꾸면 github 서버가 배포되는 출력만 다시 렌더링/저장한다."""
+    home = tmp_path / "home"
+    manifest_path = tmp_path / "mcp_outputs.json"
+    env = {"GITHUB_TOKEN": "old", "NOTION_KEY": "n1"}
+    first = _save(_generator(tmp_path, env), home, manifest_path)
+    assert set(first.values()) == {"written"}
+
+    generator = _generator(tmp_path, {**env, "GITHUB_TOKEN": "new"})
+    with patch.object(generator, "generate_gemini", wraps=generator.generate_gemini) as gemini:
+        second = _save(generator, home, manifest_path)
+
+    assert gemini.call_count == 0
+    assert {name for name, status in second.items() if status == "written"} == {
+        "claude_desktop",
+        "codex_global",
+    }
+    assert second["gemini_global"] == "unchanged"
+    assert second["antigravity"] == "unchanged"
+    assert '"new"' in (home / ".codex/config.toml").read_text()
+
+
+def test_arg_reference_is_part_of_fingerprint(tmp_path):
+    """args의 ${VAR} 값이 바뀌면 그 서버의 타겟 fingerprint만 바뀐다."""
+    before = _generator(tmp_path, {"NOTION_KEY": "n1"})
+    after = _generator(tmp_path, {"NOTION_KEY": "n2"})
+
+    assert before.input_fingerprint("gemini_global") != after.input_fingerprint("gemini_global")
+    assert before.input_fingerprint("antigravity") != after.input_fingerprint("antigravity")
+    assert before.input_fingerprint("codex_global") == after.input_fingerprint("codex_global")
+    assert before.input_fingerprint("gemini_global") == before.input_fingerprint("gemini_local")
+
+
+def test_edited_output_is_regenerated(tmp_path):
+    """입력이 같아도 파일이 손으로 수정/삭제됐으면 다시 쓴다."""
+    home = tmp_path / "home"
+    manifest_path = tmp_path / "mcp_outputs.json"
+    env = {"GITHUB_TOKEN": "t"}
+    _save(_generator(tmp_path, env), home, manifest_path)
+    (home / ".gemini/settings.json").write_text("{}")
+    (home / ".codex/config.toml").unlink()
+
+    statuses = _save(_generator(tmp_path, env), home, manifest_path)
+
+    assert statuses["gemini_global"] == "written"
+    assert statuses["codex_global"] == "written"
+    assert statuses["claude_desktop"] == "unchanged"
+    assert '"t"' in (home / ".codex/config.toml").read_text()
+
+
+def test_dry_run_does_not_record(tmp_path):
+    """dry-run은 매니페스트를 저장하지 않아 다음 실제 sync가 모두 비교한다."""
+    home = tmp_path / "home"
+    manifest_path = tmp_path / "mcp_outputs.json"
+
+    _save(_generator(tmp_path, {}), home, manifest_path, dry_run=True)
+
+    assert not manifest_path.exists()
+    assert not home.exists()
+
+
+def test_corrupt_manifest_is_ignored(tmp_path):
+    """손상되거나 버전이 다른 매니페스트는 빈 기록으로 취급한다."""
+    path = tmp_path / "mcp_outputs.json"
+    path.write_text("{not json")
+    assert OutputManifest.load(path).files == {}
+
+    path.write_text('{"version": 0, "files": {"/x": {"fingerprint": "f"}}}')
+    manifest = OutputManifest.load(path)
+    assert manifest.files == {}
+    assert manifest.dirty
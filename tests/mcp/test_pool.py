@@ -0,0 +1,156 @@
+"""Tests for the warm container pool (fake docker CLI)."""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+
+from ai_env.core.config import MCPConfig, MCPPoolConfig, MCPServerConfig, Settings
+from ai_env.mcp.generator import MCPConfigGenerator
+from ai_env.mcp.pool import ContainerPool, PoolState, config_hash, create_args
+
+FAKE_DOCKER = """\
+import json, os, sys
+state_path = os.environ["FAKE_DOCKER_STATE"]
+state = json.load(open(state_path)) if os.path.exists(state_path) else {"containers": {}, "calls": []}
+args = sys.argv[1:]
+state["calls"].append(args[0])
+code = 0
+if args[0] == "create":
+    name = args[args.index("--name") + 1]
+    state["containers"][name] = {"args": args, "token": os.environ.get("GITHUB_PERSONAL_ACCESS_TOKEN")}
+elif args[0] == "rm":
+    state["containers"].pop(args[-1], None)
+elif args[:2] == ["container", "inspect"]:
+    if args[-1] in state["containers"]:
+        print("created")
+    else:
+        code = 1
+json.dump(state, open(state_path, "w"))
+sys.exit(code)
+"""
+
+CONFIG = {
+    "command": "docker",
+    "args": [
+        "run",
+        "-i",
+        "--rm",
+        "--name",
+        "gh",
+        "-e",
+        "GITHUB_PERSONAL_ACCESS_TOKEN",
+        "ghcr.io/github/github-mcp-server",
+        "stdio",
+        "--rm",
+    ],
+    "env": {"GITHUB_PERSONAL_ACCESS_TOKEN": "t1"},
+}
+
+
+@pytest.fixture
+def fake_docker(tmp_path, monkeypatch):
+    """호출을 기록하는 가짜 docker CLI."""
+    script = tmp_path / "docker"
+    script.write_text(f"#!{sys.executable}\n{FAKE_DOCKER}")
+    script.chmod(0o755)
+    state = tmp_path / "docker_state.json"
+    monkeypatch.setenv("FAKE_DOCKER_STATE", str(state))
+
+    def read_state() -> dict:
+        return json.loads(state.read_text())
+
+    return str(script), read_state
+
+
+def test_create_args_strips_run_only_flags():
+    """--rm/--name은 이미지 앞에서만 빼고, 서버 명령 인자는 그대로 둔다."""
+    args = create_args(CONFIG, "ai-env-pool-github-0", "github")
+
+    assert args[:4] == ["create", "-i", "--name", "ai-env-pool-github-0"]
+    assert "gh" not in args
+    assert args[-4:] == [
+        "GITHUB_PERSONAL_ACCESS_TOKEN",
+        "ghcr.io/github/github-mcp-server",
+        "stdio",
+        "--rm",
+    ]
+    assert args.count("--rm") == 1
+    with pytest.raises(ValueError, match="not started with"):
+        create_args({"command": "npx", "args": ["-y", "x"]}, "c", "npx-server")
+
+
+def test_up_creates_once_and_recreates_on_secret_change(tmp_path, fake_docker):
+    """같은 설정이면 재사용하고, 시크릿이 바뀌면 컨테이너를 다시 만든다."""
+    docker, read_state = fake_docker
+    pool = ContainerPool(docker, base=tmp_path / "pool")
+
+    state = pool.up("github", CONFIG, size=2)
+    assert state.containers == ["ai-env-pool-github-0", "ai-env-pool-github-1"]
+    assert read_state()["calls"].count("create") == 2
+    assert read_state()["containers"]["ai-env-pool-github-0"]["token"] == "t1"
+
+    pool.up("github", CONFIG, size=2)
+    assert read_state()["calls"].count("create") == 2
+
+    rotated = {**CONFIG, "env": {"GITHUB_PERSONAL_ACCESS_TOKEN": "t2"}}
+    pool.up("github", rotated, size=1)
+    containers = read_state()["containers"]
+    assert set(containers) == {"ai-env-pool-github-0"}
+    assert containers["ai-env-pool-github-0"]["token"] == "t2"
+
+    assert pool.down("github") == 1
+    assert read_state()["containers"] == {}
+    assert PoolState.load("github", tmp_path / "pool") is None
+
+
+def test_acquire_locks_distinct_containers(tmp_path, fake_docker):
+    """attach 잠금은 컨테이너마다 하나의 클라이언트만 잡고, 설정이 바뀌면 pool을 쓰지 않는다."""
+    docker, _read_state = fake_docker
+    pool = ContainerPool(docker, base=tmp_path / "pool")
+    pool.up("github", CONFIG, size=2)
+
+    first = pool.acquire("github", CONFIG)
+    second = pool.acquire("github", CONFIG)
+    assert first is not None
+    assert second is not None
+    assert first[0] != second[0]
+    assert pool.acquire("github", CONFIG) is None
+    assert [s.in_use for s in pool.status("github")] == [True, True]
+
+    os.close(first[1])
+    third = pool.acquire("github", CONFIG)
+    assert third is not None
+    assert third[0] == first[0]
+    assert pool.attach_argv(third[0]) == [docker, "start", "-ai", third[0]]
+    os.close(second[1])
+    os.close(third[1])
+
+    rotated = {**CONFIG, "env": {"GITHUB_PERSONAL_ACCESS_TOKEN": "t2"}}
+    assert pool.acquire("github", rotated) is None
+
+
+def test_generator_emits_pool_attach_for_pooled_servers():
+    """mcp_pool.enabled이고 pool이 만들어진 docker 서버만 `mcp pool attach`로 생성한다."""
+    PoolState("github", config_hash(CONFIG), ["ai-env-pool-github-0"]).save()
+    secrets = MagicMock()
+    secrets.get.side_effect = lambda key, default="": default
+    secrets.substitute.side_effect = lambda value: value
+    servers = {
+        "github": MCPServerConfig(command="docker", args=CONFIG["args"], targets=["codex"]),
+        "jira": MCPServerConfig(command="docker", args=["run", "-i", "img"], targets=["codex"]),
+        "fetch": MCPServerConfig(command="uvx", args=["mcp-fetch"], targets=["codex"]),
+    }
+    settings = Settings(mcp_pool=MCPPoolConfig(enabled=True))
+    gen = MCPConfigGenerator(secrets, MCPConfig(mcp_servers=servers), settings)
+
+    codex = gen.generate_codex()
+
+    assert gen.pool_candidates() == ["github", "jira"]
+    assert gen.pool_servers() == ["github"]
+    assert 'args = ["mcp", "pool", "attach", "github"]' in codex
+    assert 'args = ["run", "-i", "img"]' in codex
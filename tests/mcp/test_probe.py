@@ -0,0 +1,103 @@
+"""Tests for the concurrent MCP server probe."""
+
+from __future__ import annotations
+
+import sys
+import textwrap
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from ai_env.core.config import MCPConfig, MCPServerConfig, Settings
+from ai_env.mcp.generator import MCPConfigGenerator
+from ai_env.mcp.probe import probe_servers
+
+FAKE_SERVER = textwrap.dedent(
+    """
+    import json, sys, time
+    delay = float(sys.argv[1]) if len(sys.argv) > 1 else 0
+    time.sleep(delay)
+    print("starting fake server", flush=True)  # JSON이 아닌 로그 줄은 무시되어야 함
+    for line in sys.stdin:
+        msg = json.loads(line)
+        if msg.get("method") == "initialize":
+            result = {"protocolVersion": "2024-11-05", "capabilities": {},
+                      "serverInfo": {"name": "fake", "version": "1.0"}}
+        elif msg.get("method") == "tools/list":
+            result = {"tools": [{"name": "a"}, {"name": "b"}]}
+        else:
+            continue
+        print(json.dumps({"jsonrpc": "2.0", "id": msg["id"], "result": result}), flush=True)
+    """
+)
+
+
+def _generator(tmp_path: Path, servers: dict[str, MCPServerConfig]) -> MCPConfigGenerator:
+    secrets = MagicMock()
+    secrets.get.side_effect = lambda key, default="": default
+    secrets.substitute.side_effect = lambda value: value.replace("$DIR", str(tmp_path))
+    (tmp_path / "fake_server.py").write_text(FAKE_SERVER)
+    return MCPConfigGenerator(secrets, MCPConfig(mcp_servers=servers), Settings())
+
+
+def _fake(delay: float = 0, **kwargs) -> MCPServerConfig:
+    return MCPServerConfig(
+        command=sys.executable, args=["$DIR/fake_server.py", str(delay)], **kwargs
+    )
+
+
+async def test_probe_reports_ready_latency_and_tools(tmp_path):
+    """initialize + tools/list 핸드셰이크로 기동 시간과 도구 수를 측정한다."""
+    gen = _generator(
+        tmp_path,
+        {
+            "fake": _fake(),
+            "missing": MCPServerConfig(command="/nonexistent/mcp-server"),
+            "remote": MCPServerConfig(type="sse", url_env="UNSET_URL"),
+            "off": MCPServerConfig(enabled=False, command="x"),
+        },
+    )
+
+    results = await probe_servers(gen, timeout=20)
+
+    by_name = {r.name: r for r in results}
+    assert [r.name for r in results] == ["fake", "missing", "remote"]
+    assert by_name["fake"].status == "ok"
+    assert by_name["fake"].tools == 2
+    assert by_name["fake"].server_info == "fake 1.0"
+    assert by_name["fake"].ready_seconds is not None
+    assert by_name["fake"].rss_bytes > 0
+    assert [t["name"] for t in by_name["fake"].catalog["tools"]] == ["a", "b"]
+    assert by_name["missing"].status == "failed"
+    assert by_name["remote"].status == "skipped"
+
+
+async def test_probe_runs_servers_concurrently(tmp_path):
+    """느린 서버 여러 개를 동시에 기동하므로 전체 시간은 가장 느린 서버 수준이다."""
+    gen = _generator(tmp_path, {f"slow{i}": _fake(delay=1.0) for i in range(4)})
+
+    start = time.perf_counter()
+    results = await probe_servers(gen, timeout=20)
+
+    assert all(r.status == "ok" for r in results)
+    assert time.perf_counter() - start < 3.5
+
+
+async def test_probe_timeout_kills_server(tmp_path):
+    """제한 시간 안에 응답하지 않으면 timeout으로 보고하고 프로세스를 정리한다."""
+    gen = _generator(tmp_path, {"hang": _fake(delay=30)})
+
+    results = await probe_servers(gen, timeout=0.5)
+
+    assert results[0].status == "timeout"
+    assert results[0].elapsed < 10
+
+
+async def test_probe_unknown_name(tmp_path):
+    """mcp_servers.yaml에 없는 이름은 ValueError."""
+    gen = _generator(tmp_path, {})
+
+    with pytest.raises(ValueError, match="Unknown MCP server"):
+        await probe_servers(gen, ["nope"])
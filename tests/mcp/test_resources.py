@@ -0,0 +1,117 @@
+"""Tests for per-server resource limits."""
+
+from __future__ import annotations
+
+import shutil
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+
+from ai_env.core.config import (
+    MCPConfig,
+    MCPResourceLimits,
+    MCPResourcesConfig,
+    MCPServerConfig,
+    Settings,
+)
+from ai_env.mcp.generator import MCPConfigGenerator
+from ai_env.mcp.pool import create_args
+from ai_env.mcp.probe import probe_servers
+from ai_env.mcp.resources import effective_limits, parse_size
+
+FAKE_SERVER = """
+import json, sys
+for line in sys.stdin:
+    msg = json.loads(line)
+    if "id" in msg:
+        result = {"tools": []} if msg["method"] == "tools/list" else {"capabilities": {}}
+        print(json.dumps({"jsonrpc": "2.0", "id": msg["id"], "result": result}), flush=True)
+"""
+
+PROFILES = {
+    "small": MCPResourceLimits(cpus=0.5, memory="256m", pids=64),
+    "large": MCPResourceLimits(cpus=2, memory="1g", pids=256),
+}
+
+
+def _generator(servers: dict[str, MCPServerConfig], **resources) -> MCPConfigGenerator:
+    secrets = MagicMock()
+    secrets.get.side_effect = lambda key, default="": default
+    secrets.substitute.side_effect = lambda value: value
+    settings = Settings(mcp_resources=MCPResourcesConfig(profiles=PROFILES, **resources))
+    return MCPConfigGenerator(secrets, MCPConfig(mcp_servers=servers), settings)
+
+
+def test_effective_limits_merges_profile_and_overrides():
+    """서버에 지정한 값이 profile 값보다 우선하고, resources가 없으면 default_profile을 쓴다."""
+    config = MCPResourcesConfig(profiles=PROFILES, default_profile="large")
+    override = MCPServerConfig(resources=MCPResourceLimits(profile="small", memory="384m"))
+
+    assert effective_limits("a", override, config) == MCPResourceLimits(
+        cpus=0.5, memory="384m", pids=64
+    )
+    assert effective_limits("b", MCPServerConfig(), config) == PROFILES["large"]
+    assert effective_limits("c", MCPServerConfig(), MCPResourcesConfig()) is None
+    with pytest.raises(ValueError, match="unknown resource profile 'huge'"):
+        effective_limits("d", MCPServerConfig(resources=MCPResourceLimits(profile="huge")), config)
+    assert parse_size("512m") == 512 * 1024**2
+    assert parse_size("1.5GiB") == 1536 * 1024**2
+    assert parse_size("12.5MiB ") == int(12.5 * 1024**2)
+    with pytest.raises(ValueError, match="memory"):
+        MCPResourceLimits(memory="lots")
+
+
+def test_generator_applies_docker_flags_and_native_wrapper():
+    """docker run 서버에는 런타임 플래그를, 그 밖의 명령에는 native wrapper를 적용한다."""
+    small = MCPResourceLimits(profile="small")
+    gen = _generator(
+        {
+            "github": MCPServerConfig(
+                command="docker",
+                args=["run", "-i", "--rm", "--memory", "2g", "img", "stdio"],
+                resources=small,
+                targets=["claude_desktop"],
+            ),
+            "fetch": MCPServerConfig(command="uvx", args=["mcp-fetch"], resources=small),
+            "free": MCPServerConfig(command="npx", args=["x"]),
+        },
+        native="systemd-run",
+    )
+
+    github = gen.generate_claude_desktop()["mcpServers"]["github"]
+    assert github["args"] == [
+        "run", "--cpus", "0.5", "--pids-limit", "64", "-i", "--rm", "--memory", "2g", "img", "stdio"
+    ]  # fmt: skip
+    # pool 컨테이너도 같은 제한으로 생성 (--pids-limit 값이 이미지로 오인되지 않음)
+    pooled = create_args(github, "ai-env-pool-github-0", "github")
+    assert pooled[-9:] == [
+        "--cpus", "0.5", "--pids-limit", "64", "-i", "--memory", "2g", "img", "stdio"
+    ]  # fmt: skip
+    assert gen.resolve_server("fetch") == {
+        "command": "systemd-run",
+        "args": [
+            "--user", "--scope", "--quiet", "--collect",
+            "-p", f"MemoryMax={256 * 1024**2}", "-p", "TasksMax=64", "-p", "CPUQuota=50%",
+            "--", "uvx", "mcp-fetch",
+        ],
+    }  # fmt: skip
+    assert gen.resolve_server("free") == {"command": "npx", "args": ["x"]}
+
+
+@pytest.mark.skipif(shutil.which("prlimit") is None, reason="prlimit not available")
+async def test_probe_reports_rss_under_prlimit(tmp_path):
+    """prlimit으로 감싼 서버도 그대로 probe되고 RSS를 보고한다."""
+    (tmp_path / "fake_server.py").write_text(FAKE_SERVER)
+    server = MCPServerConfig(
+        command=sys.executable,
+        args=[str(tmp_path / "fake_server.py")],
+        resources=MCPResourceLimits(memory="4g"),
+    )
+    gen = _generator({"fake": server}, native="prlimit")
+
+    (result,) = await probe_servers(gen, timeout=20)
+
+    assert gen.resolve_server("fake")["command"] == "prlimit"
+    assert result.status == "ok", result.error
+    assert 0 < result.rss_bytes < parse_size("4g")
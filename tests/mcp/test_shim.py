@@ -0,0 +1,143 @@
+"""Tests for the lazy-start MCP shim."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import sys
+import textwrap
+from unittest.mock import MagicMock
+
+from ai_env.core.config import MCPConfig, MCPServerConfig, MCPShimConfig, Settings
+from ai_env.mcp.catalog import load_catalog, save_catalog
+from ai_env.mcp.generator import MCPConfigGenerator
+from ai_env.mcp.shim import run_shim
+
+FAKE_SERVER = textwrap.dedent(
+    """
+    import json, sys
+    for line in sys.stdin:
+        msg = json.loads(line)
+        method = msg.get("method")
+        if method == "initialize":
+            result = {"protocolVersion": "2024-11-05", "capabilities": {"tools": {}},
+                      "serverInfo": {"name": "real", "version": "2.0"}}
+        elif method == "tools/list":
+            result = {"tools": [{"name": "echo"}, {"name": "new-tool"}]}
+        elif method == "tools/call":
+            result = {"content": [{"type": "text", "text": "called"}]}
+        else:
+            continue
+        print(json.dumps({"jsonrpc": "2.0", "id": msg["id"], "result": result}), flush=True)
+    """
+)
+CATALOG = {
+    "initialize": {
+        "protocolVersion": "2024-11-05",
+        "capabilities": {"tools": {}},
+        "serverInfo": {"name": "cached", "version": "1.0"},
+    },
+    "tools": [{"name": "echo"}],
+}
+
+
+async def _run(config: dict, messages: list[dict], expected: int) -> list[dict]:
+    """shim에 메시지를 넣고 expected개의 응답을 받을 때까지 실행"""
+    stdin = asyncio.StreamReader()
+    output: list[dict] = []
+    got_all = asyncio.Event()
+
+    def _write(data: bytes) -> None:
+        output.append(json.loads(data))
+        if len(output) >= expected:
+            got_all.set()
+
+    for message in messages:
+        stdin.feed_data(json.dumps(message).encode() + b"\n")
+    shim = asyncio.create_task(run_shim("fake", config, CATALOG, stdin=stdin, write=_write))
+    await asyncio.wait_for(got_all.wait(), 10)
+    stdin.feed_eof()
+    await asyncio.wait_for(shim, 10)
+    return output
+
+
+async def test_shim_answers_from_catalog_without_spawning():
+    """initialize/tools/list는 캐시로 응답하고 서버는 기동하지 않는다."""
+    config = {"command": "/nonexistent/mcp-server", "args": []}
+    messages = [
+        {"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {}},
+        {"jsonrpc": "2.0", "method": "notifications/initialized"},
+        {"jsonrpc": "2.0", "id": 2, "method": "tools/list"},
+    ]
+
+    output = await _run(config, messages, expected=2)
+
+    assert output[0]["result"]["serverInfo"]["name"] == "cached"
+    assert output[1] == {"jsonrpc": "2.0", "id": 2, "result": {"tools": [{"name": "echo"}]}}
+
+
+async def test_shim_answers_startup_list_requests_without_spawning(tmp_path):
+    """클라이언트가 시작할 때 보내는 resources/prompts 목록 요청으로는 서버를 기동하지 않는다."""
+    marker = tmp_path / "started"
+    config = {"command": sys.executable, "args": ["-c", f"open({str(marker)!r}, 'w')"]}
+    messages = [
+        {"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {}},
+        {"jsonrpc": "2.0", "method": "notifications/initialized"},
+        {"jsonrpc": "2.0", "id": 2, "method": "resources/list"},
+        {"jsonrpc": "2.0", "id": 3, "method": "resources/templates/list"},
+        {"jsonrpc": "2.0", "id": 4, "method": "prompts/list"},
+        {"jsonrpc": "2.0", "id": 5, "method": "tools/list"},
+    ]
+
+    output = await _run(config, messages, expected=5)
+
+    assert [message["result"] for message in output[1:]] == [
+        {"resources": []},
+        {"resourceTemplates": []},
+        {"prompts": []},
+        {"tools": [{"name": "echo"}]},
+    ]
+    assert not marker.exists()
+
+
+async def test_shim_spawns_on_first_tool_call(tmp_path):
+    """첫 tools/call에서 서버를 기동해 중계하고, 도구 목록이 바뀌었으면 알린다."""
+    script = tmp_path / "fake_server.py"
+    script.write_text(FAKE_SERVER)
+    config = {"command": sys.executable, "args": [str(script)]}
+    messages = [
+        {"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {}},
+        {"jsonrpc": "2.0", "id": 2, "method": "prompts/list"},
+        {"jsonrpc": "2.0", "id": 3, "method": "tools/call", "params": {"name": "echo"}},
+    ]
+
+    output = await _run(config, messages, expected=5)
+
+    # 캐시 없이 빈 목록으로 답한 prompts는 기동 후 다시 받도록 알림
+    assert output[2] == {"jsonrpc": "2.0", "method": "notifications/prompts/list_changed"}
+    assert output[3] == {
+        "jsonrpc": "2.0",
+        "id": 3,
+        "result": {"content": [{"type": "text", "text": "called"}]},
+    }
+    assert output[4]["method"] == "notifications/tools/list_changed"
+    assert [t["name"] for t in load_catalog("fake")["tools"]] == ["echo", "new-tool"]
+
+
+def test_generator_emits_shim_only_for_cached_servers():
+    """mcp_shim.enabled면 카탈로그가 있는 stdio 서버만 shim 명령으로 생성한다."""
+    save_catalog("cached", CATALOG)
+    secrets = MagicMock()
+    secrets.get.side_effect = lambda key, default="": default
+    secrets.substitute.side_effect = lambda value: value
+    servers = {
+        "cached": MCPServerConfig(command="docker", targets=["claude_desktop"]),
+        "uncached": MCPServerConfig(command="npx", targets=["claude_desktop"]),
+    }
+    settings = Settings(mcp_shim=MCPShimConfig(enabled=True))
+    gen = MCPConfigGenerator(secrets, MCPConfig(mcp_servers=servers), settings)
+
+    desktop = gen.generate_claude_desktop()["mcpServers"]
+
+    assert desktop["cached"] == {"command": "ai-env", "args": ["mcp", "shim", "cached"]}
+    assert desktop["uncached"]["command"] == "npx"
@@ -0,0 +1,171 @@
+"""Tests for the MCP call tap and transcript replay."""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import json
+import sys
+import textwrap
+from unittest.mock import MagicMock
+
+from ai_env.core.config import MCPConfig, MCPServerConfig, MCPShimConfig, MCPTapConfig, Settings
+from ai_env.mcp.catalog import save_catalog
+from ai_env.mcp.generator import MCPConfigGenerator
+from ai_env.mcp.tap import (
+    TapRecorder,
+    load_transcript,
+    read_calls,
+    replay_transcript,
+    run_tap,
+    summarize_calls,
+)
+
+FAKE_SERVER = textwrap.dedent(
+    """
+    import json, sys
+    for line in sys.stdin:
+        msg = json.loads(line)
+        method = msg.get("method")
+        if method == "initialize":
+            result = {"protocolVersion": "2024-11-05", "capabilities": {"tools": {}}}
+        elif method == "tools/call" and msg["params"]["name"] == "echo":
+            result = {"content": [{"type": "text", "text": msg["params"]["arguments"]["text"]}]}
+        elif method == "tools/call":
+            error = {"code": -32602, "message": "unknown tool"}
+            print(json.dumps({"jsonrpc": "2.0", "id": msg["id"], "error": error}), flush=True)
+            continue
+        else:
+            continue
+        print(json.dumps({"jsonrpc": "2.0", "id": msg["id"], "result": result}), flush=True)
+    """
+)
+
+
+def _line(message: dict) -> bytes:
+    return json.dumps(message).encode() + b"\n"
+
+
+def test_recorder_pairs_requests_and_responses():
+    """id로 요청/응답을 짝짓고, 에러 응답과 응답 없이 끝난 요청도 기록한다."""
+    ticks = iter([0.0, 1.0, 1.5, 2.0, 2.25, 3.0, 3.5, 4.0])
+    log = io.StringIO()
+    recorder = TapRecorder("fake", log=log, clock=lambda: next(ticks), wall=lambda: 100.0)
+
+    call = {"jsonrpc": "2.0", "id": "a", "method": "tools/call", "params": {"name": "echo"}}
+    recorder.observe("client", _line(call))
+    recorder.observe("client", _line({"jsonrpc": "2.0", "method": "notifications/x"}))
+    recorder.observe("server", _line({"jsonrpc": "2.0", "id": "a", "result": {}}))
+    # 서버 → 클라이언트 요청(sampling)은 direction=server로 기록
+    recorder.observe("server", _line({"jsonrpc": "2.0", "id": 1, "method": "sampling/x"}))
+    error = {"code": -1, "message": "denied"}
+    recorder.observe("client", _line({"jsonrpc": "2.0", "id": 1, "error": error}))
+    recorder.observe("client", _line({"jsonrpc": "2.0", "id": 2, "method": "tools/list"}))
+    recorder.observe("client", b"not json\n")
+    recorder.close()
+
+    records = [r.to_dict() for r in recorder.records]
+    assert [(r["direction"], r["method"], r["tool"]) for r in records] == [
+        ("client", "tools/call", "echo"),
+        ("server", "sampling/x", None),
+        ("client", "tools/list", None),
+    ]
+    assert records[0]["latency_ms"] == 1000.0
+    assert records[0]["request_bytes"] == len(_line(call))
+    assert records[1]["error"] == "denied"
+    assert records[2]["latency_ms"] is None
+    assert records[2]["error"] == "closed"
+    assert [json.loads(line) for line in log.getvalue().splitlines()] == records
+
+
+async def test_tap_proxies_records_and_replays(tmp_path):
+    """tap은 메시지를 그대로 중계하며 기록하고, 트랜스크립트를 서버에 다시 재생할 수 있다."""
+    script = tmp_path / "fake_server.py"
+    script.write_text(FAKE_SERVER)
+    config = {"command": sys.executable, "args": [str(script)]}
+    messages = [
+        {"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {}},
+        {"jsonrpc": "2.0", "method": "notifications/initialized"},
+        {
+            "jsonrpc": "2.0",
+            "id": 2,
+            "method": "tools/call",
+            "params": {"name": "echo", "arguments": {"text": "hi"}},
+        },
+        {"jsonrpc": "2.0", "id": 3, "method": "tools/call", "params": {"name": "missing"}},
+    ]
+    stdin = asyncio.StreamReader()
+    for message in messages:
+        stdin.feed_data(_line(message))
+    stdin.feed_eof()
+    output: list[bytes] = []
+
+    await asyncio.wait_for(
+        run_tap("fake", config, record=True, base=tmp_path, stdin=stdin, write=output.append), 10
+    )
+
+    assert [json.loads(line)["id"] for line in output] == [1, 2, 3]
+    assert json.loads(output[1])["result"]["content"][0]["text"] == "hi"
+    calls = read_calls(["fake"], base=tmp_path)
+    assert [(c["method"], c["tool"], c["error"]) for c in calls] == [
+        ("initialize", None, None),
+        ("tools/call", "echo", None),
+        ("tools/call", "missing", "unknown tool"),
+    ]
+    assert calls[1]["response_bytes"] == len(output[1])
+
+    (transcript,) = (tmp_path / "transcripts").glob("fake-*.jsonl")
+    header, entries = load_transcript(transcript)
+    assert header["server"] == "fake"
+    assert sorted(e["dir"] for e in entries) == ["client"] * 4 + ["server"] * 3
+
+    replayed = await replay_transcript(config, entries, timeout=10)
+    assert [(c.method, c.tool, c.error) for c in replayed] == [
+        ("initialize", None, None),
+        ("tools/call", "echo", None),
+        ("tools/call", "missing", "unknown tool"),
+    ]
+    assert all(c.replay_ms is not None and c.recorded_ms is not None for c in replayed)
+
+
+def test_summarize_calls_groups_by_tool():
+    """(서버, 메서드, 도구)별로 묶고 p95가 큰 그룹부터 정렬한다."""
+    records = [
+        {"server": "s", "method": "tools/call", "tool": "fast", "latency_ms": 10.0,
+         "request_bytes": 100, "response_bytes": 200, "error": None},
+        {"server": "s", "method": "tools/call", "tool": "slow", "latency_ms": 900.0,
+         "request_bytes": 50, "response_bytes": 5000, "error": None},
+        {"server": "s", "method": "tools/call", "tool": "slow", "latency_ms": None,
+         "request_bytes": 70, "response_bytes": None, "error": "closed"},
+    ]  # fmt: skip
+
+    summaries = summarize_calls(records)
+
+    assert [(s.tool, s.calls, s.errors) for s in summaries] == [("slow", 2, 1), ("fast", 1, 0)]
+    assert summaries[0].max_ms == 900.0
+    assert summaries[0].avg_request_bytes == 60.0
+    assert summaries[0].avg_response_bytes == 5000.0
+
+
+def test_generator_emits_tap_after_other_routes():
+    """mcp_tap.enabled면 shim으로 연결하지 않는 stdio 서버를 `mcp tap`으로 생성한다."""
+    save_catalog("cached", {"initialize": {}, "tools": []})
+    secrets = MagicMock()
+    secrets.get.side_effect = lambda key, default="": default
+    secrets.substitute.side_effect = lambda value: value
+    servers = {
+        "cached": MCPServerConfig(command="docker", targets=["claude_desktop"]),
+        "fetch": MCPServerConfig(command="uvx", targets=["claude_desktop"]),
+        "remote": MCPServerConfig(type="sse", url_env="REMOTE_URL", targets=["claude_desktop"]),
+    }
+    settings = Settings(
+        mcp_shim=MCPShimConfig(enabled=True, servers=["cached"]),
+        mcp_tap=MCPTapConfig(enabled=True, record=True),
+    )
+    gen = MCPConfigGenerator(secrets, MCPConfig(mcp_servers=servers), settings)
+
+    desktop = gen.generate_claude_desktop()["mcpServers"]
+
+    assert gen.tap_servers() == ["fetch"]
+    assert desktop["cached"]["args"] == ["mcp", "shim", "cached"]
+    assert desktop["fetch"] == {"command": "ai-env", "args": ["mcp", "tap", "fetch", "--record"]}